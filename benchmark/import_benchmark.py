@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""The benchmark of the cold import cost of agentscope and each of its
+public subpackages, where each import is measured in a fresh interpreter.
+
+Usage:
+    python benchmark/import_benchmark.py --repeats 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+SUBPACKAGES = [
+    "agentscope",
+    "agentscope.agent",
+    "agentscope.embedding",
+    "agentscope.evaluate",
+    "agentscope.formatter",
+    "agentscope.mcp",
+    "agentscope.memory",
+    "agentscope.message",
+    "agentscope.model",
+    "agentscope.pipeline",
+    "agentscope.plan",
+    "agentscope.rag",
+    "agentscope.session",
+    "agentscope.token",
+    "agentscope.tool",
+    "agentscope.tracing",
+]
+
+
+def measure(statement: str) -> float:
+    """Run the import statement in a fresh interpreter, and return its time
+    in milliseconds."""
+    res = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import time\n"
+            "start = time.perf_counter()\n"
+            f"{statement}\n"
+            "print((time.perf_counter() - start) * 1000)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(res.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    """The entry of the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {name: f"import {name}" for name in SUBPACKAGES}
+    # The first access of the public attributes, which imports the modules
+    # defining them
+    cases["ReActAgent"] = "from agentscope.agent import ReActAgent"
+    cases["OpenAIChatModel"] = "from agentscope.model import OpenAIChatModel"
+    cases["Toolkit"] = "from agentscope.tool import Toolkit"
+    cases["KnowledgeBase"] = "from agentscope.rag import KnowledgeBase"
+
+    print(f"{'import':>24} {'median ms':>10} {'min ms':>10}")
+    for name, statement in cases.items():
+        times = [measure(statement) for _ in range(args.repeats)]
+        print(
+            f"{name:>24} {statistics.median(times):>10.1f} "
+            f"{min(times):>10.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
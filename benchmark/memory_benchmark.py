@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""The micro-benchmark of adding, deleting and reading messages in the
+in-memory memory.
+
+Usage:
+    python benchmark/memory_benchmark.py --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import time
+
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+
+
+async def benchmark(size: int, n_ops: int) -> dict[str, float]:
+    """Benchmark the memory with the given number of messages, and return
+    the average time of each operation in microseconds."""
+    msgs = [Msg("user", f"message {i}", "user") for i in range(size)]
+    memory = InMemoryMemory()
+
+    res = {}
+
+    start = time.perf_counter()
+    for msg in msgs:
+        await memory.add(msg)
+    res["add"] = (time.perf_counter() - start) / size * 1e6
+
+    # Re-adding existing messages is skipped by the duplicate check
+    start = time.perf_counter()
+    for msg in msgs[:n_ops]:
+        await memory.add(msg)
+    res["add_duplicate"] = (time.perf_counter() - start) / n_ops * 1e6
+
+    start = time.perf_counter()
+    for _ in range(n_ops):
+        await memory.get_memory(-20)
+    res["get_last_20"] = (time.perf_counter() - start) / n_ops * 1e6
+
+    start = time.perf_counter()
+    for _ in range(n_ops):
+        await memory.get_memory()
+    res["get_all"] = (time.perf_counter() - start) / n_ops * 1e6
+
+    start = time.perf_counter()
+    for _ in range(n_ops):
+        await memory.delete(await memory.size() - 1)
+    res["delete_last"] = (time.perf_counter() - start) / n_ops * 1e6
+
+    # Delete in the middle, followed by a read that compacts the memory
+    start = time.perf_counter()
+    for _ in range(n_ops):
+        await memory.delete(await memory.size() // 2)
+    await memory.get_memory()
+    res["delete_middle"] = (time.perf_counter() - start) / n_ops * 1e6
+
+    return res
+
+
+async def main() -> None:
+    """The entry of the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--n-ops", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'operation':>15} {'us/op':>10}")
+    for size in args.sizes:
+        res = await benchmark(size, min(args.n_ops, size // 4))
+        for name, cost in res.items():
+            print(f"{size:>10} {name:>15} {cost:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
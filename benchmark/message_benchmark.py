@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""The benchmark of the per-turn copying cost of the messages, comparing
+the deep copies made by the formatter and the fanout pipeline before with
+the shared (frozen) messages now.
+
+Usage:
+    python benchmark/message_benchmark.py --sizes 100 1000 --n-agents 8
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from copy import deepcopy
+from functools import partial
+from typing import Any, Callable
+
+from agentscope.formatter import OpenAIChatFormatter
+from agentscope.message import (
+    Base64Source,
+    ImageBlock,
+    Msg,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+)
+
+
+def build_history(size: int) -> list[Msg]:
+    """Build a history of the given number of messages, including tool calls
+    and base64 images."""
+    msgs = [Msg("system", "You're a helpful assistant.", "system")]
+    for i in range(size // 4):
+        msgs.extend(
+            [
+                Msg(
+                    "user",
+                    [
+                        TextBlock(type="text", text=f"Describe image {i}."),
+                        ImageBlock(
+                            type="image",
+                            source=Base64Source(
+                                type="base64",
+                                media_type="image/png",
+                                data="a" * 16384,
+                            ),
+                        ),
+                    ],
+                    "user",
+                ),
+                Msg(
+                    "assistant",
+                    [
+                        ToolUseBlock(
+                            type="tool_use",
+                            id=str(i),
+                            name="search",
+                            input={"query": f"image {i}", "top_k": 5},
+                        ),
+                    ],
+                    "assistant",
+                ),
+                Msg(
+                    "system",
+                    [
+                        ToolResultBlock(
+                            type="tool_result",
+                            id=str(i),
+                            name="search",
+                            output=[
+                                TextBlock(type="text", text=f"result {j}")
+                                for j in range(5)
+                            ],
+                        ),
+                    ],
+                    "system",
+                ),
+                Msg("assistant", f"It's image {i}.", "assistant"),
+            ],
+        )
+    return msgs
+
+
+def copy_for_agents(msgs: list[Msg], n_agents: int) -> list:
+    """Deep copy the input messages for each agent."""
+    return [deepcopy(msgs) for _ in range(n_agents)]
+
+
+def share_for_agents(msgs: list[Msg], n_agents: int) -> list:
+    """Share the frozen input messages among the agents."""
+    return [list(msgs) for _ in range(n_agents)]
+
+
+def measure(func: Callable[[], Any], n_turns: int) -> tuple[float, float]:
+    """Run the function for the given turns, and return the average time in
+    milliseconds and the peak allocated memory in KB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(n_turns):
+        func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / n_turns * 1000, peak / 1024
+
+
+async def main() -> None:
+    """The entry of the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--n-agents", type=int, default=8)
+    parser.add_argument("--n-turns", type=int, default=10)
+    args = parser.parse_args()
+
+    formatter = OpenAIChatFormatter()
+
+    print(
+        f"{'size':>6} {'case':>16} {'before ms':>10} {'after ms':>10} "
+        f"{'before KB':>10} {'after KB':>10}",
+    )
+    for size in args.sizes:
+        msgs = build_history(size)
+        frozen = [_.freeze() for _ in msgs]
+
+        cases = {
+            # The formatter deep copied the history before formatting
+            "format copy": (
+                partial(deepcopy, msgs),
+                partial(list, msgs),
+            ),
+            # The fanout pipeline deep copied the input for each agent
+            "fanout input": (
+                partial(copy_for_agents, msgs[-4:], args.n_agents),
+                partial(share_for_agents, frozen[-4:], args.n_agents),
+            ),
+        }
+        for name, (before, after) in cases.items():
+            before_ms, before_kb = measure(before, args.n_turns)
+            after_ms, after_kb = measure(after, args.n_turns)
+            print(
+                f"{size:>6} {name:>16} {before_ms:>10.2f} {after_ms:>10.2f} "
+                f"{before_kb:>10.1f} {after_kb:>10.1f}",
+            )
+
+        # The formatting itself for reference, which is unchanged
+        start = time.perf_counter()
+        for _ in range(args.n_turns):
+            await formatter.format(msgs)
+        print(
+            f"{size:>6} {'format':>16} "
+            f"{(time.perf_counter() - start) / args.n_turns * 1000:>10.2f}",
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
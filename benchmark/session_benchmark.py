@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""The benchmark of saving a session after each turn, comparing the full
+rewrite of `JSONSession` with the incremental journal of `JournalSession`.
+
+Usage:
+    python benchmark/session_benchmark.py --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+from agentscope.session import JSONSession, JournalSession, SessionBase
+
+
+async def benchmark(
+    session: SessionBase,
+    size: int,
+    n_turns: int,
+) -> tuple[float, float]:
+    """Save a memory with the given number of messages, then add one
+    message and save the session for each turn, and return the average
+    time of a save and the longest blocking time of the event loop in
+    milliseconds."""
+    memory = InMemoryMemory()
+    await memory.add(
+        [
+            Msg("user", f"message {i} " + "x" * 200, "user")
+            for i in range(size)
+        ],
+    )
+    await session.save_session_state("benchmark", memory=memory)
+
+    # Measure how long the event loop is blocked by the saving
+    max_block = 0.0
+
+    async def _monitor() -> None:
+        nonlocal max_block
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_block = max(max_block, time.perf_counter() - start - 0.001)
+
+    monitor = asyncio.create_task(_monitor())
+    await asyncio.sleep(0)
+
+    elapsed = 0.0
+    for i in range(n_turns):
+        await memory.add(Msg("assistant", f"reply {i}", "assistant"))
+        start = time.perf_counter()
+        await session.save_session_state("benchmark", memory=memory)
+        elapsed += time.perf_counter() - start
+        # Let the monitor run between the turns
+        await asyncio.sleep(0.002)
+
+    monitor.cancel()
+    return elapsed / n_turns * 1000, max_block * 1000
+
+
+async def main() -> None:
+    """The entry of the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+    )
+    parser.add_argument("--n-turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'session':>15} {'ms/save':>10} {'max block ms':>13}")
+    for size in args.sizes:
+        for session_class in [JSONSession, JournalSession]:
+            save_dir = tempfile.mkdtemp()
+            cost, block = await benchmark(
+                session_class(save_dir=save_dir),
+                size,
+                args.n_turns,
+            )
+            shutil.rmtree(save_dir)
+            print(
+                f"{size:>8} {session_class.__name__:>15} "
+                f"{cost:>10.2f} {block:>13.2f}",
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -57,6 +57,7 @@ async def react_agent_solution(
         "pre_print",
         "save_logging",
         pre_hook,
+        mode="read_only",
     )
 
     # Execute the agent to solve the task
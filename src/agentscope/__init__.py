@@ -2,29 +2,11 @@
 """The agentscope serialization module"""
 import os
 
-import requests
-
-from . import exception
-from . import module
-from . import message
-from . import model
-from . import tool
-from . import formatter
-from . import memory
-from . import agent
-from . import session
-from . import embedding
-from . import token
-from . import evaluate
-from . import pipeline
-from . import tracing
-from . import rag
-
 from ._logging import (
     logger,
     setup_logger,
 )
-from .hooks import _equip_as_studio_hooks
+from ._utils._lazy import _lazy_import
 from ._version import __version__
 
 
@@ -68,6 +50,8 @@ def init(
     setup_logger(logging_level, logging_path)
 
     if studio_url:
+        import requests
+
         # Register the run
         data = {
             "id": _config.run_id,
@@ -95,6 +79,8 @@ def init(
             ),
         )
 
+        from .hooks import _equip_as_studio_hooks
+
         _equip_as_studio_hooks(studio_url)
 
     if tracing_url:
@@ -131,3 +117,34 @@ __all__ = [
     "setup_logger",
     "__version__",
 ]
+
+# The subpackages are imported on their first access, e.g.
+# `agentscope.agent`, so that `import agentscope` doesn't import the
+# third-party libraries of the unused subpackages
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        name: f".{name}"
+        for name in [
+            "exception",
+            "module",
+            "message",
+            "model",
+            "tool",
+            "formatter",
+            "memory",
+            "agent",
+            "session",
+            "embedding",
+            "token",
+            "evaluate",
+            "pipeline",
+            "tracing",
+            "rag",
+            "hooks",
+            "mcp",
+            "plan",
+            "types",
+        ]
+    },
+)
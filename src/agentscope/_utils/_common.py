@@ -6,6 +6,7 @@ import functools
 import inspect
 import json
 import os
+import struct
 import tempfile
 import types
 import typing
@@ -13,7 +14,6 @@ import uuid
 from datetime import datetime
 from typing import Union, Any, Callable, Type, Dict
 
-import requests
 from json_repair import repair_json
 from pydantic import BaseModel
 
@@ -116,6 +116,8 @@ def _get_bytes_from_web_url(
         max_retries (`int`, defaults to `3`):
             The maximum number of retries.
     """
+    import requests
+
     for _ in range(max_retries):
         try:
             response = requests.get(url)
@@ -137,6 +139,64 @@ def _get_bytes_from_web_url(
     )
 
 
+def _get_image_size_from_header(data: bytes) -> tuple[int, int] | None:
+    """Get the size of a PNG, JPEG, GIF or WebP image by parsing its header,
+    without decoding the whole image. Only the leading bytes of the image
+    are required.
+
+    Args:
+        data (`bytes`):
+            The leading bytes of the image.
+
+    Returns:
+        `tuple[int, int] | None`:
+            The width and height of the image, or `None` if the format is
+            not recognized or the header is incomplete.
+    """
+    size = None
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        size = struct.unpack(">II", data[16:24])
+
+    elif data[:6] in [b"GIF87a", b"GIF89a"] and len(data) >= 10:
+        size = struct.unpack("<HH", data[6:10])
+
+    elif data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            size = (width & 0x3FFF, height & 0x3FFF)
+        elif chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            size = ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+        elif chunk == b"VP8X":
+            size = (
+                int.from_bytes(data[24:27], "little") + 1,
+                int.from_bytes(data[27:30], "little") + 1,
+            )
+
+    elif data[:2] == b"\xff\xd8":
+        # Walk through the JPEG segments until the start of frame segment
+        index = 2
+        while size is None and index + 9 <= len(data):
+            marker = data[index + 1]
+            if data[index] != 0xFF or marker == 0xFF:
+                index += 1
+            elif marker in [0xD8, 0x01] or 0xD0 <= marker <= 0xD7:
+                index += 2
+            elif 0xC0 <= marker <= 0xCF and marker not in [0xC4, 0xC8, 0xCC]:
+                height, width = struct.unpack(
+                    ">HH",
+                    data[index + 5 : index + 9],
+                )
+                size = (width, height)
+            else:
+                index += (
+                    2 + struct.unpack(">H", data[index + 2 : index + 4])[0]
+                )
+
+    return size
+
+
 def _save_base64_data(
     media_type: str,
     base64_data: str,
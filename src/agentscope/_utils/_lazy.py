@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""The lazy loading of the public attributes of the packages in
+agentscope."""
+import importlib
+import sys
+from typing import Any, Callable
+
+
+def _lazy_import(
+    package: str,
+    attributes: dict[str, str],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Create the module-level `__getattr__` and `__dir__` functions (PEP
+    562) of a package, so that the submodule defining a public attribute,
+    together with the third-party libraries it depends on, is only imported
+    when the attribute is accessed for the first time.
+
+    Example:
+        .. code-block:: python
+
+            __getattr__, __dir__ = _lazy_import(
+                __name__,
+                {
+                    "ChatModelBase": "._model_base",
+                    # A subpackage is mapped to itself
+                    "model": ".model",
+                },
+            )
+
+    Args:
+        package (`str`):
+            The name of the package, i.e. `__name__` of its `__init__.py`.
+        attributes (`dict[str, str]`):
+            The public attributes mapped to the relative names of the
+            submodules defining them. An attribute mapped to the submodule
+            of the same name is the submodule itself.
+
+    Returns:
+        `tuple[Callable[[str], Any], Callable[[], list[str]]]`:
+            The `__getattr__` and `__dir__` functions of the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(
+                f"module '{package}' has no attribute '{name}'",
+            )
+
+        module = importlib.import_module(attributes[name], package)
+        if attributes[name].rsplit(".", 1)[-1] == name:
+            value = module
+        else:
+            value = getattr(module, name)
+
+        # Cache the attribute, so that the later accesses skip this function
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
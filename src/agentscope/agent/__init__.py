@@ -1,19 +1,25 @@
 # -*- coding: utf-8 -*-
 """The agent base class."""
-from ._agent_base import AgentBase
-from ._react_agent_base import ReActAgentBase
-from ._react_agent import ReActAgent
-from ._user_input import (
-    UserInputBase,
-    UserInputData,
-    TerminalUserInput,
-    StudioUserInput,
-)
-from ._user_agent import UserAgent
+from typing import TYPE_CHECKING
+
+from .._utils._lazy import _lazy_import
 
+if TYPE_CHECKING:
+    from ._agent_base import AgentBase
+    from ._hook_stats import HookCallStats
+    from ._react_agent_base import ReActAgentBase
+    from ._react_agent import ReActAgent
+    from ._user_input import (
+        UserInputBase,
+        UserInputData,
+        TerminalUserInput,
+        StudioUserInput,
+    )
+    from ._user_agent import UserAgent
 
 __all__ = [
     "AgentBase",
+    "HookCallStats",
     "ReActAgentBase",
     "ReActAgent",
     "UserInputData",
@@ -22,3 +28,18 @@ __all__ = [
     "StudioUserInput",
     "UserAgent",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "AgentBase": "._agent_base",
+        "HookCallStats": "._hook_stats",
+        "ReActAgentBase": "._react_agent_base",
+        "ReActAgent": "._react_agent",
+        "UserInputData": "._user_input",
+        "UserInputBase": "._user_input",
+        "TerminalUserInput": "._user_input",
+        "StudioUserInput": "._user_input",
+        "UserAgent": "._user_agent",
+    },
+)
@@ -4,13 +4,13 @@ import asyncio
 import json
 from asyncio import Task, Queue
 from collections import OrderedDict
-from typing import Callable, Any
+from typing import Awaitable, Callable, Any
 import base64
 import shortuuid
-import numpy as np
 from typing_extensions import deprecated
 
 from ._agent_meta import _AgentMeta
+from ._hook_stats import HookCallStats
 from .._logging import logger
 from ..module import StateModule
 from ..message import (
@@ -21,7 +21,15 @@ from ..message import (
     ImageBlock,
     VideoBlock,
 )
-from ..types import AgentHookTypes
+from ..types import AgentHookModes, AgentHookTypes
+
+
+async def _observe_concurrently(
+    subscribers: list["AgentBase"],
+    msg: Msg | list[Msg],
+) -> None:
+    """Let the subscribers observe the message concurrently."""
+    await asyncio.gather(*[_.observe(msg) for _ in subscribers])
 
 
 class AgentBase(StateModule, metaclass=_AgentMeta):
@@ -134,6 +142,10 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
     """The class-level hook functions that will be called after the observe
     function, which takes the `self` object as input."""
 
+    _class_hook_modes: dict[tuple[str, str], AgentHookModes] = {}
+    """The modes of the class-level hooks indexed by the hook type and name,
+    where the hooks not in it run in the "copy" mode."""
+
     def __init__(self) -> None:
         """Initialize the agent."""
         super().__init__()
@@ -154,6 +166,11 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         self._instance_pre_observe_hooks = OrderedDict()
         self._instance_post_observe_hooks = OrderedDict()
 
+        # The modes of the instance-level hooks and the statistics of all
+        # called hooks
+        self._instance_hook_modes: dict[tuple[str, str], AgentHookModes] = {}
+        self._hook_stats: dict[str, dict[str, HookCallStats]] = {}
+
         # The prefix used in streaming printing, which will save the
         # accumulated text and audio streaming data for each message id.
         # e.g. {"text": "xxx", "audio": (stream_obj, "{base64_data}")}
@@ -163,6 +180,10 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         # `observe` method. The key is the MsgHub id, and the value is the
         # list of agents.
         self._subscribers: dict[str, list[AgentBase]] = {}
+        self._subscriber_broadcasts: dict[
+            str,
+            Callable[[list[AgentBase], Msg | list[Msg]], Awaitable[None]],
+        ] = {}
 
         # We add this variable in case developers want to disable the console
         # output of the agent, e.g., in a production environment.
@@ -278,6 +299,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
 
             audio_prefix = self._stream_prefix[msg_id].get("audio", None)
 
+            import numpy as np
             import sounddevice as sd
 
             # The player and the prefix data is cached for streaming audio
@@ -410,10 +432,17 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         self,
         msg: Msg | list[Msg] | None,
     ) -> None:
-        """Broadcast the message to all subscribers."""
-        for subscribers in self._subscribers.values():
-            for subscriber in subscribers:
-                await subscriber.observe(msg)
+        """Broadcast the message to all subscribers concurrently, by the
+        broadcast function of each MsgHub if provided."""
+        await asyncio.gather(
+            *[
+                self._subscriber_broadcasts.get(
+                    msghub_name,
+                    _observe_concurrently,
+                )(subscribers, msg)
+                for msghub_name, subscribers in self._subscribers.items()
+            ],
+        )
 
     async def handle_interrupt(
         self,
@@ -437,6 +466,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         hook_type: AgentHookTypes,
         hook_name: str,
         hook: Callable,
+        mode: AgentHookModes = "copy",
     ) -> None:
         """Register a hook to the agent instance, which only takes effect
         for the current instance.
@@ -450,6 +480,21 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
                 hook will be overwritten.
             hook (`Callable`):
                 The hook function.
+            mode (`AgentHookModes`, defaults to `"copy"`):
+                How the hook receives the arguments. In `"copy"` mode, the
+                hook receives deep copies of the arguments. In `"read_only"`
+                mode, the hook receives views of the arguments without
+                copying, and modifying them (or the values returned by
+                their methods, e.g. `Msg.to_dict`) raises a `TypeError`. In
+                `"mutating"` mode, the arguments are only copied when the
+                hook modifies them, e.g. a pre-print hook that rewrites
+                some messages.
+
+        .. note:: In the `"read_only"` and `"mutating"` modes, the
+         arguments are views that pass the `isinstance` checks of the
+         viewed objects, but are not accepted by the functions requiring
+         the real containers, e.g. `json.dumps`. Use `copy.deepcopy` to
+         get a plain copy of them first.
         """
         if not isinstance(self, AgentBase):
             raise TypeError(
@@ -459,6 +504,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
             )
         hooks = getattr(self, f"_instance_{hook_type}_hooks")
         hooks[hook_name] = hook
+        self._instance_hook_modes[(hook_type, hook_name)] = mode
 
     def remove_instance_hook(
         self,
@@ -483,6 +529,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         hooks = getattr(self, f"_instance_{hook_type}_hooks")
         if hook_name in hooks:
             del hooks[hook_name]
+            self._instance_hook_modes.pop((hook_type, hook_name), None)
         else:
             raise ValueError(
                 f"Hook '{hook_name}' not found in '{hook_type}' hooks of "
@@ -495,6 +542,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         hook_type: AgentHookTypes,
         hook_name: str,
         hook: Callable,
+        mode: AgentHookModes = "copy",
     ) -> None:
         """The universal function to register a hook to the agent class, which
         will take effect for all instances of the class.
@@ -508,6 +556,14 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
                 hook will be overwritten.
             hook (`Callable`):
                 The hook function.
+            mode (`AgentHookModes`, defaults to `"copy"`):
+                How the hook receives the arguments, refer to
+                `register_instance_hook` for details.
+
+        .. note:: In the `"read_only"` and `"mutating"` modes, the
+         arguments are views rather than the real containers, e.g.
+         `json.dumps` doesn't accept them, refer to `register_instance_hook`
+         for details.
         """
 
         assert (
@@ -516,6 +572,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
 
         hooks = getattr(cls, f"_class_{hook_type}_hooks")
         hooks[hook_name] = hook
+        cls._class_hook_modes[(hook_type, hook_name)] = mode
 
     @classmethod
     def remove_class_hook(
@@ -539,6 +596,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         hooks = getattr(cls, f"_class_{hook_type}_hooks")
         if hook_name in hooks:
             del hooks[hook_name]
+            cls._class_hook_modes.pop((hook_type, hook_name), None)
 
         else:
             raise ValueError(
@@ -562,12 +620,16 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
         if hook_type is None:
             for typ in cls.supported_hook_types:
                 hooks = getattr(cls, f"_class_{typ}_hooks")
+                for name in hooks:
+                    cls._class_hook_modes.pop((typ, name), None)
                 hooks.clear()
         else:
             assert (
                 hook_type in cls.supported_hook_types
             ), f"Invalid hook type: {hook_type}"
             hooks = getattr(cls, f"_class_{hook_type}_hooks")
+            for name in hooks:
+                cls._class_hook_modes.pop((hook_type, name), None)
             hooks.clear()
 
     def clear_instance_hooks(
@@ -586,6 +648,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
                     )
                 hooks = getattr(self, f"_instance_{typ}_hooks")
                 hooks.clear()
+            self._instance_hook_modes.clear()
 
         else:
             assert (
@@ -598,12 +661,34 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
                     f"{self.__class__.__name__}.",
                 )
             hooks = getattr(self, f"_instance_{hook_type}_hooks")
+            for name in hooks:
+                self._instance_hook_modes.pop((hook_type, name), None)
             hooks.clear()
 
+    def get_hook_stats(self) -> dict[str, dict[str, HookCallStats]]:
+        """Get the overhead statistics of the hooks called by this agent,
+        including both the instance-level and class-level hooks.
+
+        Returns:
+            `dict[str, dict[str, HookCallStats]]`:
+                The statistics indexed by the hook type and name.
+        """
+        return self._hook_stats
+
+    def reset_hook_stats(self) -> None:
+        """Reset the hook statistics, e.g. to measure the hook overhead of
+        each reply."""
+        self._hook_stats = {}
+
     def reset_subscribers(
         self,
         msghub_name: str,
         subscribers: list["AgentBase"],
+        broadcast: Callable[
+            [list["AgentBase"], Msg | list[Msg]],
+            Awaitable[None],
+        ]
+        | None = None,
     ) -> None:
         """Reset the subscribers of the agent.
 
@@ -613,8 +698,17 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
             subscribers (`list[AgentBase]`):
                 A list of agents that will receive the reply message from
                 this agent via their `observe` method.
+            broadcast (`Callable[[list[AgentBase], Msg | list[Msg]], \
+            Awaitable[None]] | None`, optional):
+                The function that delivers the reply message to the
+                subscribers. If not provided, the subscribers observe the
+                message concurrently.
         """
         self._subscribers[msghub_name] = [_ for _ in subscribers if _ != self]
+        if broadcast is None:
+            self._subscriber_broadcasts.pop(msghub_name, None)
+        else:
+            self._subscriber_broadcasts[msghub_name] = broadcast
 
     def remove_subscribers(self, msghub_name: str) -> None:
         """Remove the msghub subscribers by the given msg hub name.
@@ -630,6 +724,7 @@ class AgentBase(StateModule, metaclass=_AgentMeta):
             )
         else:
             self._subscribers.pop(msghub_name)
+            self._subscriber_broadcasts.pop(msghub_name, None)
 
     @deprecated("Please use set_console_output_enabled() instead.")
     def disable_console_output(self) -> None:
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """The metaclass for agents in agentscope."""
 import inspect
+import time
 from copy import deepcopy
 from functools import wraps
 from typing import (
@@ -10,6 +11,8 @@ from typing import (
     Callable,
 )
 
+from ._hook_stats import HookCallStats
+from ._hook_view import _HookArgView, _unwrap
 from .._utils._common import _execute_async_or_sync_func
 
 if TYPE_CHECKING:
@@ -52,6 +55,85 @@ def _normalize_to_kwargs(
         ) from e
 
 
+def _get_hooks(self: AgentBase, hook_type: str) -> list[tuple]:
+    """Get the instance-level and class-level hooks of the given type, as a
+    list of (name, hook, mode) tuples."""
+    instance_modes = getattr(self, "_instance_hook_modes", {})
+    class_modes = getattr(self.__class__, "_class_hook_modes", {})
+    return [
+        (name, hook, instance_modes.get((hook_type, name), "copy"))
+        for name, hook in getattr(
+            self,
+            f"_instance_{hook_type}_hooks",
+        ).items()
+    ] + [
+        (name, hook, class_modes.get((hook_type, name), "copy"))
+        for name, hook in getattr(self, f"_class_{hook_type}_hooks").items()
+    ]
+
+
+async def _call_hook(
+    self: AgentBase,
+    hook_type: str,
+    hook_name: str,
+    hook: Callable,
+    mode: str,
+    *hook_args: Any,
+) -> Any:
+    """Call the hook with the arguments passed according to the hook mode,
+    and record the time spent in the hook statistics.
+
+    Args:
+        self (`AgentBase`):
+            The agent instance.
+        hook_type (`str`):
+            The type of the hook, e.g. "pre_print".
+        hook_name (`str`):
+            The name of the hook.
+        hook (`Callable`):
+            The hook function.
+        mode (`str`):
+            The hook mode, "copy", "read_only" or "mutating".
+        *hook_args (`Any`):
+            The arguments passed to the hook after the agent instance.
+
+    Returns:
+        `Any`:
+            The output of the hook, where the argument views are replaced by
+            the objects they refer to.
+    """
+    start = time.perf_counter()
+
+    if mode == "copy":
+        args = [deepcopy(_) for _ in hook_args]
+    else:
+        args = [
+            _HookArgView.wrap(_, writable=mode == "mutating")
+            for _ in hook_args
+        ]
+    res = await _execute_async_or_sync_func(hook, self, *args)
+    if mode != "copy":
+        res = _unwrap(res)
+
+    elapsed = time.perf_counter() - start
+    stats = getattr(self, "_hook_stats", None)
+    if stats is not None:
+        hook_stats = stats.setdefault(hook_type, {}).get(hook_name)
+        if hook_stats is None or hook_stats.mode != mode:
+            hook_stats = HookCallStats(hook_type, hook_name, mode)
+            stats[hook_type][hook_name] = hook_stats
+        hook_stats.n_calls += 1
+        hook_stats.n_copies += mode == "copy" or any(
+            # pylint: disable-next=protected-access
+            isinstance(_, _HookArgView) and _._root.memo is not None
+            for _ in args
+        )
+        hook_stats.total_time += elapsed
+        hook_stats.max_time = max(hook_stats.max_time, elapsed)
+
+    return res
+
+
 def _wrap_with_hooks(
     original_func: Callable,
 ) -> Callable:
@@ -89,22 +171,23 @@ def _wrap_with_hooks(
         ), f"Hooks for {func_name} not found in {self.__class__.__name__}"
 
         # pre-hooks
-        pre_hooks = list(
-            getattr(self, f"_instance_pre_{func_name}_hooks").values(),
-        ) + list(
-            getattr(self, f"_class_pre_{func_name}_hooks").values(),
-        )
-        for pre_hook in pre_hooks:
-            modified_keywords = await _execute_async_or_sync_func(
-                pre_hook,
+        for hook_name, pre_hook, mode in _get_hooks(
+            self,
+            f"pre_{func_name}",
+        ):
+            modified_keywords = await _call_hook(
                 self,
-                deepcopy(current_normalized_kwargs),
+                f"pre_{func_name}",
+                hook_name,
+                pre_hook,
+                mode,
+                current_normalized_kwargs,
             )
             if modified_keywords is not None:
                 assert isinstance(modified_keywords, dict), (
                     f"Pre-hook must return a dict of keyword arguments, rather"
                     f" than {type(modified_keywords)} from hook "
-                    f"{pre_hook.__name__}"
+                    f"{hook_name}"
                 )
                 current_normalized_kwargs = modified_keywords
 
@@ -125,17 +208,18 @@ def _wrap_with_hooks(
         )
 
         # post_hooks
-        post_hooks = list(
-            getattr(self, f"_instance_post_{func_name}_hooks").values(),
-        ) + list(
-            getattr(self, f"_class_post_{func_name}_hooks").values(),
-        )
-        for post_hook in post_hooks:
-            modified_output = await _execute_async_or_sync_func(
-                post_hook,
+        for hook_name, post_hook, mode in _get_hooks(
+            self,
+            f"post_{func_name}",
+        ):
+            modified_output = await _call_hook(
                 self,
-                deepcopy(current_normalized_kwargs),
-                deepcopy(current_output),
+                f"post_{func_name}",
+                hook_name,
+                post_hook,
+                mode,
+                current_normalized_kwargs,
+                current_output,
             )
             if modified_output is not None:
                 current_output = modified_output
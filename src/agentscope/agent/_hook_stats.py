@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""The execution statistics of the agent hooks."""
+from dataclasses import dataclass
+
+
+@dataclass
+class HookCallStats:
+    """The overhead statistics of a hook function, including the time spent
+    on copying its arguments."""
+
+    hook_type: str
+    """The type of the hook, e.g. "pre_print"."""
+    name: str
+    """The name of the hook."""
+    mode: str
+    """The mode of the hook, "copy", "read_only" or "mutating"."""
+    n_calls: int = 0
+    """The number of calls."""
+    n_copies: int = 0
+    """The number of calls that copied the arguments."""
+    total_time: float = 0.0
+    """The total time of the calls in seconds."""
+    max_time: float = 0.0
+    """The maximum time of a call in seconds."""
+
+    @property
+    def avg_time(self) -> float:
+        """The average time of the calls in seconds."""
+        return self.total_time / self.n_calls if self.n_calls else 0.0
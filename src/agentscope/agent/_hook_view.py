@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""The views of the hook arguments, which let the hooks read the arguments
+without copying them."""
+import enum
+import functools
+import inspect
+from copy import copy, deepcopy
+from typing import Any, Callable
+
+_MUTATING_METHODS: dict[type, set[str]] = {
+    list: {
+        "append",
+        "extend",
+        "insert",
+        "pop",
+        "remove",
+        "clear",
+        "sort",
+        "reverse",
+    },
+    dict: {"update", "pop", "popitem", "setdefault", "clear"},
+}
+
+
+class _ViewRoot:
+    """The shared state of the views over the same hook argument, which
+    holds the deep copy of the argument once it's modified."""
+
+    def __init__(self, value: Any, writable: bool) -> None:
+        """Initialize the view root.
+
+        Args:
+            value (`Any`):
+                The hook argument.
+            writable (`bool`):
+                Whether the argument can be modified through the views.
+        """
+        self.value = value
+        self.writable = writable
+        # The mapping from the ids of the original objects to their copies
+        self.memo: dict[int, Any] | None = None
+
+    def materialize(self) -> None:
+        """Copy the argument before its first modification."""
+        if not self.writable:
+            raise TypeError(
+                "The hook argument is read-only. Register the hook with "
+                "mode 'mutating' or 'copy' to modify it.",
+            )
+        if self.memo is None:
+            self.memo = {}
+            self.value = deepcopy(self.value, self.memo)
+
+
+def _is_viewable(value: Any) -> bool:
+    """Whether the value is a mutable container or object that should be
+    accessed through a view."""
+    if isinstance(value, (dict, list, tuple)):
+        return True
+    return (
+        hasattr(value, "__dict__")
+        and not isinstance(value, (type, enum.Enum))
+        and not inspect.isroutine(value)
+        and not inspect.ismodule(value)
+    )
+
+
+def _unwrap(value: Any) -> Any:
+    """Replace the views in the value by the objects they refer to."""
+    if isinstance(value, _HookArgView):
+        return value._target  # pylint: disable=protected-access
+    if type(value) is dict:
+        return {k: _unwrap(v) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(_unwrap(_) for _ in value)
+    return value
+
+
+class _HookArgView:
+    """The view of a hook argument. Reading the argument through the view
+    doesn't copy it, while modifying it either raises a `TypeError` for the
+    read-only hooks, or deep copies the whole argument on the first
+    modification for the mutating hooks, so that the original argument is
+    never changed by the hooks.
+
+    The values returned by the methods of the viewed objects (e.g.
+    `Msg.to_dict`) are viewed as well, while the methods modifying the
+    object in place (except those of `list` and `dict`) are not intercepted.
+    Note the views are not accepted by the functions requiring the real
+    containers, e.g. `json.dumps`, where `copy.deepcopy` of the view should
+    be used.
+    """
+
+    __slots__ = ("_root", "_obj")
+
+    def __init__(self, root: _ViewRoot, obj: Any) -> None:
+        """Initialize the view.
+
+        Args:
+            root (`_ViewRoot`):
+                The root of the hook argument.
+            obj (`Any`):
+                The viewed object in the original argument.
+        """
+        object.__setattr__(self, "_root", root)
+        object.__setattr__(self, "_obj", obj)
+
+    @classmethod
+    def wrap(cls, value: Any, writable: bool) -> Any:
+        """Wrap the hook argument into a view if it's mutable."""
+        if not _is_viewable(value):
+            return value
+        return cls(_ViewRoot(value, writable), value)
+
+    @property
+    def _target(self) -> Any:
+        """The viewed object, which is the copy if it's copied."""
+        memo = self._root.memo
+        if memo is None:
+            return self._obj
+        # The views created after the copy refer to the copied objects
+        # directly, which are not in the memo
+        return memo.get(id(self._obj), self._obj)
+
+    def _child(self, value: Any) -> Any:
+        """Get the view of a child object."""
+        if not _is_viewable(value):
+            return value
+        return _HookArgView(self._root, value)
+
+    def _write(self, func: Callable[[Any], Any]) -> Any:
+        """Apply the modification on the (copied) target."""
+        self._root.materialize()
+        return func(self._target)
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type:
+        """Pretend to be the viewed object in `isinstance` checks."""
+        return type(self._target)
+
+    def __getattr__(self, name: str) -> Any:
+        target = self._target
+        value = getattr(target, name)
+
+        mutating = _MUTATING_METHODS.get(type(target), set())
+        if name in mutating:
+
+            def _method(*args: Any, **kwargs: Any) -> Any:
+                return self._write(
+                    lambda _: getattr(_, name)(
+                        *_unwrap(args),
+                        **_unwrap(kwargs),
+                    ),
+                )
+
+            return _method
+
+        if isinstance(target, dict) and name in ("get", "items", "values"):
+            return self._dict_method(name)
+
+        if name == "copy" and isinstance(target, (dict, list)):
+            return lambda: deepcopy(target)
+
+        if inspect.isroutine(value):
+            return self._method(value)
+        return self._child(value)
+
+    def _method(self, method: Callable) -> Callable:
+        """Get the method whose returned value is viewed, as it may share
+        the objects with the argument, e.g. `Msg.get_content_blocks`."""
+
+        @functools.wraps(method)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self._child(method(*_unwrap(args), **_unwrap(kwargs)))
+
+        return _wrapper
+
+    def _dict_method(self, name: str) -> Callable:
+        """Get the read methods of a dict, whose values are viewed."""
+        target = self._target
+
+        if name == "get":
+            return lambda key, default=None: self._child(
+                target.get(key, default),
+            )
+        if name == "items":
+            return lambda: [(k, self._child(v)) for k, v in target.items()]
+        return lambda: [self._child(v) for v in target.values()]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._write(lambda _: setattr(_, name, _unwrap(value)))
+
+    def __delattr__(self, name: str) -> None:
+        self._write(lambda _: delattr(_, name))
+
+    def __getitem__(self, key: Any) -> Any:
+        target = self._target
+        if isinstance(key, slice) and isinstance(target, (list, tuple)):
+            return [self._child(_) for _ in target[key]]
+        return self._child(target[key])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._write(lambda _: _.__setitem__(key, _unwrap(value)))
+
+    def __delitem__(self, key: Any) -> None:
+        self._write(lambda _: _.__delitem__(key))
+
+    def __iadd__(self, other: Any) -> "_HookArgView":
+        self._write(lambda _: _.extend(_unwrap(other)))
+        return self
+
+    def __copy__(self) -> Any:
+        return copy(self._target)
+
+    def __deepcopy__(self, memo: dict) -> Any:
+        return deepcopy(self._target, memo)
+
+    def __iter__(self) -> Any:
+        target = self._target
+        if isinstance(target, dict):
+            return iter(target)
+        return (self._child(_) for _ in target)
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+    def __contains__(self, item: Any) -> bool:
+        return _unwrap(item) in self._target
+
+    def __bool__(self) -> bool:
+        return bool(self._target)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._target == _unwrap(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return self._target != _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._target)
+
+    def __str__(self) -> str:
+        return str(self._target)
+
+    def __repr__(self) -> str:
+        return repr(self._target)
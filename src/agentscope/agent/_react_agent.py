@@ -3,7 +3,15 @@
 # mypy: disable-error-code="list-item"
 """ReAct agent class in agentscope."""
 import asyncio
-from typing import Type, Any, AsyncGenerator, Literal
+from copy import deepcopy
+from typing import (
+    Type,
+    Any,
+    AsyncGenerator,
+    Coroutine,
+    Literal,
+    TYPE_CHECKING,
+)
 
 import shortuuid
 from pydantic import BaseModel, ValidationError, Field
@@ -13,11 +21,53 @@ from .._logging import logger
 from ..formatter import FormatterBase
 from ..memory import MemoryBase, LongTermMemoryBase, InMemoryMemory
 from ..message import Msg, ToolUseBlock, ToolResultBlock, TextBlock
-from ..model import ChatModelBase
-from ..rag import KnowledgeBase, Document
+from ..model import ChatModelBase, ChatResponse
+from ..model._stream_accumulator import _merge_delta_content
 from ..plan import PlanNotebook
 from ..tool import Toolkit, ToolResponse
-from ..tracing import trace_reply
+from ..tracing import trace, trace_reply
+
+if TYPE_CHECKING:
+    from ..rag import KnowledgeBase, Document
+else:
+    KnowledgeBase = "KnowledgeBase"
+    Document = "Document"
+
+
+def _merge_documents(results: list[list[Document]]) -> list[Document]:
+    """Merge the documents retrieved from multiple knowledge bases and rerank
+    them. The scores are min-max normalized within each knowledge base, as
+    the knowledge bases may score on different scales, and the same chunk
+    retrieved more than once is kept with its highest normalized score."""
+    scored: dict[tuple[str, int], tuple[float, Document]] = {}
+    for docs in results:
+        scores = [doc.score or 0.0 for doc in docs]
+        if not scores:
+            continue
+
+        low, high = min(scores), max(scores)
+        for doc, score in zip(docs, scores):
+            normalized = (score - low) / (high - low) if high > low else 1.0
+            key = (doc.metadata.doc_id, doc.metadata.chunk_id)
+            if key not in scored or normalized > scored[key][0]:
+                scored[key] = (normalized, doc)
+
+    return [
+        doc
+        for _, doc in sorted(
+            scored.values(),
+            key=lambda _: _[0],
+            reverse=True,
+        )
+    ]
+
+
+async def _replay(
+    chunks: list[ToolResponse],
+) -> AsyncGenerator[ToolResponse, None]:
+    """Yield the collected tool response chunks of a speculative call."""
+    for chunk in chunks:
+        yield chunk
 
 
 class _QueryRewriteModel(BaseModel):
@@ -93,8 +143,10 @@ class ReActAgent(ReActAgentBase):
         ] = "both",
         enable_meta_tool: bool = False,
         parallel_tool_calls: bool = False,
-        knowledge: KnowledgeBase | list[KnowledgeBase] | None = None,
+        speculative_tool_calls: bool = False,
+        knowledge: "KnowledgeBase | list[KnowledgeBase] | None" = None,
         enable_rewrite_query: bool = True,
+        retrieval_timeout: float | None = None,
         plan_notebook: PlanNotebook | None = None,
         print_hint_msg: bool = False,
         max_iters: int = 10,
@@ -138,6 +190,13 @@ class ReActAgent(ReActAgentBase):
             parallel_tool_calls (`bool`, defaults to `False`):
                 When LLM generates multiple tool calls, whether to execute
                 them in parallel.
+            speculative_tool_calls (`bool`, defaults to `False`):
+                Whether to call the tool functions registered with
+                `speculative=True` as soon as their arguments are completely
+                received in the streaming model response, rather than after
+                the whole response. The speculative calls are cancelled if
+                the final tool calls differ, e.g. the reasoning is
+                interrupted.
             knowledge (`KnowledgeBase | list[KnowledgeBase] | None`, optional):
                 The knowledge object(s) used by the agent to retrieve
                 relevant documents at the beginning of each reply.
@@ -146,6 +205,11 @@ class ReActAgent(ReActAgentBase):
                 retrieving from the knowledge base(s), e.g. rewrite "Who am I"
                 to "{user's name}" to get more relevant documents. Only works
                 when the knowledge base(s) is provided.
+            retrieval_timeout (`float | None`, optional):
+                The timeout in seconds for retrieving from each source, i.e.
+                the long-term memory and each knowledge base, which are
+                retrieved concurrently. The sources timed out are skipped in
+                the current reply. If `None`, no timeout.
             plan_notebook (`PlanNotebook | None`, optional):
                 The plan notebook instance, allow the agent to finish the
                 complex task by decomposing it into a sequence of subtasks.
@@ -210,13 +274,21 @@ class ReActAgent(ReActAgentBase):
             )
 
         self.parallel_tool_calls = parallel_tool_calls
+        self.speculative_tool_calls = speculative_tool_calls
+        # The speculative tool calls started during reasoning by the tool
+        # call ID, which are consumed by the acting
+        self._speculative_calls: dict[
+            str,
+            tuple[ToolUseBlock, asyncio.Task],
+        ] = {}
 
         # -------------- RAG management --------------
         # The knowledge base(s) used by the agent
-        if isinstance(knowledge, KnowledgeBase):
+        if knowledge is not None and not isinstance(knowledge, list):
             knowledge = [knowledge]
         self.knowledge: list[KnowledgeBase] = knowledge or []
         self.enable_rewrite_query = enable_rewrite_query
+        self.retrieval_timeout = retrieval_timeout
 
         # -------------- Plan management --------------
         # Equipped the plan-related tools provided by the plan notebook as
@@ -261,6 +333,7 @@ class ReActAgent(ReActAgentBase):
             "pre_print",
             "finish_function_pre_print_hook",
             finish_function_pre_print_hook,
+            mode="mutating",
         )
 
     @property
@@ -291,10 +364,9 @@ class ReActAgent(ReActAgentBase):
         # Record the input message(s) in the memory
         await self.memory.add(msg)
 
-        # Retrieve relevant records from the long-term memory if activated
-        await self._retrieve_from_long_term_memory(msg)
-        # Retrieve relevant documents from the knowledge base(s) if any
-        await self._retrieve_from_knowledge(msg)
+        # Retrieve relevant records from the long-term memory if activated,
+        # and relevant documents from the knowledge base(s) if any
+        await self._retrieve(msg)
 
         self._required_structured_model = structured_model
         # Record structured output model if provided
@@ -306,30 +378,35 @@ class ReActAgent(ReActAgentBase):
 
         # The reasoning-acting loop
         reply_msg = None
-        for _ in range(self.max_iters):
-            msg_reasoning = await self._reasoning()
+        try:
+            for _ in range(self.max_iters):
+                msg_reasoning = await self._reasoning()
 
-            futures = [
-                self._acting(tool_call)
-                for tool_call in msg_reasoning.get_content_blocks(
-                    "tool_use",
-                )
-            ]
+                futures = [
+                    self._acting(tool_call)
+                    for tool_call in msg_reasoning.get_content_blocks(
+                        "tool_use",
+                    )
+                ]
 
-            # Parallel tool calls or not
-            if self.parallel_tool_calls:
-                acting_responses = await asyncio.gather(*futures)
+                # Parallel tool calls or not
+                if self.parallel_tool_calls:
+                    acting_responses = await asyncio.gather(*futures)
 
-            else:
-                # Sequential tool calls
-                acting_responses = [await _ for _ in futures]
+                else:
+                    # Sequential tool calls
+                    acting_responses = [await _ for _ in futures]
 
-            # Find the first non-None replying message from the acting
-            for acting_msg in acting_responses:
-                reply_msg = reply_msg or acting_msg
+                # Find the first non-None replying message from the acting
+                for acting_msg in acting_responses:
+                    reply_msg = reply_msg or acting_msg
 
-            if reply_msg:
-                break
+                if reply_msg:
+                    break
+        finally:
+            # Cancel the speculative calls left by an early exit or an
+            # interruption
+            self._cancel_speculative_calls(None)
 
         # When the maximum iterations are reached
         if reply_msg is None:
@@ -352,6 +429,10 @@ class ReActAgent(ReActAgentBase):
         self,
     ) -> Msg:
         """Perform the reasoning process."""
+        # Cancel the speculative calls left by the last reasoning, e.g. if
+        # the acting was not reached due to an error
+        self._cancel_speculative_calls(None)
+
         if self.plan_notebook:
             # Insert the reasoning hint from the plan notebook
             hint_msg = await self.plan_notebook.get_current_hint()
@@ -383,7 +464,9 @@ class ReActAgent(ReActAgentBase):
             if self.model.stream:
                 msg = Msg(self.name, [], "assistant")
                 async for content_chunk in res:
-                    msg.content = content_chunk.content
+                    self._update_streaming_content(msg, content_chunk)
+                    if self.speculative_tool_calls:
+                        self._start_speculative_calls(content_chunk)
                     await self.print(msg, False)
                 await self.print(msg, True)
 
@@ -410,6 +493,12 @@ class ReActAgent(ReActAgentBase):
                     ),
                 ]
 
+            # Cancel the speculative tool calls that differ from the final
+            # tool calls
+            self._cancel_speculative_calls(
+                None if interrupted_by_user else msg,
+            )
+
             # None will be ignored by the memory
             await self.memory.add(msg)
 
@@ -462,8 +551,23 @@ class ReActAgent(ReActAgentBase):
             "system",
         )
         try:
-            # Execute the tool call
-            tool_res = await self.toolkit.call_tool_function(tool_call)
+            # Execute the tool call, or take over the speculative call
+            speculative_call = self._speculative_calls.pop(
+                tool_call["id"],
+                None,
+            )
+            if speculative_call is not None and (
+                speculative_call[0]["name"] != tool_call["name"]
+                or speculative_call[0]["input"] != tool_call["input"]
+            ):
+                # The tool call is modified by the pre-acting hooks
+                speculative_call[1].cancel()
+                speculative_call = None
+
+            if speculative_call is not None:
+                tool_res = _replay(await speculative_call[1])
+            else:
+                tool_res = await self.toolkit.call_tool_function(tool_call)
 
             response_msg = None
             # Async generator handling
@@ -501,6 +605,84 @@ class ReActAgent(ReActAgentBase):
             # Record the tool result message in the memory
             await self.memory.add(tool_res_msg)
 
+    def _update_streaming_content(self, msg: Msg, chunk: ChatResponse) -> None:
+        """Update the message content with the streaming chunk, where the
+        chunks are accumulated in the delta mode of the model.
+
+        Args:
+            msg (`Msg`):
+                The message being generated.
+            chunk (`ChatResponse`):
+                The streaming chunk of the model response.
+        """
+        if self.model.stream_mode == "delta":
+            if not isinstance(msg.content, list):
+                msg.content = list(msg.get_content_blocks())
+            _merge_delta_content(msg.content, chunk.content)
+        else:
+            msg.content = chunk.content
+
+    def _start_speculative_calls(self, chunk: ChatResponse) -> None:
+        """Start the speculative calls of the tool calls whose arguments are
+        completely received in the streaming chunk, if their tool functions
+        are registered as speculative.
+
+        Args:
+            chunk (`ChatResponse`):
+                The streaming chunk of the model response.
+        """
+        completed_ids = set(chunk.completed_tool_call_ids or [])
+        for block in chunk.content:
+            if (
+                block["type"] != "tool_use"
+                or block["id"] not in completed_ids
+                or block["id"] in self._speculative_calls
+                or block["name"] == self.finish_function_name
+            ):
+                continue
+
+            tool_func = self.toolkit.tools.get(block["name"])
+            if tool_func is None or not tool_func.speculative:
+                continue
+
+            tool_call = deepcopy(block)
+            self._speculative_calls[block["id"]] = (
+                tool_call,
+                asyncio.create_task(self._call_speculatively(tool_call)),
+            )
+
+    async def _call_speculatively(
+        self,
+        tool_call: ToolUseBlock,
+    ) -> list[ToolResponse]:
+        """Call the tool function and collect the response chunks."""
+        tool_res = await self.toolkit.call_tool_function(tool_call)
+        return [_ async for _ in tool_res]
+
+    def _cancel_speculative_calls(self, msg: Msg | None) -> None:
+        """Cancel the speculative calls that are not in the final reasoning
+        message with the same name and input.
+
+        Args:
+            msg (`Msg | None`):
+                The final reasoning message. If `None`, all the speculative
+                calls are cancelled.
+        """
+        final_calls = {
+            _["id"]: _
+            for _ in (msg.get_content_blocks("tool_use") if msg else [])
+        }
+        for call_id in list(self._speculative_calls):
+            tool_call, task = self._speculative_calls[call_id]
+            final_call = final_calls.get(call_id)
+            if (
+                final_call is None
+                or final_call["name"] != tool_call["name"]
+                or final_call["input"] != tool_call["input"]
+            ):
+                task.cancel()
+                self._speculative_calls.pop(call_id)
+
     async def observe(self, msg: Msg | list[Msg] | None) -> None:
         """Receive observing message(s) without generating a reply.
 
@@ -536,7 +718,7 @@ class ReActAgent(ReActAgentBase):
         res_msg = Msg(self.name, [], "assistant")
         if isinstance(res, AsyncGenerator):
             async for chunk in res:
-                res_msg.content = chunk.content
+                self._update_streaming_content(res_msg, chunk)
                 await self.print(res_msg, False)
             await self.print(res_msg, True)
 
@@ -623,42 +805,107 @@ class ReActAgent(ReActAgentBase):
             is_last=True,
         )
 
+    async def _retrieve(self, msg: Msg | list[Msg] | None) -> None:
+        """Retrieve from the long-term memory and the knowledge base(s)
+        concurrently, and insert the retrieved information into the
+        short-term memory in order.
+
+        Args:
+            msg (`Msg | list[Msg] | None`):
+                The input message to the agent.
+        """
+        retrieved_msgs = await asyncio.gather(
+            self._retrieve_from_long_term_memory(msg),
+            self._retrieve_from_knowledge(msg),
+        )
+        for retrieved_msg in retrieved_msgs:
+            if retrieved_msg is not None:
+                if self.print_hint_msg:
+                    await self.print(retrieved_msg, True)
+                await self.memory.add(retrieved_msg)
+
+    async def _retrieve_from_source(
+        self,
+        source: str,
+        coro: Coroutine[Any, Any, Any],
+    ) -> Any:
+        """Await the retrieval from one source within the retrieval timeout,
+        which is traced as a span to record the latency of the source.
+
+        Args:
+            source (`str`):
+                The name of the source.
+            coro (`Coroutine[Any, Any, Any]`):
+                The retrieval coroutine.
+
+        Returns:
+            `Any`:
+                The retrieval result, or `None` if timed out.
+        """
+
+        @trace(name=f"{self.__class__.__name__}.retrieve.{source}")
+        async def _retrieve() -> Any:
+            return await asyncio.wait_for(coro, self.retrieval_timeout)
+
+        try:
+            return await _retrieve()
+
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Skipping the retrieval from %s as it's timed out after %s "
+                "seconds.",
+                source,
+                self.retrieval_timeout,
+            )
+            return None
+
     async def _retrieve_from_long_term_memory(
         self,
         msg: Msg | list[Msg] | None,
-    ) -> None:
-        """Insert the retrieved information from the long-term memory into
-        the short-term memory as a Msg object.
+    ) -> Msg | None:
+        """Retrieve the information from the long-term memory as a Msg
+        object.
 
         Args:
             msg (`Msg | list[Msg] | None`):
                 The input message to the agent.
+
+        Returns:
+            `Msg | None`:
+                The message with the retrieved information, or `None` if
+                nothing is retrieved.
         """
         if self._static_control and msg:
             # Retrieve information from the long-term memory if available
-            retrieved_info = await self.long_term_memory.retrieve(msg)
+            retrieved_info = await self._retrieve_from_source(
+                "long_term_memory",
+                self.long_term_memory.retrieve(msg),
+            )
             if retrieved_info:
-                retrieved_msg = Msg(
+                return Msg(
                     name="long_term_memory",
                     content="<long_term_memory>The content below are "
                     "retrieved from long-term memory, which maybe "
                     f"useful:\n{retrieved_info}</long_term_memory>",
                     role="user",
                 )
-                if self.print_hint_msg:
-                    await self.print(retrieved_msg, True)
-                await self.memory.add(retrieved_msg)
+        return None
 
     async def _retrieve_from_knowledge(
         self,
         msg: Msg | list[Msg] | None,
-    ) -> None:
-        """Insert the retrieved documents from the RAG knowledge base(s) if
-        available.
+    ) -> Msg | None:
+        """Retrieve the documents from the RAG knowledge base(s) concurrently
+        as a Msg object if available.
 
         Args:
             msg (`Msg | list[Msg] | None`):
                 The input message to the agent.
+
+        Returns:
+            `Msg | None`:
+                The message with the retrieved documents, or `None` if
+                nothing is retrieved.
         """
         if self.knowledge and msg:
             # Prepare the user input query
@@ -670,7 +917,7 @@ class ReActAgent(ReActAgentBase):
 
             # Skip if the query is empty
             if not query:
-                return
+                return None
 
             # Rewrite the query by the LLM if enabled
             if self.enable_rewrite_query:
@@ -708,21 +955,22 @@ class ReActAgent(ReActAgentBase):
                         str(e),
                     )
 
-            docs: list[Document] = []
-            for kb in self.knowledge:
-                # retrieve the user input query
-                docs.extend(
-                    await kb.retrieve(query=query),
-                )
+            # Retrieve the user input query from the knowledge bases
+            # concurrently
+            results = await asyncio.gather(
+                *[
+                    self._retrieve_from_source(
+                        f"knowledge_{i}",
+                        kb.retrieve(query=query),
+                    )
+                    for i, kb in enumerate(self.knowledge)
+                ],
+            )
+            # Rerank by the normalized relevance score
+            docs = _merge_documents([_ for _ in results if _ is not None])
             if docs:
-                # Rerank by the relevance score
-                docs = sorted(
-                    docs,
-                    key=lambda doc: doc.score or 0.0,
-                    reverse=True,
-                )
                 # Prepare the retrieved knowledge string
-                retrieved_msg = Msg(
+                return Msg(
                     name="user",
                     content=[
                         TextBlock(
@@ -741,6 +989,4 @@ class ReActAgent(ReActAgentBase):
                     ],
                     role="user",
                 )
-                if self.print_hint_msg:
-                    await self.print(retrieved_msg, True)
-                await self.memory.add(retrieved_msg)
+        return None
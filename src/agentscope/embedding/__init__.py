@@ -1,17 +1,21 @@
 # -*- coding: utf-8 -*-
 """The embedding module in agentscope."""
+from typing import TYPE_CHECKING
 
-from ._embedding_base import EmbeddingModelBase
-from ._embedding_usage import EmbeddingUsage
-from ._embedding_response import EmbeddingResponse
-from ._dashscope_embedding import DashScopeTextEmbedding
-from ._dashscope_multimodal_embedding import DashScopeMultiModalEmbedding
-from ._openai_embedding import OpenAITextEmbedding
-from ._gemini_embedding import GeminiTextEmbedding
-from ._ollama_embedding import OllamaTextEmbedding
-from ._cache_base import EmbeddingCacheBase
-from ._file_cache import FileEmbeddingCache
+from .._utils._lazy import _lazy_import
 
+if TYPE_CHECKING:
+    from ._embedding_base import EmbeddingModelBase
+    from ._embedding_usage import EmbeddingUsage
+    from ._embedding_response import EmbeddingResponse
+    from ._dashscope_embedding import DashScopeTextEmbedding
+    from ._dashscope_multimodal_embedding import DashScopeMultiModalEmbedding
+    from ._openai_embedding import OpenAITextEmbedding
+    from ._gemini_embedding import GeminiTextEmbedding
+    from ._ollama_embedding import OllamaTextEmbedding
+    from ._cache_base import EmbeddingCacheBase
+    from ._file_cache import FileEmbeddingCache
+    from ._mmap_cache import MmapEmbeddingCache
 
 __all__ = [
     "EmbeddingModelBase",
@@ -24,4 +28,22 @@ __all__ = [
     "OllamaTextEmbedding",
     "EmbeddingCacheBase",
     "FileEmbeddingCache",
+    "MmapEmbeddingCache",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "EmbeddingModelBase": "._embedding_base",
+        "EmbeddingUsage": "._embedding_usage",
+        "EmbeddingResponse": "._embedding_response",
+        "DashScopeTextEmbedding": "._dashscope_embedding",
+        "DashScopeMultiModalEmbedding": "._dashscope_multimodal_embedding",
+        "OpenAITextEmbedding": "._openai_embedding",
+        "GeminiTextEmbedding": "._gemini_embedding",
+        "OllamaTextEmbedding": "._ollama_embedding",
+        "EmbeddingCacheBase": "._cache_base",
+        "FileEmbeddingCache": "._file_cache",
+        "MmapEmbeddingCache": "._mmap_cache",
+    },
+)
@@ -46,6 +46,48 @@ class EmbeddingCacheBase:
                 The identifier to retrieve the embeddings.
         """
 
+    async def store_batch(
+        self,
+        embeddings: List[List[Embedding]],
+        identifiers: List[JSONSerializableObject],
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store multiple groups of embeddings, each with its own identifier.
+        By default, it calls `store` one by one, and the subclasses can
+        override it for a more efficient implementation.
+
+        Args:
+            embeddings (`List[List[Embedding]]`):
+                The groups of embeddings to store.
+            identifiers (`List[JSONSerializableObject]`):
+                The identifiers of the groups, in the same order.
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite existing embeddings with the same
+                identifier.
+        """
+        for group, identifier in zip(embeddings, identifiers):
+            await self.store(group, identifier, overwrite, **kwargs)
+
+    async def retrieve_batch(
+        self,
+        identifiers: List[JSONSerializableObject],
+    ) -> List[List[Embedding] | None]:
+        """Retrieve multiple groups of embeddings by their identifiers. By
+        default, it calls `retrieve` one by one, and the subclasses can
+        override it for a more efficient implementation.
+
+        Args:
+            identifiers (`List[JSONSerializableObject]`):
+                The identifiers to retrieve the embeddings.
+
+        Returns:
+            `List[List[Embedding] | None]`:
+                The embeddings in the same order as the identifiers, with
+                `None` for the identifiers not found.
+        """
+        return [await self.retrieve(_) for _ in identifiers]
+
     @abstractmethod
     async def remove(
         self,
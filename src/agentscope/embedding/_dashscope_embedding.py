@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """The dashscope embedding module in agentscope."""
 from datetime import datetime
-from typing import Any, List, Literal
+from typing import Any, List
 
 from ._cache_base import EmbeddingCacheBase
 from ._embedding_response import EmbeddingResponse
@@ -28,6 +28,9 @@ class DashScopeTextEmbedding(EmbeddingModelBase):
     supported_modalities: list[str] = ["text"]
     """This class only supports text input."""
 
+    batch_size_limit: int = 10
+    """The maximum number of texts in one API call."""
+
     def __init__(
         self,
         api_key: str,
@@ -49,37 +52,31 @@ class DashScopeTextEmbedding(EmbeddingModelBase):
                 for more details.
             embedding_cache (`EmbeddingCacheBase`):
                 The embedding cache class instance, used to cache the
-                embedding results to avoid repeated API calls.
+                embedding results to avoid repeated API calls. Each input
+                text is cached separately.
         """
         super().__init__(model_name, dimensions)
 
         self.api_key = api_key
         self.embedding_cache = embedding_cache
-        self.batch_size_limit = 10
-
-    async def _call_api(self, kwargs: dict[str, Any]) -> EmbeddingResponse:
-        """Call the DashScope embedding API by the given keyword arguments."""
-
-        if self.embedding_cache:
-            cached_embeddings = await self.embedding_cache.retrieve(
-                identifier=kwargs,
-            )
-            if cached_embeddings:
-                return EmbeddingResponse(
-                    embeddings=cached_embeddings,
-                    usage=EmbeddingUsage(
-                        tokens=0,
-                        time=0,
-                    ),
-                    source="cache",
-                )
 
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Call the DashScope embedding API with a batch of texts."""
         import dashscope
 
         start_time = datetime.now()
         response = dashscope.embeddings.TextEmbedding.call(
             api_key=self.api_key,
-            **kwargs,
+            **{
+                "input": inputs,
+                "model": self.model_name,
+                "dimensions": self.dimensions,
+                **kwargs,
+            },
         )
         time = (datetime.now() - start_time).total_seconds()
 
@@ -88,14 +85,6 @@ class DashScopeTextEmbedding(EmbeddingModelBase):
                 f"Failed to get embedding from DashScope API: {response}",
             )
 
-        if self.embedding_cache:
-            await self.embedding_cache.store(
-                identifier=kwargs,
-                embeddings=[
-                    _["embedding"] for _ in response.output["embeddings"]
-                ],
-            )
-
         return EmbeddingResponse(
             embeddings=[_["embedding"] for _ in response.output["embeddings"]],
             usage=EmbeddingUsage(
@@ -128,7 +117,8 @@ class DashScopeTextEmbedding(EmbeddingModelBase):
 
         if len(gather_text) > self.batch_size_limit:
             logger.info(
-                "The input texts (%d) will be embedded with %d API calls due "
+                "The input texts (%d) will be embedded with at most %d API "
+                "calls due "
                 f"to the batch size limit of {self.batch_size_limit} for "
                 f"DashScope embedding API.",
                 len(gather_text),
@@ -136,34 +126,4 @@ class DashScopeTextEmbedding(EmbeddingModelBase):
                 // self.batch_size_limit,
             )
 
-        # Handle the batch size limit for DashScope embedding API
-        collected_embeddings = []
-        collected_time = 0.0
-        collected_tokens = 0
-        collected_source: Literal["cache", "api"] = "cache"
-        for _ in range(0, len(gather_text), self.batch_size_limit):
-            batch_texts = gather_text[_ : _ + self.batch_size_limit]
-            batch_kwargs = {
-                "input": batch_texts,
-                "model": self.model_name,
-                "dimensions": self.dimensions,
-                **kwargs,
-            }
-
-            res = await self._call_api(batch_kwargs)
-
-            collected_embeddings.extend(res.embeddings)
-            collected_time += res.usage.time
-            if res.usage.tokens:
-                collected_tokens += res.usage.tokens
-            if res.source == "api":
-                collected_source = "api"
-
-        return EmbeddingResponse(
-            embeddings=collected_embeddings,
-            usage=EmbeddingUsage(
-                tokens=collected_tokens,
-                time=collected_time,
-            ),
-            source=collected_source,
-        )
+        return await self._embed_with_cache(gather_text, **kwargs)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """The dashscope multimodal embedding model in agentscope."""
 from datetime import datetime
-from typing import Any, Literal
+from typing import Any
 
 from ._cache_base import EmbeddingCacheBase
 from ._embedding_response import EmbeddingResponse
@@ -43,7 +43,8 @@ class DashScopeMultiModalEmbedding(EmbeddingModelBase):
                 for more details.
             embedding_cache (`EmbeddingCacheBase`):
                 The embedding cache class instance, used to cache the
-                embedding results to avoid repeated API calls.
+                embedding results to avoid repeated API calls. Each input
+                is cached separately.
         """
         path_doc = (
             "https://bailian.console.aliyun.com/?tab=api#/api/?type=model&"
@@ -165,59 +166,26 @@ class DashScopeMultiModalEmbedding(EmbeddingModelBase):
                     f"ImageBlock, or VideoBlock.",
                 )
 
-        # Handle the batch size limit of the DashScope multimodal embedding API
-        collected_embeddings = []
-        collected_time = 0.0
-        collected_tokens = 0
-        collected_source: Literal["cache", "api"] = "cache"
-        for _ in range(0, len(formatted_data), self.batch_size_limit):
-            batch_data = formatted_data[_ : _ + self.batch_size_limit]
-            batch_kwargs = {
-                "input": batch_data,
-                "model": self.model_name,
-                **kwargs,
-            }
-            res = await self._call_api(batch_kwargs)
-
-            collected_embeddings.extend(res.embeddings)
-            collected_time += res.usage.time
-            if res.usage.tokens:
-                collected_tokens += res.usage.tokens
-            if res.source == "api":
-                collected_source = "api"
+        return await self._embed_with_cache(formatted_data, **kwargs)
 
-        return EmbeddingResponse(
-            embeddings=collected_embeddings,
-            usage=EmbeddingUsage(
-                tokens=collected_tokens,
-                time=collected_time,
-            ),
-            source=collected_source,
-        )
-
-    async def _call_api(self, kwargs: dict[str, Any]) -> EmbeddingResponse:
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
         """
-        Call the DashScope multimodal embedding API by the given arguments.
+        Call the DashScope multimodal embedding API with a batch of inputs.
         """
-        # Search in cache first
-        if self.embedding_cache:
-            cached_embeddings = await self.embedding_cache.retrieve(
-                identifier=kwargs,
-            )
-            if cached_embeddings:
-                return EmbeddingResponse(
-                    embeddings=cached_embeddings,
-                    usage=EmbeddingUsage(
-                        tokens=0,
-                        time=0,
-                    ),
-                    source="cache",
-                )
-
         import dashscope
 
         start_time = datetime.now()
-        res = dashscope.MultiModalEmbedding.call(**kwargs)
+        res = dashscope.MultiModalEmbedding.call(
+            **{
+                "input": inputs,
+                "model": self.model_name,
+                **kwargs,
+            },
+        )
         time = (datetime.now() - start_time).total_seconds()
 
         if res.status_code != 200:
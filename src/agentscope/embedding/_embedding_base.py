@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
 """The embedding model base class."""
+import hashlib
+import json
 from typing import Any
 
+import numpy as np
+
+from ._cache_base import EmbeddingCacheBase
 from ._embedding_response import EmbeddingResponse
+from ._embedding_usage import EmbeddingUsage
+from ..types import Embedding, JSONSerializableObject
 
 
 class EmbeddingModelBase:
@@ -17,6 +24,13 @@ class EmbeddingModelBase:
     dimensions: int
     """The dimensions of the embedding vector."""
 
+    embedding_cache: EmbeddingCacheBase | None = None
+    """The embedding cache, which caches the embedding of each input."""
+
+    batch_size_limit: int | None = None
+    """The maximum number of inputs in one API call, `None` means no
+    limit."""
+
     def __init__(
         self,
         model_name: str,
@@ -43,3 +57,130 @@ class EmbeddingModelBase:
             f"The {self.__class__.__name__} class does not implement "
             f"the __call__ method.",
         )
+
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Call the embedding API with a batch of inputs that fits the batch
+        size limit, without touching the cache.
+
+        Args:
+            inputs (`list`):
+                The formatted inputs to be embedded.
+            **kwargs (`Any`):
+                The extra keyword arguments for the API.
+        """
+        raise NotImplementedError(
+            f"The {self.__class__.__name__} class does not implement "
+            f"the _call_api method.",
+        )
+
+    def _get_cache_identifier(
+        self,
+        data: JSONSerializableObject,
+        **kwargs: Any,
+    ) -> dict:
+        """Get the cache identifier of a single input, which consists of the
+        model name, the dimensions, the hash of the input and the extra API
+        keyword arguments.
+
+        Args:
+            data (`JSONSerializableObject`):
+                The formatted input, e.g. a string for text embedding.
+            **kwargs (`Any`):
+                The extra keyword arguments for the API, which may affect the
+                embedding result.
+        """
+        json_str = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        return {
+            "model": self.model_name,
+            "dimensions": self.dimensions,
+            "input": hashlib.sha256(json_str.encode("utf-8")).hexdigest(),
+            "kwargs": kwargs,
+        }
+
+    async def _embed_with_cache(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Embed the inputs with the per-input cache. The cached embeddings
+        are looked up in one batch, and only the (deduplicated) missing
+        inputs are sent to the API in batches that fit `batch_size_limit`.
+        The results are reassembled in the order of the inputs.
+
+        Args:
+            inputs (`list`):
+                The formatted inputs to be embedded.
+            **kwargs (`Any`):
+                The extra keyword arguments for the API.
+
+        Returns:
+            `EmbeddingResponse`:
+                The embedding response, with the cache hit/miss counters.
+        """
+        embeddings: list[Embedding | None] = [None] * len(inputs)
+        identifiers: list[dict] = []
+
+        if self.embedding_cache:
+            identifiers = [
+                self._get_cache_identifier(_, **kwargs) for _ in inputs
+            ]
+            cached = await self.embedding_cache.retrieve_batch(identifiers)
+            for index, group in enumerate(cached):
+                if group is not None and len(group) > 0:
+                    # The caches may return array views, whose memory can be
+                    # reused by the following stores, so copy them out
+                    embedding = group[0]
+                    embeddings[index] = (
+                        embedding.tolist()
+                        if isinstance(embedding, np.ndarray)
+                        else embedding
+                    )
+
+        # Group the positions of the missing inputs by their content, so that
+        # the duplicated inputs are only embedded once
+        missing: dict[str, list[int]] = {}
+        for index, data in enumerate(inputs):
+            if embeddings[index] is None:
+                key = json.dumps(data, ensure_ascii=False, sort_keys=True)
+                missing.setdefault(key, []).append(index)
+
+        positions = list(missing.values())
+        batch_size = self.batch_size_limit or max(len(positions), 1)
+        time, tokens = 0.0, None
+        for start in range(0, len(positions), batch_size):
+            batch_positions = positions[start : start + batch_size]
+            res = await self._call_api(
+                [inputs[_[0]] for _ in batch_positions],
+                **kwargs,
+            )
+
+            for indices, embedding in zip(batch_positions, res.embeddings):
+                for index in indices:
+                    embeddings[index] = embedding
+
+            if self.embedding_cache:
+                await self.embedding_cache.store_batch(
+                    embeddings=[[_] for _ in res.embeddings],
+                    identifiers=[identifiers[_[0]] for _ in batch_positions],
+                )
+
+            if res.usage:
+                time += res.usage.time
+                if res.usage.tokens is not None:
+                    tokens = (tokens or 0) + res.usage.tokens
+
+        n_misses = sum(len(_) for _ in positions)
+        return EmbeddingResponse(
+            embeddings=embeddings,
+            usage=EmbeddingUsage(
+                tokens=tokens if positions else 0,
+                time=time,
+            ),
+            source="cache" if inputs and not positions else "api",
+            cache_hits=len(inputs) - n_misses,
+            cache_misses=n_misses,
+        )
@@ -30,3 +30,9 @@ class EmbeddingResponse(DictMixin):
 
     source: Literal["cache", "api"] = field(default_factory=lambda: "api")
     """If the response comes from the cache or the API."""
+
+    cache_hits: int = field(default_factory=lambda: 0)
+    """The number of inputs whose embeddings are found in the cache."""
+
+    cache_misses: int = field(default_factory=lambda: 0)
+    """The number of inputs whose embeddings are obtained from the API."""
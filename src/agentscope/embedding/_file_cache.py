@@ -86,6 +86,44 @@ class FileEmbeddingCache(EmbeddingCacheBase):
             np.save(path_file, embeddings)
             await self._maintain_cache_dir()
 
+    async def store_batch(
+        self,
+        embeddings: List[List[Embedding]],
+        identifiers: List[JSONSerializableObject],
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store multiple groups of embeddings, and maintain the cache
+        directory only once afterward.
+
+        Args:
+            embeddings (`List[List[Embedding]]`):
+                The groups of embeddings to store.
+            identifiers (`List[JSONSerializableObject]`):
+                The identifiers of the groups, in the same order.
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite existing embeddings with the same
+                identifier.
+        """
+        changed = False
+        for group, identifier in zip(embeddings, identifiers):
+            path_file = os.path.join(
+                self.cache_dir,
+                self._get_filename(identifier),
+            )
+            if os.path.exists(path_file):
+                if not os.path.isfile(path_file):
+                    raise RuntimeError(
+                        f"Path {path_file} exists but is not a file.",
+                    )
+                if not overwrite:
+                    continue
+            np.save(path_file, group)
+            changed = True
+
+        if changed:
+            await self._maintain_cache_dir()
+
     async def retrieve(
         self,
         identifier: JSONSerializableObject,
@@ -16,6 +16,9 @@ class GeminiTextEmbedding(EmbeddingModelBase):
     supported_modalities: list[str] = ["text"]
     """This class only supports text input."""
 
+    batch_size_limit: int = 100
+    """The maximum number of texts in one API call."""
+
     def __init__(
         self,
         api_key: str,
@@ -38,7 +41,11 @@ class GeminiTextEmbedding(EmbeddingModelBase):
                 for more details.
             embedding_cache (`EmbeddingCacheBase | None`, defaults to `None`):
                 The embedding cache class instance, used to cache the
-                embedding results to avoid repeated API calls.
+                embedding results to avoid repeated API calls. Each input
+                text is cached separately.
+
+        .. note:: The texts are sent in batches of at most 100 inputs,
+         which is the limit of the Gemini batch embedding API.
         """
         from google import genai
 
@@ -57,8 +64,6 @@ class GeminiTextEmbedding(EmbeddingModelBase):
         Args:
             text (`List[str | TextBlock]`):
                 The input text to be embedded. It can be a list of strings.
-
-        # TODO: handle the batch size limit
         """
         gather_text = []
         for _ in text:
@@ -71,36 +76,22 @@ class GeminiTextEmbedding(EmbeddingModelBase):
                     "Input text must be a list of strings or TextBlock dicts.",
                 )
 
-        kwargs = {
-            "model": self.model_name,
-            "contents": gather_text,
-            "config": kwargs,
-        }
-
-        if self.embedding_cache:
-            cached_embeddings = await self.embedding_cache.retrieve(
-                identifier=kwargs,
-            )
-            if cached_embeddings:
-                return EmbeddingResponse(
-                    embeddings=cached_embeddings,
-                    usage=EmbeddingUsage(
-                        tokens=0,
-                        time=0,
-                    ),
-                    source="cache",
-                )
+        return await self._embed_with_cache(gather_text, **kwargs)
 
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Call the Gemini embedding API with a batch of texts."""
         start_time = datetime.now()
-        response = self.client.models.embed_content(**kwargs)
+        response = self.client.models.embed_content(
+            model=self.model_name,
+            contents=inputs,
+            config=kwargs,
+        )
         time = (datetime.now() - start_time).total_seconds()
 
-        if self.embedding_cache:
-            await self.embedding_cache.store(
-                identifier=kwargs,
-                embeddings=[_.values for _ in response.embeddings],
-            )
-
         return EmbeddingResponse(
             embeddings=[_.values for _ in response.embeddings],
             usage=EmbeddingUsage(
@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+"""An embedding cache implementation that stores all embeddings in a single
+memory-mapped file, indexed by a SQLite database."""
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, List, cast
+
+import numpy as np
+
+from ._cache_base import EmbeddingCacheBase
+from .._logging import logger
+from ..types import (
+    Embedding,
+    JSONSerializableObject,
+)
+
+
+class MmapEmbeddingCache(EmbeddingCacheBase):
+    """The embedding cache class that stores all the embeddings as float32
+    values in one memory-mapped arena file, with a SQLite index that maps
+    each identifier to its region in the arena.
+
+    Compared with :class:`FileEmbeddingCache`, looking up an identifier
+    costs one indexed query instead of a file system access, the least
+    recently used entries are evicted according to the access time recorded
+    in the index, and `retrieve` returns a read-only view into the arena
+    without copying.
+
+    The writes are atomic: the embeddings are always written into a free
+    region of the arena first, and the index is updated in one transaction
+    afterward, so an interrupted write never corrupts the existing entries.
+
+    .. note:: The arrays returned by `retrieve` are views into the arena,
+     which are valid until the entry is overwritten, removed or evicted.
+     Copy them if they should be kept longer.
+    """
+
+    _ARENA_FILENAME = "embeddings.arena"
+    _INDEX_FILENAME = "embeddings.index.sqlite"
+    _MIN_CAPACITY = 1 << 16
+    """The minimum capacity of the arena, in number of float32 values."""
+
+    def __init__(
+        self,
+        cache_dir: str = "./.cache/embeddings",
+        max_entries: int | None = None,
+        max_cache_size: int | None = None,
+    ) -> None:
+        """Initialize the memory-mapped embedding cache.
+
+        Args:
+            cache_dir (`str`, defaults to `"./.cache/embeddings"`):
+                The directory to store the arena and index files.
+            max_entries (`int | None`, defaults to `None`):
+                The maximum number of identifiers to keep. If exceeded, the
+                least recently used entries will be evicted.
+            max_cache_size (`int | None`, defaults to `None`):
+                The maximum size of the cached embeddings in MB. If exceeded,
+                the least recently used entries will be evicted until the
+                size is within the limit.
+        """
+        self._cache_dir = os.path.abspath(cache_dir)
+        self.max_entries = max_entries
+        self.max_cache_size = max_cache_size
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(self._cache_dir, self._INDEX_FILENAME),
+        )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                dim INTEGER NOT NULL,
+                last_access INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_last_access
+                ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS free_regions (
+                offset INTEGER PRIMARY KEY,
+                length INTEGER NOT NULL,
+                end_offset INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_free_regions_length
+                ON free_regions (length);
+            CREATE INDEX IF NOT EXISTS idx_free_regions_end
+                ON free_regions (end_offset);
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """,
+        )
+        self._conn.commit()
+
+        # The in-memory statistics, which are restored from the index
+        self._clock = self._query_int(
+            "SELECT COALESCE(MAX(last_access), 0) FROM entries",
+        )
+        self._n_entries = self._query_int("SELECT COUNT(*) FROM entries")
+        self._n_values = self._query_int(
+            "SELECT COALESCE(SUM(count * dim), 0) FROM entries",
+        )
+        self._arena_end = self._query_int(
+            "SELECT COALESCE(MAX(value), 0) FROM meta WHERE name = 'end'",
+        )
+
+        self._arena = self._map_arena(self._arena_end)
+
+    @property
+    def cache_dir(self) -> str:
+        """The cache directory where the arena and index files are
+        stored."""
+        return self._cache_dir
+
+    @property
+    def cache_size(self) -> float:
+        """The size of the cached embeddings in MB."""
+        return self._n_values * 4 / (1024.0 * 1024.0)
+
+    async def store(
+        self,
+        embeddings: List[Embedding],
+        identifier: JSONSerializableObject,
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store the embeddings with the given identifier.
+
+        Args:
+            embeddings (`List[Embedding]`):
+                The embeddings to store, which should have the same
+                dimension.
+            identifier (`JSONSerializableObject`):
+                The identifier to distinguish the embeddings, which should be
+                JSON serializable (e.g. a string, number, list, dict).
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite existing embeddings with the same
+                identifier. If `True`, existing embeddings will be replaced.
+        """
+        await self.store_batch([embeddings], [identifier], overwrite)
+
+    async def store_batch(
+        self,
+        embeddings: List[List[Embedding]],
+        identifiers: List[JSONSerializableObject],
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store multiple groups of embeddings in one index transaction.
+
+        Args:
+            embeddings (`List[List[Embedding]]`):
+                The groups of embeddings to store.
+            identifiers (`List[JSONSerializableObject]`):
+                The identifiers of the groups, in the same order.
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite existing embeddings with the same
+                identifier.
+        """
+        keys = [self._get_key(_) for _ in identifiers]
+        existing = self._lookup(keys)
+
+        pending: dict[str, np.ndarray] = {}
+        for key, group in zip(keys, embeddings):
+            if key in existing and not overwrite:
+                continue
+            array = np.asarray(group, dtype=np.float32)
+            if array.ndim == 1:
+                array = array.reshape(1, -1)
+            pending[key] = array
+        if not pending:
+            return
+
+        with self._conn:
+            # Write into free regions first, and flush before the index is
+            # committed, so that the existing entries are never touched
+            new_entries = []
+            for key, array in pending.items():
+                offset = self._allocate(array.size)
+                self._arena[offset : offset + array.size] = array.reshape(-1)
+                self._clock += 1
+                new_entries.append(
+                    (key, offset, array.shape[0], array.shape[1], self._clock),
+                )
+            self._arena.flush()
+
+            for key in pending:
+                if key in existing:
+                    self._release(*existing[key])
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(key, offset, count, dim, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                new_entries,
+            )
+            self._n_entries += len(
+                [_ for _ in pending if _ not in existing],
+            )
+            self._n_values += sum(_.size for _ in pending.values())
+            self._n_values -= sum(
+                existing[_][1] for _ in pending if _ in existing
+            )
+            self._evict()
+
+    async def retrieve(
+        self,
+        identifier: JSONSerializableObject,
+    ) -> List[Embedding] | None:
+        """Retrieve the embeddings with the given identifier. If not found,
+        return `None`.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier to retrieve the embeddings.
+
+        Returns:
+            `List[Embedding] | None`:
+                A read-only 2-D float32 array view into the arena, with one
+                row for each embedding.
+        """
+        return (await self.retrieve_batch([identifier]))[0]
+
+    async def retrieve_batch(
+        self,
+        identifiers: List[JSONSerializableObject],
+    ) -> List[List[Embedding] | None]:
+        """Retrieve multiple groups of embeddings with one index query, and
+        update their access time for the LRU eviction.
+
+        Args:
+            identifiers (`List[JSONSerializableObject]`):
+                The identifiers to retrieve the embeddings.
+
+        Returns:
+            `List[List[Embedding] | None]`:
+                The read-only array views in the same order as the
+                identifiers, with `None` for the identifiers not found.
+        """
+        keys = [self._get_key(_) for _ in identifiers]
+        rows = self._lookup(keys, with_dim=True)
+
+        results: List[List[Embedding] | None] = []
+        accessed = []
+        for key in keys:
+            if key not in rows:
+                results.append(None)
+                continue
+            offset, count, dim = rows[key]
+            view = self._arena[offset : offset + count * dim].view(
+                np.ndarray,
+            )
+            view = view.reshape(count, dim)
+            view.flags.writeable = False
+            results.append(cast(List[Embedding], view))
+
+            self._clock += 1
+            accessed.append((self._clock, key))
+
+        if accessed:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE entries SET last_access = ? WHERE key = ?",
+                    accessed,
+                )
+        return results
+
+    async def remove(self, identifier: JSONSerializableObject) -> None:
+        """Remove the embeddings with the given identifier.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier to remove the embeddings.
+        """
+        key = self._get_key(identifier)
+        existing = self._lookup([key])
+        if key not in existing:
+            raise KeyError(f"Identifier {identifier} does not exist.")
+
+        with self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._release(*existing[key])
+        self._n_entries -= 1
+        self._n_values -= existing[key][1]
+
+    async def clear(self) -> None:
+        """Clear all cached embeddings and shrink the arena file."""
+        with self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM free_regions")
+            self._set_arena_end(0)
+        self._n_entries = 0
+        self._n_values = 0
+        self._arena = self._map_arena(0, shrink=True)
+
+    def close(self) -> None:
+        """Close the index database connection."""
+        self._conn.close()
+
+    @staticmethod
+    def _get_key(identifier: JSONSerializableObject) -> str:
+        """Generate the index key based on the identifier."""
+        json_str = json.dumps(identifier, ensure_ascii=False)
+        return hashlib.sha256(json_str.encode("utf-8")).hexdigest()
+
+    def _query_int(self, sql: str, *params: Any) -> int:
+        """Execute a query that returns a single integer."""
+        return int(self._conn.execute(sql, params).fetchone()[0])
+
+    def _lookup(
+        self,
+        keys: List[str],
+        with_dim: bool = False,
+    ) -> dict[str, tuple[int, ...]]:
+        """Look up the regions of the given keys in the index, returning
+        `{key: (offset, length)}`, or `{key: (offset, count, dim)}` if
+        `with_dim` is `True`."""
+        found: dict[str, tuple[int, ...]] = {}
+        # Avoid exceeding the maximum number of SQL variables
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for key, offset, count, dim in self._conn.execute(
+                "SELECT key, offset, count, dim FROM entries "
+                f"WHERE key IN ({placeholders})",
+                batch,
+            ):
+                if with_dim:
+                    found[key] = (offset, count, dim)
+                else:
+                    found[key] = (offset, count * dim)
+        return found
+
+    def _map_arena(self, n_values: int, shrink: bool = False) -> np.memmap:
+        """Make sure the arena file can hold `n_values` float32 values, and
+        map it into memory. The arena grows geometrically to amortize the
+        re-mapping cost, and only shrinks when `shrink` is `True`."""
+        path_arena = os.path.join(self._cache_dir, self._ARENA_FILENAME)
+        capacity = max(n_values, self._MIN_CAPACITY)
+        current = (
+            os.path.getsize(path_arena) // 4
+            if os.path.exists(path_arena)
+            else 0
+        )
+
+        if shrink or current < capacity:
+            new_capacity = capacity if shrink else max(capacity, current * 2)
+            with open(path_arena, "ab") as f:
+                f.truncate(new_capacity * 4)
+
+        # The views returned before keep the old mapping alive
+        return np.memmap(path_arena, dtype=np.float32, mode="r+")
+
+    def _set_arena_end(self, end: int) -> None:
+        """Record the end of the used part of the arena in the index."""
+        self._arena_end = end
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('end', ?)",
+            (end,),
+        )
+
+    def _allocate(self, length: int) -> int:
+        """Allocate a free region for `length` values in the arena, and
+        return its offset. The best-fit free region is reused if any,
+        otherwise the region is appended to the end of the arena."""
+        if length == 0:
+            return 0
+
+        row = self._conn.execute(
+            "SELECT offset, length FROM free_regions WHERE length >= ? "
+            "ORDER BY length LIMIT 1",
+            (length,),
+        ).fetchone()
+
+        if row is not None:
+            offset, free_length = row
+            self._conn.execute(
+                "DELETE FROM free_regions WHERE offset = ?",
+                (offset,),
+            )
+            if free_length > length:
+                self._conn.execute(
+                    "INSERT INTO free_regions (offset, length, end_offset) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        offset + length,
+                        free_length - length,
+                        offset + free_length,
+                    ),
+                )
+            return offset
+
+        offset = self._arena_end
+        self._set_arena_end(offset + length)
+        if self._arena_end > self._arena.shape[0]:
+            self._arena = self._map_arena(self._arena_end)
+        return offset
+
+    def _release(self, offset: int, length: int) -> None:
+        """Return a region to the free list, merging it with the adjacent
+        free regions."""
+        if length == 0:
+            return
+
+        end = offset + length
+        prev_row = self._conn.execute(
+            "SELECT offset FROM free_regions WHERE end_offset = ?",
+            (offset,),
+        ).fetchone()
+        if prev_row is not None:
+            offset = prev_row[0]
+            self._conn.execute(
+                "DELETE FROM free_regions WHERE offset = ?",
+                (offset,),
+            )
+
+        next_row = self._conn.execute(
+            "SELECT end_offset FROM free_regions WHERE offset = ?",
+            (end,),
+        ).fetchone()
+        if next_row is not None:
+            self._conn.execute(
+                "DELETE FROM free_regions WHERE offset = ?",
+                (end,),
+            )
+            end = next_row[0]
+
+        if end == self._arena_end:
+            # The tail of the arena is simply given back
+            self._set_arena_end(offset)
+        else:
+            self._conn.execute(
+                "INSERT INTO free_regions (offset, length, end_offset) "
+                "VALUES (?, ?, ?)",
+                (offset, end - offset, end),
+            )
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries until the limits are
+        satisfied. Must be called within a transaction."""
+        max_values = (
+            None
+            if self.max_cache_size is None
+            else self.max_cache_size * 1024 * 1024 // 4
+        )
+
+        n_evicted = 0
+        while self._n_entries > 0 and (
+            (self.max_entries and self._n_entries > self.max_entries)
+            or (max_values is not None and self._n_values > max_values)
+        ):
+            key, offset, length = self._conn.execute(
+                "SELECT key, offset, count * dim FROM entries "
+                "ORDER BY last_access LIMIT 1",
+            ).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._release(offset, length)
+            self._n_entries -= 1
+            self._n_values -= length
+            n_evicted += 1
+
+        if n_evicted:
+            logger.info(
+                "Evict %d cached embedding(s) for the limited number of "
+                "entries (%s) or cache size (%s MB).",
+                n_evicted,
+                self.max_entries,
+                self.max_cache_size,
+            )
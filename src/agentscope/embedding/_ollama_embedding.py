@@ -37,7 +37,8 @@ class OllamaTextEmbedding(EmbeddingModelBase):
                 The host URL for the Ollama API.
             embedding_cache (`EmbeddingCacheBase | None`, defaults to `None`):
                 The embedding cache class instance, used to cache the
-                embedding results to avoid repeated API calls.
+                embedding results to avoid repeated API calls. Each input
+                text is cached separately.
         """
         import ollama
 
@@ -68,35 +69,24 @@ class OllamaTextEmbedding(EmbeddingModelBase):
                     "Input text must be a list of strings or TextBlock dicts.",
                 )
 
-        if self.embedding_cache:
-            cached_embeddings = await self.embedding_cache.retrieve(
-                identifier=kwargs,
-            )
-            if cached_embeddings:
-                return EmbeddingResponse(
-                    embeddings=cached_embeddings,
-                    usage=EmbeddingUsage(
-                        tokens=0,
-                        time=0,
-                    ),
-                    source="cache",
-                )
+        return await self._embed_with_cache(gather_text, **kwargs)
 
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Call the Ollama embedding API for each of the texts
+        concurrently."""
         start_time = datetime.now()
         response = await asyncio.gather(
             *[
                 self.client.embeddings(self.model_name, _, **kwargs)
-                for _ in gather_text
+                for _ in inputs
             ],
         )
         time = (datetime.now() - start_time).total_seconds()
 
-        if self.embedding_cache:
-            await self.embedding_cache.store(
-                identifier=kwargs,
-                embeddings=[_.embedding for _ in response],
-            )
-
         return EmbeddingResponse(
             embeddings=[_.embedding for _ in response],
             usage=EmbeddingUsage(
@@ -16,6 +16,9 @@ class OpenAITextEmbedding(EmbeddingModelBase):
     supported_modalities: list[str] = ["text"]
     """This class only supports text input."""
 
+    batch_size_limit: int = 2048
+    """The maximum number of texts in one API call."""
+
     def __init__(
         self,
         api_key: str,
@@ -35,9 +38,11 @@ class OpenAITextEmbedding(EmbeddingModelBase):
                 The dimension of the embedding vector.
             embedding_cache (`EmbeddingCacheBase | None`, defaults to `None`):
                 The embedding cache class instance, used to cache the
-                embedding results to avoid repeated API calls.
+                embedding results to avoid repeated API calls. Each input
+                text is cached separately.
 
-        # TODO: handle batch size limit and token limit
+        .. note:: The texts are sent in batches of at most 2048 inputs,
+         which is the limit of the OpenAI embedding API.
         """
         import openai
 
@@ -68,38 +73,26 @@ class OpenAITextEmbedding(EmbeddingModelBase):
                     "Input text must be a list of strings or TextBlock dicts.",
                 )
 
-        kwargs = {
-            "input": gather_text,
-            "model": self.model_name,
-            "dimensions": self.dimensions,
-            "encoding_format": "float",
-            **kwargs,
-        }
-
-        if self.embedding_cache:
-            cached_embeddings = await self.embedding_cache.retrieve(
-                identifier=kwargs,
-            )
-            if cached_embeddings:
-                return EmbeddingResponse(
-                    embeddings=cached_embeddings,
-                    usage=EmbeddingUsage(
-                        tokens=0,
-                        time=0,
-                    ),
-                    source="cache",
-                )
+        return await self._embed_with_cache(gather_text, **kwargs)
 
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Call the OpenAI embedding API with a batch of texts."""
         start_time = datetime.now()
-        response = await self.client.embeddings.create(**kwargs)
+        response = await self.client.embeddings.create(
+            **{
+                "input": inputs,
+                "model": self.model_name,
+                "dimensions": self.dimensions,
+                "encoding_format": "float",
+                **kwargs,
+            },
+        )
         time = (datetime.now() - start_time).total_seconds()
 
-        if self.embedding_cache:
-            await self.embedding_cache.store(
-                identifier=kwargs,
-                embeddings=[_.embedding for _ in response.data],
-            )
-
         return EmbeddingResponse(
             embeddings=[_.embedding for _ in response.data],
             usage=EmbeddingUsage(
@@ -1,29 +1,33 @@
 # -*- coding: utf-8 -*-
 """The evaluation module in AgentScope."""
+from typing import TYPE_CHECKING
 
-from ._evaluator import (
-    EvaluatorBase,
-    RayEvaluator,
-    GeneralEvaluator,
-)
-from ._metric_base import (
-    MetricBase,
-    MetricResult,
-    MetricType,
-)
-from ._task import Task
-from ._solution import SolutionOutput
-from ._benchmark_base import BenchmarkBase
-from ._evaluator_storage import (
-    EvaluatorStorageBase,
-    FileEvaluatorStorage,
-)
-from ._ace_benchmark import (
-    ACEBenchmark,
-    ACEAccuracy,
-    ACEProcessAccuracy,
-    ACEPhone,
-)
+from .._utils._lazy import _lazy_import
+
+if TYPE_CHECKING:
+    from ._evaluator import (
+        EvaluatorBase,
+        RayEvaluator,
+        GeneralEvaluator,
+    )
+    from ._metric_base import (
+        MetricBase,
+        MetricResult,
+        MetricType,
+    )
+    from ._task import Task
+    from ._solution import SolutionOutput
+    from ._benchmark_base import BenchmarkBase
+    from ._evaluator_storage import (
+        EvaluatorStorageBase,
+        FileEvaluatorStorage,
+    )
+    from ._ace_benchmark import (
+        ACEBenchmark,
+        ACEAccuracy,
+        ACEProcessAccuracy,
+        ACEPhone,
+    )
 
 __all__ = [
     "BenchmarkBase",
@@ -42,3 +46,24 @@ __all__ = [
     "ACEProcessAccuracy",
     "ACEPhone",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "BenchmarkBase": "._benchmark_base",
+        "EvaluatorBase": "._evaluator",
+        "RayEvaluator": "._evaluator",
+        "GeneralEvaluator": "._evaluator",
+        "MetricBase": "._metric_base",
+        "MetricResult": "._metric_base",
+        "MetricType": "._metric_base",
+        "EvaluatorStorageBase": "._evaluator_storage",
+        "FileEvaluatorStorage": "._evaluator_storage",
+        "Task": "._task",
+        "SolutionOutput": "._solution",
+        "ACEBenchmark": "._ace_benchmark",
+        "ACEAccuracy": "._ace_benchmark",
+        "ACEProcessAccuracy": "._ace_benchmark",
+        "ACEPhone": "._ace_benchmark",
+    },
+)
@@ -1,36 +1,50 @@
 # -*- coding: utf-8 -*-
 """The formatter module in agentscope."""
+from typing import TYPE_CHECKING
 
-from ._formatter_base import FormatterBase
-from ._truncated_formatter_base import TruncatedFormatterBase
-from ._dashscope_formatter import (
-    DashScopeChatFormatter,
-    DashScopeMultiAgentFormatter,
-)
-from ._anthropic_formatter import (
-    AnthropicChatFormatter,
-    AnthropicMultiAgentFormatter,
-)
-from ._openai_formatter import (
-    OpenAIChatFormatter,
-    OpenAIMultiAgentFormatter,
-)
-from ._gemini_formatter import (
-    GeminiChatFormatter,
-    GeminiMultiAgentFormatter,
-)
-from ._ollama_formatter import (
-    OllamaChatFormatter,
-    OllamaMultiAgentFormatter,
-)
-from ._deepseek_formatter import (
-    DeepSeekChatFormatter,
-    DeepSeekMultiAgentFormatter,
-)
+from .._utils._lazy import _lazy_import
+
+if TYPE_CHECKING:
+    from ._formatter_base import FormatterBase
+    from ._truncated_formatter_base import TruncatedFormatterBase
+    from ._truncation_strategy import (
+        TruncationStrategyBase,
+        DropOldestStrategy,
+        KeepFirstNStrategy,
+        SummarizeMiddleStrategy,
+    )
+    from ._dashscope_formatter import (
+        DashScopeChatFormatter,
+        DashScopeMultiAgentFormatter,
+    )
+    from ._anthropic_formatter import (
+        AnthropicChatFormatter,
+        AnthropicMultiAgentFormatter,
+    )
+    from ._openai_formatter import (
+        OpenAIChatFormatter,
+        OpenAIMultiAgentFormatter,
+    )
+    from ._gemini_formatter import (
+        GeminiChatFormatter,
+        GeminiMultiAgentFormatter,
+    )
+    from ._ollama_formatter import (
+        OllamaChatFormatter,
+        OllamaMultiAgentFormatter,
+    )
+    from ._deepseek_formatter import (
+        DeepSeekChatFormatter,
+        DeepSeekMultiAgentFormatter,
+    )
 
 __all__ = [
     "FormatterBase",
     "TruncatedFormatterBase",
+    "TruncationStrategyBase",
+    "DropOldestStrategy",
+    "KeepFirstNStrategy",
+    "SummarizeMiddleStrategy",
     "DashScopeChatFormatter",
     "DashScopeMultiAgentFormatter",
     "OpenAIChatFormatter",
@@ -44,3 +58,27 @@ __all__ = [
     "DeepSeekChatFormatter",
     "DeepSeekMultiAgentFormatter",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "FormatterBase": "._formatter_base",
+        "TruncatedFormatterBase": "._truncated_formatter_base",
+        "TruncationStrategyBase": "._truncation_strategy",
+        "DropOldestStrategy": "._truncation_strategy",
+        "KeepFirstNStrategy": "._truncation_strategy",
+        "SummarizeMiddleStrategy": "._truncation_strategy",
+        "DashScopeChatFormatter": "._dashscope_formatter",
+        "DashScopeMultiAgentFormatter": "._dashscope_formatter",
+        "OpenAIChatFormatter": "._openai_formatter",
+        "OpenAIMultiAgentFormatter": "._openai_formatter",
+        "AnthropicChatFormatter": "._anthropic_formatter",
+        "AnthropicMultiAgentFormatter": "._anthropic_formatter",
+        "GeminiChatFormatter": "._gemini_formatter",
+        "GeminiMultiAgentFormatter": "._gemini_formatter",
+        "OllamaChatFormatter": "._ollama_formatter",
+        "OllamaMultiAgentFormatter": "._ollama_formatter",
+        "DeepSeekChatFormatter": "._deepseek_formatter",
+        "DeepSeekMultiAgentFormatter": "._deepseek_formatter",
+    },
+)
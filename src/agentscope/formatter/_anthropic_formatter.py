@@ -4,7 +4,9 @@
 
 from typing import Any
 
+from ._formatter_base import _copy_block
 from ._truncated_formatter_base import TruncatedFormatterBase
+from ._truncation_strategy import TruncationStrategyBase
 from .._logging import logger
 from ..message import Msg, TextBlock, ImageBlock, ToolUseBlock, ToolResultBlock
 from ..token import TokenCounterBase
@@ -61,7 +63,7 @@ class AnthropicChatFormatter(TruncatedFormatterBase):
             for block in msg.get_content_blocks():
                 typ = block.get("type")
                 if typ in ["thinking", "text", "image"]:
-                    content_blocks.append({**block})
+                    content_blocks.append(_copy_block(block))
 
                 elif typ == "tool_use":
                     content_blocks.append(
@@ -69,7 +71,7 @@ class AnthropicChatFormatter(TruncatedFormatterBase):
                             "id": block.get("id"),
                             "type": "tool_use",
                             "name": block.get("name"),
-                            "input": block.get("input", {}),
+                            "input": _copy_block(block.get("input", {})),
                         },
                     )
 
@@ -78,7 +80,7 @@ class AnthropicChatFormatter(TruncatedFormatterBase):
                     if output is None:
                         content_value = [{"type": "text", "text": None}]
                     elif isinstance(output, list):
-                        content_value = output
+                        content_value = _copy_block(output)
                     else:
                         content_value = [{"type": "text", "text": str(output)}]
                     messages.append(
@@ -151,14 +153,23 @@ class AnthropicMultiAgentFormatter(TruncatedFormatterBase):
         ),
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the DashScope multi-agent formatter.
 
         Args:
             conversation_history_prompt (`str`):
                 The prompt to use for the conversation history section.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If `None`, the oldest messages are
+                dropped.
         """
-        super().__init__(token_counter=token_counter, max_tokens=max_tokens)
+        super().__init__(
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            truncation_strategy=truncation_strategy,
+        )
         self.conversation_history_prompt = conversation_history_prompt
 
     async def _format_tool_sequence(
@@ -204,7 +215,7 @@ class AnthropicMultiAgentFormatter(TruncatedFormatterBase):
                         )
                         accumulated_text.clear()
 
-                    conversation_blocks.append({**block})
+                    conversation_blocks.append(_copy_block(block))
 
         if accumulated_text:
             conversation_blocks.append(
@@ -7,6 +7,7 @@ import os.path
 from typing import Any
 
 from ._truncated_formatter_base import TruncatedFormatterBase
+from ._truncation_strategy import TruncationStrategyBase
 from .._logging import logger
 from .._utils._common import _is_accessible_local_file
 from ..message import (
@@ -274,6 +275,7 @@ class DashScopeMultiAgentFormatter(TruncatedFormatterBase):
         ),
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the DashScope multi-agent formatter.
 
@@ -285,8 +287,16 @@ class DashScopeMultiAgentFormatter(TruncatedFormatterBase):
             max_tokens (`int | None`, optional):
                 The maximum number of tokens allowed in the formatted
                 messages. If `None`, no truncation will be applied.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If `None`, the oldest messages are
+                dropped.
         """
-        super().__init__(token_counter=token_counter, max_tokens=max_tokens)
+        super().__init__(
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            truncation_strategy=truncation_strategy,
+        )
         self.conversation_history_prompt = conversation_history_prompt
 
     async def _format_tool_sequence(
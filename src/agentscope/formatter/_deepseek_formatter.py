@@ -5,6 +5,7 @@ import json
 from typing import Any
 
 from ._truncated_formatter_base import TruncatedFormatterBase
+from ._truncation_strategy import TruncationStrategyBase
 from .._logging import logger
 from ..message import Msg, TextBlock, ToolUseBlock, ToolResultBlock
 from ..token import TokenCounterBase
@@ -137,6 +138,7 @@ class DeepSeekMultiAgentFormatter(TruncatedFormatterBase):
         ),
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the DeepSeek multi-agent formatter.
 
@@ -151,8 +153,16 @@ class DeepSeekMultiAgentFormatter(TruncatedFormatterBase):
                 The maximum number of tokens allowed in the formatted
                 messages. If not provided, the formatter will not truncate
                 the messages.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If `None`, the oldest messages are
+                dropped.
         """
-        super().__init__(token_counter=token_counter, max_tokens=max_tokens)
+        super().__init__(
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            truncation_strategy=truncation_strategy,
+        )
         self.conversation_history_prompt = conversation_history_prompt
 
     async def _format_tool_sequence(
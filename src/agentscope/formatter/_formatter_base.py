@@ -8,6 +8,17 @@ from .._utils._common import _save_base64_data
 from ..message import Msg, AudioBlock, ImageBlock, TextBlock
 
 
+def _copy_block(data: Any) -> Any:
+    """Copy the nested dicts and lists of the block data, so that the
+    formatted messages don't alias the messages in the memory, while the
+    strings, e.g. the base64 data, are shared rather than copied."""
+    if isinstance(data, dict):
+        return {key: _copy_block(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_copy_block(_) for _ in data]
+    return data
+
+
 class FormatterBase:
     """The base class for formatters."""
 
@@ -1,13 +1,14 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=too-many-branches
 """Google gemini API formatter in agentscope."""
-import base64
 import os
 from typing import Any
 from urllib.parse import urlparse
 
+from ._media_resolver import _media_resolver
+from ._formatter_base import _copy_block
 from ._truncated_formatter_base import TruncatedFormatterBase
-from .._utils._common import _get_bytes_from_web_url
+from ._truncation_strategy import TruncationStrategyBase
 from ..message import (
     Msg,
     TextBlock,
@@ -41,7 +42,7 @@ def _to_gemini_inline_data(url: str) -> dict:
                 f"{GeminiChatFormatter.supported_extensions}",
             )
 
-        data = _get_bytes_from_web_url(url)
+        data = _media_resolver.get_base64(url)
         return {
             "data": data,
             "mime_type": f"{typ}/{extension}",
@@ -55,8 +56,7 @@ def _to_gemini_inline_data(url: str) -> dict:
                 f"{GeminiChatFormatter.supported_extensions}",
             )
 
-        with open(url, "rb") as f:
-            data = base64.b64encode(f.read()).decode("utf-8")
+        data = _media_resolver.get_base64(url)
 
         return {
             "data": data,
@@ -92,6 +92,13 @@ class GeminiChatFormatter(TruncatedFormatterBase):
     ]
     """The list of supported message blocks"""
 
+    _prefetch_media: dict[str, bool] = {
+        "image": True,
+        "audio": True,
+        "video": True,
+    }
+    """The media loaded as base64 data, which are prefetched concurrently"""
+
     supported_extensions: dict[str, list[str]] = {
         "image": ["png", "jpeg", "webp", "heic", "heif"],
         "video": [
@@ -134,7 +141,7 @@ class GeminiChatFormatter(TruncatedFormatterBase):
                             "function_call": {
                                 "id": block["id"],
                                 "name": block["name"],
-                                "args": block["input"],
+                                "args": _copy_block(block["input"]),
                             },
                         },
                     )
@@ -242,6 +249,13 @@ class GeminiMultiAgentFormatter(TruncatedFormatterBase):
     ]
     """The list of supported message blocks"""
 
+    _prefetch_media: dict[str, bool] = {
+        "image": True,
+        "audio": True,
+        "video": True,
+    }
+    """The media loaded as base64 data, which are prefetched concurrently"""
+
     def __init__(
         self,
         conversation_history_prompt: str = (
@@ -251,6 +265,7 @@ class GeminiMultiAgentFormatter(TruncatedFormatterBase):
         ),
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the Gemini multi-agent formatter.
 
@@ -262,8 +277,16 @@ class GeminiMultiAgentFormatter(TruncatedFormatterBase):
             max_tokens (`int | None`, optional):
                 The maximum number of tokens allowed in the formatted
                 messages. If `None`, no truncation will be applied.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If `None`, the oldest messages are
+                dropped.
         """
-        super().__init__(token_counter=token_counter, max_tokens=max_tokens)
+        super().__init__(
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            truncation_strategy=truncation_strategy,
+        )
         self.conversation_history_prompt = conversation_history_prompt
 
     async def _format_system_message(
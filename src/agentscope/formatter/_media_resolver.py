@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""The media resolver shared by the formatters, which loads the local files
+and web URLs as base64 data without blocking the event loop."""
+import asyncio
+import base64
+import contextvars
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .._logging import logger
+
+
+_MAX_CACHED_ERRORS = 1024
+"""The maximum number of cached loading errors."""
+
+_pinned_payloads: contextvars.ContextVar[
+    dict[str, str] | None
+] = contextvars.ContextVar("_pinned_payloads", default=None)
+"""The payloads pinned for the formatting in the current context."""
+
+
+class _MediaResolver:
+    """Load the media from local files or web URLs as base64 data.
+
+    - The loading and base64 encoding run in a thread pool, and the web
+      URLs are fetched with a connection-pooled HTTP session.
+    - The encoded payloads are cached in a bounded LRU cache, where the
+      payloads are stored by the hash of their content, so the same media
+      referred by different paths is only kept once. The local files are
+      identified by their path, modification time and size.
+    - The same media requested concurrently is only loaded once.
+    - The loading errors are cached, so that the media failed in
+      prefetching is not loaded again by the blocking `get_base64`, but
+      retried by the next prefetching.
+    - The prefetched payloads can be pinned for a formatting by `pin`, so
+      that the payloads too large for the cache, or evicted before they're
+      formatted, are not loaded again by the blocking `get_base64`.
+    - The thread pool and the HTTP session are created on the first use.
+    """
+
+    def __init__(
+        self,
+        max_cache_bytes: int = 256 * 1024 * 1024,
+        max_workers: int = 8,
+        max_retries: int = 3,
+        timeout: float = 30,
+    ) -> None:
+        """Initialize the media resolver.
+
+        Args:
+            max_cache_bytes (`int`, defaults to `256 * 1024 * 1024`):
+                The maximum total size of the cached base64 payloads.
+            max_workers (`int`, defaults to `8`):
+                The maximum number of media loaded concurrently, which is
+                also the size of the HTTP connection pool.
+            max_retries (`int`, defaults to `3`):
+                The maximum number of attempts to fetch a web URL.
+            timeout (`float`, defaults to `30`):
+                The timeout of fetching a web URL in seconds.
+        """
+        self.max_cache_bytes = max_cache_bytes
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._session: requests.Session | None = None
+
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, str] = OrderedDict()
+        self._payloads: dict[str, str] = {}
+        self._refs: dict[str, int] = {}
+        self._cache_bytes = 0
+        self._loading: dict[str, Future] = {}
+        self._errors: OrderedDict[str, Exception] = OrderedDict()
+
+    @property
+    def cache_bytes(self) -> int:
+        """The total size of the cached base64 payloads."""
+        return self._cache_bytes
+
+    def get_base64(self, url: str) -> str:
+        """Get the base64 data of the media synchronously, which is used
+        when the media is not prefetched.
+
+        Args:
+            url (`str`):
+                The local file path or web URL of the media.
+        """
+        pinned = _pinned_payloads.get()
+        if pinned is not None and url in pinned:
+            return pinned[url]
+
+        key, loader = self._get_key_and_loader(url)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            error = self._errors.get(key)
+        if error is not None:
+            raise error
+        return self._submit(key, loader).result()
+
+    async def aget_base64(self, url: str) -> str:
+        """Get the base64 data of the media without blocking the event
+        loop.
+
+        Args:
+            url (`str`):
+                The local file path or web URL of the media.
+        """
+        key, loader = self._get_key_and_loader(url)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        return await asyncio.wrap_future(self._submit(key, loader))
+
+    async def prefetch(self, urls: list[str]) -> dict[str, str]:
+        """Load the given media concurrently into the cache. The errors are
+        ignored here, and will be raised when the media is formatted.
+
+        Args:
+            urls (`list[str]`):
+                The local file paths or web URLs of the media.
+
+        Returns:
+            `dict[str, str]`:
+                The base64 data of the loaded media by their URLs, which can
+                be pinned by `pin` while formatting.
+        """
+        urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(
+            *[self.aget_base64(_) for _ in urls],
+            return_exceptions=True,
+        )
+        payloads = {}
+        for url, res in zip(urls, results):
+            if isinstance(res, BaseException):
+                logger.debug("Failed to prefetch media %s: %s", url, res)
+            else:
+                payloads[url] = res
+        return payloads
+
+    @contextmanager
+    def pin(self, payloads: dict[str, str]) -> Iterator[None]:
+        """Serve the given payloads by `get_base64` in the current context
+        regardless of the cache.
+
+        Args:
+            payloads (`dict[str, str]`):
+                The base64 data of the media by their URLs, e.g. returned by
+                `prefetch`.
+        """
+        token = _pinned_payloads.set(
+            {**(_pinned_payloads.get() or {}), **payloads},
+        )
+        try:
+            yield
+        finally:
+            _pinned_payloads.reset(token)
+
+    def clear(self) -> None:
+        """Clear the cached payloads."""
+        with self._lock:
+            self._index.clear()
+            self._payloads.clear()
+            self._refs.clear()
+            self._errors.clear()
+            self._cache_bytes = 0
+
+    def _get_key_and_loader(
+        self,
+        url: str,
+    ) -> tuple[str, Callable[[], bytes]]:
+        """Get the cache key and the loading function of the media."""
+        if os.path.isfile(url):
+            stat = os.stat(url)
+            path = os.path.abspath(url)
+
+            def _read_file() -> bytes:
+                with open(path, "rb") as f:
+                    return f.read()
+
+            return f"file:{path}:{stat.st_mtime_ns}:{stat.st_size}", _read_file
+
+        if urlparse(url).scheme not in ["http", "https"]:
+            raise ValueError(
+                f"The URL `{url}` is not a valid web URL or local file.",
+            )
+
+        return f"url:{url}", lambda: self._fetch(url)
+
+    def _fetch(self, url: str) -> bytes:
+        """Fetch the content of the web URL with retries."""
+        error: Exception | None = None
+        session = self._get_session()
+        for _ in range(self.max_retries):
+            try:
+                response = session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                return response.content
+            except Exception as e:
+                error = e
+                logger.info(
+                    "Failed to fetch media from URL %s. Error %s. Retrying...",
+                    url,
+                    str(e),
+                )
+        raise RuntimeError(
+            f"Failed to fetch media from URL `{url}` after "
+            f"{self.max_retries} retries.",
+        ) from error
+
+    def _submit(self, key: str, loader: Callable[[], bytes]) -> Future:
+        """Submit the loading to the thread pool, or return the ongoing
+        loading of the same media."""
+        with self._lock:
+            future = self._loading.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="agentscope-media",
+                    )
+                future = self._executor.submit(self._load, key, loader)
+                self._loading[key] = future
+        return future
+
+    def _get_session(self) -> requests.Session:
+        """Get the connection-pooled HTTP session, which is created on the
+        first use."""
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.max_workers,
+                    pool_maxsize=self.max_workers,
+                )
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def _load(self, key: str, loader: Callable[[], bytes]) -> str:
+        """Load, encode and cache the media in the worker thread."""
+        try:
+            try:
+                content = loader()
+            except Exception as e:
+                with self._lock:
+                    self._errors[key] = e
+                    while len(self._errors) > _MAX_CACHED_ERRORS:
+                        self._errors.popitem(last=False)
+                raise
+
+            with self._lock:
+                self._errors.pop(key, None)
+            digest = hashlib.sha256(content).hexdigest()
+            with self._lock:
+                payload = self._payloads.get(digest)
+            if payload is None:
+                payload = base64.b64encode(content).decode("utf-8")
+            self._put(key, digest, payload)
+            return payload
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _get_cached(self, key: str) -> str | None:
+        """Get the cached payload by the key."""
+        with self._lock:
+            digest = self._index.get(key)
+            if digest is None:
+                return None
+            self._index.move_to_end(key)
+            return self._payloads[digest]
+
+    def _put(self, key: str, digest: str, payload: str) -> None:
+        """Cache the payload, and evict the least recently used ones if the
+        cache is full."""
+        if len(payload) > self.max_cache_bytes:
+            return
+
+        with self._lock:
+            if key in self._index:
+                self._release(self._index.pop(key))
+
+            self._index[key] = digest
+            if digest in self._payloads:
+                self._refs[digest] += 1
+            else:
+                self._payloads[digest] = payload
+                self._refs[digest] = 1
+                self._cache_bytes += len(payload)
+
+            while self._cache_bytes > self.max_cache_bytes:
+                _, oldest = self._index.popitem(last=False)
+                self._release(oldest)
+
+    def _release(self, digest: str) -> None:
+        """Release a reference to the payload, which is removed when not
+        referred anymore. Must be called with the lock held."""
+        self._refs[digest] -= 1
+        if self._refs[digest] == 0:
+            self._cache_bytes -= len(self._payloads.pop(digest))
+            del self._refs[digest]
+
+
+_media_resolver = _MediaResolver()
+"""The media resolver shared by all the formatters."""
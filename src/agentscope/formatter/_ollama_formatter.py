@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=too-many-branches
 """The Ollama formatter module."""
-import base64
 import os
 from typing import Any
 from urllib.parse import urlparse
 
+from ._media_resolver import _media_resolver
+from ._formatter_base import _copy_block
 from ._truncated_formatter_base import TruncatedFormatterBase
+from ._truncation_strategy import TruncationStrategyBase
 from .._logging import logger
-from .._utils._common import _get_bytes_from_web_url
 from ..message import Msg, TextBlock, ImageBlock, ToolUseBlock, ToolResultBlock
 from ..token import TokenCounterBase
 
@@ -19,14 +20,10 @@ def _convert_ollama_image_url_to_base64_data(url: str) -> str:
 
     if not os.path.exists(url) and parsed_url.scheme != "":
         # Web url
-        data = _get_bytes_from_web_url(url)
-        return data
+        return _media_resolver.get_base64(url)
     if os.path.exists(url):
         # Local file
-        with open(url, "rb") as f:
-            data = base64.b64encode(f.read()).decode("utf-8")
-
-        return data
+        return _media_resolver.get_base64(url)
 
     raise ValueError(
         f"The URL `{url}` is not a valid image URL or local file.",
@@ -55,6 +52,9 @@ class OllamaChatFormatter(TruncatedFormatterBase):
     ]
     """The list of supported message blocks"""
 
+    _prefetch_media: dict[str, bool] = {"image": True}
+    """The media loaded as base64 data, which are prefetched concurrently"""
+
     async def _format(
         self,
         msgs: list[Msg],
@@ -89,7 +89,9 @@ class OllamaChatFormatter(TruncatedFormatterBase):
                             "type": "function",
                             "function": {
                                 "name": block.get("name"),
-                                "arguments": block.get("input", {}),
+                                "arguments": _copy_block(
+                                    block.get("input", {}),
+                                ),
                             },
                         },
                     )
@@ -167,6 +169,9 @@ class OllamaMultiAgentFormatter(TruncatedFormatterBase):
     ]
     """The list of supported message blocks"""
 
+    _prefetch_media: dict[str, bool] = {"image": True}
+    """The media loaded as base64 data, which are prefetched concurrently"""
+
     def __init__(
         self,
         conversation_history_prompt: str = (
@@ -176,6 +181,7 @@ class OllamaMultiAgentFormatter(TruncatedFormatterBase):
         ),
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the Ollama multi-agent formatter.
 
@@ -187,8 +193,16 @@ class OllamaMultiAgentFormatter(TruncatedFormatterBase):
             max_tokens (`int | None`, optional):
                 The maximum number of tokens allowed in the formatted
                 messages. If `None`, no truncation will be applied.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If `None`, the oldest messages are
+                dropped.
         """
-        super().__init__(token_counter=token_counter, max_tokens=max_tokens)
+        super().__init__(
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            truncation_strategy=truncation_strategy,
+        )
         self.conversation_history_prompt = conversation_history_prompt
 
     async def _format_system_message(
@@ -274,7 +288,7 @@ class OllamaMultiAgentFormatter(TruncatedFormatterBase):
                     elif source["type"] == "base64":
                         images.append(source["data"])
 
-                    conversation_blocks.append({**block})
+                    conversation_blocks.append(_copy_block(block))
 
         if accumulated_text:
             conversation_blocks.append(
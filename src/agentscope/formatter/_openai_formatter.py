@@ -1,15 +1,14 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=too-many-branches
 """The OpenAI formatter for agentscope."""
-import base64
 import json
 import os
 from typing import Any
 from urllib.parse import urlparse
 
-import requests
-
+from ._media_resolver import _media_resolver
 from ._truncated_formatter_base import TruncatedFormatterBase
+from ._truncation_strategy import TruncationStrategyBase
 from .._logging import logger
 from ..message import (
     Msg,
@@ -55,10 +54,7 @@ def _to_openai_image_url(url: str) -> str:
     # Check if it is a local file
     elif os.path.exists(url) and os.path.isfile(url):
         if any(lower_url.endswith(_) for _ in support_image_extensions):
-            with open(url, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode(
-                    "utf-8",
-                )
+            base64_image = _media_resolver.get_base64(url)
             extension = parsed_url.path.lower().split(".")[-1]
             mime_type = f"image/{extension}"
             return f"data:{mime_type};base64,{base64_image}"
@@ -78,15 +74,9 @@ def _to_openai_audio_data(source: URLSource | Base64Source) -> dict:
 
         parsed_url = urlparse(source["url"])
 
-        if os.path.exists(source["url"]):
-            with open(source["url"], "rb") as audio_file:
-                data = base64.b64encode(audio_file.read()).decode("utf-8")
-
-        # web url
-        elif parsed_url.scheme != "":
-            response = requests.get(source["url"])
-            response.raise_for_status()
-            data = base64.b64encode(response.content).decode("utf-8")
+        # local file or web url
+        if os.path.exists(source["url"]) or parsed_url.scheme != "":
+            data = _media_resolver.get_base64(source["url"])
 
         else:
             raise ValueError(
@@ -139,6 +129,9 @@ class OpenAIChatFormatter(TruncatedFormatterBase):
     ]
     """Supported message blocks for OpenAI API"""
 
+    _prefetch_media: dict[str, bool] = {"image": False, "audio": True}
+    """The media loaded as base64 data, which are prefetched concurrently"""
+
     async def _format(
         self,
         msgs: list[Msg],
@@ -274,6 +267,9 @@ class OpenAIMultiAgentFormatter(TruncatedFormatterBase):
     ]
     """Supported message blocks for OpenAI API"""
 
+    _prefetch_media: dict[str, bool] = {"image": False, "audio": True}
+    """The media loaded as base64 data, which are prefetched concurrently"""
+
     def __init__(
         self,
         conversation_history_prompt: str = (
@@ -283,14 +279,23 @@ class OpenAIMultiAgentFormatter(TruncatedFormatterBase):
         ),
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the OpenAI multi-agent formatter.
 
         Args:
             conversation_history_prompt (`str`):
                 The prompt to use for the conversation history section.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If `None`, the oldest messages are
+                dropped.
         """
-        super().__init__(token_counter=token_counter, max_tokens=max_tokens)
+        super().__init__(
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            truncation_strategy=truncation_strategy,
+        )
         self.conversation_history_prompt = conversation_history_prompt
 
     async def _format_tool_sequence(
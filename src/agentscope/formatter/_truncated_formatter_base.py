@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
 """The truncated formatter base class, which allows to truncate the input
 messages."""
+import asyncio
+import os
 from abc import ABC
-from copy import deepcopy
+from collections import OrderedDict
 from typing import (
     Any,
+    Iterator,
     Tuple,
     Literal,
     AsyncGenerator,
 )
+from urllib.parse import urlparse
 
 from ._formatter_base import FormatterBase
+from ._media_resolver import _media_resolver
+from ._truncation_strategy import TruncationStrategyBase, DropOldestStrategy
 from ..message import Msg
 from ..token import TokenCounterBase
 from ..tracing import trace_format
@@ -18,12 +24,33 @@ from ..tracing import trace_format
 
 class TruncatedFormatterBase(FormatterBase, ABC):
     """Base class for truncated formatters, which formats input messages into
-    required formats with tokens under a specified limit."""
+    required formats with tokens under a specified limit.
+
+    When the token limit is exceeded, the messages are split into groups
+    (a single message, or a tool call with its tool result), the tokens of
+    each group are counted once and cached by the message IDs, and the
+    truncation strategy selects the groups to keep in one pass.
+    """
+
+    _token_count_cache_size: int = 4096
+    """The maximum number of cached token counts of the message groups."""
+
+    _prefetch_media: dict[str, bool] = {}
+    """The block types whose URL sources are loaded as base64 data by the
+    formatter, mapped to whether the web URLs are also loaded. These media
+    are loaded concurrently before formatting without blocking the event
+    loop."""
+
+    _prefetch_tool_result_media: bool = False
+    """Whether the media nested in the outputs of the tool results are also
+    prefetched, which should be enabled by the formatters that send them as
+    media rather than converting them into text."""
 
     def __init__(
         self,
         token_counter: TokenCounterBase | None = None,
         max_tokens: int | None = None,
+        truncation_strategy: TruncationStrategyBase | None = None,
     ) -> None:
         """Initialize the TruncatedFormatterBase.
 
@@ -36,6 +63,11 @@ class TruncatedFormatterBase(FormatterBase, ABC):
                 The maximum number of tokens allowed in the formatted
                 messages. If not provided, the formatter will not truncate
                 the messages.
+            truncation_strategy (`TruncationStrategyBase | None`, optional):
+                The strategy to select the messages to keep when the token
+                limit is exceeded. If not provided, the oldest messages are
+                dropped, or the `_truncate` method is used if it's
+                overridden by the subclass.
         """
         self.token_counter = token_counter
 
@@ -43,6 +75,9 @@ class TruncatedFormatterBase(FormatterBase, ABC):
             max_tokens is None or 0 < max_tokens
         ), "max_tokens must be greater than 0"
         self.max_tokens = max_tokens
+        self.truncation_strategy = truncation_strategy
+
+        self._token_count_cache: OrderedDict[tuple, int] = OrderedDict()
 
     @trace_format
     async def format(
@@ -66,22 +101,97 @@ class TruncatedFormatterBase(FormatterBase, ABC):
         # Check if the input messages are valid
         self.assert_list_of_msgs(msgs)
 
-        msgs = deepcopy(msgs)
+        # The messages are only read in formatting and truncation, so they
+        # are shared with the caller rather than copied, while the nested
+        # block data are copied into the formatted messages by the
+        # formatters
+        msgs = list(msgs)
+
+        # The prefetched media are pinned, so that formatting them costs
+        # no blocking I/O even if they're too large for the cache, or
+        # evicted in the meantime
+        with _media_resolver.pin(await self._prefetch(msgs)):
+            return await self._format_and_truncate(msgs)
 
+    async def _format_and_truncate(
+        self,
+        msgs: list[Msg],
+    ) -> list[dict[str, Any]]:
+        """Format the messages, and truncate them if the formatted messages
+        exceed the token limit."""
+        formatted_msgs = await self._format(msgs)
+        n_tokens = await self._count(formatted_msgs)
+        if (
+            n_tokens is None
+            or self.max_tokens is None
+            or n_tokens <= self.max_tokens
+        ):
+            return formatted_msgs
+
+        if (
+            self.truncation_strategy is None
+            and type(self)._truncate is not TruncatedFormatterBase._truncate
+        ):
+            msgs = await self._truncate(msgs)
+        else:
+            msgs = await self._truncate_by_strategy(msgs, n_tokens)
+
+        # The group counts are estimations, so we still verify the result,
+        # and truncate one more group each time if it still exceeds
         while True:
             formatted_msgs = await self._format(msgs)
             n_tokens = await self._count(formatted_msgs)
 
-            if (
-                n_tokens is None
-                or self.max_tokens is None
-                or n_tokens <= self.max_tokens
-            ):
+            if n_tokens is None or n_tokens <= self.max_tokens:
                 return formatted_msgs
 
             # truncate the input messages
             msgs = await self._truncate(msgs)
 
+    async def _prefetch(self, msgs: list[Msg]) -> dict[str, str]:
+        """Load the media in the messages concurrently into the cache of the
+        shared media resolver, and return their base64 data by the URLs."""
+        if not self._prefetch_media:
+            return {}
+
+        urls = []
+        for msg in msgs:
+            blocks = msg.get_content_blocks()
+            if self._prefetch_tool_result_media:
+                blocks = list(self._iter_nested_blocks(blocks))
+            for block in blocks:
+                source = block.get("source")
+                if (
+                    block["type"] not in self._prefetch_media
+                    or not isinstance(source, dict)
+                    or source.get("type") != "url"
+                ):
+                    continue
+
+                url = source["url"]
+                if os.path.isfile(url) or (
+                    self._prefetch_media[block["type"]]
+                    and urlparse(url).scheme in ["http", "https"]
+                ):
+                    urls.append(url)
+
+        if not urls:
+            return {}
+        return await _media_resolver.prefetch(urls)
+
+    @staticmethod
+    def _iter_nested_blocks(blocks: list) -> Iterator[dict]:
+        """Iterate over the content blocks, including the nested ones in the
+        outputs of the tool results."""
+        for block in blocks:
+            yield block
+            output = block.get("output")
+            if block.get("type") == "tool_result" and isinstance(
+                output,
+                list,
+            ):
+                yield from TruncatedFormatterBase._iter_nested_blocks(output)
+
     async def _format(self, msgs: list[Msg]) -> list[dict[str, Any]]:
         """Format the input messages into the required format. This method
         should be implemented by the subclasses."""
@@ -214,6 +324,110 @@ class TruncatedFormatterBase(FormatterBase, ABC):
 
         return msgs[:start_index]
 
+    async def _truncate_by_strategy(
+        self,
+        msgs: list[Msg],
+        n_tokens: int,
+    ) -> list[Msg]:
+        """Truncate the input messages with the truncation strategy in one
+        pass, based on the token counts of the message groups.
+
+        Args:
+            msgs (`list[Msg]`):
+                The input messages to be truncated.
+            n_tokens (`int`):
+                The number of tokens of all the formatted input messages.
+
+        Raises:
+            `ValueError`:
+                If there are tool calls without corresponding tool results
+                in the dropped messages.
+
+        Returns:
+            `list[Msg]`:
+                The truncated messages.
+        """
+        assert self.max_tokens is not None
+
+        start_index = 1 if len(msgs) > 0 and msgs[0].role == "system" else 0
+        groups, pending_ids = self._split_groups(msgs[start_index:])
+        if not groups:
+            # Only the system prompt, which is handled by `_truncate`
+            return msgs
+
+        system_count, *counts = await asyncio.gather(
+            self._count_group(msgs[:start_index]),
+            *[self._count_group(_) for _ in groups],
+        )
+
+        # The groups formatted separately may have extra prompts or miss the
+        # shared overhead, so the counts are calibrated with the total
+        total = sum(counts)
+        scale = 1.0
+        if total > 0 and n_tokens > system_count:
+            scale = (n_tokens - system_count) / total
+
+        strategy = self.truncation_strategy or DropOldestStrategy()
+        kept_msgs = await strategy(
+            groups,
+            [_ * scale for _ in counts],
+            self.max_tokens - system_count,
+        )
+
+        if pending_ids and not any(_ is groups[-1][-1] for _ in kept_msgs):
+            raise ValueError(
+                "The input messages contains tool call(s) that do not have "
+                f"the corresponding tool result(s): {pending_ids}. ",
+            )
+
+        return msgs[:start_index] + kept_msgs
+
+    async def _count_group(self, msgs: list[Msg]) -> int:
+        """Count the tokens of a message group formatted alone, which is
+        cached by the IDs and contents of the messages."""
+        if not msgs or self.token_counter is None:
+            return 0
+
+        key = tuple((_.id, hash(str(_.content))) for _ in msgs)
+        if key in self._token_count_cache:
+            self._token_count_cache.move_to_end(key)
+            return self._token_count_cache[key]
+
+        n_tokens = await self.token_counter.count(await self._format(msgs))
+        self._token_count_cache[key] = n_tokens
+        if len(self._token_count_cache) > self._token_count_cache_size:
+            self._token_count_cache.popitem(last=False)
+        return n_tokens
+
+    @staticmethod
+    def _split_groups(msgs: list[Msg]) -> tuple[list[list[Msg]], set[str]]:
+        """Split the messages into groups that can be truncated
+        independently, i.e. a single message or a sequence of messages from
+        tool calls to their tool results.
+
+        Returns:
+            `tuple[list[list[Msg]], set[str]]`:
+                The message groups, and the IDs of the tool calls without
+                tool results in the last group.
+        """
+        groups: list[list[Msg]] = []
+        group: list[Msg] = []
+        tool_call_ids: set[str] = set()
+        for msg in msgs:
+            group.append(msg)
+            for block in msg.get_content_blocks("tool_use"):
+                tool_call_ids.add(block["id"])
+            for block in msg.get_content_blocks("tool_result"):
+                tool_call_ids.discard(block["id"])
+
+            if len(tool_call_ids) == 0:
+                groups.append(group)
+                group = []
+
+        if group:
+            groups.append(group)
+        return groups, tool_call_ids
+
     async def _count(self, msgs: list[dict[str, Any]]) -> int | None:
         """Count the number of tokens in the input messages. If token counter
         is not provided, `None` will be returned.
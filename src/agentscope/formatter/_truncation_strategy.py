@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""The truncation strategies used by the truncated formatters to fit the
+messages into the token limit."""
+from abc import abstractmethod
+from typing import Awaitable, Callable
+
+from ..message import Msg
+
+
+class TruncationStrategyBase:
+    """The base class of the truncation strategies, which selects the
+    messages to keep within the token budget in one pass, based on the
+    token counts of the message groups.
+
+    A message group is either a single message, or a sequence of messages
+    from a tool call to its tool result, which must be kept or dropped
+    together. The system prompt message is not included in the groups and
+    is always kept.
+    """
+
+    @abstractmethod
+    async def __call__(
+        self,
+        groups: list[list[Msg]],
+        counts: list[float],
+        budget: float,
+    ) -> list[Msg]:
+        """Select the messages to keep.
+
+        Args:
+            groups (`list[list[Msg]]`):
+                The message groups in chronological order.
+            counts (`list[float]`):
+                The (estimated) number of tokens of each group.
+            budget (`float`):
+                The number of tokens available for the kept messages.
+
+        Returns:
+            `list[Msg]`:
+                The messages to keep, in chronological order.
+        """
+
+
+def _keep_latest(
+    groups: list[list[Msg]],
+    counts: list[float],
+    budget: float,
+) -> int:
+    """Return the index of the first group to keep, so that the latest
+    groups fit into the budget."""
+    total = 0.0
+    start = len(groups)
+    while start > 0 and total + counts[start - 1] <= budget:
+        start -= 1
+        total += counts[start]
+    return start
+
+
+class DropOldestStrategy(TruncationStrategyBase):
+    """Drop the oldest message groups until the rest fit into the budget,
+    which is the default strategy."""
+
+    async def __call__(
+        self,
+        groups: list[list[Msg]],
+        counts: list[float],
+        budget: float,
+    ) -> list[Msg]:
+        """Keep the latest message groups that fit into the budget."""
+        start = _keep_latest(groups, counts, budget)
+        return [msg for group in groups[start:] for msg in group]
+
+
+class KeepFirstNStrategy(TruncationStrategyBase):
+    """Always keep the first N message groups (e.g. the task description
+    from the user), and drop the oldest of the following groups."""
+
+    def __init__(self, n: int = 1) -> None:
+        """Initialize the strategy.
+
+        Args:
+            n (`int`, defaults to `1`):
+                The number of the first message groups to keep.
+        """
+        self.n = n
+
+    async def __call__(
+        self,
+        groups: list[list[Msg]],
+        counts: list[float],
+        budget: float,
+    ) -> list[Msg]:
+        """Keep the first N groups, and the latest groups that fit into the
+        rest of the budget. If the first N groups exceed the budget, fall
+        back to dropping the oldest groups."""
+        head_count = sum(counts[: self.n])
+        if head_count > budget:
+            return await DropOldestStrategy()(groups, counts, budget)
+
+        start = self.n + _keep_latest(
+            groups[self.n :],
+            counts[self.n :],
+            budget - head_count,
+        )
+        return [
+            msg for group in groups[: self.n] + groups[start:] for msg in group
+        ]
+
+
+class SummarizeMiddleStrategy(TruncationStrategyBase):
+    """Keep the first N message groups and the latest groups, and replace
+    the dropped groups in the middle with a summary message."""
+
+    def __init__(
+        self,
+        summarizer: Callable[[list[Msg]], Awaitable[Msg]],
+        keep_first: int = 1,
+        summary_tokens: int = 512,
+    ) -> None:
+        """Initialize the strategy.
+
+        Args:
+            summarizer (`Callable[[list[Msg]], Awaitable[Msg]]`):
+                The async function that summarizes the dropped messages into
+                one message, e.g. by calling an LLM.
+            keep_first (`int`, defaults to `1`):
+                The number of the first message groups to keep.
+            summary_tokens (`int`, defaults to `512`):
+                The number of tokens reserved for the summary message.
+        """
+        self.summarizer = summarizer
+        self.keep_first = keep_first
+        self.summary_tokens = summary_tokens
+
+    async def __call__(
+        self,
+        groups: list[list[Msg]],
+        counts: list[float],
+        budget: float,
+    ) -> list[Msg]:
+        """Keep the first groups and the latest groups that fit into the
+        budget, and summarize the groups in between."""
+        n = self.keep_first
+        rest_budget = budget - self.summary_tokens - sum(counts[:n])
+        if rest_budget < 0:
+            return await DropOldestStrategy()(groups, counts, budget)
+
+        start = n + _keep_latest(groups[n:], counts[n:], rest_budget)
+        middle = [msg for group in groups[n:start] for msg in group]
+        summary = [await self.summarizer(middle)] if middle else []
+        return (
+            [msg for group in groups[:n] for msg in group]
+            + summary
+            + [msg for group in groups[start:] for msg in group]
+        )
@@ -3,6 +3,8 @@
 from functools import partial
 
 from ._studio_hooks import (
+    StudioForwarder,
+    _get_forwarder,
     as_studio_forward_message_pre_print_hook,
 )
 from .. import _config
@@ -10,6 +12,7 @@ from ..agent import AgentBase
 
 
 __all__ = [
+    "StudioForwarder",
     "as_studio_forward_message_pre_print_hook",
 ]
 
@@ -25,5 +28,7 @@ def _equip_as_studio_hooks(
             as_studio_forward_message_pre_print_hook,
             studio_url=studio_url,
             run_id=_config.run_id,
+            forwarder=_get_forwarder(studio_url, _config.run_id),
         ),
+        mode="read_only",
     )
@@ -1,47 +1,283 @@
 # -*- coding: utf-8 -*-
 """The studio related hook functions in agentscope."""
-from typing import Any
+import asyncio
+import atexit
+import weakref
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Literal
 
+import httpx
 import requests
 import shortuuid
 
+from .._logging import logger
 from ..agent import AgentBase
 
 
+class StudioForwarder:
+    """The forwarder that pushes the printed messages to the studio in the
+    background, so that printing a message only puts it into a queue rather
+    than waiting for the HTTP request.
+
+    The messages are sent at a fixed cadence by a worker task with a pooled
+    HTTP client. A streaming message printed many times within one interval
+    is coalesced, i.e. only its latest accumulated state is sent. The queue
+    is bounded, and the failed requests are retried with exponential backoff
+    by the worker.
+    """
+
+    def __init__(
+        self,
+        studio_url: str,
+        run_id: str,
+        interval: float = 0.1,
+        max_pending: int = 1000,
+        drop_policy: Literal["oldest", "newest"] = "oldest",
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10,
+    ) -> None:
+        """Initialize the studio forwarder.
+
+        Args:
+            studio_url (`str`):
+                The URL of the studio.
+            run_id (`str`):
+                The ID of the current run.
+            interval (`float`, defaults to `0.1`):
+                The interval in seconds between two sends, within which the
+                states of the same message are coalesced.
+            max_pending (`int`, defaults to `1000`):
+                The maximum number of the messages waiting to be sent.
+            drop_policy (`Literal["oldest", "newest"]`, defaults to \
+            `"oldest"`):
+                Which message to drop when the queue is full, the oldest
+                waiting message or the newly printed one.
+            max_retries (`int`, defaults to `3`):
+                The maximum number of retries for a failed request.
+            backoff (`float`, defaults to `0.5`):
+                The delay in seconds before the first retry, which is doubled
+                for each retry.
+            timeout (`float`, defaults to `10`):
+                The timeout in seconds of the requests.
+        """
+        if drop_policy not in ["oldest", "newest"]:
+            raise ValueError(
+                f"Invalid drop policy '{drop_policy}', expected 'oldest' or "
+                "'newest'.",
+            )
+
+        self.studio_url = studio_url
+        self.run_id = run_id
+        self.interval = interval
+        self.max_pending = max_pending
+        self.drop_policy = drop_policy
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.n_dropped = 0
+
+        # The latest states of the messages to send, keyed by the reply ID
+        # and the message ID
+        self._pending: OrderedDict[tuple[str, str], dict] = OrderedDict()
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # Send the messages left in the queue when the program exits
+        _instances.add(self)
+
+    def submit(self, reply_id: str, message_data: dict) -> None:
+        """Put the message into the queue without waiting for it to be sent.
+        If the same message is already waiting, its state is replaced.
+
+        Args:
+            reply_id (`str`):
+                The ID of the reply the message belongs to.
+            message_data (`dict`):
+                The message in JSON dict data.
+        """
+        key = (reply_id, message_data["id"])
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            self.n_dropped += 1
+            if self.n_dropped == 1 or self.n_dropped % 100 == 0:
+                logger.warning(
+                    "The studio forwarding queue is full, %d message(s) "
+                    "dropped so far.",
+                    self.n_dropped,
+                )
+            if self.drop_policy == "newest":
+                return
+            self._pending.popitem(last=False)
+
+        self._pending[key] = self._payload(reply_id, message_data)
+        self._ensure_worker()
+        self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Send the waiting messages now. The message is removed from the
+        queue only when it's about to be sent, so that the messages not sent
+        yet are still sent when the program exits."""
+        for key in list(self._pending):
+            payload = self._pending.pop(key, None)
+            if payload is not None:
+                await self._send(key, payload)
+
+    def _payload(self, reply_id: str, message_data: dict) -> dict:
+        """Get the request payload of the message."""
+        return {
+            "runId": self.run_id,
+            "replyId": reply_id,
+            "name": reply_id,
+            "role": "assistant",
+            "msg": message_data,
+        }
+
+    def _ensure_worker(self) -> None:
+        """Start the worker task in the running event loop if it's not
+        running, e.g. for the first message or a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and self._loop is loop:
+            if not self._worker.done():
+                return
+
+        if self._client is None or self._loop is not loop:
+            self._close_worker()
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._worker = loop.create_task(self._run())
+
+    def _close_worker(self) -> None:
+        """Cancel the worker task and close the HTTP client bound to the
+        previous event loop. They're cleaned up in that loop if it's still
+        running, e.g. in another thread, otherwise the loop is closed (or
+        can't run again now) and they're dropped."""
+        worker, client, loop = self._worker, self._client, self._loop
+        self._worker, self._client = None, None
+
+        if loop is None or loop.is_closed() or not loop.is_running():
+            return
+
+        if worker is not None:
+            loop.call_soon_threadsafe(worker.cancel)
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def _run(self) -> None:
+        """Send the waiting messages at the fixed cadence."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.flush()
+            await asyncio.sleep(self.interval)
+
+    async def _send(self, key: tuple[str, str], payload: dict) -> None:
+        """Send one payload, retrying with exponential backoff. The retry is
+        given up if a newer state of the message is waiting."""
+        n_retry = 0
+        while True:
+            try:
+                res = await self._client.post(
+                    f"{self.studio_url}/trpc/pushMessage",
+                    json=payload,
+                )
+                res.raise_for_status()
+                return
+
+            except Exception as e:
+                if n_retry >= self.max_retries or key in self._pending:
+                    logger.warning(
+                        "Failed to forward the message %s to the studio: "
+                        "%s",
+                        key[1],
+                        e,
+                    )
+                    return
+
+                await asyncio.sleep(self.backoff * 2**n_retry)
+                n_retry += 1
+
+    def _send_pending_sync(self) -> None:
+        """Send the waiting messages synchronously, as the event loop may be
+        closed when the program exits."""
+        while self._pending:
+            _, payload = self._pending.popitem(last=False)
+            try:
+                requests.post(
+                    f"{self.studio_url}/trpc/pushMessage",
+                    json=payload,
+                    timeout=self.timeout,
+                ).raise_for_status()
+            except Exception as e:
+                logger.warning(
+                    "Failed to forward the message %s to the studio: %s",
+                    payload["msg"]["id"],
+                    e,
+                )
+
+
+_instances: weakref.WeakSet[StudioForwarder] = weakref.WeakSet()
+
+_forwarders: dict[tuple[str, str], StudioForwarder] = {}
+
+
+@atexit.register
+def _send_all_pending_sync() -> None:
+    """Send the messages left in the queues of the forwarders when the
+    program exits."""
+    for forwarder in list(_instances):
+        # pylint: disable-next=protected-access
+        forwarder._send_pending_sync()
+
+
+def _get_forwarder(studio_url: str, run_id: str) -> StudioForwarder:
+    """Get the shared forwarder of the studio and the run."""
+    key = (studio_url, run_id)
+    if key not in _forwarders:
+        _forwarders[key] = StudioForwarder(studio_url, run_id)
+    return _forwarders[key]
+
+
 def as_studio_forward_message_pre_print_hook(
     self: AgentBase,
     kwargs: dict[str, Any],
     studio_url: str,
     run_id: str,
+    forwarder: StudioForwarder | None = None,
 ) -> None:
-    """The pre-speak hook to forward messages to the studio."""
+    """The pre-speak hook to forward messages to the studio, which only
+    queues the message for the background forwarder.
+
+    Args:
+        self (`AgentBase`):
+            The agent printing the message.
+        kwargs (`dict[str, Any]`):
+            The keyword arguments of the print function.
+        studio_url (`str`):
+            The URL of the studio.
+        run_id (`str`):
+            The ID of the current run.
+        forwarder (`StudioForwarder | None`, optional):
+            The forwarder to use. If not given, the forwarder shared by the
+            same studio URL and run ID is used.
+    """
     msg = kwargs["msg"]
 
-    message_data = msg.to_dict()
+    # Copied as the message is a view in the read-only mode, which is
+    # serialized later by the forwarder
+    message_data = deepcopy(msg.to_dict())
 
     if hasattr(self, "_reply_id"):
         reply_id = getattr(self, "_reply_id")
     else:
         reply_id = shortuuid.uuid()
 
-    n_retry = 0
-    while True:
-        try:
-            res = requests.post(
-                f"{studio_url}/trpc/pushMessage",
-                json={
-                    "runId": run_id,
-                    "replyId": reply_id,
-                    "name": reply_id,
-                    "role": "assistant",
-                    "msg": message_data,
-                },
-            )
-            res.raise_for_status()
-            break
-        except Exception as e:
-            if n_retry < 3:
-                n_retry += 1
-                continue
+    if forwarder is None:
+        forwarder = _get_forwarder(studio_url, run_id)
 
-            raise e from None
+    forwarder.submit(reply_id, message_data)
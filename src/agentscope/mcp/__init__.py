@@ -1,14 +1,17 @@
 # -*- coding: utf-8 -*-
 """The MCP module in AgentScope, that provides fine-grained control over
 the MCP servers."""
+from typing import TYPE_CHECKING
 
-from ._client_base import MCPClientBase
-from ._mcp_function import MCPToolFunction
-from ._stateful_client_base import StatefulClientBase
-from ._stdio_stateful_client import StdIOStatefulClient
-from ._http_stateless_client import HttpStatelessClient
-from ._http_stateful_client import HttpStatefulClient
+from .._utils._lazy import _lazy_import
 
+if TYPE_CHECKING:
+    from ._client_base import MCPClientBase
+    from ._mcp_function import MCPToolFunction
+    from ._stateful_client_base import StatefulClientBase
+    from ._stdio_stateful_client import StdIOStatefulClient
+    from ._http_stateless_client import HttpStatelessClient
+    from ._http_stateful_client import HttpStatefulClient
 
 __all__ = [
     "MCPToolFunction",
@@ -18,3 +21,15 @@ __all__ = [
     "HttpStatelessClient",
     "HttpStatefulClient",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "MCPToolFunction": "._mcp_function",
+        "MCPClientBase": "._client_base",
+        "StatefulClientBase": "._stateful_client_base",
+        "StdIOStatefulClient": "._stdio_stateful_client",
+        "HttpStatelessClient": "._http_stateless_client",
+        "HttpStatefulClient": "._http_stateful_client",
+    },
+)
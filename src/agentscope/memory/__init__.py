@@ -1,15 +1,36 @@
 # -*- coding: utf-8 -*-
 """The memory module."""
+from typing import TYPE_CHECKING
 
-from ._memory_base import MemoryBase
-from ._in_memory_memory import InMemoryMemory
-from ._long_term_memory_base import LongTermMemoryBase
-from ._mem0_long_term_memory import Mem0LongTermMemory
+from .._utils._lazy import _lazy_import
 
+if TYPE_CHECKING:
+    from ._memory_base import MemoryBase
+    from ._in_memory_memory import InMemoryMemory
+    from ._paged_memory import PagedMemory
+    from ._shared_log_memory import MessageLog, SharedLogMemory
+    from ._long_term_memory_base import LongTermMemoryBase
+    from ._mem0_long_term_memory import Mem0LongTermMemory
 
 __all__ = [
     "MemoryBase",
     "InMemoryMemory",
+    "PagedMemory",
+    "MessageLog",
+    "SharedLogMemory",
     "LongTermMemoryBase",
     "Mem0LongTermMemory",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "MemoryBase": "._memory_base",
+        "InMemoryMemory": "._in_memory_memory",
+        "PagedMemory": "._paged_memory",
+        "MessageLog": "._shared_log_memory",
+        "SharedLogMemory": "._shared_log_memory",
+        "LongTermMemoryBase": "._long_term_memory_base",
+        "Mem0LongTermMemory": "._mem0_long_term_memory",
+    },
+)
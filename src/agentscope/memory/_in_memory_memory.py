@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """The dialogue memory class"""
-
+from bisect import insort
 from typing import Union, Iterable, Any
 
 from ._memory_base import MemoryBase
@@ -8,14 +8,46 @@ from ..message import Msg
 
 
 class InMemoryMemory(MemoryBase):
-    """The in-memory memory class for storing messages."""
+    """The in-memory memory class for storing messages.
+
+    The message IDs are indexed for constant-time duplicate checks. The
+    deleted messages are marked as tombstones and compacted when they
+    exceed the given ratio of the memory, or before the memory is read, so
+    that deleting from the end of the memory costs constant time.
+    """
 
     def __init__(
         self,
+        compaction_ratio: float = 0.25,
     ) -> None:
-        """Initialize the in-memory memory object."""
+        """Initialize the in-memory memory object.
+
+        Args:
+            compaction_ratio (`float`, defaults to `0.25`):
+                The ratio of the deleted messages in the memory, above which
+                the memory is compacted.
+        """
         super().__init__()
-        self.content: list[Msg] = []
+        self.compaction_ratio = compaction_ratio
+
+        self._msgs: list[Msg | None] = []
+        self._tombstones: list[int] = []
+        self._id_counts: dict[str, int] = {}
+
+    @property
+    def content(self) -> list[Msg]:
+        """The messages in the memory."""
+        self._compact()
+        return self._msgs  # type: ignore[return-value]
+
+    @content.setter
+    def content(self, msgs: list[Msg]) -> None:
+        """Replace the messages in the memory."""
+        self._msgs = list(msgs)
+        self._tombstones = []
+        self._id_counts = {}
+        for msg in msgs:
+            self._id_counts[msg.id] = self._id_counts.get(msg.id, 0) + 1
 
     def state_dict(self) -> dict:
         """Convert the current memory into JSON data format."""
@@ -38,14 +70,15 @@ class InMemoryMemory(MemoryBase):
                 If `True`, raises an error if any key in the module is not
                 found in the state_dict. If `False`, skips missing keys.
         """
-        self.content = []
+        content = []
         for data in state_dict["content"]:
             data.pop("type", None)
-            self.content.append(Msg.from_dict(data))
+            content.append(Msg.from_dict(data))
+        self.content = content
 
     async def size(self) -> int:
         """The size of the memory."""
-        return len(self.content)
+        return len(self._msgs) - len(self._tombstones)
 
     async def retrieve(self, *args: Any, **kwargs: Any) -> None:
         """Retrieve items from the memory."""
@@ -64,16 +97,31 @@ class InMemoryMemory(MemoryBase):
         if isinstance(index, int):
             index = [index]
 
-        invalid_index = [_ for _ in index if 0 > _ or _ >= len(self.content)]
+        size = await self.size()
+        positions = sorted(set(index))
+        invalid_index = [_ for _ in positions if 0 > _ or _ >= size]
 
         if invalid_index:
             raise IndexError(
                 f"The index {invalid_index} does not exist.",
             )
 
-        self.content = [
-            _ for idx, _ in enumerate(self.content) if idx not in index
-        ]
+        for slot in self._to_slots(positions):
+            msg = self._msgs[slot]
+            self._msgs[slot] = None
+            insort(self._tombstones, slot)
+
+            self._id_counts[msg.id] -= 1
+            if self._id_counts[msg.id] == 0:
+                del self._id_counts[msg.id]
+
+        # The tombstones at the end are removed directly
+        while self._tombstones and self._tombstones[-1] == len(self._msgs) - 1:
+            self._tombstones.pop()
+            self._msgs.pop()
+
+        if len(self._tombstones) > self.compaction_ratio * len(self._msgs):
+            self._compact()
 
     async def add(
         self,
@@ -109,14 +157,52 @@ class InMemoryMemory(MemoryBase):
                 )
 
         if not allow_duplicates:
-            existing_ids = [_.id for _ in self.content]
-            memories = [_ for _ in memories if _.id not in existing_ids]
-        self.content.extend(memories)
+            memories = [_ for _ in memories if _.id not in self._id_counts]
+
+        for msg in memories:
+            self._id_counts[msg.id] = self._id_counts.get(msg.id, 0) + 1
+        self._msgs.extend(memories)
+
+    async def get_memory(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> list[Msg]:
+        """Get the memory content, or a range of it with the same semantics
+        as Python slicing, e.g. `get_memory(-10)` for the last 10 messages.
 
-    async def get_memory(self) -> list[Msg]:
-        """Get the memory content."""
-        return self.content
+        Args:
+            start (`int | None`, optional):
+                The start index of the range.
+            end (`int | None`, optional):
+                The end index (exclusive) of the range.
+        """
+        if start is None and end is None:
+            return self.content
+        return self.content[start:end]
 
     async def clear(self) -> None:
         """Clear the memory content."""
         self.content = []
+
+    def _to_slots(self, positions: list[int]) -> list[int]:
+        """Convert the sorted positions of the messages into the slots in
+        the storage, skipping the tombstones."""
+        slots = []
+        i_tombstone = 0
+        for position in positions:
+            slot = position + i_tombstone
+            while (
+                i_tombstone < len(self._tombstones)
+                and self._tombstones[i_tombstone] <= slot
+            ):
+                i_tombstone += 1
+                slot += 1
+            slots.append(slot)
+        return slots
+
+    def _compact(self) -> None:
+        """Remove the tombstones from the storage."""
+        if self._tombstones:
+            self._msgs = [_ for _ in self._msgs if _ is not None]
+            self._tombstones = []
@@ -0,0 +1,547 @@
+# -*- coding: utf-8 -*-
+"""The disk-backed paged memory class, which keeps only the recent messages
+in RAM."""
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Union
+
+from ._memory_base import MemoryBase
+from ..message import Msg
+
+
+class PagedMemory(MemoryBase):
+    """The memory class that stores messages in a SQLite log on disk, and
+    keeps only a hot tail of the recent messages and an index of the
+    message IDs in RAM. The older messages are paged back from disk when
+    they are requested by `get_memory`.
+
+    The large base64 data (e.g. images and audio) in the messages are moved
+    into a content-addressed blob store, where the same data is stored once
+    and referenced by its hash.
+
+    The messages evicted from the hot tail are written to disk in batches
+    of `hot_size` messages, and the messages in the hot tail are written
+    when `state_dict` or `flush` is called, so that the modifications to
+    the recent messages after adding are kept. The disk I/O of the async
+    methods runs in a worker thread. The state dict only contains the path
+    of the storage.
+
+    By default, each instance stores its messages in a new temporary
+    directory, which is removed by `close`. An existing storage is only
+    restored when `restore` is `True`, or by `load_state_dict`.
+
+    .. note:: The messages paged from disk are frozen and kept in a bounded
+     page cache, so that the repeated `get_memory` calls don't read the disk
+     again, and only the messages in the hot tail can be modified.
+    """
+
+    _DB_FILENAME = "messages.sqlite"
+    _BLOB_DIRNAME = "blobs"
+
+    def __init__(
+        self,
+        path: str | None = None,
+        hot_size: int = 64,
+        blob_threshold: int = 1024,
+        page_cache_size: int = 256,
+        restore: bool = False,
+    ) -> None:
+        """Initialize the paged memory.
+
+        Args:
+            path (`str | None`, optional):
+                The directory to store the messages and blobs. If `None`, a
+                new temporary directory is used, so that the instances never
+                share their storage, and it's removed when the memory is
+                closed.
+            hot_size (`int`, defaults to `64`):
+                The number of the recent messages kept in RAM.
+            blob_threshold (`int`, defaults to `1024`):
+                The minimum length of the base64 data to be moved into the
+                blob store.
+            page_cache_size (`int`, defaults to `256`):
+                The maximum number of the older messages paged from disk that
+                are cached in RAM.
+            restore (`bool`, defaults to `False`):
+                Whether to restore the messages stored in `path`. If `False`
+                and the storage already has messages, a `ValueError` is
+                raised rather than mixing them with the new ones.
+        """
+        super().__init__()
+        self.hot_size = hot_size
+        self.blob_threshold = blob_threshold
+        self.page_cache_size = page_cache_size
+
+        self._temp_dir: str | None = None
+        if path is None:
+            path = tempfile.mkdtemp(prefix="agentscope_paged_memory_")
+            self._temp_dir = path
+
+        # The async methods are serialized by the lock, while the database
+        # lock guards the connection used by the worker threads
+        self._lock = asyncio.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._path = ""
+        self._hot: OrderedDict[int, Msg] = OrderedDict()
+        # The frozen messages evicted from the hot tail but not written yet
+        self._unwritten: OrderedDict[int, Msg] = OrderedDict()
+        self._pages: OrderedDict[int, Msg] = OrderedDict()
+        self._seqs: list[int] = []
+        self._ids: list[str] = []
+        self._id_counts: dict[str, int] = {}
+        self._next_seq = 0
+        self._open(path, restore)
+
+    @property
+    def path(self) -> str:
+        """The directory where the messages and blobs are stored."""
+        return self._path
+
+    def state_dict(self) -> dict:
+        """Flush the messages to disk, and get the path of the storage."""
+        self.flush()
+        return {"path": self._path}
+
+    def load_state_dict(
+        self,
+        state_dict: dict,
+        strict: bool = True,
+    ) -> None:
+        """Load the memory from the state dict, which can contain the path
+        of the storage, or the "content" field from `InMemoryMemory`.
+
+        Args:
+            state_dict (`dict`):
+                The state dictionary to load, which should have a "path" or
+                "content" field.
+            strict (`bool`, defaults to `True`):
+                If `True`, raises an error if any key in the module is not
+                found in the state_dict. If `False`, skips missing keys.
+        """
+        if "content" in state_dict:
+            self._clear()
+            msgs = []
+            for data in state_dict["content"]:
+                data.pop("type", None)
+                msgs.append(Msg.from_dict(data))
+            self._add(msgs, allow_duplicates=True)
+            self.flush()
+            return
+
+        if "path" not in state_dict:
+            raise KeyError(
+                "The state_dict of PagedMemory should have a 'path' or "
+                f"'content' field, but got {list(state_dict.keys())}.",
+            )
+
+        if os.path.abspath(state_dict["path"]) != self._path:
+            self.flush()
+            self._open(state_dict["path"], restore=True)
+
+    async def size(self) -> int:
+        """The size of the memory."""
+        return len(self._seqs)
+
+    async def retrieve(self, *args: Any, **kwargs: Any) -> None:
+        """Retrieve items from the memory."""
+        raise NotImplementedError(
+            "The retrieve method is not implemented in "
+            f"{self.__class__.__name__} class.",
+        )
+
+    async def delete(self, index: Union[Iterable, int]) -> None:
+        """Delete the specified item by index(es).
+
+        Args:
+            index (`Union[Iterable, int]`):
+                The index to delete.
+        """
+        if isinstance(index, int):
+            index = [index]
+
+        positions = set(index)
+        async with self._lock:
+            invalid_index = [
+                _ for _ in positions if 0 > _ or _ >= len(self._seqs)
+            ]
+            if invalid_index:
+                raise IndexError(
+                    f"The index {invalid_index} does not exist.",
+                )
+
+            seqs = [self._seqs[_] for _ in positions]
+            for i in positions:
+                self._id_counts[self._ids[i]] -= 1
+                if self._id_counts[self._ids[i]] == 0:
+                    del self._id_counts[self._ids[i]]
+                self._hot.pop(self._seqs[i], None)
+                self._unwritten.pop(self._seqs[i], None)
+                self._pages.pop(self._seqs[i], None)
+
+            self._seqs = [
+                seq for i, seq in enumerate(self._seqs) if i not in positions
+            ]
+            self._ids = [
+                id_ for i, id_ in enumerate(self._ids) if i not in positions
+            ]
+
+            await asyncio.to_thread(self._commit, self._delete_rows, seqs)
+
+    async def add(
+        self,
+        memories: Union[list[Msg], Msg, None],
+        allow_duplicates: bool = False,
+    ) -> None:
+        """Add message into the memory.
+
+        Args:
+            memories (`Union[list[Msg], Msg, None]`):
+                The message to add.
+            allow_duplicates (`bool`, defaults to `False`):
+                If allow adding duplicate messages (with the same id) into
+                the memory.
+        """
+        if memories is None:
+            return
+
+        if isinstance(memories, Msg):
+            memories = [memories]
+
+        if not isinstance(memories, list):
+            raise TypeError(
+                f"The memories should be a list of Msg or a single Msg, "
+                f"but got {type(memories)}.",
+            )
+
+        for msg in memories:
+            if not isinstance(msg, Msg):
+                raise TypeError(
+                    f"The memories should be a list of Msg or a single Msg, "
+                    f"but got {type(msg)}.",
+                )
+
+        async with self._lock:
+            self._add(memories, allow_duplicates)
+            if len(self._unwritten) >= self.hot_size:
+                rows = list(self._unwritten.items())
+                await asyncio.to_thread(self._commit, self._write_rows, rows)
+                self._mark_written(rows)
+
+    async def get_memory(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> list[Msg]:
+        """Get the memory content, or a range of it with the same semantics
+        as Python slicing, where the messages not in the hot tail are paged
+        from disk.
+
+        Args:
+            start (`int | None`, optional):
+                The start index of the range.
+            end (`int | None`, optional):
+                The end index (exclusive) of the range.
+        """
+        async with self._lock:
+            seqs = self._seqs[start:end]
+            missing = [
+                _
+                for _ in seqs
+                if _ not in self._hot
+                and _ not in self._unwritten
+                and _ not in self._pages
+            ]
+            paged = (
+                await asyncio.to_thread(self._read_rows, missing)
+                if missing
+                else {}
+            )
+
+            res = []
+            for seq in seqs:
+                if seq in self._hot:
+                    res.append(self._hot[seq])
+                elif seq in self._unwritten:
+                    res.append(self._unwritten[seq])
+                elif seq in paged:
+                    res.append(paged[seq])
+                    self._cache_page(seq, paged[seq])
+                else:
+                    self._pages.move_to_end(seq)
+                    res.append(self._pages[seq])
+            return res
+
+    async def clear(self) -> None:
+        """Clear the memory content."""
+        async with self._lock:
+            self._reset()
+            await asyncio.to_thread(self._commit, self._delete_all_rows)
+
+    def flush(self) -> None:
+        """Write the evicted messages not written yet and the messages in
+        the hot tail to disk."""
+        rows = list(self._unwritten.items())
+        self._commit(self._write_rows, [*rows, *self._hot.items()])
+        self._mark_written(rows)
+
+    def close(self) -> None:
+        """Flush the messages and close the storage, where the temporary
+        directory created by default is removed."""
+        if self._conn is not None:
+            if self._path != self._temp_dir:
+                self.flush()
+            with self._db_lock:
+                self._conn.close()
+                self._conn = None
+
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def _open(self, path: str, restore: bool) -> None:
+        """Open the storage in the given directory, and restore the index
+        of the stored messages if `restore` is `True`."""
+        if self._conn is not None:
+            self._conn.close()
+
+        self._path = os.path.abspath(path)
+        os.makedirs(
+            os.path.join(self._path, self._BLOB_DIRNAME),
+            exist_ok=True,
+        )
+        self._conn = sqlite3.connect(
+            os.path.join(self._path, self._DB_FILENAME),
+            check_same_thread=False,
+        )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+                seq INTEGER PRIMARY KEY,
+                id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                blobs TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                refs INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_blobs_refs ON blobs (refs);
+            """,
+        )
+        self._conn.commit()
+
+        if (
+            not restore
+            and self._conn.execute(
+                "SELECT 1 FROM messages LIMIT 1",
+            ).fetchone()
+        ):
+            self._conn.close()
+            self._conn = None
+            raise ValueError(
+                f"The storage in {self._path} already has messages. Set "
+                "`restore=True` to restore them, or use another path.",
+            )
+
+        self._reset()
+        for seq, msg_id in self._conn.execute(
+            "SELECT seq, id FROM messages ORDER BY seq",
+        ):
+            self._seqs.append(seq)
+            self._ids.append(msg_id)
+            self._id_counts[msg_id] = self._id_counts.get(msg_id, 0) + 1
+        self._next_seq = self._seqs[-1] + 1 if self._seqs else 0
+
+    def _add(self, msgs: list[Msg], allow_duplicates: bool) -> None:
+        """Add the messages into the hot tail, and freeze the evicted ones
+        to be written to disk."""
+        for msg in msgs:
+            if not allow_duplicates and msg.id in self._id_counts:
+                continue
+
+            self._id_counts[msg.id] = self._id_counts.get(msg.id, 0) + 1
+            self._seqs.append(self._next_seq)
+            self._ids.append(msg.id)
+            self._hot[self._next_seq] = msg
+            self._next_seq += 1
+
+            while len(self._hot) > self.hot_size:
+                seq, evicted = self._hot.popitem(last=False)
+                self._unwritten[seq] = evicted.freeze()
+
+    def _mark_written(self, rows: list[tuple[int, Msg]]) -> None:
+        """Move the written messages into the page cache, unless they're
+        deleted or replaced in the meantime."""
+        for seq, msg in rows:
+            if self._unwritten.get(seq) is msg:
+                del self._unwritten[seq]
+                self._cache_page(seq, msg)
+
+    def _cache_page(self, seq: int, msg: Msg) -> None:
+        """Keep the frozen message paged from disk in the page cache."""
+        self._pages[seq] = msg
+        self._pages.move_to_end(seq)
+        while len(self._pages) > self.page_cache_size:
+            self._pages.popitem(last=False)
+
+    def _clear(self) -> None:
+        """Remove all the messages and blobs."""
+        self._reset()
+        self._commit(self._delete_all_rows)
+
+    def _reset(self) -> None:
+        """Remove all the messages in RAM."""
+        self._hot.clear()
+        self._unwritten.clear()
+        self._pages.clear()
+        self._seqs = []
+        self._ids = []
+        self._id_counts = {}
+
+    def _commit(self, func: Callable, *args: Any) -> None:
+        """Run the database operation in one transaction, which is safe to
+        call from the worker threads."""
+        with self._db_lock, self._conn:
+            func(*args)
+
+    def _read_rows(self, seqs: list[int]) -> dict[int, Msg]:
+        """Read the frozen messages of the given sequence numbers from
+        disk."""
+        paged = {}
+        with self._db_lock:
+            for i in range(0, len(seqs), 500):
+                batch = seqs[i : i + 500]
+                for seq, data in self._conn.execute(
+                    "SELECT seq, data FROM messages "
+                    f"WHERE seq IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall():
+                    paged[seq] = self._deserialize(data).freeze()
+        return paged
+
+    def _write_rows(self, rows: list[tuple[int, Msg]]) -> None:
+        """Write or overwrite the messages at the sequence numbers."""
+        for seq, msg in rows:
+            self._write_row(seq, msg)
+
+    def _delete_all_rows(self) -> None:
+        """Delete all the rows and the blobs."""
+        self._delete_rows(
+            [_[0] for _ in self._conn.execute("SELECT seq FROM messages")],
+        )
+
+    def _write_row(self, seq: int, msg: Msg) -> None:
+        """Write or overwrite the message at the given sequence number,
+        where the large base64 data are moved into the blob store."""
+        # Release the blobs of the overwritten row first, so that the blob
+        # files removed here are written again by the extraction
+        self._delete_rows([seq])
+        hashes: list[str] = []
+        data = json.dumps(
+            self._extract_blobs(msg.to_dict(), hashes),
+            ensure_ascii=False,
+        )
+        self._conn.execute(
+            "INSERT INTO messages (seq, id, data, blobs) VALUES (?, ?, ?, ?)",
+            (seq, msg.id, data, json.dumps(hashes)),
+        )
+        self._conn.executemany(
+            "INSERT INTO blobs (hash, refs) VALUES (?, 1) "
+            "ON CONFLICT(hash) DO UPDATE SET refs = refs + 1",
+            [(_,) for _ in hashes],
+        )
+
+    def _delete_rows(self, seqs: list[int]) -> None:
+        """Delete the rows of the given sequence numbers, and remove the
+        blobs that are no longer referenced."""
+        for i in range(0, len(seqs), 500):
+            batch = seqs[i : i + 500]
+            condition = f"seq IN ({','.join('?' * len(batch))})"
+            hashes = [
+                hash_
+                for (blobs,) in self._conn.execute(
+                    f"SELECT blobs FROM messages WHERE {condition}",
+                    batch,
+                )
+                for hash_ in json.loads(blobs)
+            ]
+            self._conn.execute(
+                f"DELETE FROM messages WHERE {condition}",
+                batch,
+            )
+            self._conn.executemany(
+                "UPDATE blobs SET refs = refs - 1 WHERE hash = ?",
+                [(_,) for _ in hashes],
+            )
+
+        for (hash_,) in self._conn.execute(
+            "SELECT hash FROM blobs WHERE refs <= 0",
+        ).fetchall():
+            blob_path = self._get_blob_path(hash_)
+            if os.path.exists(blob_path):
+                os.remove(blob_path)
+        self._conn.execute("DELETE FROM blobs WHERE refs <= 0")
+
+    def _get_blob_path(self, hash_: str) -> str:
+        """Get the path of the blob file by its hash."""
+        return os.path.join(self._path, self._BLOB_DIRNAME, hash_)
+
+    def _extract_blobs(self, value: Any, hashes: list[str]) -> Any:
+        """Replace the large base64 data in the value with the references
+        to the blob store, without modifying the original value."""
+        if isinstance(value, list):
+            return [self._extract_blobs(_, hashes) for _ in value]
+
+        if not isinstance(value, dict):
+            return value
+
+        data = value.get("data")
+        if (
+            value.get("type") == "base64"
+            and isinstance(data, str)
+            and len(data) >= self.blob_threshold
+        ):
+            hash_ = hashlib.sha256(data.encode("utf-8")).hexdigest()
+            blob_path = self._get_blob_path(hash_)
+            if not os.path.exists(blob_path):
+                with open(blob_path + ".tmp", "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(blob_path + ".tmp", blob_path)
+            hashes.append(hash_)
+            return {
+                **{k: v for k, v in value.items() if k != "data"},
+                "blob": hash_,
+            }
+
+        return {k: self._extract_blobs(v, hashes) for k, v in value.items()}
+
+    def _restore_blobs(self, value: Any) -> Any:
+        """Restore the base64 data from the blob store in place."""
+        if isinstance(value, list):
+            for item in value:
+                self._restore_blobs(item)
+
+        elif isinstance(value, dict):
+            if value.get("type") == "base64" and "blob" in value:
+                with open(
+                    self._get_blob_path(value.pop("blob")),
+                    "r",
+                    encoding="utf-8",
+                ) as f:
+                    value["data"] = f.read()
+            for item in value.values():
+                self._restore_blobs(item)
+
+        return value
+
+    def _deserialize(self, data: str) -> Msg:
+        """Load a message from the stored data."""
+        return Msg.from_dict(self._restore_blobs(json.loads(data)))
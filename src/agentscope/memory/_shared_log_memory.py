@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""The memory class reading the messages from shared message logs, so that
+the agents in a MsgHub don't hold their own copies of the conversation."""
+from bisect import bisect_left
+from typing import Union, Iterable, Any
+
+from ._memory_base import MemoryBase
+from ..message import Msg
+
+
+class MessageLog:
+    """An append-only log of messages shared by a group of agents, e.g. the
+    messages broadcast in a MsgHub."""
+
+    def __init__(self) -> None:
+        """Initialize the message log."""
+        self._msgs: list[Msg] = []
+        self._positions: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        """The number of messages in the log."""
+        return len(self._msgs)
+
+    def append(self, msgs: Msg | list[Msg]) -> None:
+        """Append the message(s) to the log.
+
+        Args:
+            msgs (`Msg | list[Msg]`):
+                The message(s) to append.
+        """
+        if isinstance(msgs, Msg):
+            msgs = [msgs]
+
+        for msg in msgs:
+            self._positions.setdefault(msg.id, []).append(len(self._msgs))
+            self._msgs.append(msg)
+
+    def get(self, start: int = 0, end: int | None = None) -> list[Msg]:
+        """Get the messages in the range of the log.
+
+        Args:
+            start (`int`, defaults to `0`):
+                The start position.
+            end (`int | None`, defaults to `None`):
+                The end position (exclusive). If `None`, to the end of the
+                log.
+        """
+        return self._msgs[start:end]
+
+    def contains(
+        self,
+        msg_id: str,
+        start: int = 0,
+        end: int | None = None,
+    ) -> bool:
+        """Whether the message is in the range of the log.
+
+        Args:
+            msg_id (`str`):
+                The message ID.
+            start (`int`, defaults to `0`):
+                The start position.
+            end (`int | None`, defaults to `None`):
+                The end position (exclusive). If `None`, to the end of the
+                log.
+        """
+        positions = self._positions.get(msg_id, [])
+        i = bisect_left(positions, start)
+        return i < len(positions) and (end is None or positions[i] < end)
+
+
+class _LogSpan:
+    """A range of a message log in the memory, whose end is `None` while the
+    memory is attached to the log."""
+
+    def __init__(self, log: MessageLog, start: int) -> None:
+        """Initialize the span."""
+        self.log = log
+        self.start = start
+        self.end: int | None = None
+
+    def get(self) -> list[Msg]:
+        """Get the messages in the span."""
+        return self.log.get(self.start, self.end)
+
+
+class SharedLogMemory(MemoryBase):
+    """The memory class that composes the private messages of the agent with
+    ranges of the shared message logs.
+
+    When attached to a MsgHub with `shared_log=True`, the broadcast messages
+    are appended to the log of the MsgHub once, and the memory only records
+    the position it starts reading from, so that N agents hold one copy of
+    the conversation rather than N copies. The messages with the same ID
+    appear once in the memory, e.g. the agent's own reply that is also
+    broadcast to the log.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the shared log memory."""
+        super().__init__()
+
+        self._segments: list[Msg | _LogSpan] = []
+        self._private_ids: dict[str, int] = {}
+        # The IDs of the deleted messages in the logs
+        self._hidden: set[str] = set()
+
+    def attach(self, log: MessageLog) -> None:
+        """Read the new messages appended to the log from now on.
+
+        Args:
+            log (`MessageLog`):
+                The message log.
+        """
+        if not any(span.log is log for span in self._open_spans()):
+            self._segments.append(_LogSpan(log, len(log)))
+
+    def detach(self, log: MessageLog) -> None:
+        """Stop reading the new messages appended to the log.
+
+        Args:
+            log (`MessageLog`):
+                The message log.
+        """
+        for span in self._open_spans():
+            if span.log is log:
+                span.end = len(log)
+
+    def state_dict(self) -> dict:
+        """Convert the current memory into JSON data format."""
+        return {
+            "content": [_.to_dict() for _ in self._materialize()],
+        }
+
+    def load_state_dict(
+        self,
+        state_dict: dict,
+        strict: bool = True,
+    ) -> None:
+        """Load the memory from JSON data, while keeping reading the attached
+        message logs.
+
+        Args:
+            state_dict (`dict`):
+                The state dictionary to load, which should have a "content"
+                field.
+            strict (`bool`, defaults to `True`):
+                If `True`, raises an error if any key in the module is not
+                found in the state_dict. If `False`, skips missing keys.
+        """
+        content = []
+        for data in state_dict["content"]:
+            data.pop("type", None)
+            content.append(Msg.from_dict(data))
+
+        self._reset()
+        self._add_private(content)
+
+    async def size(self) -> int:
+        """The size of the memory."""
+        return len(self._materialize())
+
+    async def retrieve(self, *args: Any, **kwargs: Any) -> None:
+        """Retrieve items from the memory."""
+        raise NotImplementedError(
+            "The retrieve method is not implemented in "
+            f"{self.__class__.__name__} class.",
+        )
+
+    async def delete(self, index: Union[Iterable, int]) -> None:
+        """Delete the specified item by index(es). The messages in the logs
+        are hidden from this memory, rather than removed from the logs.
+
+        Args:
+            index (`Union[Iterable, int]`):
+                The index to delete.
+        """
+        if isinstance(index, int):
+            index = [index]
+
+        msgs = self._materialize()
+        positions = set(index)
+        invalid_index = [_ for _ in positions if 0 > _ or _ >= len(msgs)]
+
+        if invalid_index:
+            raise IndexError(
+                f"The index {invalid_index} does not exist.",
+            )
+
+        deleted = {id(msgs[_]) for _ in positions}
+        segments = []
+        for segment in self._segments:
+            if isinstance(segment, _LogSpan):
+                self._hidden.update(
+                    msg.id for msg in segment.get() if id(msg) in deleted
+                )
+                segments.append(segment)
+
+            elif id(segment) in deleted:
+                self._private_ids[segment.id] -= 1
+                if self._private_ids[segment.id] == 0:
+                    del self._private_ids[segment.id]
+
+            else:
+                segments.append(segment)
+
+        self._segments = segments
+
+    async def add(
+        self,
+        memories: Union[list[Msg], Msg, None],
+        allow_duplicates: bool = False,
+    ) -> None:
+        """Add the private message(s) into the memory.
+
+        Args:
+            memories (`Union[list[Msg], Msg, None]`):
+                The message to add.
+            allow_duplicates (`bool`, defaults to `False`):
+                If allow adding duplicate messages (with the same id) into
+                the memory.
+        """
+        if memories is None:
+            return
+
+        if isinstance(memories, Msg):
+            memories = [memories]
+
+        if not isinstance(memories, list):
+            raise TypeError(
+                f"The memories should be a list of Msg or a single Msg, "
+                f"but got {type(memories)}.",
+            )
+
+        for msg in memories:
+            if not isinstance(msg, Msg):
+                raise TypeError(
+                    f"The memories should be a list of Msg or a single Msg, "
+                    f"but got {type(msg)}.",
+                )
+
+        if not allow_duplicates:
+            memories = [_ for _ in memories if not self._contains(_.id)]
+
+        self._add_private(memories)
+
+    async def get_memory(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> list[Msg]:
+        """Get the memory content, or a range of it with the same semantics
+        as Python slicing.
+
+        Args:
+            start (`int | None`, optional):
+                The start index of the range.
+            end (`int | None`, optional):
+                The end index (exclusive) of the range.
+        """
+        return self._materialize()[start:end]
+
+    async def clear(self) -> None:
+        """Clear the memory content, while keeping reading the attached
+        message logs."""
+        self._reset()
+
+    def _open_spans(self) -> list[_LogSpan]:
+        """Get the spans of the attached logs."""
+        return [
+            _
+            for _ in self._segments
+            if isinstance(_, _LogSpan) and _.end is None
+        ]
+
+    def _contains(self, msg_id: str) -> bool:
+        """Whether the message is in the memory."""
+        if msg_id in self._private_ids:
+            return True
+        if msg_id in self._hidden:
+            return False
+        return any(
+            _.log.contains(msg_id, _.start, _.end)
+            for _ in self._segments
+            if isinstance(_, _LogSpan)
+        )
+
+    def _add_private(self, msgs: list[Msg]) -> None:
+        """Append the private messages after the messages read from the
+        attached logs so far."""
+        if not msgs:
+            return
+
+        open_spans = self._open_spans()
+        for span in open_spans:
+            span.end = len(span.log)
+            if span.start == span.end:
+                self._segments.remove(span)
+
+        for msg in msgs:
+            self._private_ids[msg.id] = self._private_ids.get(msg.id, 0) + 1
+        self._segments.extend(msgs)
+        self._segments.extend(_LogSpan(_.log, len(_.log)) for _ in open_spans)
+
+    def _reset(self) -> None:
+        """Remove all messages, and read the attached logs from their
+        current ends."""
+        open_spans = self._open_spans()
+        self._segments = [_LogSpan(_.log, len(_.log)) for _ in open_spans]
+        self._private_ids = {}
+        self._hidden = set()
+
+    def _materialize(self) -> list[Msg]:
+        """Get the messages in the memory, where the messages in the logs
+        are skipped if the same messages appear before."""
+        msgs = []
+        seen: set[str] = set()
+        for segment in self._segments:
+            if isinstance(segment, Msg):
+                msgs.append(segment)
+                seen.add(segment.id)
+                continue
+
+            for msg in segment.get():
+                if msg.id not in seen and msg.id not in self._hidden:
+                    msgs.append(msg)
+                    seen.add(msg.id)
+
+        return msgs
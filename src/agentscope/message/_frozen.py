@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""The immutable containers used by the frozen messages."""
+from copy import deepcopy
+from typing import Any, NoReturn
+
+
+def _raise_frozen(*args: Any, **kwargs: Any) -> NoReturn:
+    """Raise an error for modifying a frozen container."""
+    raise TypeError(
+        "The frozen message cannot be modified. Use `Msg.evolve` to create "
+        "a modified message, or `copy.deepcopy` to get a mutable copy.",
+    )
+
+
+class _FrozenDict(dict):
+    """An immutable dict, which is still a `dict` so that it can be
+    serialized and read as the content blocks."""
+
+    __setitem__ = __delitem__ = __ior__ = _raise_frozen
+    clear = pop = popitem = setdefault = update = _raise_frozen
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self),)
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return {k: deepcopy(v, memo) for k, v in self.items()}
+
+
+class _FrozenList(list):
+    """An immutable list, which is still a `list` so that it can be
+    serialized and read as the content."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_frozen
+    append = extend = insert = pop = remove = _raise_frozen
+    clear = sort = reverse = _raise_frozen
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (list(self),)
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [deepcopy(_, memo) for _ in self]
+
+
+def _freeze(value: Any) -> Any:
+    """Convert the nested dicts and lists in the value into immutable ones,
+    where the frozen parts and the other values (e.g. the base64 strings)
+    are shared rather than copied."""
+    if isinstance(value, (_FrozenDict, _FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return _FrozenDict({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return _FrozenList(_freeze(_) for _ in value)
+    return value
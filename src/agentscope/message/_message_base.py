@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 """The message class in agentscope."""
+from copy import copy, deepcopy
 from datetime import datetime
-from typing import Literal, List, overload, Sequence
+from typing import Any, Literal, List, overload, Sequence
 
 import shortuuid
 
 from . import ToolResultBlock
+from ._frozen import _freeze
 from ._message_block import (
     TextBlock,
     ToolUseBlock,
@@ -19,7 +21,14 @@ from ..types import JSONSerializableObject
 
 
 class Msg:
-    """The message class in agentscope."""
+    """The message class in agentscope.
+
+    A message can be frozen by `freeze()`, so that it can be shared among
+    agents and formatters without copying. The modified versions of a
+    frozen message are created by `evolve()`, which shares the unchanged
+    parts with the original message, while `copy.deepcopy` returns a
+    mutable copy.
+    """
 
     def __init__(
         self,
@@ -66,6 +75,90 @@ class Msg:
         )
         self.invocation_id = invocation_id
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set the attribute, which is forbidden for the frozen messages."""
+        if self.__dict__.get("_frozen", False):
+            raise AttributeError(
+                f"Cannot set attribute '{name}' of the frozen message. Use "
+                "`Msg.evolve` to create a modified message instead.",
+            )
+        super().__setattr__(name, value)
+
+    def __deepcopy__(self, memo: dict) -> "Msg":
+        """Get a mutable deep copy of the message."""
+        new_obj = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new_obj
+        for key, value in self.__dict__.items():
+            if key != "_frozen":
+                new_obj.__dict__[key] = deepcopy(value, memo)
+        return new_obj
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the message is frozen."""
+        return self.__dict__.get("_frozen", False)
+
+    def freeze(self) -> "Msg":
+        """Get a frozen version of the message with the same ID, whose
+        attributes and content blocks cannot be modified. The strings in
+        the message (e.g. the base64 data) are shared rather than copied.
+
+        Returns:
+            `Msg`:
+                The frozen message, or the message itself if it's already
+                frozen.
+        """
+        if self.frozen:
+            return self
+
+        new_obj = copy(self)
+        new_obj.__dict__["content"] = _freeze(self.content)
+        new_obj.__dict__["metadata"] = _freeze(self.metadata)
+        new_obj.__dict__["_frozen"] = True
+        return new_obj
+
+    def evolve(self, **changes: Any) -> "Msg":
+        """Create a new message with the given attributes changed, sharing
+        the unchanged attributes with this message. The new message is
+        frozen if this message is frozen.
+
+        Example:
+            .. code-block:: python
+
+                msg = Msg("user", "Hi!", "user").freeze()
+                new_msg = msg.evolve(content="Hello!")
+
+        Args:
+            **changes (`Any`):
+                The attributes to change, e.g. `content`, `metadata` and
+                `name`. The ID is kept unless it's given.
+
+        Returns:
+            `Msg`:
+                The new message.
+        """
+        unknown = set(changes) - {
+            "id",
+            "name",
+            "content",
+            "role",
+            "metadata",
+            "timestamp",
+            "invocation_id",
+        }
+        if unknown:
+            raise TypeError(f"Unknown message attributes: {unknown}")
+        assert changes.get("role", self.role) in [
+            "user",
+            "assistant",
+            "system",
+        ]
+
+        new_obj = copy(self)
+        for key, value in changes.items():
+            new_obj.__dict__[key] = _freeze(value) if self.frozen else value
+        return new_obj
+
     def to_dict(self) -> dict:
         """Convert the message into JSON dict data."""
         return {
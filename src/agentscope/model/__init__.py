@@ -1,20 +1,49 @@
 # -*- coding: utf-8 -*-
 """The model module."""
+from typing import TYPE_CHECKING
 
-from ._model_base import ChatModelBase
-from ._model_response import ChatResponse
-from ._dashscope_model import DashScopeChatModel
-from ._openai_model import OpenAIChatModel
-from ._anthropic_model import AnthropicChatModel
-from ._ollama_model import OllamaChatModel
-from ._gemini_model import GeminiChatModel
+from .._utils._lazy import _lazy_import
+
+if TYPE_CHECKING:
+    from ._model_base import ChatModelBase
+    from ._model_response import ChatResponse
+    from ._rate_limiter import RateLimiter
+    from ._cache_base import ChatCacheBase
+    from ._in_memory_cache import InMemoryChatCache
+    from ._file_cache import FileChatCache
+    from ._dashscope_model import DashScopeChatModel
+    from ._openai_model import OpenAIChatModel
+    from ._anthropic_model import AnthropicChatModel
+    from ._ollama_model import OllamaChatModel
+    from ._gemini_model import GeminiChatModel
 
 __all__ = [
     "ChatModelBase",
     "ChatResponse",
+    "RateLimiter",
+    "ChatCacheBase",
+    "InMemoryChatCache",
+    "FileChatCache",
     "DashScopeChatModel",
     "OpenAIChatModel",
     "AnthropicChatModel",
     "OllamaChatModel",
     "GeminiChatModel",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "ChatModelBase": "._model_base",
+        "ChatResponse": "._model_response",
+        "RateLimiter": "._rate_limiter",
+        "ChatCacheBase": "._cache_base",
+        "InMemoryChatCache": "._in_memory_cache",
+        "FileChatCache": "._file_cache",
+        "DashScopeChatModel": "._dashscope_model",
+        "OpenAIChatModel": "._openai_model",
+        "AnthropicChatModel": "._anthropic_model",
+        "OllamaChatModel": "._ollama_model",
+        "GeminiChatModel": "._gemini_model",
+    },
+)
@@ -11,18 +11,17 @@ from typing import (
     Literal,
     Type,
 )
-from collections import OrderedDict
 
 from pydantic import BaseModel
 
+from ._cache_base import ChatCacheBase, _cached
 from ._model_base import ChatModelBase
+from ._rate_limiter import RateLimiter, _rate_limited
 from ._model_response import ChatResponse
 from ._model_usage import ChatUsage
+from ._stream_accumulator import _StreamAccumulator
 from .._logging import logger
-from .._utils._common import (
-    _json_loads_with_repair,
-    _create_tool_from_base_model,
-)
+from .._utils._common import _create_tool_from_base_model
 from ..message import TextBlock, ToolUseBlock, ThinkingBlock
 from ..tracing import trace_llm
 from ..types._json import JSONSerializableObject
@@ -38,6 +37,8 @@ else:
 class AnthropicChatModel(ChatModelBase):
     """The Anthropic model wrapper for AgentScope."""
 
+    _cache_config = ("max_tokens", "thinking", "generate_kwargs")
+
     def __init__(
         self,
         model_name: str,
@@ -47,6 +48,9 @@ class AnthropicChatModel(ChatModelBase):
         thinking: dict | None = None,
         client_args: dict | None = None,
         generate_kwargs: dict[str, JSONSerializableObject] | None = None,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ChatCacheBase | None = None,
     ) -> None:
         """Initialize the Anthropic chat model.
 
@@ -76,6 +80,18 @@ class AnthropicChatModel(ChatModelBase):
              optional):
                 The extra keyword arguments used in Gemini API generation,
                 e.g. `temperature`, `seed`.
+            stream_mode (`Literal["accumulated", "delta"]`, default \
+            `"accumulated"`):
+                Yield the full content received so far or only the changes
+                in streaming mode.
+            rate_limiter (`RateLimiter | None`, default `None`):
+                The rate limiter applied to the requests, which can be
+                shared by the models using the same endpoint. The retries of
+                the Anthropic client are disabled when it's given, unless
+                `max_retries` is specified in `client_args`.
+            response_cache (`ChatCacheBase | None`, default `None`):
+                The cache of the responses, which answers the identical
+                requests by the mode of the cache.
         """
 
         try:
@@ -86,17 +102,30 @@ class AnthropicChatModel(ChatModelBase):
                 "`pip install anthropic`.",
             ) from e
 
-        super().__init__(model_name, stream)
+        super().__init__(
+            model_name,
+            stream,
+            stream_mode,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
+
+        client_args = dict(client_args or {})
+        if rate_limiter is not None:
+            # The rate limited requests are retried by the rate limiter
+            client_args.setdefault("max_retries", 0)
 
         self.client = anthropic.AsyncAnthropic(
             api_key=api_key,
-            **(client_args or {}),
+            **client_args,
         )
         self.max_tokens = max_tokens
         self.thinking = thinking
         self.generate_kwargs = generate_kwargs or {}
 
     @trace_llm
+    @_cached
+    @_rate_limited
     async def __call__(
         self,
         messages: list[dict[str, Any]],
@@ -340,17 +369,11 @@ class AnthropicChatModel(ChatModelBase):
         """
 
         usage = None
-        text_buffer = ""
-        thinking_buffer = ""
-        thinking_signature = ""
-        tool_calls = OrderedDict()
-        tool_call_buffers = {}
-        res = None
         metadata = None
+        acc = _StreamAccumulator(self.stream_mode)
 
         async for event in response:
-            content_changed = False
-            thinking_changed = False
+            changed = False
 
             if event.type == "message_start":
                 message = event.message
@@ -367,85 +390,47 @@ class AnthropicChatModel(ChatModelBase):
 
             elif event.type == "content_block_start":
                 if event.content_block.type == "tool_use":
-                    block_index = event.index
-                    tool_block = event.content_block
-                    tool_calls[block_index] = {
-                        "type": "tool_use",
-                        "id": tool_block.id,
-                        "name": tool_block.name,
-                        "input": "",
-                    }
-                    tool_call_buffers[block_index] = ""
-                    content_changed = True
+                    acc.add_tool_call(
+                        event.index,
+                        tool_id=event.content_block.id,
+                        name=event.content_block.name,
+                    )
+                    changed = True
 
             elif event.type == "content_block_delta":
                 block_index = event.index
                 delta = event.delta
                 if delta.type == "text_delta":
-                    text_buffer += delta.text
-                    content_changed = True
+                    acc.add_text(delta.text)
+                    changed = True
                 elif delta.type == "thinking_delta":
-                    thinking_buffer += delta.thinking
-                    thinking_changed = True
+                    acc.add_thinking(delta.thinking)
+                    changed = True
                 elif delta.type == "signature_delta":
-                    thinking_signature = delta.signature
+                    acc.set_thinking_signature(delta.signature)
                 elif (
                     delta.type == "input_json_delta"
-                    and block_index in tool_calls
+                    and acc.get_tool_call(block_index) is not None
                 ):
-                    tool_call_buffers[block_index] += delta.partial_json or ""
-                    tool_calls[block_index]["input"] = tool_call_buffers[
-                        block_index
-                    ]
-                    content_changed = True
+                    acc.add_tool_call(
+                        block_index,
+                        arguments=delta.partial_json,
+                    )
+                    changed = True
 
             elif event.type == "message_delta":
                 if event.usage and usage:
                     usage.output_tokens = event.usage.output_tokens
 
-            if (thinking_changed or content_changed) and usage:
-                contents: list = []
-                if thinking_buffer:
-                    thinking_block = ThinkingBlock(
-                        type="thinking",
-                        thinking=thinking_buffer,
-                    )
-                    thinking_block["signature"] = thinking_signature
-                    contents.append(thinking_block)
-                if text_buffer:
-                    contents.append(
-                        TextBlock(
-                            type="text",
-                            text=text_buffer,
-                        ),
-                    )
-                for block_index, tool_call in tool_calls.items():
-                    input_str = tool_call["input"]
-                    try:
-                        input_obj = _json_loads_with_repair(input_str or "{}")
-                        if not isinstance(input_obj, dict):
-                            input_obj = {}
-
-                    except Exception:
-                        input_obj = {}
+            if changed and usage and acc.has_content:
+                if structured_model:
+                    metadata = acc.get_last_tool_input()
+                yield acc.build(usage, metadata)
 
-                    contents.append(
-                        ToolUseBlock(
-                            type=tool_call["type"],
-                            id=tool_call["id"],
-                            name=tool_call["name"],
-                            input=input_obj,
-                        ),
-                    )
-                    if structured_model:
-                        metadata = input_obj
-                if contents:
-                    res = ChatResponse(
-                        content=contents,
-                        usage=usage,
-                        metadata=metadata,
-                    )
-                    yield res
+        if usage and acc.finish():
+            if structured_model:
+                metadata = acc.get_last_tool_input()
+            yield acc.build(usage, metadata, final=True)
 
     def _format_tools_json_schemas(
         self,
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""The chat response cache base class."""
+import json
+from abc import abstractmethod
+from functools import wraps
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Literal,
+    TYPE_CHECKING,
+)
+
+from ._model_response import ChatResponse
+from ._model_usage import ChatUsage
+from ..types import JSONSerializableObject
+
+if TYPE_CHECKING:
+    from ._model_base import ChatModelBase
+else:
+    ChatModelBase = "ChatModelBase"
+
+
+class ChatCacheBase:
+    """Base class for chat response caches, which store the responses of the
+    chat models by their requests, so that the identical requests, e.g. in
+    the evaluation and regression runs, are answered without calling the
+    API. A streaming response in the delta mode is stored as its delta
+    chunks and replayed chunk by chunk, while in the accumulated mode, only
+    the final response is stored and replayed as the only chunk.
+
+    The cache works in one of the following modes:
+
+    - `"read_through"`: return the cached response if found, otherwise call
+      the API and store the response.
+    - `"record"`: always call the API and store (overwrite) the response.
+    - `"replay"`: only return the cached responses, and raise an error if
+      not found, e.g. for offline benchmarking.
+    """
+
+    mode: Literal["read_through", "record", "replay"]
+    """The cache mode."""
+
+    def __init__(
+        self,
+        mode: Literal["read_through", "record", "replay"] = "read_through",
+    ) -> None:
+        """Initialize the chat cache.
+
+        Args:
+            mode (`Literal["read_through", "record", "replay"]`, defaults \
+            to `"read_through"`):
+                The cache mode.
+        """
+        if mode not in ["read_through", "record", "replay"]:
+            raise ValueError(
+                f"Invalid cache mode '{mode}', expected 'read_through', "
+                "'record' or 'replay'.",
+            )
+        self.mode = mode
+
+    @abstractmethod
+    async def store(
+        self,
+        responses: list[ChatResponse],
+        identifier: JSONSerializableObject,
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store the responses with the given identifier.
+
+        Args:
+            responses (`list[ChatResponse]`):
+                The responses to store, i.e. the delta chunks of a
+                streaming response, or a single (final) response.
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite the existing responses with the same
+                identifier.
+        """
+
+    @abstractmethod
+    async def retrieve(
+        self,
+        identifier: JSONSerializableObject,
+    ) -> list[ChatResponse] | None:
+        """Retrieve the responses with the given identifier. If not found,
+        return `None`.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+        """
+
+    @abstractmethod
+    async def remove(self, identifier: JSONSerializableObject) -> None:
+        """Remove the responses with the given identifier.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Clear all cached responses."""
+
+
+def _response_from_dict(data: dict) -> ChatResponse:
+    """Rebuild the chat response from its JSON dict data."""
+    if data.get("usage") is not None:
+        data["usage"] = ChatUsage(**data["usage"])
+    return ChatResponse(**data)
+
+
+def _copy_response(
+    response: ChatResponse,
+    source: Literal["cache", "api"] | None = None,
+) -> ChatResponse:
+    """Copy the response through its JSON data, so that the cached responses
+    are not affected by the modifications of the returned ones."""
+    data = json.loads(json.dumps(response, ensure_ascii=False))
+    if source is not None:
+        data["source"] = source
+    return _response_from_dict(data)
+
+
+async def _replay(
+    responses: list[ChatResponse],
+) -> AsyncGenerator[ChatResponse, None]:
+    """Replay the cached chunks of a streaming response."""
+    for response in responses:
+        yield _copy_response(response, "cache")
+
+
+async def _record(
+    cache: ChatCacheBase,
+    identifier: JSONSerializableObject,
+    stream: AsyncGenerator[ChatResponse, None],
+    accumulated: bool,
+) -> AsyncGenerator[ChatResponse, None]:
+    """Yield the streaming responses, and store them when the stream is
+    complete. In the accumulated mode, each chunk contains the previous
+    ones, so only the last chunk is copied and stored."""
+    chunks = []
+    last = None
+    async for chunk in stream:
+        if accumulated:
+            last = chunk
+        else:
+            chunks.append(_copy_response(chunk))
+        yield chunk
+
+    if last is not None:
+        chunks = [_copy_response(last)]
+    await cache.store(chunks, identifier, overwrite=True)
+
+
+def _cached(
+    func: Callable[..., Coroutine[Any, Any, Any]],
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """The decorator applying the `response_cache` of the chat model to its
+    `__call__` function by the mode of the cache."""
+
+    @wraps(func)
+    async def wrapper(
+        self: ChatModelBase,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        cache: ChatCacheBase | None = getattr(self, "response_cache", None)
+        if cache is None:
+            return await func(self, *args, **kwargs)
+
+        # pylint: disable-next=protected-access
+        identifier = self._get_cache_identifier(*args, **kwargs)
+
+        if cache.mode != "record":
+            cached = await cache.retrieve(identifier)
+            if cached:
+                if self.stream:
+                    return _replay(cached)
+                return _copy_response(cached[-1], "cache")
+
+            if cache.mode == "replay":
+                raise RuntimeError(
+                    f"The response of model {self.model_name} is not found "
+                    f"in the cache in replay mode: {identifier}",
+                )
+
+        res = await func(self, *args, **kwargs)
+        if isinstance(res, AsyncGenerator):
+            return _record(
+                cache,
+                identifier,
+                res,
+                self.stream_mode == "accumulated",
+            )
+
+        await cache.store([_copy_response(res)], identifier, overwrite=True)
+        return res
+
+    return wrapper
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 """The dashscope API model classes."""
-import collections
 from datetime import datetime
 from http import HTTPStatus
 from typing import (
@@ -16,14 +15,17 @@ from typing import (
 from pydantic import BaseModel
 from aioitertools import iter as giter
 
+from ._cache_base import ChatCacheBase, _cached
 from ._model_base import ChatModelBase
+from ._rate_limiter import RateLimiter, _rate_limited
 from ._model_response import ChatResponse
 from ._model_usage import ChatUsage
+from ._stream_accumulator import _StreamAccumulator
 from .._utils._common import (
     _json_loads_with_repair,
     _create_tool_from_base_model,
 )
-from ..message import TextBlock, ToolUseBlock, ThinkingBlock
+from ..message import TextBlock, ToolUseBlock
 from ..tracing import trace_llm
 from ..types import JSONSerializableObject
 from .._logging import logger
@@ -47,6 +49,8 @@ class DashScopeChatModel(ChatModelBase):
     """The DashScope chat model class, which unifies the Generation and
     MultimodalConversation APIs into one method."""
 
+    _cache_config = ("enable_thinking", "generate_kwargs")
+
     def __init__(
         self,
         model_name: str,
@@ -55,6 +59,9 @@ class DashScopeChatModel(ChatModelBase):
         enable_thinking: bool | None = None,
         generate_kwargs: dict[str, JSONSerializableObject] | None = None,
         base_http_api_url: str | None = None,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ChatCacheBase | None = None,
     ) -> None:
         """Initialize the DashScope chat model.
 
@@ -77,6 +84,16 @@ class DashScopeChatModel(ChatModelBase):
             base_http_api_url (`str | None`, optional):
                 The base URL for DashScope API requests. If not provided,
                 the default base URL from the DashScope SDK will be used.
+            stream_mode (`Literal["accumulated", "delta"]`, default \
+            `"accumulated"`):
+                Yield the full content received so far or only the changes
+                in streaming mode.
+            rate_limiter (`RateLimiter | None`, default `None`):
+                The rate limiter applied to the requests, which can be
+                shared by the models using the same endpoint.
+            response_cache (`ChatCacheBase | None`, default `None`):
+                The cache of the responses, which answers the identical
+                requests by the mode of the cache.
         """
         if enable_thinking and not stream:
             logger.info(
@@ -85,7 +102,13 @@ class DashScopeChatModel(ChatModelBase):
             )
             stream = True
 
-        super().__init__(model_name, stream)
+        super().__init__(
+            model_name,
+            stream,
+            stream_mode,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
 
         self.api_key = api_key
         self.enable_thinking = enable_thinking
@@ -97,6 +120,8 @@ class DashScopeChatModel(ChatModelBase):
             dashscope.base_http_api_url = base_http_api_url
 
     @trace_llm
+    @_cached
+    @_rate_limited
     async def __call__(
         self,
         messages: list[dict[str, Any]],
@@ -262,9 +287,9 @@ class DashScopeChatModel(ChatModelBase):
             If `structured_model` is not `None`, the expected structured output
             will be stored in the metadata of the `ChatResponse`.
         """
-        acc_content, acc_thinking_content = "", ""
-        acc_tool_calls = collections.defaultdict(dict)
+        acc = _StreamAccumulator(self.stream_mode)
         metadata = None
+        usage = None
 
         async for chunk in giter(response):
             if chunk.status_code != HTTPStatus.OK:
@@ -276,78 +301,45 @@ class DashScopeChatModel(ChatModelBase):
 
             # Update reasoning content
             if isinstance(message.get("reasoning_content"), str):
-                acc_thinking_content += message["reasoning_content"]
+                acc.add_thinking(message["reasoning_content"])
 
             # Update text content
             if isinstance(message.content, str):
-                acc_content += message.content
+                acc.add_text(message.content)
             elif isinstance(message.content, list):
                 for item in message.content:
                     if isinstance(item, dict) and "text" in item:
-                        acc_content += item["text"]
+                        acc.add_text(item["text"])
 
-            # Update tool calls
+            # Update tool calls, note the id and name may also be streamed
             for tool_call in message.get("tool_calls", []):
                 index = tool_call.get("index", 0)
-
-                if "id" in tool_call and tool_call["id"] != acc_tool_calls[
-                    index
-                ].get("id"):
-                    acc_tool_calls[index]["id"] = (
-                        acc_tool_calls[index].get("id", "") + tool_call["id"]
+                func = tool_call.get("function", {})
+
+                block = acc.get_tool_call(index)
+                if block is None:
+                    acc.add_tool_call(
+                        index,
+                        tool_id=tool_call.get("id", ""),
+                        name=func.get("name", ""),
+                        arguments=func.get("arguments"),
                     )
+                    continue
 
-                if "function" in tool_call:
-                    func = tool_call["function"]
-                    if "name" in func:
-                        acc_tool_calls[index]["name"] = (
-                            acc_tool_calls[index].get("name", "")
-                            + func["name"]
-                        )
-
-                    if "arguments" in func:
-                        acc_tool_calls[index]["arguments"] = (
-                            acc_tool_calls[index].get("arguments", "")
-                            + func["arguments"]
-                        )
-
-            # to content blocks
-            content_blocks: list[TextBlock | ToolUseBlock | ThinkingBlock] = []
-            if acc_thinking_content:
-                content_blocks.append(
-                    ThinkingBlock(
-                        type="thinking",
-                        thinking=acc_thinking_content,
-                    ),
-                )
-
-            if acc_content:
-                content_blocks.append(
-                    TextBlock(
-                        type="text",
-                        text=acc_content,
-                    ),
-                )
-
-            for tool_call in acc_tool_calls.values():
-                repaired_input = _json_loads_with_repair(
-                    tool_call.get("arguments", "{}") or "{}",
-                )
-
-                if not isinstance(repaired_input, dict):
-                    repaired_input = {}
-
-                content_blocks.append(
-                    ToolUseBlock(
-                        type="tool_use",
-                        id=tool_call.get("id", ""),
-                        name=tool_call.get("name", ""),
-                        input=repaired_input,
-                    ),
-                )
+                if "id" in tool_call and tool_call["id"] != block["id"]:
+                    acc.update_tool_call(
+                        index,
+                        id=block["id"] + tool_call["id"],
+                    )
+                if "name" in func:
+                    acc.update_tool_call(
+                        index,
+                        name=block["name"] + func["name"],
+                    )
+                acc.add_tool_call(index, arguments=func.get("arguments"))
 
-                if structured_model:
-                    metadata = repaired_input
+            if structured_model:
+                metadata = acc.get_last_tool_input()
 
             usage = None
             if chunk.usage:
@@ -357,12 +349,12 @@ class DashScopeChatModel(ChatModelBase):
                     time=(datetime.now() - start_datetime).total_seconds(),
                 )
 
-            parsed_chunk = ChatResponse(
-                content=content_blocks,
-                usage=usage,
-                metadata=metadata,
-            )
-            yield parsed_chunk
+            yield acc.build(usage, metadata)
+
+        if acc.finish():
+            if structured_model:
+                metadata = acc.get_last_tool_input()
+            yield acc.build(usage, metadata, final=True)
 
     async def _parse_dashscope_generation_response(
         self,
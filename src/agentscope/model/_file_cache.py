@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""The file chat response cache, which stores the responses in JSON files,
+e.g. to record the responses once and replay them in the later runs."""
+import hashlib
+import json
+import os
+from typing import Any, Literal
+
+from ._cache_base import ChatCacheBase, _response_from_dict
+from ._model_response import ChatResponse
+from .._logging import logger
+from ..types import JSONSerializableObject
+
+
+class FileChatCache(ChatCacheBase):
+    """The chat response cache that stores the responses of each request in
+    a JSON file, which persists across the runs."""
+
+    def __init__(
+        self,
+        cache_dir: str = "./.cache/chat",
+        max_file_number: int | None = None,
+        mode: Literal["read_through", "record", "replay"] = "read_through",
+    ) -> None:
+        """Initialize the file chat cache.
+
+        Args:
+            cache_dir (`str`, defaults to `"./.cache/chat"`):
+                The directory to store the response files.
+            max_file_number (`int | None`, defaults to `None`):
+                The maximum number of files to keep in the cache directory. If
+                exceeded, the least recently used files will be removed.
+            mode (`Literal["read_through", "record", "replay"]`, defaults \
+            to `"read_through"`):
+                The cache mode, refer to `ChatCacheBase` for details.
+        """
+        super().__init__(mode)
+        self._cache_dir = os.path.abspath(cache_dir)
+        self.max_file_number = max_file_number
+
+    @property
+    def cache_dir(self) -> str:
+        """The cache directory where the response files are stored."""
+        if not os.path.exists(self._cache_dir):
+            os.makedirs(self._cache_dir, exist_ok=True)
+        return self._cache_dir
+
+    async def store(
+        self,
+        responses: list[ChatResponse],
+        identifier: JSONSerializableObject,
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store the responses with the given identifier.
+
+        Args:
+            responses (`list[ChatResponse]`):
+                The responses to store.
+            identifier (`JSONSerializableObject`):
+                The identifier of the request, which will be used to generate
+                a hashable filename, so it should be JSON serializable.
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite the existing responses with the same
+                identifier.
+        """
+        path_file = os.path.join(
+            self.cache_dir,
+            self._get_filename(identifier),
+        )
+        if os.path.exists(path_file) and not overwrite:
+            return
+
+        # Write to a temporary file first, so that the concurrent readers
+        # never see a partially written file
+        path_tmp = f"{path_file}.{os.getpid()}.tmp"
+        with open(path_tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"identifier": identifier, "responses": responses},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(path_tmp, path_file)
+
+        await self._maintain_cache_dir()
+
+    async def retrieve(
+        self,
+        identifier: JSONSerializableObject,
+    ) -> list[ChatResponse] | None:
+        """Retrieve the responses with the given identifier. If not found,
+        return `None`.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier of the request, which will be used to generate
+                a hashable filename, so it should be JSON serializable.
+        """
+        path_file = os.path.join(
+            self.cache_dir,
+            self._get_filename(identifier),
+        )
+        if not os.path.isfile(path_file):
+            return None
+
+        with open(path_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        # Mark the file as recently used for the eviction
+        os.utime(path_file)
+        return [_response_from_dict(_) for _ in data["responses"]]
+
+    async def remove(self, identifier: JSONSerializableObject) -> None:
+        """Remove the responses with the given identifier.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+        """
+        path_file = os.path.join(
+            self.cache_dir,
+            self._get_filename(identifier),
+        )
+        if os.path.exists(path_file):
+            os.remove(path_file)
+        else:
+            raise FileNotFoundError(f"File {path_file} does not exist.")
+
+    async def clear(self) -> None:
+        """Clear the cache directory by removing all response files."""
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    @staticmethod
+    def _get_filename(identifier: JSONSerializableObject) -> str:
+        """Generate a filename based on the identifier."""
+        json_str = json.dumps(identifier, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(json_str.encode("utf-8")).hexdigest() + ".json"
+
+    async def _maintain_cache_dir(self) -> None:
+        """Remove the least recently used files if the number of files
+        exceeds the maximum limit."""
+        if not self.max_file_number:
+            return
+
+        files = [
+            (_.name, _.stat().st_mtime)
+            for _ in os.scandir(self.cache_dir)
+            if _.is_file() and _.name.endswith(".json")
+        ]
+        if len(files) <= self.max_file_number:
+            return
+
+        files.sort(key=lambda x: x[1])
+        for file_name, _ in files[: len(files) - self.max_file_number]:
+            os.remove(os.path.join(self.cache_dir, file_name))
+            logger.info(
+                "Remove cached chat response file %s for limited number "
+                "of files (%d).",
+                file_name,
+                self.max_file_number,
+            )
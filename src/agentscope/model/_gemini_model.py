@@ -18,8 +18,11 @@ from .._logging import logger
 from .._utils._common import _json_loads_with_repair
 from ..message import ToolUseBlock, TextBlock, ThinkingBlock
 from ._model_usage import ChatUsage
+from ._cache_base import ChatCacheBase, _cached
 from ._model_base import ChatModelBase
+from ._rate_limiter import RateLimiter, _rate_limited
 from ._model_response import ChatResponse
+from ._stream_accumulator import _StreamAccumulator
 from ..tracing import trace_llm
 from ..types import JSONSerializableObject
 
@@ -32,6 +35,8 @@ else:
 class GeminiChatModel(ChatModelBase):
     """The Google Gemini chat model class in agentscope."""
 
+    _cache_config = ("thinking_config", "generate_kwargs")
+
     def __init__(
         self,
         model_name: str,
@@ -40,6 +45,9 @@ class GeminiChatModel(ChatModelBase):
         thinking_config: dict | None = None,
         client_args: dict = None,
         generate_kwargs: dict[str, JSONSerializableObject] | None = None,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ChatCacheBase | None = None,
     ) -> None:
         """Initialize the Gemini chat model.
 
@@ -69,6 +77,16 @@ class GeminiChatModel(ChatModelBase):
              optional):
                The extra keyword arguments used in Gemini API generation,
                e.g. `temperature`, `seed`.
+            stream_mode (`Literal["accumulated", "delta"]`, default \
+            `"accumulated"`):
+                Yield the full content received so far or only the changes
+                in streaming mode.
+            rate_limiter (`RateLimiter | None`, default `None`):
+                The rate limiter applied to the requests, which can be
+                shared by the models using the same endpoint.
+            response_cache (`ChatCacheBase | None`, default `None`):
+                The cache of the responses, which answers the identical
+                requests by the mode of the cache.
         """
         try:
             from google import genai
@@ -78,7 +96,13 @@ class GeminiChatModel(ChatModelBase):
                 "`pip install -q -U google-genai`",
             ) from e
 
-        super().__init__(model_name, stream)
+        super().__init__(
+            model_name,
+            stream,
+            stream_mode,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
 
         self.client = genai.Client(
             api_key=api_key,
@@ -88,6 +112,8 @@ class GeminiChatModel(ChatModelBase):
         self.generate_kwargs = generate_kwargs or {}
 
     @trace_llm
+    @_cached
+    @_rate_limited
     async def __call__(
         self,
         messages: list[dict],
@@ -215,12 +241,14 @@ class GeminiChatModel(ChatModelBase):
             will be stored in the metadata of the `ChatResponse`.
         """
 
-        text = ""
-        thinking = ""
+        acc = _StreamAccumulator(
+            self.stream_mode,
+            text_as_json=structured_model is not None,
+        )
         metadata: dict | None = None
+        usage = None
+        n_tool_calls = 0
         async for chunk in response:
-            content_block: list = []
-
             # Thinking parts
             if (
                 chunk.candidates
@@ -229,26 +257,23 @@ class GeminiChatModel(ChatModelBase):
             ):
                 for part in chunk.candidates[0].content.parts:
                     if part.thought and part.text:
-                        thinking += part.text
+                        acc.add_thinking(part.text)
 
             # Text parts
             if chunk.text:
-                text += chunk.text
+                acc.add_text(chunk.text)
                 if structured_model:
-                    metadata = _json_loads_with_repair(text)
-
-            # Function calls
-            tool_calls = []
-            if chunk.function_calls:
-                for function_call in chunk.function_calls:
-                    tool_calls.append(
-                        ToolUseBlock(
-                            type="tool_use",
-                            id=function_call.id,
-                            name=function_call.name,
-                            input=function_call.args or {},
-                        ),
-                    )
+                    metadata = acc.get_text_json()
+
+            # Function calls, which are delivered completely in one chunk
+            for function_call in chunk.function_calls or []:
+                acc.set_tool_call(
+                    n_tool_calls,
+                    tool_id=function_call.id,
+                    name=function_call.name,
+                    tool_input=function_call.args or {},
+                )
+                n_tool_calls += 1
 
             usage = None
             if chunk.usage_metadata:
@@ -259,34 +284,12 @@ class GeminiChatModel(ChatModelBase):
                     time=(datetime.now() - start_datetime).total_seconds(),
                 )
 
-            if thinking:
-                content_block.append(
-                    ThinkingBlock(
-                        type="thinking",
-                        thinking=thinking,
-                    ),
-                )
+            yield acc.build(usage, metadata)
 
-            if text:
-                content_block.append(
-                    TextBlock(
-                        type="text",
-                        text=text,
-                    ),
-                )
-
-            content_block.extend(
-                [
-                    *tool_calls,
-                ],
-            )
-
-            parsed_chunk = ChatResponse(
-                content=content_block,
-                usage=usage,
-                metadata=metadata,
-            )
-            yield parsed_chunk
+        if structured_model and acc.has_content:
+            final_metadata = acc.get_text_json(force=True)
+            if final_metadata != metadata:
+                yield acc.build(usage, final_metadata, final=True)
 
     def _parse_gemini_generation_response(
         self,
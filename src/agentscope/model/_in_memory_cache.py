@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""The in-memory chat response cache with the LRU eviction."""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Literal
+
+from ._cache_base import ChatCacheBase
+from ._model_response import ChatResponse
+from ..types import JSONSerializableObject
+
+
+class InMemoryChatCache(ChatCacheBase):
+    """The chat response cache in memory, which evicts the least recently
+    used responses beyond the maximum number of entries."""
+
+    def __init__(
+        self,
+        max_entries: int | None = 1024,
+        mode: Literal["read_through", "record", "replay"] = "read_through",
+    ) -> None:
+        """Initialize the in-memory chat cache.
+
+        Args:
+            max_entries (`int | None`, defaults to `1024`):
+                The maximum number of the cached requests. If `None`, no
+                limit.
+            mode (`Literal["read_through", "record", "replay"]`, defaults \
+            to `"read_through"`):
+                The cache mode, refer to `ChatCacheBase` for details.
+        """
+        super().__init__(mode)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, list[ChatResponse]] = OrderedDict()
+
+    async def store(
+        self,
+        responses: list[ChatResponse],
+        identifier: JSONSerializableObject,
+        overwrite: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Store the responses with the given identifier.
+
+        Args:
+            responses (`list[ChatResponse]`):
+                The responses to store.
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+            overwrite (`bool`, defaults to `False`):
+                Whether to overwrite the existing responses with the same
+                identifier.
+        """
+        key = self._get_key(identifier)
+        if key in self._entries and not overwrite:
+            return
+
+        self._entries[key] = list(responses)
+        self._entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def retrieve(
+        self,
+        identifier: JSONSerializableObject,
+    ) -> list[ChatResponse] | None:
+        """Retrieve the responses with the given identifier. If not found,
+        return `None`.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+        """
+        key = self._get_key(identifier)
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    async def remove(self, identifier: JSONSerializableObject) -> None:
+        """Remove the responses with the given identifier.
+
+        Args:
+            identifier (`JSONSerializableObject`):
+                The identifier of the request.
+        """
+        self._entries.pop(self._get_key(identifier), None)
+
+    async def clear(self) -> None:
+        """Clear all cached responses."""
+        self._entries.clear()
+
+    @staticmethod
+    def _get_key(identifier: JSONSerializableObject) -> str:
+        """Get the key of the identifier."""
+        json_str = json.dumps(identifier, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(json_str.encode("utf-8")).hexdigest()
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 """The chat model base class."""
 
+import hashlib
+import json
 from abc import abstractmethod
-from typing import AsyncGenerator, Any
+from typing import AsyncGenerator, Any, Literal
 
+from pydantic import BaseModel
+
+from ._cache_base import ChatCacheBase
 from ._model_response import ChatResponse
+from ._rate_limiter import RateLimiter
 
 TOOL_CHOICE_MODES = ["auto", "none", "any", "required"]
 
@@ -18,10 +24,30 @@ class ChatModelBase:
     stream: bool
     """Is the model output streaming or not"""
 
+    stream_mode: Literal["accumulated", "delta"]
+    """In streaming mode, whether each yielded response holds the full
+    content received so far (`"accumulated"`) or only what changed since the
+    last one (`"delta"`)"""
+
+    rate_limiter: RateLimiter | None
+    """The rate limiter applied to the requests, which can be shared by
+    multiple models"""
+
+    response_cache: ChatCacheBase | None
+    """The cache of the responses by the requests"""
+
+    _cache_config: tuple[str, ...] = ()
+    """The attributes of the model affecting its responses besides the
+    request arguments, e.g. the generation keyword arguments, which are
+    included in the cache identifier"""
+
     def __init__(
         self,
         model_name: str,
         stream: bool,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ChatCacheBase | None = None,
     ) -> None:
         """Initialize the chat model base class.
 
@@ -30,9 +56,26 @@ class ChatModelBase:
                 The name of the model
             stream (`bool`):
                 Whether the model output is streaming or not
+            stream_mode (`Literal["accumulated", "delta"]`, defaults to \
+            `"accumulated"`):
+                In streaming mode, `"accumulated"` yields responses with the
+                full content received so far, while `"delta"` only yields
+                the newly received text/thinking/audio pieces and the tool
+                use blocks once their arguments are complete.
+            rate_limiter (`RateLimiter | None`, optional):
+                The rate limiter applied to the requests of the model, which
+                can be shared by the models using the same endpoint. If
+                `None`, the requests are not limited.
+            response_cache (`ChatCacheBase | None`, optional):
+                The cache of the responses, which answers the identical
+                requests by the mode of the cache. If `None`, the responses
+                are not cached.
         """
         self.model_name = model_name
         self.stream = stream
+        self.stream_mode = stream_mode
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
 
     @abstractmethod
     async def __call__(
@@ -42,6 +85,45 @@ class ChatModelBase:
     ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
         pass
 
+    def _get_cache_identifier(self, *args: Any, **kwargs: Any) -> dict:
+        """Get the cache identifier of a request, which consists of the
+        model name, the streaming settings, and the canonical hash of the
+        request arguments (e.g. the formatted messages, the tools and the
+        generation keyword arguments) together with the attributes in
+        `_cache_config`.
+
+        Args:
+            *args (`Any`):
+                The positional arguments of the request.
+            **kwargs (`Any`):
+                The keyword arguments of the request.
+        """
+
+        def _default(obj: Any) -> Any:
+            if isinstance(obj, type) and issubclass(obj, BaseModel):
+                return obj.model_json_schema()
+            return repr(obj)
+
+        json_str = json.dumps(
+            {
+                "args": args,
+                "kwargs": kwargs,
+                "config": {
+                    _: getattr(self, _, None) for _ in self._cache_config
+                },
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=_default,
+        )
+        return {
+            "class": self.__class__.__name__,
+            "model": self.model_name,
+            "stream": self.stream,
+            "stream_mode": self.stream_mode,
+            "request": hashlib.sha256(json_str.encode("utf-8")).hexdigest(),
+        }
+
     def _validate_tool_choice(
         self,
         tool_choice: str,
@@ -40,3 +40,14 @@ class ChatResponse(DictMixin):
         default_factory=lambda: None,
     )
     """The metadata of the chat response"""
+
+    completed_tool_call_ids: list[str] | None = field(
+        default_factory=lambda: None,
+    )
+    """The IDs of the tool calls whose arguments have been completely
+    received in a streaming response, so that they can be executed before
+    the stream ends. `None` if not tracked, e.g. for non-streaming
+    responses."""
+
+    source: Literal["cache", "api"] = field(default_factory=lambda: "api")
+    """If the response comes from the cache or the API."""
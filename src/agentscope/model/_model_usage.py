@@ -19,5 +19,9 @@ class ChatUsage(DictMixin):
     time: float
     """The time used in seconds."""
 
+    queue_time: float = field(default_factory=lambda: 0.0)
+    """The time in seconds waiting in the rate limiter of the model before
+    sending the request, including the backoff of the retries."""
+
     type: Literal["chat"] = field(default_factory=lambda: "chat")
     """The type of the usage, must be `chat`."""
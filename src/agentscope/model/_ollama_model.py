@@ -10,13 +10,15 @@ from typing import (
     Literal,
     Type,
 )
-from collections import OrderedDict
 
 from pydantic import BaseModel
 
 from . import ChatResponse
+from ._cache_base import ChatCacheBase, _cached
 from ._model_base import ChatModelBase
+from ._rate_limiter import RateLimiter, _rate_limited
 from ._model_usage import ChatUsage
+from ._stream_accumulator import _StreamAccumulator
 from .._logging import logger
 from .._utils._common import _json_loads_with_repair
 from ..message import ToolUseBlock, TextBlock, ThinkingBlock
@@ -32,6 +34,8 @@ else:
 class OllamaChatModel(ChatModelBase):
     """The Ollama chat model class in agentscope."""
 
+    _cache_config = ("options", "think")
+
     def __init__(
         self,
         model_name: str,
@@ -40,6 +44,9 @@ class OllamaChatModel(ChatModelBase):
         keep_alive: str = "5m",
         enable_thinking: bool | None = None,
         host: str | None = None,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ChatCacheBase | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the Ollama chat model.
@@ -63,6 +70,16 @@ class OllamaChatModel(ChatModelBase):
            host (`str | None`, default `None`):
                The host address of the Ollama server. If None, uses the
                default address (typically http://localhost:11434).
+           stream_mode (`Literal["accumulated", "delta"]`, default \
+           `"accumulated"`):
+               Yield the full content received so far or only the changes
+               in streaming mode.
+           rate_limiter (`RateLimiter | None`, default `None`):
+               The rate limiter applied to the requests, which can be
+               shared by the models using the same endpoint.
+           response_cache (`ChatCacheBase | None`, default `None`):
+               The cache of the responses, which answers the identical
+               requests by the mode of the cache.
            **kwargs (`Any`):
                Additional keyword arguments to pass to the base chat model
                class.
@@ -76,7 +93,13 @@ class OllamaChatModel(ChatModelBase):
                 'running command `pip install "ollama>=0.1.7"`',
             ) from e
 
-        super().__init__(model_name, stream)
+        super().__init__(
+            model_name,
+            stream,
+            stream_mode,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
 
         self.client = ollama.AsyncClient(
             host=host,
@@ -87,6 +110,8 @@ class OllamaChatModel(ChatModelBase):
         self.think = enable_thinking
 
     @trace_llm
+    @_cached
+    @_rate_limited
     async def __call__(
         self,
         messages: list[dict[str, Any]],
@@ -192,27 +217,40 @@ class OllamaChatModel(ChatModelBase):
             will be stored in the metadata of the `ChatResponse`.
 
         """
-        accumulated_text = ""
-        acc_thinking_content = ""
-        tool_calls = OrderedDict()  # Store tool calls
+        acc = _StreamAccumulator(
+            self.stream_mode,
+            text_as_json=structured_model is not None,
+        )
         metadata: dict | None = None
 
         async for chunk in response:
             # Handle text content
             msg = chunk.message
-            acc_thinking_content += msg.thinking or ""
-            accumulated_text += msg.content or ""
+            acc.add_thinking(msg.thinking)
+            acc.add_text(msg.content)
 
             # Handle tool calls
             for idx, tool_call in enumerate(msg.tool_calls or []):
                 function = tool_call.function
                 tool_id = f"{idx}_{function.name}"
-                tool_calls[tool_id] = {
-                    "type": "tool_use",
-                    "id": tool_id,
-                    "name": function.name,
-                    "input": function.arguments,
-                }
+                if isinstance(function.arguments, str):
+                    acc.add_tool_call(
+                        tool_id,
+                        tool_id=tool_id,
+                        name=function.name,
+                        arguments=function.arguments,
+                    )
+                else:
+                    acc.set_tool_call(
+                        tool_id,
+                        tool_id=tool_id,
+                        name=function.name,
+                        tool_input=function.arguments,
+                    )
+
+            if structured_model:
+                metadata = acc.get_text_json(force=chunk.done)
+
             # Calculate usage statistics
             current_time = (datetime.now() - start_datetime).total_seconds()
             usage = ChatUsage(
@@ -220,47 +258,15 @@ class OllamaChatModel(ChatModelBase):
                 output_tokens=getattr(chunk, "eval_count", 0) or 0,
                 time=current_time,
             )
-            # Create content blocks
-            contents: list = []
-
-            if acc_thinking_content:
-                contents.append(
-                    ThinkingBlock(
-                        type="thinking",
-                        thinking=acc_thinking_content,
-                    ),
-                )
 
-            if accumulated_text:
-                contents.append(TextBlock(type="text", text=accumulated_text))
-                if structured_model:
-                    metadata = _json_loads_with_repair(accumulated_text)
-
-            # Add tool call blocks
-            for tool_call in tool_calls.values():
-                try:
-                    input_data = tool_call["input"]
-                    if isinstance(input_data, str):
-                        input_data = _json_loads_with_repair(input_data)
-                    contents.append(
-                        ToolUseBlock(
-                            type=tool_call["type"],
-                            id=tool_call["id"],
-                            name=tool_call["name"],
-                            input=input_data,
-                        ),
-                    )
-                except Exception as e:
-                    print(f"Error parsing tool call input: {e}")
-
-            # Generate response when there's new content or at final chunk
-            if chunk.done and contents:
-                res = ChatResponse(
-                    content=contents,
-                    usage=usage,
-                    metadata=metadata,
-                )
-                yield res
+            # In accumulated mode, only the final response is generated
+            if chunk.done:
+                acc.finish()
+                if acc.has_content:
+                    yield acc.build(usage, metadata, final=True)
+
+            elif acc.mode == "delta" and acc.has_changes:
+                yield acc.build(usage, metadata)
 
     async def _parse_ollama_completion_response(
         self,
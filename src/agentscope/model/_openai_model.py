@@ -10,13 +10,14 @@ from typing import (
     Literal,
     Type,
 )
-from collections import OrderedDict
-
 from pydantic import BaseModel
 
 from . import ChatResponse
+from ._cache_base import ChatCacheBase, _cached
 from ._model_base import ChatModelBase
+from ._rate_limiter import RateLimiter, _rate_limited
 from ._model_usage import ChatUsage
+from ._stream_accumulator import _StreamAccumulator
 from .._logging import logger
 from .._utils._common import _json_loads_with_repair
 from ..message import (
@@ -40,6 +41,8 @@ else:
 class OpenAIChatModel(ChatModelBase):
     """The OpenAI chat model class."""
 
+    _cache_config = ("reasoning_effort", "generate_kwargs")
+
     def __init__(
         self,
         model_name: str,
@@ -49,6 +52,9 @@ class OpenAIChatModel(ChatModelBase):
         organization: str = None,
         client_args: dict = None,
         generate_kwargs: dict[str, JSONSerializableObject] | None = None,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ChatCacheBase | None = None,
     ) -> None:
         """Initialize the openai client.
 
@@ -75,22 +81,47 @@ class OpenAIChatModel(ChatModelBase):
              optional):
                The extra keyword arguments used in OpenAI API generation,
                 e.g. `temperature`, `seed`.
+            stream_mode (`Literal["accumulated", "delta"]`, default \
+            `"accumulated"`):
+                Yield the full content received so far or only the changes
+                in streaming mode.
+            rate_limiter (`RateLimiter | None`, default `None`):
+                The rate limiter applied to the requests, which can be
+                shared by the models using the same endpoint. The retries of
+                the OpenAI client are disabled when it's given, unless
+                `max_retries` is specified in `client_args`.
+            response_cache (`ChatCacheBase | None`, default `None`):
+                The cache of the responses, which answers the identical
+                requests by the mode of the cache.
         """
 
-        super().__init__(model_name, stream)
+        super().__init__(
+            model_name,
+            stream,
+            stream_mode,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
 
         import openai
 
+        client_args = dict(client_args or {})
+        if rate_limiter is not None:
+            # The rate limited requests are retried by the rate limiter
+            client_args.setdefault("max_retries", 0)
+
         self.client = openai.AsyncClient(
             api_key=api_key,
             organization=organization,
-            **(client_args or {}),
+            **client_args,
         )
 
         self.reasoning_effort = reasoning_effort
         self.generate_kwargs = generate_kwargs or {}
 
     @trace_llm
+    @_cached
+    @_rate_limited
     async def __call__(
         self,
         messages: list[dict],
@@ -244,15 +275,16 @@ class OpenAIChatModel(ChatModelBase):
             If `structured_model` is not `None`, the expected structured output
             will be stored in the metadata of the `ChatResponse`.
         """
-        usage, res = None, None
-        text = ""
-        thinking = ""
-        audio = ""
-        tool_calls = OrderedDict()
+        usage = None
         metadata: dict | None = None
-        contents: List[
-            TextBlock | ToolUseBlock | ThinkingBlock | AudioBlock
-        ] = []
+        acc = _StreamAccumulator(
+            self.stream_mode,
+            text_as_json=structured_model is not None,
+        )
+        media_type = self.generate_kwargs.get("audio", {}).get(
+            "format",
+            "wav",
+        )
 
         async with response as stream:
             async for item in stream:
@@ -271,106 +303,51 @@ class OpenAIChatModel(ChatModelBase):
                     )
 
                 if not chunk.choices:
-                    if usage and contents:
-                        res = ChatResponse(
-                            content=contents,
-                            usage=usage,
-                            metadata=metadata,
-                        )
-                        yield res
+                    if usage and acc.has_content:
+                        yield acc.build(usage, metadata)
                     continue
 
                 choice = chunk.choices[0]
 
-                thinking += (
-                    getattr(choice.delta, "reasoning_content", None) or ""
+                acc.add_thinking(
+                    getattr(choice.delta, "reasoning_content", None),
                 )
-                text += choice.delta.content or ""
+                acc.add_text(choice.delta.content)
 
                 if (
                     hasattr(choice.delta, "audio")
                     and "data" in choice.delta.audio
                 ):
-                    audio += choice.delta.audio["data"]
+                    acc.add_audio(
+                        choice.delta.audio["data"],
+                        f"audio/{media_type}",
+                    )
                 if (
                     hasattr(choice.delta, "audio")
                     and "transcript" in choice.delta.audio
                 ):
-                    text += choice.delta.audio["transcript"]
+                    acc.add_text(choice.delta.audio["transcript"])
 
                 for tool_call in choice.delta.tool_calls or []:
-                    if tool_call.index in tool_calls:
-                        if tool_call.function.arguments is not None:
-                            tool_calls[tool_call.index][
-                                "input"
-                            ] += tool_call.function.arguments
-
-                    else:
-                        tool_calls[tool_call.index] = {
-                            "type": "tool_use",
-                            "id": tool_call.id,
-                            "name": tool_call.function.name,
-                            "input": tool_call.function.arguments or "",
-                        }
-
-                contents = []
-
-                if thinking:
-                    contents.append(
-                        ThinkingBlock(
-                            type="thinking",
-                            thinking=thinking,
-                        ),
-                    )
-
-                if audio:
-                    media_type = self.generate_kwargs.get("audio", {}).get(
-                        "format",
-                        "wav",
-                    )
-                    contents.append(
-                        AudioBlock(
-                            type="audio",
-                            source=Base64Source(
-                                data=audio,
-                                media_type=f"audio/{media_type}",
-                                type="base64",
-                            ),
-                        ),
-                    )
-
-                if text:
-                    contents.append(
-                        TextBlock(
-                            type="text",
-                            text=text,
-                        ),
+                    acc.add_tool_call(
+                        tool_call.index,
+                        tool_id=tool_call.id,
+                        name=tool_call.function.name,
+                        arguments=tool_call.function.arguments,
                     )
 
-                    if structured_model:
-                        metadata = _json_loads_with_repair(text)
-
-                for tool_call in tool_calls.values():
-                    contents.append(
-                        ToolUseBlock(
-                            type=tool_call["type"],
-                            id=tool_call["id"],
-                            name=tool_call["name"],
-                            input=_json_loads_with_repair(
-                                tool_call["input"] or "{}",
-                            ),
-                        ),
-                    )
+                if structured_model and acc.has_content:
+                    metadata = acc.get_text_json()
 
-                if not contents:
+                if not acc.has_changes:
                     continue
 
-                res = ChatResponse(
-                    content=contents,
-                    usage=usage,
-                    metadata=metadata,
-                )
-                yield res
+                yield acc.build(usage, metadata)
+
+        if acc.finish():
+            if structured_model:
+                metadata = acc.get_text_json(force=True)
+            yield acc.build(usage, metadata, final=True)
 
     def _parse_openai_completion_response(
         self,
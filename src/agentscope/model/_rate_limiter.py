@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+"""The rate limiter shared by the chat models in agentscope."""
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from functools import wraps
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Mapping,
+    TYPE_CHECKING,
+)
+
+from ._model_response import ChatResponse
+from .._logging import logger
+from ..token._token_estimator import _estimate_text_tokens
+
+if TYPE_CHECKING:
+    from ._model_base import ChatModelBase
+else:
+    ChatModelBase = "ChatModelBase"
+
+
+class _TokenBucket:
+    """The token bucket that reserves the capacity in advance, so that the
+    waiting callers are served in order without polling. The level can go
+    negative, which is the debt paid by the later callers.
+
+    A reservation is a ticket of the total refill it needs, so that the
+    refunds, e.g. the unused estimated tokens, shorten the waits of the
+    callers queued behind."""
+
+    def __init__(self, per_minute: float) -> None:
+        """Initialize the token bucket.
+
+        Args:
+            per_minute (`float`):
+                The capacity of the bucket, refilled within one minute.
+        """
+        self.capacity = per_minute
+        self.level = per_minute
+        self._refilled = 0.0
+        self._updated_at = time.monotonic()
+
+    def reserve(self, amount: float, scale: float) -> float:
+        """Take the amount from the bucket, and return the ticket to wait
+        for by `wait_time`. The amount is capped by the capacity, so that
+        a large request doesn't wait forever.
+
+        Args:
+            amount (`float`):
+                The amount to take.
+            scale (`float`):
+                The ratio of the refill rate to use, which is lowered by the
+                adaptive backoff.
+        """
+        self._refill(scale)
+        self.level -= min(amount, self.capacity)
+        return self._refilled - min(self.level, 0.0)
+
+    def wait_time(self, ticket: float, scale: float) -> float:
+        """Get the seconds to wait until the reservation of the ticket is
+        available.
+
+        Args:
+            ticket (`float`):
+                The ticket returned by `reserve`.
+            scale (`float`):
+                The ratio of the refill rate to use.
+        """
+        self._refill(scale)
+        return max(ticket - self._refilled, 0.0) / (self.capacity / 60 * scale)
+
+    def refund(self, amount: float) -> None:
+        """Return the amount to the bucket, or take more if negative."""
+        self._add(amount)
+
+    def _refill(self, scale: float) -> None:
+        """Refill the bucket by the elapsed time."""
+        now = time.monotonic()
+        self._add((now - self._updated_at) * self.capacity / 60 * scale)
+        self._updated_at = now
+
+    def _add(self, amount: float) -> None:
+        """Add the amount to the level, which is capped by the capacity."""
+        level = min(self.level + amount, self.capacity)
+        self._refilled += level - self.level
+        self.level = level
+
+
+class RateLimiter:
+    """The provider-agnostic rate limiter of the chat model requests, which
+    combines the requests per minute and tokens per minute token buckets,
+    a pool bounding the in-flight requests and the adaptive retry of the
+    rate limited (HTTP 429) requests.
+
+    A rate limiter can be shared by the model instances sending requests to
+    the same endpoint, e.g. the agents in a `fanout_pipeline`, either by
+    passing the same instance or by `RateLimiter.shared`. When a request is
+    rate limited, all requests sharing the limiter pause for the delay given
+    by the response headers (or the exponential backoff without them), and
+    the refill rates are lowered, which are recovered gradually by the
+    successful requests.
+
+    The time waiting in the limiter is recorded in the `queue_time` field of
+    the `ChatUsage`.
+
+    Example:
+        .. code-block:: python
+
+            limiter = RateLimiter.shared(
+                "https://api.openai.com/v1",
+                requests_per_minute=500,
+                tokens_per_minute=200_000,
+                max_concurrency=16,
+            )
+            model = OpenAIChatModel("gpt-4o", rate_limiter=limiter)
+    """
+
+    _shared: dict[str, "RateLimiter"] = {}
+    _shared_kwargs: dict[str, dict[str, Any]] = {}
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int | None = None,
+        max_retries: int = 5,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute (`float | None`, optional):
+                The maximum number of requests per minute. If `None`, not
+                limited.
+            tokens_per_minute (`float | None`, optional):
+                The maximum number of the input and output tokens per
+                minute. The tokens of a request are estimated from its
+                messages before sending, and corrected by the usage in the
+                response. If `None`, not limited.
+            max_concurrency (`int | None`, optional):
+                The maximum number of the in-flight requests, where a
+                streaming request is in flight until its stream ends. If
+                `None`, not limited.
+            max_retries (`int`, defaults to `5`):
+                The maximum number of retries of a rate limited request.
+            initial_backoff (`float`, defaults to `1.0`):
+                The delay in seconds before the first retry if the response
+                doesn't give one, which is doubled for each retry.
+            max_backoff (`float`, defaults to `60.0`):
+                The maximum delay in seconds before a retry.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self._requests = (
+            _TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._tokens = (
+            _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+
+        # The ratio of the refill rates, lowered when rate limited
+        self._scale = 1.0
+        # The requests are paused until this time when rate limited
+        self._blocked_until = 0.0
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # Set to wake up the requests waiting for the buckets when the
+        # tokens are refunded
+        self._refunded: asyncio.Event | None = None
+
+    @classmethod
+    def shared(cls, endpoint: str, **kwargs: Any) -> "RateLimiter":
+        """Get the rate limiter shared by the models sending requests to the
+        given endpoint, which is created with the keyword arguments on the
+        first call. The keyword arguments of the later calls can be
+        omitted, and a warning is logged if they differ, as they are ignored.
+
+        Args:
+            endpoint (`str`):
+                The endpoint, e.g. the base URL of the API, or any key
+                identifying the quota.
+            **kwargs (`Any`):
+                The keyword arguments to initialize the rate limiter.
+        """
+        if endpoint not in cls._shared:
+            cls._shared[endpoint] = cls(**kwargs)
+            cls._shared_kwargs[endpoint] = kwargs
+        elif kwargs and kwargs != cls._shared_kwargs[endpoint]:
+            logger.warning(
+                "The rate limiter of endpoint '%s' is already created with "
+                "%s, the different arguments %s are ignored.",
+                endpoint,
+                cls._shared_kwargs[endpoint],
+                kwargs,
+            )
+        return cls._shared[endpoint]
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait until a request with the estimated tokens can be sent, and
+        take an in-flight slot, which must be released by `release`.
+
+        Args:
+            tokens (`int`, defaults to `0`):
+                The estimated number of tokens of the request.
+
+        Returns:
+            `float`:
+                The seconds waited.
+        """
+        start = time.monotonic()
+
+        await self._wait_for_buckets(tokens)
+
+        if (
+            self.max_concurrency is not None
+            and self._in_flight >= self.max_concurrency
+        ):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    # The slot was handed over, pass it to the next waiter
+                    self.release()
+                raise
+        else:
+            self._in_flight += 1
+
+        # A rate limited request may have paused the others meanwhile
+        wait = self._blocked_until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        return time.monotonic() - start
+
+    async def _wait_for_buckets(self, tokens: int) -> None:
+        """Reserve the request and the tokens from the buckets, and wait
+        until they're available. The buckets are re-checked after each
+        sleep, which is woken up early by the refunds, as the refunds and
+        the adaptive backoff change the waits meanwhile."""
+        reservations = []
+        if self._requests is not None:
+            reservations.append(
+                (self._requests, 1, self._requests.reserve(1, self._scale)),
+            )
+        if self._tokens is not None and tokens:
+            reservations.append(
+                (
+                    self._tokens,
+                    tokens,
+                    self._tokens.reserve(tokens, self._scale),
+                ),
+            )
+
+        try:
+            while True:
+                wait = max(
+                    [self._blocked_until - time.monotonic()]
+                    + [
+                        bucket.wait_time(ticket, self._scale)
+                        for bucket, _, ticket in reservations
+                    ],
+                )
+                if wait <= 0:
+                    return
+
+                if self._refunded is None:
+                    self._refunded = asyncio.Event()
+                try:
+                    await asyncio.wait_for(self._refunded.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+        except asyncio.CancelledError:
+            # Return the reservations to the requests queued behind
+            for bucket, amount, _ in reservations:
+                bucket.refund(amount)
+            raise
+
+    def release(self, estimated_tokens: int = 0, used_tokens: int = 0) -> None:
+        """Release the in-flight slot, and correct the tokens taken by the
+        estimation with the actual usage.
+
+        Args:
+            estimated_tokens (`int`, defaults to `0`):
+                The tokens estimated when acquiring.
+            used_tokens (`int`, defaults to `0`):
+                The tokens actually used. If `0`, e.g. the request failed or
+                the usage is unknown, the estimation is kept.
+        """
+        if self._tokens is not None and used_tokens:
+            self._tokens.refund(estimated_tokens - used_tokens)
+            if estimated_tokens > used_tokens and self._refunded is not None:
+                self._refunded.set()
+                self._refunded = None
+
+        # Hand over the slot to the next waiter directly
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+        else:
+            self._in_flight -= 1
+
+    def on_success(self) -> None:
+        """Recover the refill rates gradually after a successful request."""
+        self._scale = min(self._scale + 0.05, 1.0)
+
+    def on_rate_limited(
+        self,
+        headers: Mapping[str, str] | None,
+        n_retry: int,
+    ) -> float:
+        """Pause all requests sharing the limiter for the delay given by the
+        response headers, or the exponential backoff, and halve the refill
+        rates.
+
+        Args:
+            headers (`Mapping[str, str] | None`):
+                The headers of the rate limited response.
+            n_retry (`int`):
+                The number of the retries made so far.
+
+        Returns:
+            `float`:
+                The delay in seconds.
+        """
+        delay = _parse_retry_after(headers)
+        if delay is None:
+            delay = (
+                self.initial_backoff * 2**n_retry * random.uniform(1, 1.5)
+            )
+        delay = min(delay, self.max_backoff)
+
+        self._blocked_until = max(
+            self._blocked_until,
+            time.monotonic() + delay,
+        )
+        self._scale = max(self._scale / 2, 0.1)
+        return delay
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        """Hand over the in-flight slot to the waiter, or to the next one if
+        the waiter is cancelled meanwhile."""
+        if waiter.done():
+            self.release()
+        else:
+            waiter.set_result(None)
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse the duration in the rate limit headers, either in seconds, e.g.
+    `"1.5"`, or with units, e.g. `"6m0s"` and `"20ms"`."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = re.findall(r"([\d.]+)(ms|s|m|h)", value)
+    if not parts:
+        return None
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(number) * units[unit] for number, unit in parts)
+
+
+def _parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
+    """Get the delay in seconds before retrying from the response headers,
+    i.e. `retry-after-ms` and `retry-after`, or the reset time of the
+    exhausted limit in the `x-ratelimit-*` headers of the OpenAI-compatible
+    APIs."""
+    if not headers:
+        return None
+
+    headers = {str(k).lower(): str(v) for k, v in headers.items()}
+    if "retry-after-ms" in headers:
+        delay = _parse_duration(headers["retry-after-ms"])
+        if delay is not None:
+            return delay / 1000
+
+    if "retry-after" in headers:
+        delay = _parse_duration(headers["retry-after"])
+        if delay is not None:
+            return delay
+
+    resets = {}
+    for limit in ["requests", "tokens"]:
+        delay = _parse_duration(headers.get(f"x-ratelimit-reset-{limit}", ""))
+        if delay is not None:
+            resets[limit] = delay
+
+    exhausted = [
+        delay
+        for limit, delay in resets.items()
+        if headers.get(f"x-ratelimit-remaining-{limit}") == "0"
+    ]
+    if exhausted:
+        return max(exhausted)
+    return min(resets.values()) if resets else None
+
+
+def _get_status_code(error: Exception) -> int | None:
+    """Get the HTTP status code of the error raised by the provider SDKs,
+    e.g. `status_code` of the OpenAI, Anthropic and Ollama errors, `code` of
+    the Gemini errors, and the failed DashScope response."""
+    for obj in [error, getattr(error, "response", None), *error.args[:1]]:
+        for name in ["status_code", "code"]:
+            code = getattr(obj, name, None)
+            if isinstance(code, int):
+                return code
+    return None
+
+
+def _get_headers(error: Exception) -> Mapping[str, str] | None:
+    """Get the response headers of the error raised by the provider SDKs."""
+    for obj in [getattr(error, "response", None), error, *error.args[:1]]:
+        headers = getattr(obj, "headers", None)
+        if isinstance(headers, Mapping):
+            return headers
+    return None
+
+
+_MEDIA_TOKENS = 1600
+"""The tokens charged for a media block, i.e. about the upper bound of an
+image after resizing by the APIs."""
+
+_MEDIA_TYPES = {
+    "image",
+    "image_url",
+    "audio",
+    "input_audio",
+    "video",
+    "document",
+    "inline_data",
+}
+
+
+def _estimate_tokens(messages: Any) -> int:
+    """Estimate the number of tokens of the messages roughly from their text
+    parts, while the media blocks (e.g. base64 images) are charged a fixed
+    cost rather than by the length of their data."""
+    if isinstance(messages, str):
+        if messages.startswith("data:"):
+            return _MEDIA_TOKENS
+        return _estimate_text_tokens(messages)
+
+    if isinstance(messages, dict):
+        if messages.get("type") in _MEDIA_TYPES:
+            return _MEDIA_TOKENS
+        total = 0
+        for key, value in messages.items():
+            if key in _MEDIA_TYPES:
+                total += _MEDIA_TOKENS
+            elif key == "images" and isinstance(value, list):
+                # e.g. the base64 images in the Ollama messages
+                total += _MEDIA_TOKENS * len(value)
+            elif key not in ["role", "type"]:
+                total += _estimate_tokens(value)
+        return total
+
+    if isinstance(messages, (list, tuple)):
+        return sum(_estimate_tokens(_) for _ in messages)
+
+    return 0
+
+
+def _set_queue_time(
+    response: ChatResponse,
+    queue_time: float,
+) -> ChatResponse:
+    """Record the queue time in the usage of the response."""
+    if response.usage is not None:
+        response.usage.queue_time = queue_time
+    return response
+
+
+def _used_tokens(response: ChatResponse | None) -> int:
+    """Get the total tokens used by the response."""
+    if response is None or response.usage is None:
+        return 0
+    return response.usage.input_tokens + response.usage.output_tokens
+
+
+async def _limit_stream(
+    limiter: RateLimiter,
+    first: ChatResponse,
+    stream: AsyncGenerator[ChatResponse, None],
+    estimated_tokens: int,
+    queue_time: float,
+) -> AsyncGenerator[ChatResponse, None]:
+    """Yield the streaming responses, and release the in-flight slot when
+    the stream ends."""
+    last = first
+    try:
+        yield _set_queue_time(first, queue_time)
+        async for chunk in stream:
+            last = chunk
+            yield _set_queue_time(chunk, queue_time)
+    finally:
+        limiter.release(estimated_tokens, _used_tokens(last))
+
+
+def _rate_limited(
+    func: Callable[..., Coroutine[Any, Any, Any]],
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """The decorator applying the `rate_limiter` of the chat model to its
+    `__call__` function. The request is sent after acquiring the limiter,
+    and retried if rate limited. For a streaming request, the first
+    response is awaited within the retries, as some APIs report the rate
+    limit in the stream."""
+
+    @wraps(func)
+    async def wrapper(
+        self: ChatModelBase,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        limiter: RateLimiter | None = getattr(self, "rate_limiter", None)
+        if limiter is None:
+            return await func(self, *args, **kwargs)
+
+        estimated_tokens = (
+            _estimate_tokens(args[0] if args else kwargs.get("messages")) + 1
+        )
+
+        queue_time = 0.0
+        n_retry = 0
+        while True:
+            queue_time += await limiter.acquire(estimated_tokens)
+            try:
+                res = await func(self, *args, **kwargs)
+                if isinstance(res, AsyncGenerator):
+                    first = await anext(res)
+
+            except StopAsyncIteration:
+                limiter.release()
+                return res
+
+            except Exception as e:
+                limiter.release()
+                if (
+                    _get_status_code(e) != 429
+                    or n_retry >= limiter.max_retries
+                ):
+                    raise
+
+                delay = limiter.on_rate_limited(_get_headers(e), n_retry)
+                n_retry += 1
+                logger.warning(
+                    "The request of model %s is rate limited, retrying in "
+                    "%.2fs (%d/%d).",
+                    self.model_name,
+                    delay,
+                    n_retry,
+                    limiter.max_retries,
+                )
+                continue
+
+            except BaseException:
+                # e.g. cancelled
+                limiter.release()
+                raise
+
+            limiter.on_success()
+            if isinstance(res, AsyncGenerator):
+                return _limit_stream(
+                    limiter,
+                    first,
+                    res,
+                    estimated_tokens,
+                    queue_time,
+                )
+
+            limiter.release(estimated_tokens, _used_tokens(res))
+            return _set_queue_time(res, queue_time)
+
+    return wrapper
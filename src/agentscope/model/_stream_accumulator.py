@@ -0,0 +1,587 @@
+# -*- coding: utf-8 -*-
+"""The incremental accumulator shared by the streaming response parsers of
+the chat models."""
+import json
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Literal, Sequence
+
+from ._model_response import ChatResponse
+from ._model_usage import ChatUsage
+from .._utils._common import _json_loads_with_repair
+from ..message import (
+    TextBlock,
+    ThinkingBlock,
+    AudioBlock,
+    ToolUseBlock,
+    Base64Source,
+)
+
+
+class _IncrementalJSONParser:
+    """Parse a JSON string that arrives in pieces.
+
+    Each piece is scanned once to track the nesting depth, so that we know
+    when the top-level value is complete without re-reading the whole
+    buffer. The (expensive) repair-and-load of the partial buffer is only
+    redone when a top-level member has been closed or the buffer has doubled
+    in size since the last parse, which keeps the total parsing cost linear
+    in the length of the string.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the incremental JSON parser."""
+        self._parts: list[str] = []
+        self._length = 0
+
+        # The scanner state
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self._complete = False
+        self._boundary = False
+
+        # The parsing cache
+        self._value: Any = None
+        self._parsed_length = -1
+
+    @property
+    def complete(self) -> bool:
+        """If the top-level JSON value (object, array or string) is closed."""
+        return self._complete
+
+    @property
+    def pending(self) -> bool:
+        """If the received string has not been fully parsed yet."""
+        return self._length > 0 and self._parsed_length != self._length
+
+    @property
+    def text(self) -> str:
+        """The raw JSON string received so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def feed(self, delta: str) -> None:  # pylint: disable=too-many-branches
+        """Append a piece of the JSON string.
+
+        Args:
+            delta (`str`):
+                The newly received piece of the JSON string.
+        """
+        if not delta:
+            return
+        self._parts.append(delta)
+        self._length += len(delta)
+
+        for char in delta:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        self._complete = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._started = True
+            elif char in "{[":
+                self._depth += 1
+                self._started = True
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth <= 1:
+                    self._boundary = True
+                if self._depth == 0 and self._started:
+                    self._complete = True
+            elif char == "," and self._depth == 1:
+                self._boundary = True
+
+    def parse(self, force: bool = False) -> Any:
+        """Get the parsed value of the received JSON string. The cached value
+        is returned if the buffer has not grown enough to be worth parsing
+        again.
+
+        Args:
+            force (`bool`, defaults to `False`):
+                Parse the current buffer regardless of the throttling, e.g.
+                when the stream is finished.
+
+        Returns:
+            `Any`:
+                The (possibly repaired) parsed value, or `None` if nothing
+                has been received.
+        """
+        if not self.pending:
+            return self._value
+
+        if not (
+            force
+            or self._complete
+            or self._boundary
+            or self._parsed_length < 0
+            or self._length >= 2 * self._parsed_length
+        ):
+            return self._value
+
+        text = self.text
+        value = None
+        if self._complete:
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError:
+                value = None
+
+        if value is None:
+            try:
+                value = _json_loads_with_repair(text)
+            except ValueError:
+                value = self._value
+
+        self._value = value
+        self._parsed_length = self._length
+        self._boundary = False
+        return value
+
+
+class _ToolCallState:
+    """The accumulated state of a single streaming tool call."""
+
+    def __init__(self, tool_id: str, name: str) -> None:
+        """Initialize the tool call state.
+
+        Args:
+            tool_id (`str`):
+                The identity of the tool call.
+            name (`str`):
+                The name of the tool.
+        """
+        self.arguments = _IncrementalJSONParser()
+        self.block = ToolUseBlock(
+            type="tool_use",
+            id=tool_id,
+            name=name,
+            input={},
+        )
+        # If the input is given as a parsed object rather than a JSON string
+        self.fixed_input = False
+        self.changed = True
+        self.emitted = False
+
+    @property
+    def complete(self) -> bool:
+        """If the arguments of the tool call are completely received."""
+        return self.fixed_input or self.arguments.complete
+
+    def refresh(self, force: bool = False) -> None:
+        """Update the input of the tool use block in place from the received
+        arguments."""
+        if self.fixed_input:
+            return
+        value = self.arguments.parse(force=force)
+        if not isinstance(value, dict):
+            value = {}
+        self.block["input"] = value
+
+
+class _StreamAccumulator:
+    """Accumulate the chunks of a streaming chat response incrementally.
+
+    The text, thinking and audio pieces are kept in append-only buffers, the
+    tool call arguments are parsed by :class:`_IncrementalJSONParser`, and
+    the content blocks are created once and updated in place. The yielded
+    `ChatResponse` objects depend on the mode:
+
+    - ``"accumulated"``: the content holds the full content received so far,
+      which is the default behavior of the chat models. Note the blocks are
+      shared between the yielded responses and updated in place.
+    - ``"delta"``: the content only holds what changed since the last
+      yielded response, i.e. the new text/thinking/audio pieces and the tool
+      use blocks whose arguments have just been completed.
+    """
+
+    def __init__(
+        self,
+        mode: Literal["accumulated", "delta"] = "accumulated",
+        text_as_json: bool = False,
+    ) -> None:
+        """Initialize the stream accumulator.
+
+        Args:
+            mode (`Literal["accumulated", "delta"]`, defaults to \
+            `"accumulated"`):
+                The yield mode, refer to the class docstring for details.
+            text_as_json (`bool`, defaults to `False`):
+                Whether to parse the text content as JSON incrementally, which
+                is used for the structured output of some providers.
+        """
+        assert mode in [
+            "accumulated",
+            "delta",
+        ], f"Invalid stream mode {mode}, expected 'accumulated' or 'delta'."
+        self.mode = mode
+
+        # The append-only buffers of the text, thinking and audio pieces
+        self._parts: dict[str, list[str]] = {
+            "thinking": [],
+            "text": [],
+            "audio": [],
+        }
+        # The joined string of each buffer and the number of pieces in it
+        self._joined = {"thinking": "", "text": "", "audio": ""}
+        self._joined_count = {"thinking": 0, "text": 0, "audio": 0}
+        # The number of pieces that have been emitted in delta mode
+        self._emitted = {"thinking": 0, "text": 0, "audio": 0}
+
+        self._thinking_signature: str | None = None
+        self._signature_emitted = False
+        self._text_json = _IncrementalJSONParser() if text_as_json else None
+        self._audio_media_type = "audio/wav"
+
+        self._blocks: dict[str, TextBlock | ThinkingBlock | AudioBlock] = {}
+        self._tool_calls: OrderedDict[Any, _ToolCallState] = OrderedDict()
+        self._changed = False
+
+    @property
+    def has_content(self) -> bool:
+        """If any content has been received."""
+        return bool(
+            self._tool_calls or any(self._parts.values()),
+        )
+
+    @property
+    def has_changes(self) -> bool:
+        """If any content has been received since the last yielded
+        response."""
+        return self._changed
+
+    @property
+    def text(self) -> str:
+        """The accumulated text content."""
+        return self._materialize("text")
+
+    def add_thinking(self, delta: str | None) -> None:
+        """Append a piece of the thinking content."""
+        if delta:
+            self._parts["thinking"].append(delta)
+            self._changed = True
+
+    def set_thinking_signature(self, signature: str) -> None:
+        """Set the signature of the thinking block, which is emitted once in
+        the delta mode."""
+        if signature and signature != self._thinking_signature:
+            self._thinking_signature = signature
+            self._signature_emitted = False
+            self._changed = True
+
+    def add_text(self, delta: str | None) -> None:
+        """Append a piece of the text content."""
+        if delta:
+            self._parts["text"].append(delta)
+            if self._text_json is not None:
+                self._text_json.feed(delta)
+            self._changed = True
+
+    def add_audio(self, delta: str | None, media_type: str) -> None:
+        """Append a piece of the base64 encoded audio data."""
+        if delta:
+            self._parts["audio"].append(delta)
+            self._audio_media_type = media_type
+            self._changed = True
+
+    def add_tool_call(
+        self,
+        key: Any,
+        tool_id: str | None = None,
+        name: str | None = None,
+        arguments: str | None = None,
+    ) -> None:
+        """Create or update a tool call with a piece of its JSON arguments.
+
+        Args:
+            key (`Any`):
+                The key of the tool call in the stream, e.g. its index.
+            tool_id (`str | None`, optional):
+                The identity of the tool call, only used when the tool call
+                is created.
+            name (`str | None`, optional):
+                The name of the tool, only used when the tool call is
+                created.
+            arguments (`str | None`, optional):
+                The newly received piece of the JSON arguments.
+        """
+        state = self._tool_calls.get(key)
+        if state is None:
+            state = _ToolCallState(tool_id or "", name or "")
+            self._tool_calls[key] = state
+
+        if arguments:
+            state.arguments.feed(arguments)
+            state.changed = True
+        self._changed = True
+
+    def set_tool_call(
+        self,
+        key: Any,
+        tool_id: str,
+        name: str,
+        tool_input: dict,
+    ) -> None:
+        """Create or replace a tool call whose input is already parsed.
+
+        Args:
+            key (`Any`):
+                The key of the tool call in the stream.
+            tool_id (`str`):
+                The identity of the tool call.
+            name (`str`):
+                The name of the tool.
+            tool_input (`dict`):
+                The complete input of the tool call.
+        """
+        state = self._tool_calls.get(key)
+        if state is None:
+            state = _ToolCallState(tool_id, name)
+            self._tool_calls[key] = state
+        state.block["id"] = tool_id
+        state.block["name"] = name
+        state.block["input"] = tool_input
+        state.fixed_input = True
+        state.changed = True
+        self._changed = True
+
+    def get_tool_call(self, key: Any) -> ToolUseBlock | None:
+        """Get the tool use block by its key in the stream."""
+        state = self._tool_calls.get(key)
+        return state.block if state else None
+
+    def update_tool_call(self, key: Any, **fields: str) -> None:
+        """Update the identity or name fields of a tool use block in place,
+        e.g. for providers that stream the tool name in pieces."""
+        state = self._tool_calls[key]
+        for field, value in fields.items():
+            state.block[field] = value
+        state.changed = True
+        self._changed = True
+
+    def get_completed_tool_calls(self) -> list[ToolUseBlock]:
+        """Get the tool use blocks whose arguments have been completely
+        received so far."""
+        completed = []
+        for state in self._tool_calls.values():
+            if state.complete:
+                state.refresh()
+                completed.append(state.block)
+        return completed
+
+    def get_text_json(self, force: bool = False) -> Any:
+        """Get the text content parsed as JSON, only available when the
+        accumulator is created with `text_as_json=True`."""
+        if self._text_json is None:
+            return None
+        return self._text_json.parse(force=force)
+
+    def get_last_tool_input(self) -> dict | None:
+        """Get the input of the last tool call, which is used as the
+        structured output for the tool-based structured output."""
+        if not self._tool_calls:
+            return None
+        state = next(reversed(self._tool_calls.values()))
+        state.refresh()
+        return state.block["input"]
+
+    def finish(self) -> bool:
+        """Parse all the pending tool call arguments regardless of the
+        throttling when the stream is finished.
+
+        Returns:
+            `bool`:
+                If any tool use block is changed, so that the caller should
+                yield a final response.
+        """
+        for state in self._tool_calls.values():
+            if state.arguments.pending:
+                state.refresh(force=True)
+                state.changed = True
+                self._changed = True
+            elif self.mode == "delta" and not state.emitted:
+                self._changed = True
+        return self._changed
+
+    def build(
+        self,
+        usage: ChatUsage | None = None,
+        metadata: dict | None = None,
+        final: bool = False,
+    ) -> ChatResponse:
+        """Build the chat response according to the mode.
+
+        Args:
+            usage (`ChatUsage | None`, optional):
+                The usage information so far.
+            metadata (`dict | None`, optional):
+                The metadata of the response.
+            final (`bool`, defaults to `False`):
+                If the stream is finished, in delta mode the tool calls with
+                incomplete arguments will be emitted.
+
+        Returns:
+            `ChatResponse`:
+                The chat response.
+        """
+        if self.mode == "delta":
+            content = self._build_delta(final)
+        else:
+            content = self._build_accumulated()
+
+        self._changed = False
+        return ChatResponse(
+            content=content,
+            usage=usage,
+            metadata=metadata,
+            completed_tool_call_ids=[
+                state.block["id"]
+                for state in self._tool_calls.values()
+                if state.complete
+            ],
+        )
+
+    def _materialize(self, kind: str) -> str:
+        """Join the pieces received since the last call onto the cached
+        string of the given buffer, and return it."""
+        parts = self._parts[kind]
+        if self._joined_count[kind] < len(parts):
+            self._joined[kind] += "".join(parts[self._joined_count[kind] :])
+            self._joined_count[kind] = len(parts)
+        return self._joined[kind]
+
+    def _build_accumulated(self) -> list:
+        """Build the content with all the received content, the blocks are
+        updated in place."""
+        contents: list = []
+
+        if self._parts["thinking"]:
+            block = self._blocks.setdefault(
+                "thinking",
+                ThinkingBlock(type="thinking", thinking=""),
+            )
+            block["thinking"] = self._materialize("thinking")
+            if self._thinking_signature is not None:
+                block["signature"] = self._thinking_signature
+            contents.append(block)
+
+        if self._parts["audio"]:
+            block = self._blocks.setdefault(
+                "audio",
+                AudioBlock(
+                    type="audio",
+                    source=Base64Source(
+                        type="base64",
+                        media_type=self._audio_media_type,
+                        data="",
+                    ),
+                ),
+            )
+            block["source"]["data"] = self._materialize("audio")
+            contents.append(block)
+
+        if self._parts["text"]:
+            block = self._blocks.setdefault(
+                "text",
+                TextBlock(type="text", text=""),
+            )
+            block["text"] = self._materialize("text")
+            contents.append(block)
+
+        for state in self._tool_calls.values():
+            if state.changed:
+                state.refresh()
+                state.changed = False
+            contents.append(state.block)
+
+        return contents
+
+    def _take_delta(self, kind: str) -> str:
+        """Get the pieces received since the last delta response."""
+        parts = self._parts[kind]
+        start = self._emitted[kind]
+        self._emitted[kind] = len(parts)
+        return "".join(parts[start:])
+
+    def _build_delta(self, final: bool) -> list:
+        """Build the content with only what changed since the last delta
+        response."""
+        contents: list = []
+
+        thinking = self._take_delta("thinking")
+        signature = (
+            None if self._signature_emitted else self._thinking_signature
+        )
+        if thinking or signature is not None:
+            block = ThinkingBlock(type="thinking", thinking=thinking)
+            if signature is not None:
+                block["signature"] = signature
+                self._signature_emitted = True
+            contents.append(block)
+
+        audio = self._take_delta("audio")
+        if audio:
+            contents.append(
+                AudioBlock(
+                    type="audio",
+                    source=Base64Source(
+                        type="base64",
+                        media_type=self._audio_media_type,
+                        data=audio,
+                    ),
+                ),
+            )
+
+        text = self._take_delta("text")
+        if text:
+            contents.append(TextBlock(type="text", text=text))
+
+        for state in self._tool_calls.values():
+            if state.emitted or not (state.complete or final):
+                continue
+            state.refresh(force=True)
+            state.emitted = True
+            state.changed = False
+            contents.append(state.block)
+
+        return contents
+
+
+def _merge_delta_content(content: list, delta: Sequence) -> None:
+    """Merge the content of a delta mode response into the accumulated
+    content in place, where the text, thinking and audio pieces are appended
+    to the existing blocks of the same type, and the tool use blocks, which
+    are emitted once in the delta mode, are appended.
+
+    Args:
+        content (`list`):
+            The accumulated content blocks.
+        delta (`Sequence`):
+            The content blocks of the delta response.
+    """
+    for block in delta:
+        typ = block["type"]
+        existing = None
+        if typ in ["text", "thinking", "audio"]:
+            existing = next((_ for _ in content if _["type"] == typ), None)
+
+        if existing is None:
+            content.append(deepcopy(block))
+        elif typ == "text":
+            existing["text"] += block["text"]
+        elif typ == "thinking":
+            existing["thinking"] += block["thinking"]
+            if "signature" in block:
+                existing["signature"] = block["signature"]
+        else:
+            existing["source"]["data"] += block["source"]["data"]
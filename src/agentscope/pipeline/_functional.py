@@ -82,7 +82,9 @@ async def fanout_pipeline(
         agents (`list[AgentBase]`):
             A list of agents.
         msg (`Msg | list[Msg] | None`, defaults to `None`):
-            The initial input that will be passed to all agents.
+            The initial input that will be passed to all agents. Each agent
+            receives a deep copy of it, unless it's frozen by
+            `Msg.freeze()` and shared among the agents without copying.
         enable_gather (`bool`, defaults to `True`):
             Whether to execute agents concurrently using `asyncio.gather()`.
             If False, agents are executed sequentially.
@@ -95,13 +97,25 @@ async def fanout_pipeline(
     """
     if enable_gather:
         tasks = [
-            asyncio.create_task(agent(deepcopy(msg), **kwargs))
+            asyncio.create_task(agent(_copy_unless_frozen(msg), **kwargs))
             for agent in agents
         ]
 
         return await asyncio.gather(*tasks)
     else:
-        return [await agent(deepcopy(msg), **kwargs) for agent in agents]
+        return [
+            await agent(_copy_unless_frozen(msg), **kwargs) for agent in agents
+        ]
+
+
+def _copy_unless_frozen(msg: Msg | list[Msg] | None) -> Msg | list[Msg] | None:
+    """Copy the input message for each agent, unless it's frozen and can be
+    shared safely."""
+    if isinstance(msg, Msg) and msg.frozen:
+        return msg
+    if isinstance(msg, list) and all(_.frozen for _ in msg):
+        return list(msg)
+    return deepcopy(msg)
 
 
 async def stream_printing_messages(
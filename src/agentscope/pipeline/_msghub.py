@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """MsgHub is designed to share messages among a group of agents."""
+import asyncio
 from typing import Any
 
 import shortuuid
@@ -7,9 +8,77 @@ import shortuuid
 from .._logging import logger
 
 from ..agent import AgentBase
+from ..memory import MessageLog, SharedLogMemory
 from ..message import Msg
 
 
+class _Inbox:
+    """The inbox of a subscriber, whose worker task delivers the messages to
+    the `observe` function of the subscriber one by one, so that the
+    subscriber observes the messages in the order they are broadcast."""
+
+    def __init__(
+        self,
+        agent: AgentBase,
+        maxsize: int,
+        semaphore: asyncio.Semaphore | None,
+    ) -> None:
+        """Initialize the inbox.
+
+        Args:
+            agent (`AgentBase`):
+                The subscriber agent.
+            maxsize (`int`):
+                The maximum number of the undelivered messages, beyond which
+                the broadcast waits for the subscriber.
+            semaphore (`asyncio.Semaphore | None`):
+                The semaphore limiting the concurrent `observe` calls of the
+                MsgHub.
+        """
+        self.agent = agent
+        self.semaphore = semaphore
+        self.queue: asyncio.Queue[
+            tuple[list[Msg] | Msg, asyncio.Future | None]
+        ] = asyncio.Queue(maxsize)
+        self.worker = asyncio.create_task(self._work())
+
+    async def put(self, msg: list[Msg] | Msg, wait: bool) -> asyncio.Future:
+        """Put the message into the inbox, and return a future that is done
+        when the message is observed if `wait` is `True`."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((msg, future if wait else None))
+        if not wait:
+            future.set_result(None)
+        return future
+
+    async def _work(self) -> None:
+        """Deliver the messages to the subscriber."""
+        while True:
+            msg, future = await self.queue.get()
+            try:
+                if self.semaphore is None:
+                    await self.agent.observe(msg)
+                else:
+                    async with self.semaphore:
+                        await self.agent.observe(msg)
+
+                if future is not None and not future.done():
+                    future.set_result(None)
+
+            except Exception as e:
+                if future is None:
+                    logger.warning(
+                        "Failed to deliver the message to agent %s: %s",
+                        self.agent.id,
+                        e,
+                    )
+                elif not future.done():
+                    future.set_exception(e)
+
+            finally:
+                self.queue.task_done()
+
+
 class MsgHub:
     """MsgHub class that controls the subscription of the participated agents.
 
@@ -44,6 +113,10 @@ class MsgHub:
         announcement: list[Msg] | Msg | None = None,
         enable_auto_broadcast: bool = True,
         name: str | None = None,
+        max_concurrency: int | None = None,
+        fire_and_forget: bool = False,
+        inbox_size: int = 100,
+        shared_log: bool = False,
     ) -> None:
         """Initialize a MsgHub context manager.
 
@@ -62,15 +135,59 @@ class MsgHub:
             name (`str | None`):
                 The name of this MsgHub. If not provided, a random ID
                 will be generated.
+            max_concurrency (`int | None`, defaults to `None`):
+                The maximum number of the participants observing the
+                broadcast messages concurrently. If `None`, all
+                participants observe concurrently.
+            fire_and_forget (`bool`, defaults to `False`):
+                If `True`, the broadcast returns once the message is put
+                into the inboxes of the participants, without waiting for
+                them to observe it. Use `flush()` to wait for the delivery.
+            inbox_size (`int`, defaults to `100`):
+                The maximum number of the undelivered messages in the inbox
+                of each participant, beyond which the broadcast waits for
+                the participant to catch up.
+            shared_log (`bool`, defaults to `False`):
+                If `True`, the broadcast messages are appended to the
+                message log of the MsgHub once. The participants with a
+                `SharedLogMemory` as their `memory` read the messages from
+                the log directly, so that adding the observed messages to
+                their memory is skipped as duplicates, while their `observe`
+                function and hooks are still called as usual.
         """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                "The max_concurrency should be a positive integer or None, "
+                f"but got {max_concurrency}.",
+            )
+
         self.name = name or shortuuid.uuid()
         self.participants = participants
         self.announcement = announcement
         self.enable_auto_broadcast = enable_auto_broadcast
+        self.max_concurrency = max_concurrency
+        self.fire_and_forget = fire_and_forget
+        self.inbox_size = inbox_size
+
+        # The inboxes of the participants, which are created on their first
+        # broadcast messages
+        self._inboxes: dict[str, _Inbox] = {}
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
+        # The tasks closing the inboxes of the deleted participants
+        self._closing: set[asyncio.Task] = set()
+
+        self.log = MessageLog() if shared_log else None
+        # The IDs of the participants that read the messages from the log
+        self._log_readers: set[str] = set()
 
     async def __aenter__(self) -> "MsgHub":
         """Will be called when entering the MsgHub."""
         self._reset_subscriber()
+        self._attach_log(self.participants)
 
         # broadcast the input message to all participants
         if self.announcement is not None:
@@ -84,11 +201,22 @@ class MsgHub:
             for agent in self.participants:
                 agent.remove_subscribers(self.name)
 
+        await self.flush()
+        for inbox in self._inboxes.values():
+            inbox.worker.cancel()
+        self._inboxes.clear()
+
+        self._detach_log(self.participants)
+
     def _reset_subscriber(self) -> None:
         """Reset the subscriber for agent in `self.participant`"""
         if self.enable_auto_broadcast:
             for agent in self.participants:
-                agent.reset_subscribers(self.name, self.participants)
+                agent.reset_subscribers(
+                    self.name,
+                    self.participants,
+                    self._deliver,
+                )
 
     def add(
         self,
@@ -103,6 +231,7 @@ class MsgHub:
                 self.participants.append(agent)
 
         self._reset_subscriber()
+        self._attach_log(new_participant)
 
     def delete(
         self,
@@ -116,6 +245,11 @@ class MsgHub:
             if agent in self.participants:
                 # remove agent from self.participant
                 self.participants.pop(self.participants.index(agent))
+                inbox = self._inboxes.pop(agent.id, None)
+                if inbox is not None:
+                    task = asyncio.create_task(self._close_inbox(inbox))
+                    self._closing.add(task)
+                    task.add_done_callback(self._closing.discard)
             else:
                 logger.warning(
                     "Cannot find the agent with ID %s, skip its deletion.",
@@ -124,6 +258,7 @@ class MsgHub:
 
         # Remove this agent from the subscriber of other agents
         self._reset_subscriber()
+        self._detach_log(participant)
 
     async def broadcast(self, msg: list[Msg] | Msg) -> None:
         """Broadcast the message to all participants.
@@ -132,8 +267,77 @@ class MsgHub:
             msg (`list[Msg] | Msg`):
                 Message(s) to be broadcast among all participants.
         """
-        for agent in self.participants:
-            await agent.observe(msg)
+        await self._deliver(self.participants, msg)
+
+    async def flush(self) -> None:
+        """Wait until all the broadcast messages are observed by the
+        participants, including the deleted ones."""
+        await asyncio.gather(
+            *[inbox.queue.join() for inbox in self._inboxes.values()],
+            *self._closing,
+        )
+
+    @staticmethod
+    async def _close_inbox(inbox: _Inbox) -> None:
+        """Deliver the messages left in the inbox of a deleted participant,
+        and stop its worker."""
+        try:
+            await inbox.queue.join()
+        finally:
+            inbox.worker.cancel()
+
+    async def _deliver(
+        self,
+        subscribers: list[AgentBase],
+        msg: list[Msg] | Msg,
+    ) -> None:
+        """Deliver the message to the subscribers through their inboxes,
+        which are observed concurrently, while each subscriber observes the
+        messages in order.
+
+        Args:
+            subscribers (`list[AgentBase]`):
+                The agents to receive the message.
+            msg (`list[Msg] | Msg`):
+                The message(s) to be delivered.
+        """
+        if self.log is not None:
+            # Appended before the delivery, so that the log readers find the
+            # message in their memory when observing it
+            self.log.append(msg)
+
+        futures = []
+        for agent in subscribers:
+            inbox = self._inboxes.get(agent.id)
+            if inbox is None:
+                inbox = _Inbox(agent, self.inbox_size, self._semaphore)
+                self._inboxes[agent.id] = inbox
+            futures.append(await inbox.put(msg, not self.fire_and_forget))
+
+        await asyncio.gather(*futures)
+
+    def _attach_log(self, agents: list[AgentBase]) -> None:
+        """Let the agents with a shared log memory read the messages from
+        the log of the MsgHub."""
+        if self.log is None:
+            return
+
+        for agent in agents:
+            memory = getattr(agent, "memory", None)
+            if isinstance(memory, SharedLogMemory):
+                memory.attach(self.log)
+                self._log_readers.add(agent.id)
+
+    def _detach_log(self, agents: list[AgentBase]) -> None:
+        """Stop the agents reading the messages from the log of the
+        MsgHub."""
+        if self.log is None:
+            return
+
+        for agent in agents:
+            if agent.id in self._log_readers:
+                agent.memory.detach(self.log)  # type: ignore[attr-defined]
+                self._log_readers.discard(agent.id)
 
     def set_auto_broadcast(self, enable: bool) -> None:
         """Enable automatic broadcasting of the replied message from any
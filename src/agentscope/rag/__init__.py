@@ -1,23 +1,28 @@
 # -*- coding: utf-8 -*-
 """The retrieval-augmented generation (RAG) module in AgentScope."""
+from typing import TYPE_CHECKING
 
-from ._document import (
-    DocMetadata,
-    Document,
-)
-from ._reader import (
-    ReaderBase,
-    TextReader,
-    PDFReader,
-    ImageReader,
-)
-from ._store import (
-    VDBStoreBase,
-    QdrantStore,
-)
-from ._knowledge_base import KnowledgeBase
-from ._simple_knowledge import SimpleKnowledge
+from .._utils._lazy import _lazy_import
 
+if TYPE_CHECKING:
+    from ._document import (
+        DocMetadata,
+        Document,
+    )
+    from ._reader import (
+        ReaderBase,
+        TextReader,
+        PDFReader,
+        ImageReader,
+    )
+    from ._store import (
+        VDBStoreBase,
+        QdrantStore,
+        NumpyStore,
+    )
+    from ._ingestion import IngestionProgress
+    from ._knowledge_base import KnowledgeBase
+    from ._simple_knowledge import SimpleKnowledge
 
 __all__ = [
     "ReaderBase",
@@ -28,6 +33,26 @@ __all__ = [
     "Document",
     "VDBStoreBase",
     "QdrantStore",
+    "NumpyStore",
+    "IngestionProgress",
     "KnowledgeBase",
     "SimpleKnowledge",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "ReaderBase": "._reader",
+        "TextReader": "._reader",
+        "PDFReader": "._reader",
+        "ImageReader": "._reader",
+        "DocMetadata": "._document",
+        "Document": "._document",
+        "VDBStoreBase": "._store",
+        "QdrantStore": "._store",
+        "NumpyStore": "._store",
+        "IngestionProgress": "._ingestion",
+        "KnowledgeBase": "._knowledge_base",
+        "SimpleKnowledge": "._simple_knowledge",
+    },
+)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""The progress of the document ingestion in the RAG module."""
+from dataclasses import dataclass, field
+
+from .._utils._mixin import DictMixin
+
+
+@dataclass
+class IngestionProgress(DictMixin):
+    """The progress of a streaming document ingestion, which is reported
+    after each batch is stored, and returned when the ingestion is done."""
+
+    documents: int = field(default_factory=lambda: 0)
+    """The number of documents embedded and stored."""
+
+    batches: int = field(default_factory=lambda: 0)
+    """The number of batches embedded and stored."""
+
+    tokens: int | None = field(default_factory=lambda: None)
+    """The number of tokens used by the embedding model, if available."""
+
+    embedding_time: float = field(default_factory=lambda: 0.0)
+    """The accumulated time of the embedding API calls in seconds."""
+
+    elapsed: float = field(default_factory=lambda: 0.0)
+    """The wall time since the ingestion started in seconds."""
+
+    @property
+    def throughput(self) -> float:
+        """The number of documents stored per second."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.documents / self.elapsed
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 """A general implementation of the knowledge class in AgentScope RAG module."""
-from typing import Any
+import asyncio
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
 
 from ._reader import Document
 from ..message import TextBlock
+from ._ingestion import IngestionProgress
 from ._knowledge_base import KnowledgeBase
+from .._logging import logger
+from .._utils._common import _execute_async_or_sync_func
 
 
 class SimpleKnowledge(KnowledgeBase):
@@ -54,6 +59,8 @@ class SimpleKnowledge(KnowledgeBase):
     async def add_documents(
         self,
         documents: list[Document],
+        batch_size: int | None = None,
+        max_concurrency: int = 4,
         **kwargs: Any,
     ) -> None:
         """Add documents to the knowledge
@@ -61,24 +68,165 @@ class SimpleKnowledge(KnowledgeBase):
         Args:
             documents (`list[Document]`):
                 The list of documents to add.
+            batch_size (`int | None`, defaults to `None`):
+                The number of documents embedded in one batch, refer to
+                `add_documents_stream` for details.
+            max_concurrency (`int`, defaults to `4`):
+                The maximum number of batches embedded concurrently.
         """
-        # Prepare the content to be embedded
+        # Validate all the documents before any of them is stored
         for doc in documents:
-            if (
-                doc.metadata.content["type"]
-                not in self.embedding_model.supported_modalities
-            ):
-                raise ValueError(
-                    f"The embedding model {self.embedding_model.model_name} "
-                    f"does not support {doc.metadata.content['type']} data.",
+            self._validate_modality(doc)
+
+        await self.add_documents_stream(
+            documents,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+        )
+
+    async def add_documents_stream(
+        self,
+        documents: AsyncIterable[Document] | Iterable[Document],
+        batch_size: int | None = None,
+        max_concurrency: int = 4,
+        progress_callback: Callable[
+            [IngestionProgress], Awaitable[None] | None
+        ]
+        | None = None,
+    ) -> IngestionProgress:
+        """Add documents to the knowledge with a pipeline: the documents are
+        read and grouped into batches, up to `max_concurrency` batches are
+        embedded concurrently, and the embedded batches are added to the
+        embedding store one by one while the following batches are being
+        embedded. The number of batches waiting in the pipeline is bounded,
+        so the documents are only read as fast as they are processed.
+
+        Args:
+            documents (`AsyncIterable[Document] | Iterable[Document]`):
+                The documents to add, e.g. a list of documents or an async
+                generator that yields the documents from the readers.
+            batch_size (`int | None`, defaults to `None`):
+                The number of documents embedded in one batch. If `None`,
+                the `batch_size_limit` of the embedding model is used, or 64
+                if the embedding model has no limit.
+            max_concurrency (`int`, defaults to `4`):
+                The maximum number of batches embedded concurrently.
+            progress_callback (`Callable[[IngestionProgress], \
+            Awaitable[None] | None] | None`, defaults to `None`):
+                The sync or async function called with the progress after
+                each batch is added to the embedding store.
+
+        Returns:
+            `IngestionProgress`:
+                The final progress of the ingestion.
+        """
+        if max_concurrency < 1:
+            raise ValueError(
+                "The max_concurrency should be a positive integer, but got "
+                f"{max_concurrency}.",
+            )
+
+        batch_size = batch_size or self.embedding_model.batch_size_limit or 64
+        progress = IngestionProgress()
+        start_time = time.perf_counter()
+
+        # The bounded queues apply the backpressure to the reading
+        embedding_queue: asyncio.Queue[list[Document] | None] = asyncio.Queue(
+            maxsize=max_concurrency,
+        )
+        store_queue: asyncio.Queue[list[Document] | None] = asyncio.Queue(
+            maxsize=max_concurrency,
+        )
+
+        async def _produce() -> None:
+            batch: list[Document] = []
+            async for doc in self._iterate(documents):
+                self._validate_modality(doc)
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    await embedding_queue.put(batch)
+                    batch = []
+            if batch:
+                await embedding_queue.put(batch)
+            for _ in range(max_concurrency):
+                await embedding_queue.put(None)
+
+        async def _embed() -> None:
+            while (batch := await embedding_queue.get()) is not None:
+                res = await self.embedding_model(
+                    [_.metadata.content for _ in batch],
                 )
+                for doc, embedding in zip(batch, res.embeddings):
+                    doc.embedding = embedding
+
+                if res.usage:
+                    progress.embedding_time += res.usage.time
+                    if res.usage.tokens is not None:
+                        progress.tokens = (
+                            progress.tokens or 0
+                        ) + res.usage.tokens
+                await store_queue.put(batch)
+
+        async def _store() -> None:
+            while (batch := await store_queue.get()) is not None:
+                await self.embedding_store.add(batch)
+                progress.documents += len(batch)
+                progress.batches += 1
+                progress.elapsed = time.perf_counter() - start_time
+                if progress_callback is not None:
+                    await _execute_async_or_sync_func(
+                        progress_callback,
+                        progress,
+                    )
+
+        async def _embed_all() -> None:
+            await asyncio.gather(*[_embed() for _ in range(max_concurrency)])
+            await store_queue.put(None)
+
+        tasks = [
+            asyncio.create_task(_produce()),
+            asyncio.create_task(_embed_all()),
+            asyncio.create_task(_store()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Cancel the other stages, otherwise they may wait forever
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
-        # Get the embeddings
-        res_embeddings = await self.embedding_model(
-            [_.metadata.content for _ in documents],
+        progress.elapsed = time.perf_counter() - start_time
+        logger.info(
+            "Added %d documents in %d batches to the knowledge in %.2fs "
+            "(%.1f documents/s).",
+            progress.documents,
+            progress.batches,
+            progress.elapsed,
+            progress.throughput,
         )
+        return progress
 
-        for doc, embedding in zip(documents, res_embeddings.embeddings):
-            doc.embedding = embedding
+    def _validate_modality(self, doc: Document) -> None:
+        """Check that the embedding model supports the document content."""
+        if (
+            doc.metadata.content["type"]
+            not in self.embedding_model.supported_modalities
+        ):
+            raise ValueError(
+                f"The embedding model {self.embedding_model.model_name} "
+                f"does not support {doc.metadata.content['type']} data.",
+            )
 
-        await self.embedding_store.add(documents)
+    @staticmethod
+    async def _iterate(
+        documents: AsyncIterable[Document] | Iterable[Document],
+    ) -> AsyncIterable[Document]:
+        """Iterate over the sync or async iterable of documents."""
+        if isinstance(documents, AsyncIterable):
+            async for doc in documents:
+                yield doc
+        else:
+            for doc in documents:
+                yield doc
@@ -5,8 +5,10 @@ from ._store_base import (
     VDBStoreBase,
 )
 from ._qdrant_store import QdrantStore
+from ._numpy_store import NumpyStore
 
 __all__ = [
     "VDBStoreBase",
     "QdrantStore",
+    "NumpyStore",
 ]
@@ -0,0 +1,533 @@
+# -*- coding: utf-8 -*-
+"""The in-process vector store implementation based on NumPy."""
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Literal
+
+import numpy as np
+
+from .._reader import Document
+from ._store_base import VDBStoreBase
+from .._document import DocMetadata
+from ..._logging import logger
+from ..._utils._common import _map_text_to_uuid
+from ...types import Embedding
+
+
+class NumpyStore(VDBStoreBase):
+    """The in-process vector store that keeps all the embeddings in one
+    contiguous NumPy matrix, so that RAG can run without any external
+    vector database service.
+
+    The search computes the scores of all rows with one vectorized
+    operation and selects the top-k with `numpy.argpartition`. For large
+    collections, the rows can be clustered into IVF partitions, so that
+    only the rows in the partitions closest to the query are scored.
+
+    If `persist_dir` is given, the embeddings are stored in a
+    memory-mapped file, and the metadata in a SQLite database in that
+    directory, which are loaded again when the store is created with the
+    same directory.
+
+    .. note:: For the "Cosine" distance, the embeddings are normalized
+     before being stored, as done in Qdrant.
+
+    """
+
+    _VECTORS_FILENAME = "vectors.f32"
+    _INDEX_FILENAME = "index.sqlite"
+    _CENTROIDS_FILENAME = "centroids.npy"
+
+    def __init__(
+        self,
+        dimensions: int,
+        distance: Literal["Cosine", "Euclid", "Dot"] = "Cosine",
+        persist_dir: str | None = None,
+        ivf_threshold: int | None = 1_000_000,
+        n_partitions: int | None = None,
+        n_probe: int = 8,
+    ) -> None:
+        """Initialize the NumPy vector store.
+
+        Args:
+            dimensions (`int`):
+                The dimension of the embeddings.
+            distance (`Literal["Cosine", "Euclid", "Dot"]`, defaults to \
+            `"Cosine"`):
+                The distance metric. For "Cosine" and "Dot", a higher score
+                is more relevant. For "Euclid", the score is the distance,
+                and a lower score is more relevant.
+            persist_dir (`str | None`, defaults to `None`):
+                The directory to persist the store. If `None`, the store is
+                kept in memory only.
+            ivf_threshold (`int | None`, defaults to `1_000_000`):
+                The number of stored embeddings above which they are
+                clustered into IVF partitions. `None` means never.
+            n_partitions (`int | None`, defaults to `None`):
+                The number of IVF partitions. If `None`, the square root of
+                the number of stored embeddings is used.
+            n_probe (`int`, defaults to `8`):
+                The number of partitions closest to the query to search.
+        """
+        if distance not in ["Cosine", "Euclid", "Dot"]:
+            raise ValueError(
+                f"Unsupported distance {distance}, expected one of "
+                "'Cosine', 'Euclid' and 'Dot'.",
+            )
+
+        self.dimensions = dimensions
+        self.distance = distance
+        self.ivf_threshold = ivf_threshold
+        self.n_partitions = n_partitions
+        self.n_probe = n_probe
+        self.persist_dir = persist_dir
+
+        self._size = 0
+        self._ids: list[str] = []
+        self._payloads: list[dict] = []
+        self._id_to_row: dict[str, int] = {}
+        self._matrix = np.empty((0, dimensions), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._partitions = np.empty(0, dtype=np.int32)
+        self._centroids: np.ndarray | None = None
+
+        self._conn: sqlite3.Connection | None = None
+        if persist_dir is not None:
+            self._load()
+
+    @property
+    def size(self) -> int:
+        """The number of stored embeddings."""
+        return self._size
+
+    async def add(self, documents: list[Document], **kwargs: Any) -> None:
+        """Add embeddings to the store. The documents with the same
+        document ID, chunk ID and content will be overwritten.
+
+        Args:
+            documents (`list[Document]`):
+                A list of embedding records to be recorded in the store.
+        """
+        if not documents:
+            return
+
+        vectors = np.asarray(
+            [_.embedding for _ in documents],
+            dtype=np.float32,
+        ).reshape(len(documents), self.dimensions)
+        if self.distance == "Cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+
+        # Deduplicate the points within the batch, the last one wins
+        point_rows: dict[str, int] = {}
+        for index, doc in enumerate(documents):
+            point_id = _map_text_to_uuid(
+                json.dumps(
+                    {
+                        "doc_id": doc.metadata.doc_id,
+                        "chunk_id": doc.metadata.chunk_id,
+                        "content": doc.metadata.content,
+                    },
+                    ensure_ascii=False,
+                ),
+            )
+            point_rows[point_id] = index
+
+        n_new = len([_ for _ in point_rows if _ not in self._id_to_row])
+        self._reserve(self._size + n_new)
+
+        changed_rows = []
+        for point_id, index in point_rows.items():
+            row = self._id_to_row.get(point_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._ids.append(point_id)
+                self._payloads.append({})
+                self._id_to_row[point_id] = row
+            self._matrix[row] = vectors[index]
+            self._payloads[row] = dict(documents[index].metadata)
+            changed_rows.append(row)
+
+        rows = np.asarray(changed_rows)
+        self._sq_norms[rows] = np.einsum(
+            "ij,ij->i",
+            self._matrix[rows],
+            self._matrix[rows],
+        )
+
+        if self._centroids is not None:
+            self._partitions[rows] = self._nearest_centroids(
+                self._matrix[rows],
+            )
+        elif self.ivf_threshold is not None and (
+            self._size >= self.ivf_threshold
+        ):
+            self._train_partitions()
+            changed_rows = list(range(self._size))
+
+        self._persist(changed_rows)
+
+    async def delete(
+        self,
+        doc_ids: list[str] | None = None,
+        metadata_filter: dict[str, Any] | Callable[[dict], bool] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Delete the embeddings of the given documents, or the ones whose
+        metadata match the filter.
+
+        Args:
+            doc_ids (`list[str] | None`, defaults to `None`):
+                The document IDs whose chunks will be deleted.
+            metadata_filter (`dict[str, Any] | Callable[[dict], bool] | \
+            None`, defaults to `None`):
+                The filter on the metadata, refer to the `search` method
+                for details.
+        """
+        if doc_ids is None and metadata_filter is None:
+            raise ValueError(
+                "Either doc_ids or metadata_filter must be provided.",
+            )
+
+        mask = np.ones(self._size, dtype=bool)
+        if doc_ids is not None:
+            targets = set(doc_ids)
+            mask &= np.fromiter(
+                (_["doc_id"] in targets for _ in self._payloads),
+                dtype=bool,
+                count=self._size,
+            )
+        if metadata_filter is not None:
+            mask &= self._filter_mask(metadata_filter)
+
+        # Remove from the end, so that the rows moved to fill the holes are
+        # always the remaining ones
+        moved: dict[int, int] = {}
+        for row in np.flatnonzero(mask)[::-1].tolist():
+            last = self._size - 1
+            del self._id_to_row[self._ids[row]]
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._sq_norms[row] = self._sq_norms[last]
+                self._partitions[row] = self._partitions[last]
+                self._ids[row] = self._ids[last]
+                self._payloads[row] = self._payloads[last]
+                self._id_to_row[self._ids[row]] = row
+                moved[row] = last
+            self._ids.pop()
+            self._payloads.pop()
+            self._size -= 1
+
+        if mask.any():
+            self._persist(
+                [_ for _ in moved if _ < self._size],
+                deleted_from=self._size,
+            )
+
+    async def search(
+        self,
+        query_embedding: Embedding,
+        limit: int,
+        score_threshold: float | None = None,
+        **kwargs: Any,
+    ) -> list[Document]:
+        """Search relevant documents from the store.
+
+        Args:
+            query_embedding (`Embedding`):
+                The embedding of the query text.
+            limit (`int`):
+                The number of relevant documents to retrieve.
+            score_threshold (`float | None`, optional):
+                The threshold of the score to filter the results. For the
+                "Euclid" distance, it's the maximum distance.
+            **kwargs (`Any`):
+                Other keyword arguments, including
+                - `metadata_filter` (`dict[str, Any] | Callable[[dict], \
+                bool]`): The filter on the metadata. A dict matches the
+                  documents whose metadata fields equal the given values
+                  (or are in the given list/set), e.g. `{"doc_id": "xxx"}`,
+                  and a callable receives the metadata dict and returns
+                  whether to keep it.
+                - `exact` (`bool`): Whether to score all the rows even if
+                  the IVF partitions are built.
+        """
+        if self._size == 0 or limit <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if self.distance == "Cosine":
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        if self._centroids is not None and not kwargs.get("exact", False):
+            probes = np.argsort(self._score(query, self._centroids))[
+                : self.n_probe
+            ]
+            candidates = np.flatnonzero(
+                np.isin(self._partitions[: self._size], probes),
+            )
+        else:
+            candidates = None
+
+        metadata_filter = kwargs.get("metadata_filter")
+        if metadata_filter is not None:
+            mask = self._filter_mask(metadata_filter)
+            if candidates is None:
+                candidates = np.flatnonzero(mask)
+            else:
+                candidates = candidates[mask[candidates]]
+
+        if candidates is None:
+            scores = self._score(
+                query,
+                self._matrix[: self._size],
+                self._sq_norms[: self._size],
+            )
+            rows = np.arange(self._size)
+        else:
+            scores = self._score(
+                query,
+                self._matrix[candidates],
+                self._sq_norms[candidates],
+            )
+            rows = candidates
+
+        # The scores are negated (or not) to make lower always better
+        if score_threshold is not None:
+            keep = scores <= self._to_key(score_threshold)
+            scores, rows = scores[keep], rows[keep]
+
+        if limit < len(scores):
+            top = np.argpartition(scores, limit - 1)[:limit]
+            scores, rows = scores[top], rows[top]
+        order = np.argsort(scores, kind="stable")
+
+        return [
+            Document(
+                embedding=self._matrix[row].tolist(),
+                score=float(self._to_key(float(score))),
+                metadata=DocMetadata(**self._payloads[row]),
+            )
+            for row, score in zip(rows[order], scores[order])
+        ]
+
+    def get_client(self) -> "NumpyStore":
+        """There is no underlying client for the NumPy store, so the store
+        itself is returned."""
+        return self
+
+    def _to_key(self, score: Any) -> Any:
+        """Convert between the score and the sorting key, where a lower key
+        is always more relevant."""
+        return score if self.distance == "Euclid" else -score
+
+    def _score(
+        self,
+        query: np.ndarray,
+        matrix: np.ndarray,
+        sq_norms: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Compute the sorting keys of the rows in the matrix, where a
+        lower key is more relevant."""
+        dots = matrix @ query
+        if self.distance != "Euclid":
+            return -dots
+        if sq_norms is None:
+            sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+        sq_dists = sq_norms - 2 * dots + float(query @ query)
+        return np.sqrt(np.maximum(sq_dists, 0))
+
+    def _filter_mask(
+        self,
+        metadata_filter: dict[str, Any] | Callable[[dict], bool],
+    ) -> np.ndarray:
+        """Get the boolean mask of the rows whose metadata match the
+        filter."""
+        if callable(metadata_filter):
+            matches = (metadata_filter(_) for _ in self._payloads)
+        else:
+            conditions = [
+                (key, set(value) if isinstance(value, (list, set)) else None)
+                for key, value in metadata_filter.items()
+            ]
+
+            def _match(payload: dict) -> bool:
+                for key, values in conditions:
+                    if values is None:
+                        if payload.get(key) != metadata_filter[key]:
+                            return False
+                    elif payload.get(key) not in values:
+                        return False
+                return True
+
+            matches = (_match(_) for _ in self._payloads)
+        return np.fromiter(matches, dtype=bool, count=self._size)
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        """Assign the vectors to their nearest centroids by the euclidean
+        distance, in chunks to bound the memory usage."""
+        assert self._centroids is not None
+        sq_centroids = np.einsum("ij,ij->i", self._centroids, self._centroids)
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), 65536):
+            chunk = vectors[start : start + 65536]
+            assignments[start : start + 65536] = np.argmin(
+                sq_centroids - 2 * chunk @ self._centroids.T,
+                axis=1,
+            )
+        return assignments
+
+    def _train_partitions(self, n_iterations: int = 10) -> None:
+        """Cluster the stored embeddings into IVF partitions by k-means on
+        a sample of the rows."""
+        n_partitions = self.n_partitions or max(1, int(np.sqrt(self._size)))
+        n_partitions = min(n_partitions, self._size)
+
+        rng = np.random.default_rng(0)
+        sample = self._matrix[
+            np.sort(
+                rng.choice(
+                    self._size,
+                    size=min(self._size, n_partitions * 64),
+                    replace=False,
+                ),
+            )
+        ]
+        centroids = sample[
+            rng.choice(len(sample), size=n_partitions, replace=False)
+        ].copy()
+        self._centroids = centroids
+
+        for _ in range(n_iterations):
+            assignments = self._nearest_centroids(sample)
+            counts = np.bincount(assignments, minlength=n_partitions)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            non_empty = counts > 0
+            centroids[non_empty] = sums[non_empty] / counts[non_empty, None]
+
+        self._partitions[: self._size] = self._nearest_centroids(
+            self._matrix[: self._size],
+        )
+        logger.info(
+            "Clustered %d embeddings into %d IVF partitions.",
+            self._size,
+            n_partitions,
+        )
+
+    def _reserve(self, n_rows: int) -> None:
+        """Make sure the matrix can hold `n_rows` rows, growing the capacity
+        geometrically to amortize the copies."""
+        capacity = len(self._matrix)
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, capacity * 2, 1024)
+
+        if self.persist_dir is not None:
+            path_vectors = os.path.join(
+                self.persist_dir,
+                self._VECTORS_FILENAME,
+            )
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            with open(path_vectors, "ab") as f:
+                f.truncate(capacity * self.dimensions * 4)
+            matrix = np.memmap(
+                path_vectors,
+                dtype=np.float32,
+                mode="r+",
+                shape=(capacity, self.dimensions),
+            )
+        else:
+            matrix = np.empty((capacity, self.dimensions), dtype=np.float32)
+            matrix[: self._size] = self._matrix[: self._size]
+        self._matrix = matrix
+
+        self._sq_norms = np.resize(self._sq_norms, capacity)
+        self._partitions = np.resize(self._partitions, capacity)
+
+    def _load(self) -> None:
+        """Load the store from the persist directory."""
+        assert self.persist_dir is not None
+        os.makedirs(self.persist_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            os.path.join(self.persist_dir, self._INDEX_FILENAME),
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS points (
+                row INTEGER PRIMARY KEY,
+                id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                partition INTEGER NOT NULL
+            )
+            """,
+        )
+        self._conn.commit()
+
+        partitions = []
+        for point_id, payload, partition in self._conn.execute(
+            "SELECT id, payload, partition FROM points ORDER BY row",
+        ):
+            self._id_to_row[point_id] = len(self._ids)
+            self._ids.append(point_id)
+            self._payloads.append(json.loads(payload))
+            partitions.append(partition)
+
+        self._reserve(len(self._ids))
+        self._size = len(self._ids)
+        self._partitions[: self._size] = partitions
+        self._sq_norms[: self._size] = np.einsum(
+            "ij,ij->i",
+            self._matrix[: self._size],
+            self._matrix[: self._size],
+        )
+
+        path_centroids = os.path.join(
+            self.persist_dir,
+            self._CENTROIDS_FILENAME,
+        )
+        if os.path.exists(path_centroids):
+            self._centroids = np.load(path_centroids)
+
+    def _persist(
+        self,
+        rows: list[int],
+        deleted_from: int | None = None,
+    ) -> None:
+        """Persist the given rows, and remove the rows from `deleted_from`
+        on. The vectors are flushed before the metadata is committed."""
+        if self._conn is None or self.persist_dir is None:
+            return
+
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        if self._centroids is not None:
+            np.save(
+                os.path.join(self.persist_dir, self._CENTROIDS_FILENAME),
+                self._centroids,
+            )
+
+        with self._conn:
+            if deleted_from is not None:
+                self._conn.execute(
+                    "DELETE FROM points WHERE row >= ?",
+                    (deleted_from,),
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO points (row, id, payload, partition) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        row,
+                        self._ids[row],
+                        json.dumps(self._payloads[row], ensure_ascii=False),
+                        int(self._partitions[row]),
+                    )
+                    for row in rows
+                ],
+            )
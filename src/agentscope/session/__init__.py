@@ -1,10 +1,28 @@
 # -*- coding: utf-8 -*-
 """The session module in agentscope."""
+from typing import TYPE_CHECKING
 
-from ._session_base import SessionBase
-from ._json_session import JSONSession
+from .._utils._lazy import _lazy_import
+
+if TYPE_CHECKING:
+    from ._session_base import SessionBase
+    from ._json_session import JSONSession
+    from ._journal_session import JournalSession
+    from ._sqlite_session import SQLiteSession
 
 __all__ = [
     "SessionBase",
     "JSONSession",
+    "JournalSession",
+    "SQLiteSession",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "SessionBase": "._session_base",
+        "JSONSession": "._json_session",
+        "JournalSession": "._journal_session",
+        "SQLiteSession": "._sqlite_session",
+    },
+)
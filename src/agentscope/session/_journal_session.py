@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""The journal session class, which persists the session state
+incrementally."""
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from ._session_base import SessionBase
+from .._logging import logger
+from ..module import StateModule
+
+
+def _diff_state(old: Any, new: Any, path: list) -> list[dict]:
+    """Get the operations that turn the old state into the new state, where
+    the lists are compared by their common prefix, so that appending to a
+    list only records the appended items."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict] = [
+            {"op": "del", "path": [*path, key]}
+            for key in old
+            if key not in new
+        ]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "set", "path": [*path, key], "value": value})
+            else:
+                ops.extend(_diff_state(old[key], value, [*path, key]))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        start = 0
+        for old_item, new_item in zip(old, new):
+            if old_item != new_item:
+                break
+            start += 1
+
+        if start == len(old) == len(new):
+            return []
+        return [
+            {
+                "op": "splice",
+                "path": path,
+                "start": start,
+                "value": new[start:],
+            },
+        ]
+
+    if type(old) is not type(new) or old != new:
+        return [{"op": "set", "path": path, "value": new}]
+
+    return []
+
+
+def _apply_ops(state: Any, ops: list[dict]) -> Any:
+    """Apply the operations to the state in place, and return the new
+    state."""
+    for op in ops:
+        *parent_path, key = op["path"] or [None]
+        parent = state
+        for _ in parent_path:
+            parent = parent[_]
+
+        if op["op"] == "splice":
+            target = parent if key is None else parent[key]
+            del target[op["start"] :]
+            target.extend(op["value"])
+        elif key is None:
+            state = op["value"]
+        elif op["op"] == "set":
+            parent[key] = op["value"]
+        else:
+            parent.pop(key, None)
+
+    return state
+
+
+class JournalSession(SessionBase):
+    """The session class that saves only the changes of the state since the
+    last save, as a record appended to a journal file. The journal is
+    compacted into a snapshot file when it grows larger than the snapshot.
+
+    Compared with :class:`JSONSession`, saving the session after each turn
+    costs the size of the changes rather than the whole history in disk
+    I/O, and the diff and the file I/O run in a thread without blocking the
+    event loop.
+
+    The snapshot is written atomically by renaming a temporary file, and
+    each journal record carries a sequence number, so that an interrupted
+    save never corrupts the saved state: an incomplete journal record is
+    ignored, and the records already merged into the snapshot are skipped.
+    """
+
+    def __init__(
+        self,
+        save_dir: str = "./",
+        compaction_ratio: float = 1.0,
+        max_journal_records: int = 1000,
+        max_cached_sessions: int = 128,
+    ) -> None:
+        """Initialize the journal session class.
+
+        Args:
+            save_dir (`str`, defaults to `"./"`):
+                The directory to save the session state.
+            compaction_ratio (`float`, defaults to `1.0`):
+                Compact the journal into the snapshot when the size of the
+                journal exceeds this ratio of the snapshot size.
+            max_journal_records (`int`, defaults to `1000`):
+                Compact the journal into the snapshot when the number of
+                the journal records exceeds this value.
+            max_cached_sessions (`int`, defaults to `128`):
+                The maximum number of the sessions whose last saved states
+                are kept in memory. The least recently used sessions are
+                evicted, and read from the files again when accessed.
+        """
+        self.save_dir = save_dir
+        self.compaction_ratio = compaction_ratio
+        self.max_journal_records = max_journal_records
+        self.max_cached_sessions = max_cached_sessions
+
+        # The last saved state, sequence number, and file sizes of the
+        # recently used sessions, which are loaded when first accessed
+        self._sessions: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # The lock of each session and the number of its users, which is
+        # removed when no longer used
+        self._locks: dict[str, tuple[asyncio.Lock, list[int]]] = {}
+
+    def _get_save_paths(self, session_id: str) -> tuple[str, str]:
+        """Get the paths of the snapshot and journal files.
+
+        Args:
+            session_id (`str`):
+                The session id.
+
+        Returns:
+            `tuple[str, str]`:
+                The paths of the snapshot and journal files.
+        """
+        os.makedirs(self.save_dir, exist_ok=True)
+        return (
+            os.path.join(self.save_dir, f"{session_id}.snapshot.json"),
+            os.path.join(self.save_dir, f"{session_id}.journal.jsonl"),
+        )
+
+    async def save_session_state(
+        self,
+        session_id: str,
+        **state_modules_mapping: StateModule,
+    ) -> None:
+        """Save the changes of the session state since the last save.
+
+        Args:
+            session_id (`str`):
+                The session id.
+            **state_modules_mapping (`dict[str, StateModule]`):
+                A dictionary mapping of state module names to their instances.
+        """
+        # Serialize the state on the event loop since it may refer to the
+        # live objects of the state modules, while the diff and file I/O
+        # run in a thread
+        state_json = json.dumps(
+            {
+                name: state_module.state_dict()
+                for name, state_module in state_modules_mapping.items()
+            },
+            ensure_ascii=False,
+        )
+
+        async with self._lock(session_id):
+            session = await self._get_session(session_id)
+            try:
+                await asyncio.to_thread(
+                    self._save,
+                    session_id,
+                    session,
+                    state_json,
+                )
+            except Exception:
+                # Reload the saved state from the files in the next access
+                self._sessions.pop(session_id, None)
+                raise
+
+    async def load_session_state(
+        self,
+        session_id: str,
+        allow_not_exist: bool = True,
+        **state_modules_mapping: StateModule,
+    ) -> None:
+        """Load the session state from the snapshot and journal files.
+
+        Args:
+            session_id (`str`):
+                The session id.
+            allow_not_exist (`bool`, defaults to `True`):
+                Whether to allow the session to not exist. If `False`, raises
+                an error if the session does not exist.
+            state_modules_mapping (`list[StateModule]`):
+                The list of state modules to be loaded.
+        """
+        async with self._lock(session_id):
+            # Reload from the files in case they are modified by others
+            self._sessions.pop(session_id, None)
+            session = await self._get_session(session_id)
+
+            # Load a copy, so that the saved state is not modified by the
+            # state modules, and by the saves running in the threads
+            seq = session["seq"]
+            states = json.loads(json.dumps(session["state"]))
+
+        snapshot_path, _ = self._get_save_paths(session_id)
+        if seq > 0:
+            for name, state_module in state_modules_mapping.items():
+                if name in states:
+                    state_module.load_state_dict(states[name])
+            logger.info(
+                "Load session state from %s successfully.",
+                snapshot_path,
+            )
+
+        elif allow_not_exist:
+            logger.info(
+                "Session file %s does not exist. Skip loading session state.",
+                snapshot_path,
+            )
+
+        else:
+            raise ValueError(
+                f"Failed to load session state for file {snapshot_path} "
+                "does not exist.",
+            )
+
+    @asynccontextmanager
+    async def _lock(self, session_id: str) -> AsyncIterator[None]:
+        """Hold the lock of the session, which is removed when no one holds
+        or waits for it."""
+        lock, n_users = self._locks.setdefault(
+            session_id,
+            (asyncio.Lock(), [0]),
+        )
+        n_users[0] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            n_users[0] -= 1
+            if n_users[0] == 0:
+                self._locks.pop(session_id, None)
+
+    async def _get_session(self, session_id: str) -> dict[str, Any]:
+        """Get the saved state of the session, which is read from the files
+        in a thread if not cached."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = await asyncio.to_thread(self._read_session, session_id)
+
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_cached_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def _save(
+        self,
+        session_id: str,
+        session: dict[str, Any],
+        state_json: str,
+    ) -> None:
+        """Diff the state with the last saved one, and append the changes
+        to the journal, or compact them into the snapshot."""
+        ops = _diff_state(session["state"], json.loads(state_json), [])
+        if not ops:
+            return
+
+        session["seq"] += 1
+        record = json.dumps(
+            {"seq": session["seq"], "ops": ops},
+            ensure_ascii=False,
+        )
+
+        # The values in the operations are parsed from the JSON above, so
+        # they're private to the saved state
+        session["state"] = _apply_ops(session["state"], ops)
+
+        n_records = session["journal_records"] + 1
+        journal_size = session["journal_size"] + len(record) + 1
+        if (
+            n_records > self.max_journal_records
+            or journal_size > self.compaction_ratio * session["snapshot_size"]
+        ):
+            session["snapshot_size"] = self._write_snapshot(
+                session_id,
+                session["seq"],
+                session["state"],
+            )
+            session["journal_size"] = 0
+            session["journal_records"] = 0
+
+        else:
+            self._append_journal(session_id, record)
+            session["journal_size"] = journal_size
+            session["journal_records"] = n_records
+
+    def _read_session(self, session_id: str) -> dict[str, Any]:
+        """Read the snapshot and replay the journal records on it."""
+        snapshot_path, journal_path = self._get_save_paths(session_id)
+
+        session: dict[str, Any] = {
+            "state": {},
+            "seq": 0,
+            "snapshot_size": 0,
+            "journal_size": 0,
+            "journal_records": 0,
+        }
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as file:
+                content = file.read()
+            snapshot = json.loads(content)
+            session["state"] = snapshot["state"]
+            session["seq"] = snapshot["seq"]
+            session["snapshot_size"] = len(content)
+
+        if os.path.exists(journal_path):
+            with open(journal_path, "rb") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        record = None
+
+                    if record is None or not line.endswith(b"\n"):
+                        # An incomplete record written by an interrupted
+                        # save, which is removed so that the following
+                        # records can be appended correctly
+                        logger.warning(
+                            "Remove the incomplete record in %s.",
+                            journal_path,
+                        )
+                        break
+
+                    session["journal_size"] += len(line)
+                    session["journal_records"] += 1
+                    if record["seq"] > session["seq"]:
+                        session["state"] = _apply_ops(
+                            session["state"],
+                            record["ops"],
+                        )
+                        session["seq"] = record["seq"]
+
+            if os.path.getsize(journal_path) > session["journal_size"]:
+                os.truncate(journal_path, session["journal_size"])
+
+        return session
+
+    def _write_snapshot(
+        self,
+        session_id: str,
+        seq: int,
+        state: dict,
+    ) -> int:
+        """Write the snapshot atomically, clear the journal, and return the
+        size of the snapshot."""
+        snapshot_path, journal_path = self._get_save_paths(session_id)
+        snapshot = json.dumps({"seq": seq, "state": state}, ensure_ascii=False)
+
+        tmp_path = snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(snapshot)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, snapshot_path)
+
+        # The records in the journal are skipped by their sequence numbers
+        # if we fail before clearing it
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+
+        return len(snapshot)
+
+    def _append_journal(self, session_id: str, record: str) -> None:
+        """Append a record to the journal."""
+        _, journal_path = self._get_save_paths(session_id)
+        with open(journal_path, "a", encoding="utf-8") as file:
+            file.write(record + "\n")
+            file.flush()
+            os.fsync(file.fileno())
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""The SQLite session class for serving many concurrent sessions."""
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import time
+import weakref
+from functools import partial
+from typing import Any, Callable
+
+from ._session_base import SessionBase
+from .._logging import logger
+from ..module import StateModule
+
+
+class SQLiteSession(SessionBase):
+    """The session class that stores the session states in a SQLite
+    database, which is designed for serving many concurrent sessions in one
+    process:
+
+    - The database runs in WAL mode, so that the reads don't block the
+      writes, and the queries run in threads with a pool of connections.
+    - The operations on the same session are serialized by a per-session
+      lock, while different sessions are processed concurrently.
+    - The concurrent saves of different sessions are batched into one
+      transaction.
+    - The sessions idle longer than the TTL are evicted by a background job.
+    """
+
+    _TABLE = "as_session_state"
+
+    def __init__(
+        self,
+        sqlite_path: str = "./sessions.db",
+        pool_size: int = 4,
+        batch_delay: float = 0.0,
+        session_ttl: float | None = None,
+        eviction_interval: float = 300.0,
+    ) -> None:
+        """Initialize the SQLite session class.
+
+        Args:
+            sqlite_path (`str`, defaults to `"./sessions.db"`):
+                The path to the SQLite database file.
+            pool_size (`int`, defaults to `4`):
+                The number of the pooled database connections.
+            batch_delay (`float`, defaults to `0.0`):
+                The seconds to wait for more saves before writing them in
+                one transaction. With `0.0`, the saves issued in the same
+                event loop iteration are batched.
+            session_ttl (`float | None`, defaults to `None`):
+                The seconds after the last save or load, after which the
+                session is evicted. If `None`, the sessions are kept.
+            eviction_interval (`float`, defaults to `300.0`):
+                The interval in seconds of the eviction job, which is
+                started with the first operation if `session_ttl` is set.
+        """
+        self.sqlite_path = sqlite_path
+        self.batch_delay = batch_delay
+        self.session_ttl = session_ttl
+        self.eviction_interval = eviction_interval
+
+        os.makedirs(
+            os.path.dirname(os.path.abspath(sqlite_path)),
+            exist_ok=True,
+        )
+
+        self._pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(pool_size):
+            conn = sqlite3.connect(
+                sqlite_path,
+                timeout=30,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+
+        self._run_sync(
+            lambda conn: conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._TABLE} (
+                    session_id TEXT PRIMARY KEY,
+                    session_data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """,
+            ),
+        )
+        self._run_sync(
+            lambda conn: conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self._TABLE}_accessed_at "
+                f"ON {self._TABLE} (accessed_at)",
+            ),
+        )
+
+        self._locks: weakref.WeakValueDictionary[
+            str,
+            asyncio.Lock,
+        ] = weakref.WeakValueDictionary()
+        self._pending: dict[str, tuple[str, asyncio.Future]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._eviction_task: asyncio.Task | None = None
+
+    async def save_session_state(
+        self,
+        session_id: str,
+        **state_modules_mapping: StateModule,
+    ) -> None:
+        """Save the session state, which returns after the state is written
+        into the database.
+
+        Args:
+            session_id (`str`):
+                The session id.
+            **state_modules_mapping (`dict[str, StateModule]`):
+                A dictionary mapping of state module names to their instances.
+        """
+        self._start_eviction()
+        session_data = json.dumps(
+            {
+                name: state_module.state_dict()
+                for name, state_module in state_modules_mapping.items()
+            },
+            ensure_ascii=False,
+        )
+
+        async with self._get_lock(session_id):
+            future = asyncio.get_running_loop().create_future()
+            self._pending[session_id] = (session_data, future)
+
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush())
+            await future
+
+    async def load_session_state(
+        self,
+        session_id: str,
+        allow_not_exist: bool = True,
+        **state_modules_mapping: StateModule,
+    ) -> None:
+        """Load the session state from the database.
+
+        Args:
+            session_id (`str`):
+                The session id.
+            allow_not_exist (`bool`, defaults to `True`):
+                Whether to allow the session to not exist. If `False`, raises
+                an error if the session does not exist.
+            state_modules_mapping (`list[StateModule]`):
+                The list of state modules to be loaded.
+        """
+        self._start_eviction()
+
+        def _load(conn: sqlite3.Connection) -> str | None:
+            row = conn.execute(
+                f"SELECT session_data FROM {self._TABLE} "
+                "WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    f"UPDATE {self._TABLE} SET accessed_at = ? "
+                    "WHERE session_id = ?",
+                    (time.time(), session_id),
+                )
+            return row[0] if row else None
+
+        async with self._get_lock(session_id):
+            session_data = await self._run(_load)
+
+        if session_data is not None:
+            states = json.loads(session_data)
+            for name, state_module in state_modules_mapping.items():
+                if name in states:
+                    state_module.load_state_dict(states[name])
+            logger.info(
+                "Load session state for session_id %s from %s successfully.",
+                session_id,
+                self.sqlite_path,
+            )
+
+        elif allow_not_exist:
+            logger.info(
+                "Session_id %s does not exist in %s. Skip loading session "
+                "state.",
+                session_id,
+                self.sqlite_path,
+            )
+
+        else:
+            raise ValueError(
+                f"Failed to load session state for session_id {session_id} "
+                "does not exist.",
+            )
+
+    async def evict_idle_sessions(self, ttl: float | None = None) -> int:
+        """Delete the sessions that are not saved or loaded within the TTL.
+
+        Args:
+            ttl (`float | None`, defaults to `None`):
+                The TTL in seconds. If `None`, the `session_ttl` of the
+                session class is used.
+
+        Returns:
+            `int`:
+                The number of the evicted sessions.
+        """
+        ttl = ttl if ttl is not None else self.session_ttl
+        if ttl is None:
+            raise ValueError("The TTL of the sessions is not specified.")
+
+        n_evicted = await self._run(
+            lambda conn: conn.execute(
+                f"DELETE FROM {self._TABLE} WHERE accessed_at < ?",
+                (time.time() - ttl,),
+            ).rowcount,
+        )
+        if n_evicted:
+            logger.info("Evicted %d idle sessions.", n_evicted)
+        return n_evicted
+
+    async def close(self) -> None:
+        """Write the pending saves, stop the eviction job and close the
+        database connections."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+
+        while not self._pool.empty():
+            self._pool.get().close()
+
+    def _get_lock(self, session_id: str) -> asyncio.Lock:
+        """Get the lock of the session, which is released when it's not
+        used."""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+
+    async def _flush(self) -> None:
+        """Write the pending saves in batches, each in one transaction,
+        until no save is pending."""
+        while self._pending:
+            await asyncio.sleep(self.batch_delay)
+
+            pending, self._pending = self._pending, {}
+            try:
+                await self._run(partial(self._write, pending))
+                error = None
+            except Exception as e:
+                error = e
+
+            # The futures of the cancelled saves are already done
+            for _, future in pending.values():
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    def _write(
+        self,
+        pending: dict[str, tuple[str, asyncio.Future]],
+        conn: sqlite3.Connection,
+    ) -> None:
+        """Write the session states in one transaction."""
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"""
+                INSERT INTO {self._TABLE}
+                    (session_id, session_data, created_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    session_data = excluded.session_data,
+                    accessed_at = excluded.accessed_at
+                """,
+                [
+                    (session_id, data, now, now)
+                    for session_id, (data, _) in pending.items()
+                ],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _start_eviction(self) -> None:
+        """Start the eviction job if the TTL is set."""
+        if self.session_ttl is None or (
+            self._eviction_task is not None and not self._eviction_task.done()
+        ):
+            return
+
+        async def _evict_periodically() -> None:
+            while True:
+                try:
+                    await self.evict_idle_sessions()
+                except Exception as e:
+                    logger.warning("Failed to evict idle sessions: %s", e)
+                await asyncio.sleep(self.eviction_interval)
+
+        self._eviction_task = asyncio.create_task(_evict_periodically())
+
+    def _run_sync(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run the function with a pooled connection."""
+        conn = self._pool.get()
+        try:
+            return func(conn)
+        finally:
+            self._pool.put(conn)
+
+    async def _run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run the function with a pooled connection in a thread."""
+        return await asyncio.to_thread(self._run_sync, func)
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 """The token module in agentscope"""
+from typing import TYPE_CHECKING
 
-from ._token_base import TokenCounterBase
-from ._gemini_token_counter import GeminiTokenCounter
-from ._openai_token_counter import OpenAITokenCounter
-from ._anthropic_token_counter import AnthropicTokenCounter
-from ._huggingface_token_counter import HuggingFaceTokenCounter
+from .._utils._lazy import _lazy_import
+
+if TYPE_CHECKING:
+    from ._token_base import TokenCounterBase
+    from ._gemini_token_counter import GeminiTokenCounter
+    from ._openai_token_counter import OpenAITokenCounter
+    from ._anthropic_token_counter import AnthropicTokenCounter
+    from ._huggingface_token_counter import HuggingFaceTokenCounter
 
 __all__ = [
     "TokenCounterBase",
@@ -14,3 +18,14 @@ __all__ = [
     "AnthropicTokenCounter",
     "HuggingFaceTokenCounter",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "TokenCounterBase": "._token_base",
+        "GeminiTokenCounter": "._gemini_token_counter",
+        "OpenAITokenCounter": "._openai_token_counter",
+        "AnthropicTokenCounter": "._anthropic_token_counter",
+        "HuggingFaceTokenCounter": "._huggingface_token_counter",
+    },
+)
@@ -1,24 +1,98 @@
 # -*- coding: utf-8 -*-
 """The Anthropic token counter class."""
-from typing import Any
+import math
+from typing import Any, Callable, Literal
 
+from ._token_base import TokenCounterBase
+from ._token_estimator import (
+    _OfflineTokenEstimator,
+    _TokenCountCache,
+    _get_image_size_from_base64,
+    _hash_object,
+)
 
-class AnthropicTokenCounter:
-    """The Anthropic token counter class."""
 
-    def __init__(self, model_name: str, api_key: str, **kwargs: Any) -> None:
+def _get_anthropic_media_tokens(block: dict) -> int | None:
+    """Get the number of tokens of an image or document block in Anthropic
+    API format, following
+    https://docs.anthropic.com/en/docs/build-with-claude/vision#calculate-image-costs
+    """
+    source = block.get("source")
+    if block.get("type") not in ["image", "document"] or not isinstance(
+        source,
+        dict,
+    ):
+        return None
+
+    size = None
+    if block["type"] == "image" and source.get("type") == "base64":
+        size = _get_image_size_from_base64(source.get("data", ""))
+
+    if size is None:
+        # The upper bound of an image after resizing
+        return 1600
+
+    width, height = size
+    ratio = min(1.0, 1568 / max(width, height))
+    return math.ceil(width * ratio * height * ratio / 750)
+
+
+class AnthropicTokenCounter(TokenCounterBase):
+    """The Anthropic token counter class, which counts the tokens by the
+    Anthropic token counting API, or estimates them offline.
+
+    The counts are cached by the hash of the request, and in the "estimate"
+    mode, the estimation of each message is memoized by its content hash,
+    so that the repeated counting in the formatter costs no network
+    round-trip.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        api_key: str | None = None,
+        mode: Literal["remote", "estimate"] = "remote",
+        safety_margin: float = 0.1,
+        tokenizer: Callable[[str], int] | None = None,
+        cache_size: int = 1024,
+        **kwargs: Any,
+    ) -> None:
         """Initialize the Anthropic token counter.
 
         Args:
             model_name (`str`):
                 The name of the Anthropic model to use, e.g. "claude-2".
-            api_key (`str`):
-                The API key for Anthropic.
+            api_key (`str | None`, defaults to `None`):
+                The API key for Anthropic, which is required in the "remote"
+                mode.
+            mode (`Literal["remote", "estimate"]`, defaults to `"remote"`):
+                Count the tokens by the token counting API ("remote"), or
+                estimate them locally without network ("estimate").
+            safety_margin (`float`, defaults to `0.1`):
+                The ratio added to the estimation in the "estimate" mode,
+                so that the estimation is more likely to be an upper bound.
+            tokenizer (`Callable[[str], int] | None`, defaults to `None`):
+                The function that counts the tokens of a text in the
+                "estimate" mode. If `None`, a character-based approximation
+                is used.
+            cache_size (`int`, defaults to `1024`):
+                The maximum number of cached counts.
         """
-        import anthropic
-
-        self.client = anthropic.AsyncAnthropic(api_key=api_key, **kwargs)
         self.model_name = model_name
+        self.mode = mode
+        self._cache = _TokenCountCache(cache_size)
+        self._estimator = _OfflineTokenEstimator(
+            media_tokens=_get_anthropic_media_tokens,
+            tokenizer=tokenizer,
+            safety_margin=safety_margin,
+            cache_size=cache_size,
+        )
+
+        self.client = None
+        if mode == "remote":
+            import anthropic
+
+            self.client = anthropic.AsyncAnthropic(api_key=api_key, **kwargs)
 
     async def count(
         self,
@@ -40,9 +114,13 @@ class AnthropicTokenCounter:
             **kwargs (`Any`):
                 Additional keyword arguments for the token counting API.
         """
+        if self.mode == "estimate":
+            return self._estimator.estimate(messages, tools)
+
         system_message = None
-        if messages[0].get("role") == "system":
-            system_message = messages.pop(0)
+        if messages and messages[0].get("role") == "system":
+            system_message = messages[0]
+            messages = messages[1:]
 
         extra_kwargs: dict = {
             "model": self.model_name,
@@ -56,6 +134,11 @@ class AnthropicTokenCounter:
         if system_message:
             extra_kwargs["system"] = system_message
 
-        res = await self.client.messages.count_tokens(**extra_kwargs)
+        key = _hash_object(extra_kwargs)
+        n_tokens = self._cache.get(key)
+        if n_tokens is None:
+            res = await self.client.messages.count_tokens(**extra_kwargs)
+            n_tokens = res.input_tokens
+            self._cache.set(key, n_tokens)
 
-        return res.input_tokens
+        return n_tokens
@@ -1,32 +1,99 @@
 # -*- coding: utf-8 -*-
 """The gemini token counter class in agentscope."""
-from typing import Any
+import math
+from typing import Any, Callable, Literal
 
 from agentscope.token._token_base import TokenCounterBase
+from agentscope.token._token_estimator import (
+    _OfflineTokenEstimator,
+    _TokenCountCache,
+    _get_image_size_from_base64,
+    _hash_object,
+)
+
+
+def _get_gemini_media_tokens(part: dict) -> int | None:
+    """Get the number of tokens of an inline or file data part in Gemini
+    API format, where an image costs 258 tokens per 768x768 tile."""
+    data = part.get("inline_data") or part.get("file_data")
+    if not isinstance(data, dict):
+        return None
+
+    size = None
+    if "data" in data and str(data.get("mime_type", "")).startswith("image"):
+        size = _get_image_size_from_base64(data["data"])
+
+    if size is None:
+        return 258
+
+    width, height = size
+    if width <= 384 and height <= 384:
+        return 258
+    return math.ceil(width / 768) * math.ceil(height / 768) * 258
 
 
 class GeminiTokenCounter(TokenCounterBase):
-    """The Gemini token counter class."""
+    """The Gemini token counter class, which counts the tokens by the
+    Gemini token counting API, or estimates them offline.
+
+    The counts are cached by the hash of the request, and in the "estimate"
+    mode, the estimation of each message is memoized by its content hash,
+    so that the repeated counting in the formatter costs no network
+    round-trip.
+    """
 
-    def __init__(self, model_name: str, api_key: str, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        api_key: str | None = None,
+        mode: Literal["remote", "estimate"] = "remote",
+        safety_margin: float = 0.1,
+        tokenizer: Callable[[str], int] | None = None,
+        cache_size: int = 1024,
+        **kwargs: Any,
+    ) -> None:
         """Initialize the Gemini token counter.
 
         Args:
             model_name (`str`):
                 The name of the Gemini model to use, e.g. "gemini-2.5-flash".
-            api_key (`str`):
-                The API key for Google Gemini.
+            api_key (`str | None`, defaults to `None`):
+                The API key for Google Gemini, which is required in the
+                "remote" mode.
+            mode (`Literal["remote", "estimate"]`, defaults to `"remote"`):
+                Count the tokens by the token counting API ("remote"), or
+                estimate them locally without network ("estimate").
+            safety_margin (`float`, defaults to `0.1`):
+                The ratio added to the estimation in the "estimate" mode,
+                so that the estimation is more likely to be an upper bound.
+            tokenizer (`Callable[[str], int] | None`, defaults to `None`):
+                The function that counts the tokens of a text in the
+                "estimate" mode. If `None`, a character-based approximation
+                is used.
+            cache_size (`int`, defaults to `1024`):
+                The maximum number of cached counts.
             **kwargs:
                 Additional keyword arguments that will be passed to the
                 Gemini client.
         """
-        from google import genai
-
-        self.client = genai.Client(
-            api_key=api_key,
-            **kwargs,
-        )
         self.model_name = model_name
+        self.mode = mode
+        self._cache = _TokenCountCache(cache_size)
+        self._estimator = _OfflineTokenEstimator(
+            media_tokens=_get_gemini_media_tokens,
+            tokenizer=tokenizer,
+            safety_margin=safety_margin,
+            cache_size=cache_size,
+        )
+
+        self.client = None
+        if mode == "remote":
+            from google import genai
+
+            self.client = genai.Client(
+                api_key=api_key,
+                **kwargs,
+            )
 
     async def count(
         self,
@@ -35,6 +102,8 @@ class GeminiTokenCounter(TokenCounterBase):
         **config_kwargs: Any,
     ) -> int:
         """Count the number of tokens of gemini models."""
+        if self.mode == "estimate":
+            return self._estimator.estimate(messages, tools)
 
         kwargs = {
             "model": self.model_name,
@@ -45,6 +114,11 @@ class GeminiTokenCounter(TokenCounterBase):
             },
         }
 
-        res = self.client.models.count_tokens(**kwargs)
+        key = _hash_object(kwargs)
+        n_tokens = self._cache.get(key)
+        if n_tokens is None:
+            res = await self.client.aio.models.count_tokens(**kwargs)
+            n_tokens = res.total_tokens
+            self._cache.set(key, n_tokens)
 
-        return res.total_tokens
+        return n_tokens
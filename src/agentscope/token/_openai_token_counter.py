@@ -3,16 +3,35 @@
 follows
 https://platform.openai.com/docs/guides/images-vision?api-mode=chat#calculating-costs
 """
+import asyncio
 import base64
+import hashlib
 import io
 import json
 import math
+import threading
+from collections import OrderedDict
 from http import HTTPStatus
 from typing import Any
 
 import requests
 
 from ._token_base import TokenCounterBase
+from .._utils._common import _get_image_size_from_header
+
+_IMAGE_SIZE_CACHE: OrderedDict[str, tuple[int, int]] = OrderedDict()
+"""The LRU cache of the image sizes, keyed by the web URL or the hash of the
+base64 data URL."""
+
+_IMAGE_SIZE_CACHE_LOCK = threading.Lock()
+"""The lock of the image size cache, which is accessed by the threads
+fetching the images."""
+
+_IMAGE_SIZE_CACHE_SIZE = 1024
+"""The maximum number of cached image sizes."""
+
+_IMAGE_HEADER_BYTES = 65536
+"""The number of leading bytes read to parse the image header."""
 
 
 def _calculate_tokens_for_high_quality_image(
@@ -48,8 +67,36 @@ def _calculate_tokens_for_high_quality_image(
     return total_tokens
 
 
+def _get_image_cache_key(url: str) -> str:
+    """Get the cache key of an image URL, where the base64 data URL is
+    hashed to keep the cache small."""
+    if url.startswith("data:"):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return url
+
+
+def _get_cached_image_size(key: str) -> tuple[int, int] | None:
+    """Get the cached image size by the key, or `None` if not cached."""
+    with _IMAGE_SIZE_CACHE_LOCK:
+        size = _IMAGE_SIZE_CACHE.get(key)
+        if size is not None:
+            _IMAGE_SIZE_CACHE.move_to_end(key)
+        return size
+
+
+def _cache_image_size(key: str, size: tuple[int, int]) -> None:
+    """Cache the image size, and evict the least recently used ones."""
+    with _IMAGE_SIZE_CACHE_LOCK:
+        _IMAGE_SIZE_CACHE[key] = size
+        _IMAGE_SIZE_CACHE.move_to_end(key)
+        while len(_IMAGE_SIZE_CACHE) > _IMAGE_SIZE_CACHE_SIZE:
+            _IMAGE_SIZE_CACHE.popitem(last=False)
+
+
 def _get_size_of_image_url(url: str) -> tuple[int, int]:
-    """Get the size of an image from the given URL.
+    """Get the size of an image from the given URL. The size is parsed from
+    the image header if possible, so that only the leading bytes are decoded
+    or downloaded, and the result is cached.
 
     Args:
         url (`str`):
@@ -59,24 +106,81 @@ def _get_size_of_image_url(url: str) -> tuple[int, int]:
         `tuple[int, int]`:
             A tuple containing the width and height of the image.
     """
+    key = _get_image_cache_key(url)
+    cached_size = _get_cached_image_size(key)
+    if cached_size is not None:
+        return cached_size
+
     if url.startswith("data:image/"):
         base64_data = url.split("base64,")[1]
-        image_data = base64.b64decode(base64_data)
+        # Decode the leading part only, whose length is a multiple of 4
+        n_chars = _IMAGE_HEADER_BYTES // 3 * 4
+        size = _get_image_size_from_header(
+            base64.b64decode(base64_data[:n_chars]),
+        )
+        image_data = None if size else base64.b64decode(base64_data)
 
     else:
         response = None
         for _ in range(3):
-            response = requests.get(url)
-            if response.status_code == HTTPStatus.OK:
+            response = requests.get(
+                url,
+                headers={"Range": f"bytes=0-{_IMAGE_HEADER_BYTES - 1}"},
+                timeout=30,
+            )
+            if response.status_code in [
+                HTTPStatus.OK,
+                HTTPStatus.PARTIAL_CONTENT,
+            ]:
                 break
         response.raise_for_status()
-        image_data = response.content
+        size = _get_image_size_from_header(response.content)
+
+        image_data = None
+        if size is None:
+            if response.status_code == HTTPStatus.PARTIAL_CONTENT:
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+            image_data = response.content
 
-    from PIL import Image
+    if size is None:
+        from PIL import Image
 
-    image = Image.open(io.BytesIO(image_data))
-    width, height = image.size
-    return width, height
+        image = Image.open(io.BytesIO(image_data or b""))
+        size = image.size
+
+    _cache_image_size(key, size)
+    return size
+
+
+async def _get_sizes_of_image_urls(
+    urls: list[str],
+) -> dict[str, tuple[int, int]]:
+    """Get the sizes of the images concurrently without blocking the event
+    loop, where the uncached images are fetched in threads.
+
+    Args:
+        urls (`list[str]`):
+            The web URLs or base64 encoded image URLs.
+
+    Returns:
+        `dict[str, tuple[int, int]]`:
+            The mapping from the URLs to the width and height of the images.
+    """
+    sizes = {}
+    missing = []
+    for url in dict.fromkeys(urls):
+        size = _get_cached_image_size(_get_image_cache_key(url))
+        if size is not None:
+            sizes[url] = size
+        else:
+            missing.append(url)
+
+    results = await asyncio.gather(
+        *[asyncio.to_thread(_get_size_of_image_url, _) for _ in missing],
+    )
+    sizes.update(zip(missing, results))
+    return sizes
 
 
 def _get_base_and_tile_tokens(model_name: str) -> tuple[int, int]:
@@ -178,6 +282,7 @@ def _count_content_tokens_for_openai_vision_model(
     model_name: str,
     content: list[dict],
     encoding: Any,
+    image_sizes: dict[str, tuple[int, int]] | None = None,
 ) -> int:
     """Yield the number of tokens for the content of an OpenAI vision model.
     Implemented according to https://platform.openai.com/docs/guides/vision.
@@ -189,6 +294,9 @@ def _count_content_tokens_for_openai_vision_model(
             A list of dictionaries.
         encoding (`Any`):
             The encoding object.
+        image_sizes (`dict[str, tuple[int, int]] | None`, defaults to \
+        `None`):
+            The pre-fetched sizes of the images, keyed by the image URLs.
 
     Example:
         .. code-block:: python
@@ -229,7 +337,10 @@ def _count_content_tokens_for_openai_vision_model(
             )
 
         elif typ == "image_url":
-            width, height = _get_size_of_image_url(item["image_url"]["url"])
+            url = item["image_url"]["url"]
+            width, height = (image_sizes or {}).get(
+                url,
+            ) or _get_size_of_image_url(url)
 
             # Different counting logic for different models
             if any(
@@ -331,6 +442,17 @@ class OpenAITokenCounter(TokenCounterBase):
         except KeyError:
             encoding = tiktoken.get_encoding("o200k_base")
 
+        # Fetch the sizes of all the images concurrently in advance
+        image_sizes = await _get_sizes_of_image_urls(
+            [
+                item["image_url"]["url"]
+                for message in messages
+                if isinstance(message.get("content"), list)
+                for item in message["content"]
+                if isinstance(item, dict) and item.get("type") == "image_url"
+            ],
+        )
+
         tokens_per_message = 3
         tokens_per_name = 1
 
@@ -346,6 +468,7 @@ class OpenAITokenCounter(TokenCounterBase):
                             self.model_name,
                             value,
                             encoding,
+                            image_sizes,
                         )
                     )
 
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""The offline token estimator and the token count cache shared by the
+token counters of the remote APIs."""
+import base64
+import hashlib
+import io
+import json
+import math
+import re
+from collections import OrderedDict
+from typing import Any, Callable
+
+from .._utils._common import _get_image_size_from_header
+
+_CJK_PATTERN = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]",
+)
+
+
+def _estimate_text_tokens(text: str) -> int:
+    """Estimate the number of tokens of the text without a tokenizer, where
+    a CJK character is about one token, and other text is about four
+    characters per token."""
+    n_cjk = len(_CJK_PATTERN.findall(text))
+    return n_cjk + math.ceil((len(text) - n_cjk) / 4)
+
+
+def _get_image_size_from_base64(data: str) -> tuple[int, int] | None:
+    """Get the size of a base64 encoded image from its header, or `None` if
+    it cannot be decoded."""
+    try:
+        size = _get_image_size_from_header(base64.b64decode(data[:8192]))
+        if size is None:
+            from PIL import Image
+
+            size = Image.open(io.BytesIO(base64.b64decode(data))).size
+        return size
+    except Exception:
+        return None
+
+
+def _hash_object(obj: Any) -> str:
+    """Get the hash of a JSON serializable object as the cache key."""
+    json_str = json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode("utf-8")).hexdigest()
+
+
+class _TokenCountCache:
+    """A least recently used cache of the token counts, keyed by the hash
+    of the counted content."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size (`int`):
+                The maximum number of cached counts.
+        """
+        self.max_size = max_size
+        self._counts: OrderedDict[str, int] = OrderedDict()
+
+    def get(self, key: str) -> int | None:
+        """Get the cached count, or `None` if not cached."""
+        count = self._counts.get(key)
+        if count is not None:
+            self._counts.move_to_end(key)
+        return count
+
+    def set(self, key: str, count: int) -> None:
+        """Cache the count."""
+        self._counts[key] = count
+        self._counts.move_to_end(key)
+        while len(self._counts) > self.max_size:
+            self._counts.popitem(last=False)
+
+
+class _OfflineTokenEstimator:
+    """Estimate the number of tokens of the formatted messages locally,
+    with the estimation of each message memoized by its content hash."""
+
+    def __init__(
+        self,
+        media_tokens: Callable[[dict], int | None],
+        tokenizer: Callable[[str], int] | None = None,
+        safety_margin: float = 0.1,
+        tokens_per_message: int = 4,
+        cache_size: int = 4096,
+    ) -> None:
+        """Initialize the estimator.
+
+        Args:
+            media_tokens (`Callable[[dict], int | None]`):
+                The function that returns the number of tokens of a media
+                block (e.g. an image) in the API format, or `None` if the
+                dict is not a media block.
+            tokenizer (`Callable[[str], int] | None`, defaults to `None`):
+                The function that counts the tokens of a text. If `None`, a
+                character-based approximation is used.
+            safety_margin (`float`, defaults to `0.1`):
+                The ratio added to the estimation, so that the estimation is
+                more likely to be an upper bound.
+            tokens_per_message (`int`, defaults to `4`):
+                The tokens of the message structure, e.g. the role.
+            cache_size (`int`, defaults to `4096`):
+                The maximum number of memoized message estimations.
+        """
+        self.media_tokens = media_tokens
+        self.tokenizer = tokenizer or _estimate_text_tokens
+        self.safety_margin = safety_margin
+        self.tokens_per_message = tokens_per_message
+        self._cache = _TokenCountCache(cache_size)
+
+    def estimate(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+    ) -> int:
+        """Estimate the number of tokens of the messages and tools.
+
+        Args:
+            messages (`list[dict]`):
+                The formatted messages.
+            tools (`list[dict] | None`, defaults to `None`):
+                The tools JSON schemas.
+        """
+        total = sum(self._estimate_message(_) for _ in messages)
+        if tools:
+            total += self.tokenizer(json.dumps(tools, ensure_ascii=False))
+        return math.ceil(total * (1 + self.safety_margin))
+
+    def _estimate_message(self, message: Any) -> int:
+        """Estimate the tokens of one message, memoized by its hash."""
+        key = _hash_object(message)
+        count = self._cache.get(key)
+        if count is None:
+            count = self.tokens_per_message + self._estimate_value(message)
+            self._cache.set(key, count)
+        return count
+
+    def _estimate_value(self, value: Any) -> int:
+        """Estimate the tokens of a value in the message recursively, where
+        only the string values are counted as text."""
+        if isinstance(value, str):
+            return self.tokenizer(value)
+
+        if isinstance(value, dict):
+            n_media_tokens = self.media_tokens(value)
+            if n_media_tokens is not None:
+                return n_media_tokens
+            return sum(
+                self._estimate_value(_)
+                for key, _ in value.items()
+                if key not in ["role", "type"]
+            )
+
+        if isinstance(value, (list, tuple)):
+            return sum(self._estimate_value(_) for _ in value)
+
+        if isinstance(value, (int, float)):
+            return 1
+
+        return 0
@@ -1,31 +1,37 @@
 # -*- coding: utf-8 -*-
 """The tool module in agentscope."""
+from typing import TYPE_CHECKING
 
-from ._response import ToolResponse
-from ._coding import (
-    execute_python_code,
-    execute_shell_command,
-)
-from ._text_file import (
-    view_text_file,
-    write_text_file,
-    insert_text_file,
-)
-from ._multi_modality import (
-    dashscope_text_to_image,
-    dashscope_text_to_audio,
-    dashscope_image_to_text,
-    openai_text_to_image,
-    openai_text_to_audio,
-    openai_edit_image,
-    openai_create_image_variation,
-    openai_image_to_text,
-    openai_audio_to_text,
-)
-from ._toolkit import Toolkit
+from .._utils._lazy import _lazy_import
+
+if TYPE_CHECKING:
+    from ._response import ToolResponse
+    from ._coding import (
+        execute_python_code,
+        execute_shell_command,
+    )
+    from ._text_file import (
+        view_text_file,
+        write_text_file,
+        insert_text_file,
+    )
+    from ._multi_modality import (
+        dashscope_text_to_image,
+        dashscope_text_to_audio,
+        dashscope_image_to_text,
+        openai_text_to_image,
+        openai_text_to_audio,
+        openai_edit_image,
+        openai_create_image_variation,
+        openai_image_to_text,
+        openai_audio_to_text,
+    )
+    from ._toolkit import Toolkit
+    from ._tool_stats import ToolCallStats
 
 __all__ = [
     "Toolkit",
+    "ToolCallStats",
     "ToolResponse",
     "execute_python_code",
     "execute_shell_command",
@@ -42,3 +48,26 @@ __all__ = [
     "openai_image_to_text",
     "openai_audio_to_text",
 ]
+
+__getattr__, __dir__ = _lazy_import(
+    __name__,
+    {
+        "Toolkit": "._toolkit",
+        "ToolCallStats": "._tool_stats",
+        "ToolResponse": "._response",
+        "execute_python_code": "._coding",
+        "execute_shell_command": "._coding",
+        "view_text_file": "._text_file",
+        "write_text_file": "._text_file",
+        "insert_text_file": "._text_file",
+        "dashscope_text_to_image": "._multi_modality",
+        "dashscope_text_to_audio": "._multi_modality",
+        "dashscope_image_to_text": "._multi_modality",
+        "openai_text_to_image": "._multi_modality",
+        "openai_text_to_audio": "._multi_modality",
+        "openai_edit_image": "._multi_modality",
+        "openai_create_image_variation": "._multi_modality",
+        "openai_image_to_text": "._multi_modality",
+        "openai_audio_to_text": "._multi_modality",
+    },
+)
@@ -6,6 +6,8 @@ TODO: handle the exception raised when yielding from async generator
  into a normal ToolResponse instance.
 """
 import asyncio
+import contextvars
+from concurrent.futures import Executor
 from typing import AsyncGenerator, Generator, Callable
 
 from ._response import ToolResponse
@@ -35,9 +37,25 @@ async def _object_wrapper(
 async def _sync_generator_wrapper(
     sync_generator: Generator[ToolResponse, None, None],
     postprocess_func: Callable[[ToolResponse], ToolResponse | None] | None,
+    executor: Executor | None = None,
 ) -> AsyncGenerator[ToolResponse, None]:
-    """Wrap a sync generator to an async generator."""
-    for chunk in sync_generator:
+    """Wrap a sync generator to an async generator, where the generator is
+    iterated in the executor (the default executor of the event loop if
+    `None`) to avoid blocking the event loop, with a copy of the current
+    context variables shared by all the iterations."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    exhausted = object()
+    while True:
+        chunk = await loop.run_in_executor(
+            executor,
+            context.run,
+            next,
+            sync_generator,
+            exhausted,
+        )
+        if chunk is exhausted:
+            break
         yield await _postprocess_tool_response(chunk, postprocess_func)
 
 
@@ -84,3 +102,76 @@ async def _async_generator_wrapper(
                 ),
                 postprocess_func,
             )
+
+
+async def _timeout_wrapper(
+    async_func: AsyncGenerator[ToolResponse, None],
+    timeout: float,
+    on_timeout: Callable[[], None] | None = None,
+) -> AsyncGenerator[ToolResponse, None]:
+    """Run the tool in a separate task and stop it when the timeout is
+    exceeded, where a timeout message is added to the last response.
+
+    The deadline is fixed when the wrapper starts, so the time the consumer
+    spends between the chunks counts towards the timeout, while the tool
+    keeps producing the chunks into the queue in the meantime.
+
+    .. note:: A sync tool function running in a thread cannot be stopped,
+     its result will be discarded after the timeout.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def _produce() -> None:
+        try:
+            async for chunk in async_func:
+                await queue.put(chunk)
+            await queue.put(finished)
+        except Exception as e:
+            await queue.put(e)
+
+    task = asyncio.create_task(_produce())
+    deadline = loop.time() + timeout
+    last_chunk = None
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    queue.get(),
+                    max(deadline - loop.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                break
+
+            if item is finished:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            yield item
+            last_chunk = item
+
+    finally:
+        task.cancel()
+
+    if on_timeout:
+        on_timeout()
+
+    timeout_info = TextBlock(
+        type="text",
+        text="<system-info>"
+        f"The tool call has exceeded the timeout of {timeout} seconds."
+        "</system-info>",
+    )
+    if last_chunk:
+        last_chunk.content.append(timeout_info)
+        last_chunk.is_last = True
+        yield last_chunk
+
+    else:
+        yield ToolResponse(
+            content=[timeout_info],
+            stream=True,
+            is_last=True,
+        )
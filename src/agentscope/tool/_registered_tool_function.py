@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """The data model for registered tool functions in AgentScope."""
+import asyncio
 from copy import deepcopy
 from dataclasses import field, dataclass
 from typing import Callable, Literal, Type
@@ -45,6 +46,30 @@ class RegisteredToolFunction:
     response as arguments. If it returns `None`, the tool result will be
     returned as is. If it returns a `ToolResponse`, the returned block
     will be used as the final tool response."""
+    max_concurrency: int | None = None
+    """The maximum number of concurrent calls of the tool function, `None`
+    means no limit."""
+    timeout: float | None = None
+    """The timeout of a tool call in seconds, `None` means no timeout."""
+    speculative: bool = False
+    """Whether the tool function is side-effect-free or idempotent, so that
+    it can be called speculatively before the model finishes generating the
+    tool call message, and cancelled if the final tool call differs."""
+    run_in_process: bool = False
+    """Whether to run the sync tool function in the process pool executor of
+    the toolkit, which requires a picklable module-level function."""
+    semaphore: asyncio.Semaphore | None = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    """The semaphore that limits the concurrent calls."""
+
+    def __post_init__(self) -> None:
+        """Create the semaphore if the concurrency is limited."""
+        if self.max_concurrency is not None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
 
     @property
     def extended_json_schema(self) -> dict:
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""The execution statistics of the tool functions in the toolkit."""
+from dataclasses import dataclass
+
+
+@dataclass
+class ToolCallStats:
+    """The queueing and latency statistics of a tool function, where the
+    waiting time is spent on the concurrency limits, and the running time
+    is spent on the tool execution, including streaming."""
+
+    name: str
+    """The name of the tool function."""
+    n_calls: int = 0
+    """The number of finished calls."""
+    n_waiting: int = 0
+    """The number of calls waiting for the concurrency limits."""
+    n_running: int = 0
+    """The number of running calls."""
+    n_timeouts: int = 0
+    """The number of calls that exceeded the timeout."""
+    total_wait_time: float = 0.0
+    """The total waiting time in seconds."""
+    max_wait_time: float = 0.0
+    """The maximum waiting time in seconds."""
+    total_run_time: float = 0.0
+    """The total running time in seconds."""
+    max_run_time: float = 0.0
+    """The maximum running time in seconds."""
+
+    @property
+    def avg_wait_time(self) -> float:
+        """The average waiting time of the finished calls in seconds."""
+        return self.total_wait_time / self.n_calls if self.n_calls else 0.0
+
+    @property
+    def avg_run_time(self) -> float:
+        """The average running time of the finished calls in seconds."""
+        return self.total_run_time / self.n_calls if self.n_calls else 0.0
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+# pylint: disable=too-many-lines
 """The toolkit class for tool calls in agentscope."""
 
 import asyncio
+import contextvars
 import inspect
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AsyncExitStack
 from copy import deepcopy
 from dataclasses import dataclass
 from functools import partial
@@ -14,6 +20,7 @@ from typing import (
     Type,
     Generator,
     Callable,
+    TYPE_CHECKING,
 )
 
 from pydantic import (
@@ -28,15 +35,12 @@ from ._async_wrapper import (
     _async_generator_wrapper,
     _object_wrapper,
     _sync_generator_wrapper,
+    _timeout_wrapper,
 )
 from ._registered_tool_function import RegisteredToolFunction
 from ._response import ToolResponse
+from ._tool_stats import ToolCallStats
 from .._utils._common import _remove_title_field
-from ..mcp import (
-    MCPToolFunction,
-    MCPClientBase,
-    StatefulClientBase,
-)
 from ..message import (
     ToolUseBlock,
     TextBlock,
@@ -49,6 +53,11 @@ from ..types import (
 from ..tracing._trace import trace_toolkit
 from .._logging import logger
 
+if TYPE_CHECKING:
+    from ..mcp import MCPClientBase
+else:
+    MCPClientBase = "MCPClientBase"
+
 
 @dataclass
 class ToolGroup:
@@ -93,13 +102,39 @@ class Toolkit(StateModule):
     - `get_tool_group_notes`
     """
 
-    def __init__(self) -> None:
-        """Initialize the toolkit."""
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize the toolkit.
+
+        Args:
+            max_concurrency (`int | None`, optional):
+                The maximum number of concurrent tool calls across all the
+                tool functions. If `None`, no global limit is applied.
+            executor (`Executor | None`, optional):
+                The executor to run the sync tool functions and iterate the
+                sync generators, so that they don't block the event loop.
+                If `None`, the default thread pool of the event loop is
+                used. When a `ProcessPoolExecutor` is given, only the tool
+                functions registered with `run_in_process=True` are run in
+                it, while the others and the sync generators are still run
+                in the default thread pool.
+        """
         super().__init__()
 
         self.tools: dict[str, RegisteredToolFunction] = {}
         self.groups: dict[str, ToolGroup] = {}
 
+        self.executor = executor
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
+        self._tool_stats: dict[str, ToolCallStats] = {}
+
     def create_tool_group(
         self,
         group_name: str,
@@ -204,6 +239,10 @@ class Toolkit(StateModule):
             ToolResponse | None,
         ]
         | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        speculative: bool = False,
+        run_in_process: bool = False,
     ) -> None:
         """Register a tool function to the toolkit.
 
@@ -245,6 +284,28 @@ class Toolkit(StateModule):
                 result will be returned as is. If it returns a
                 `ToolResponse`, the returned block will be used as the
                 final tool result.
+            max_concurrency (`int | None`, optional):
+                The maximum number of concurrent calls of this tool
+                function. If `None`, only the global limit of the toolkit
+                is applied.
+            timeout (`float | None`, optional):
+                The timeout of a call in seconds, after which the tool call
+                is stopped and a timeout message is returned. It's measured
+                from the start of the call, including the time the caller
+                spends between the streaming chunks. If `None`, no timeout
+                is applied.
+            speculative (`bool`, defaults to `False`):
+                Whether the tool function is side-effect-free or idempotent,
+                so that the agent can call it as soon as its arguments are
+                completely received in the streaming model response, and
+                cancel it if the final tool call differs.
+            run_in_process (`bool`, defaults to `False`):
+                Whether to run the tool function in the executor of the
+                toolkit when it's a `ProcessPoolExecutor`, e.g. for the
+                CPU-bound tools. Only the plain module-level sync functions
+                are supported, since they're pickled to the worker
+                processes, where the modifications of the states are not
+                visible to the current process.
         """
         # Arguments checking
         if group_name not in self.groups and group_name != "basic":
@@ -264,7 +325,7 @@ class Toolkit(StateModule):
 
         # Handle MCP tool function and regular function respectively
         mcp_name = None
-        if isinstance(tool_func, MCPToolFunction):
+        if self._is_mcp_tool_function(tool_func):
             func_name = tool_func.name
             original_func = tool_func.__call__
             self._validate_tool_function(func_name)
@@ -310,6 +371,9 @@ class Toolkit(StateModule):
                 include_var_keyword=include_var_keyword,
             )
 
+        if run_in_process:
+            self._validate_process_function(func_name, original_func)
+
         # Override the description if provided
         if func_description:
             json_schema["function"]["description"] = func_description
@@ -345,6 +409,10 @@ class Toolkit(StateModule):
             extended_model=None,
             mcp_name=mcp_name,
             postprocess_func=postprocess_func,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            speculative=speculative,
+            run_in_process=run_in_process,
         )
 
         self.tools[func_name] = func_obj
@@ -527,76 +595,20 @@ class Toolkit(StateModule):
                 None,
             )
 
-        # Prepare function and keyword arguments
-        tool_func = self.tools[tool_call["name"]]
-        kwargs = {
-            **tool_func.preset_kwargs,
-            **(tool_call.get("input", {}) or {}),
-        }
-
-        # Prepare postprocess function
-        if tool_func.postprocess_func:
-            partial_postprocess_func = partial(
-                tool_func.postprocess_func,
-                tool_call,
-            )
-        else:
-            partial_postprocess_func = None
-
-        # Async function
-        try:
-            if inspect.iscoroutinefunction(tool_func.original_func):
-                try:
-                    res = await tool_func.original_func(**kwargs)
-                except asyncio.CancelledError:
-                    res = ToolResponse(
-                        content=[
-                            TextBlock(
-                                type="text",
-                                text="<system-info>"
-                                "The tool call has been interrupted "
-                                "by the user."
-                                "</system-info>",
-                            ),
-                        ],
-                        stream=True,
-                        is_last=True,
-                        is_interrupted=True,
-                    )
-
-            else:
-                # When `tool_func.original_func` is Async generator function or
-                # Sync function
-                res = tool_func.original_func(**kwargs)
-
-        except Exception as e:
-            res = ToolResponse(
-                content=[
-                    TextBlock(
-                        type="text",
-                        text=f"Error: {e}",
-                    ),
-                ],
-            )
-
-        # Handle different return type
-
-        # If return an async generator
-        if isinstance(res, AsyncGenerator):
-            return _async_generator_wrapper(res, partial_postprocess_func)
-
-        # If return a sync generator
-        if isinstance(res, Generator):
-            return _sync_generator_wrapper(res, partial_postprocess_func)
+        return self._execute_tool_function(
+            self.tools[tool_call["name"]],
+            tool_call,
+        )
 
-        if isinstance(res, ToolResponse):
-            return _object_wrapper(res, partial_postprocess_func)
+    def get_tool_stats(self) -> dict[str, ToolCallStats]:
+        """Get the queueing and latency statistics of the called tool
+        functions.
 
-        raise TypeError(
-            "The tool function must return a ToolResponse object, or an "
-            "AsyncGenerator/Generator of ToolResponse objects, "
-            f"but got {type(res)}.",
-        )
+        Returns:
+            `dict[str, ToolCallStats]`:
+                The statistics, whose keys are the tool function names.
+        """
+        return self._tool_stats
 
     async def register_mcp_client(
         self,
@@ -640,6 +652,8 @@ class Toolkit(StateModule):
                 `ToolResponse`, the returned block will be used as the
                 final tool result.
         """
+        from ..mcp import StatefulClientBase
+
         if (
             isinstance(mcp_client, StatefulClientBase)
             and not mcp_client.is_connected
@@ -847,6 +861,17 @@ class Toolkit(StateModule):
                 "in the toolkit.",
             )
 
+    @staticmethod
+    def _is_mcp_tool_function(tool_func: ToolFunction) -> bool:
+        """Check if the tool function is an MCP tool function, without
+        importing the MCP library, as no MCP tool function exists unless its
+        module is imported."""
+        module = sys.modules.get("agentscope.mcp._mcp_function")
+        return module is not None and isinstance(
+            tool_func,
+            module.MCPToolFunction,
+        )
+
     @staticmethod
     def _parse_tool_function(
         tool_func: ToolFunction,
@@ -951,3 +976,207 @@ class Toolkit(StateModule):
             func_json_schema["function"]["description"] = func_description
 
         return func_json_schema
+
+    async def _execute_tool_function(
+        self,
+        tool_func: RegisteredToolFunction,
+        tool_call: ToolUseBlock,
+    ) -> AsyncGenerator[ToolResponse, None]:
+        """Execute the tool function under the global and per-tool
+        concurrency limits and timeout, and record the statistics."""
+        stats = self._tool_stats.setdefault(
+            tool_func.name,
+            ToolCallStats(name=tool_func.name),
+        )
+
+        start_time = time.perf_counter()
+        run_start_time = None
+        stats.n_waiting += 1
+        try:
+            async with AsyncExitStack() as stack:
+                for semaphore in [self._semaphore, tool_func.semaphore]:
+                    if semaphore is not None:
+                        await stack.enter_async_context(semaphore)
+
+                run_start_time = time.perf_counter()
+                stats.n_waiting -= 1
+                stats.n_running += 1
+
+                chunks = self._run_tool_function(tool_func, tool_call)
+                if tool_func.timeout is not None:
+
+                    def _on_timeout() -> None:
+                        stats.n_timeouts += 1
+
+                    chunks = _timeout_wrapper(
+                        chunks,
+                        tool_func.timeout,
+                        _on_timeout,
+                    )
+
+                async for chunk in chunks:
+                    yield chunk
+
+        finally:
+            if run_start_time is None:
+                stats.n_waiting -= 1
+            else:
+                end_time = time.perf_counter()
+                wait_time = run_start_time - start_time
+                run_time = end_time - run_start_time
+                stats.n_running -= 1
+                stats.n_calls += 1
+                stats.total_wait_time += wait_time
+                stats.max_wait_time = max(stats.max_wait_time, wait_time)
+                stats.total_run_time += run_time
+                stats.max_run_time = max(stats.max_run_time, run_time)
+
+    async def _run_tool_function(
+        self,
+        tool_func: RegisteredToolFunction,
+        tool_call: ToolUseBlock,
+    ) -> AsyncGenerator[ToolResponse, None]:
+        """Run the tool function, where the sync functions and generators
+        are run in the executor to avoid blocking the event loop."""
+        kwargs = {
+            **tool_func.preset_kwargs,
+            **(tool_call.get("input", {}) or {}),
+        }
+
+        # Prepare postprocess function
+        if tool_func.postprocess_func:
+            partial_postprocess_func = partial(
+                tool_func.postprocess_func,
+                tool_call,
+            )
+        else:
+            partial_postprocess_func = None
+
+        # Async function
+        try:
+            if inspect.iscoroutinefunction(tool_func.original_func):
+                try:
+                    res = await tool_func.original_func(**kwargs)
+                except asyncio.CancelledError:
+                    res = ToolResponse(
+                        content=[
+                            TextBlock(
+                                type="text",
+                                text="<system-info>"
+                                "The tool call has been interrupted "
+                                "by the user."
+                                "</system-info>",
+                            ),
+                        ],
+                        stream=True,
+                        is_last=True,
+                        is_interrupted=True,
+                    )
+
+            elif inspect.isasyncgenfunction(
+                tool_func.original_func,
+            ) or inspect.isgeneratorfunction(tool_func.original_func):
+                # Create the generator, which is iterated in the wrappers
+                res = tool_func.original_func(**kwargs)
+
+            elif getattr(tool_func.original_func, "__self__", None) is self:
+                # The meta tool functions, e.g. `reset_equipped_tools`, modify
+                # the toolkit, so they're run in the event loop
+                res = tool_func.original_func(**kwargs)
+
+            else:
+                # Sync function
+                res = await self._run_in_executor(
+                    tool_func.original_func,
+                    kwargs,
+                    tool_func.run_in_process,
+                )
+
+        except Exception as e:
+            res = ToolResponse(
+                content=[
+                    TextBlock(
+                        type="text",
+                        text=f"Error: {e}",
+                    ),
+                ],
+            )
+
+        # Handle different return type
+
+        # If return an async generator
+        if isinstance(res, AsyncGenerator):
+            wrapper = _async_generator_wrapper(res, partial_postprocess_func)
+
+        # If return a sync generator, which cannot be sent to other processes
+        elif isinstance(res, Generator):
+            wrapper = _sync_generator_wrapper(
+                res,
+                partial_postprocess_func,
+                None
+                if isinstance(self.executor, ProcessPoolExecutor)
+                else self.executor,
+            )
+
+        elif isinstance(res, ToolResponse):
+            wrapper = _object_wrapper(res, partial_postprocess_func)
+
+        else:
+            raise TypeError(
+                "The tool function must return a ToolResponse object, or an "
+                "AsyncGenerator/Generator of ToolResponse objects, "
+                f"but got {type(res)}.",
+            )
+
+        async for chunk in wrapper:
+            yield chunk
+
+    async def _run_in_executor(
+        self,
+        func: Callable[..., Any],
+        kwargs: dict[str, Any],
+        run_in_process: bool = False,
+    ) -> Any:
+        """Run the sync function in the executor, with the context variables
+        copied when running in threads. Only the functions registered with
+        `run_in_process=True` are sent to the process pool executor."""
+        loop = asyncio.get_running_loop()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            if run_in_process:
+                return await loop.run_in_executor(
+                    self.executor,
+                    partial(func, **kwargs),
+                )
+            executor = None
+        else:
+            executor = self.executor
+
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            executor,
+            partial(context.run, func, **kwargs),
+        )
+
+    @staticmethod
+    def _validate_process_function(
+        func_name: str,
+        func: Callable[..., Any],
+    ) -> None:
+        """Check the tool function can be run in the worker processes, i.e.
+        a plain sync function defined at the module level, rather than a
+        bound method, lambda or nested function."""
+        is_sync = not (
+            inspect.iscoroutinefunction(func)
+            or inspect.isgeneratorfunction(func)
+            or inspect.isasyncgenfunction(func)
+        )
+        if (
+            not inspect.isfunction(func)
+            or not is_sync
+            or func.__qualname__ != func.__name__
+            or func.__name__ == "<lambda>"
+        ):
+            raise ValueError(
+                f"Tool function '{func_name}' cannot be run in process, "
+                "only the plain module-level sync functions are supported.",
+            )
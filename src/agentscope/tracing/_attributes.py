@@ -2,6 +2,7 @@
 """Attributes processor for span attributes."""
 import datetime
 import enum
+import hashlib
 import inspect
 import json
 from dataclasses import is_dataclass
@@ -57,22 +58,107 @@ def _to_serializable(
     return res
 
 
-def _serialize_to_str(value: Any) -> str:
+def _digest(data: str | bytes) -> str:
+    """Get the digest of the binary payload, which is recorded instead of
+    the payload itself."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return f"sha256:{hashlib.sha256(data).hexdigest()} ({len(data)} bytes)"
+
+
+def _shrink(
+    value: Any,
+    max_length: int | None,
+    hash_binary: bool,
+) -> Any:
+    """Replace the binary payloads with their digests and cut the long
+    strings in the value before serialization, so that the large payloads
+    are not serialized only to be truncated.
+
+    Args:
+        value (`Any`):
+            The value to shrink.
+        max_length (`int | None`):
+            The maximum length of the strings, or `None` for no limit.
+        hash_binary (`bool`):
+            Whether to replace the base64 data, the base64 data URLs and the
+            bytes with their digests.
+
+    Returns:
+        `Any`:
+            The shrunk value, where the unchanged parts are shared with the
+            input value.
+    """
+    res = value
+    if isinstance(value, str):
+        if hash_binary and value.startswith("data:") and ";base64," in value:
+            prefix, data = value.split(";base64,", 1)
+            res = f"{prefix};base64,{_digest(data)}"
+        elif max_length is not None and len(value) > max_length:
+            res = value[:max_length]
+
+    elif isinstance(value, bytes) and hash_binary:
+        res = _digest(value)
+
+    elif isinstance(value, dict):
+        if (
+            hash_binary
+            and value.get("type") == "base64"
+            and isinstance(value.get("data"), str)
+        ):
+            res = {**value, "data": _digest(value["data"])}
+        else:
+            res = {
+                key: _shrink(val, max_length, hash_binary)
+                for key, val in value.items()
+            }
+
+    elif isinstance(value, (list, tuple)):
+        res = [_shrink(_, max_length, hash_binary) for _ in value]
+
+    elif isinstance(value, Msg):
+        res = value.evolve(
+            content=_shrink(value.content, max_length, hash_binary),
+            metadata=_shrink(value.metadata, max_length, hash_binary),
+        )
+
+    return res
+
+
+def _serialize_to_str(
+    value: Any,
+    max_length: int | None = None,
+    hash_binary: bool = False,
+) -> str:
     """Get input attributes
 
     Args:
         value (`Any`):
             The input value
+        max_length (`int | None`, defaults to `None`):
+            The maximum length of the serialized string, beyond which the
+            string is truncated. If `None`, no limit.
+        hash_binary (`bool`, defaults to `False`):
+            Whether to record the digests of the binary payloads (e.g. the
+            base64 images) instead of the payloads themselves.
 
     Returns:
         `str`:
             JSON serialized string of the input value
     """
+    if max_length is not None or hash_binary:
+        value = _shrink(value, max_length, hash_binary)
+
     try:
-        return json.dumps(value, ensure_ascii=False)
+        res = json.dumps(value, ensure_ascii=False)
 
     except TypeError:
-        return json.dumps(
+        res = json.dumps(
             _to_serializable(value),
             ensure_ascii=False,
         )
+
+    if max_length is not None and len(res) > max_length:
+        res = f"{res[:max_length]}...[truncated {len(res) - max_length} chars]"
+
+    return res
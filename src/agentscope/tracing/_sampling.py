@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""The sampling and the attribute budgets of the tracing in agentscope."""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import (
+    Link,
+    SpanContext,
+    SpanKind as OTelSpanKind,
+    StatusCode,
+    TraceFlags,
+)
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
+
+from ._attributes import _serialize_to_str
+from ._types import SpanKind
+
+
+@dataclass
+class _TracingSettings:
+    """The settings of the attribute serialization, which are set by
+    `setup_tracing`."""
+
+    max_attribute_length: dict[str, int | None] = field(default_factory=dict)
+    """The maximum length of the serialized attributes by the span kind, where
+    the kinds not in the dict have no limit."""
+
+    hash_binary: bool = False
+    """Whether to record the digests of the binary payloads instead of the
+    payloads themselves."""
+
+    tail_sampling: bool = False
+    """Whether the spans not sampled at the start are recorded for the tail
+    sampling, whose attributes are serialized only if the trace is kept."""
+
+
+_settings = _TracingSettings()
+
+# The serialization of the attributes of the recorded but not (yet) sampled
+# spans, which is deferred until the tail sampling keeps the trace
+_deferred: dict[int, list[tuple[str, Callable[[], dict[str, Any]]]]] = {}
+_deferred_lock = threading.Lock()
+
+
+def _serialize_attributes(
+    kind: str,
+    attributes: dict[str, Any],
+) -> dict[str, str]:
+    """Serialize the attributes within the budget of the span kind."""
+    return {
+        key: _serialize_to_str(
+            value,
+            max_length=_settings.max_attribute_length.get(kind),
+            hash_binary=_settings.hash_binary,
+        )
+        for key, value in attributes.items()
+    }
+
+
+def _set_lazy_attributes(
+    span: Span,
+    kind: str,
+    get_attributes: Callable[[], dict[str, Any]],
+) -> None:
+    """Set the attributes on the span, which are only collected and
+    serialized if the span is sampled. For the spans recorded for the tail
+    sampling, the serialization is deferred until the trace is kept, and the
+    objects are serialized in their state by then.
+
+    Args:
+        span (`Span`):
+            The span.
+        kind (`str`):
+            The span kind, which decides the attribute budget.
+        get_attributes (`Callable[[], dict[str, Any]]`):
+            A function returning the attributes to be serialized.
+    """
+    if not span.is_recording():
+        return
+
+    span_context = span.get_span_context()
+    if span_context.trace_flags.sampled:
+        span.set_attributes(_serialize_attributes(kind, get_attributes()))
+
+    elif _settings.tail_sampling:
+        with _deferred_lock:
+            _deferred.setdefault(span_context.span_id, []).append(
+                (kind, get_attributes),
+            )
+
+
+class _TraceSampler(Sampler):
+    """The head sampler that samples a ratio of the traces by their IDs, and
+    records the other spans without sampling them if the tail sampling is
+    enabled, so that the tail sampling can keep them later."""
+
+    def __init__(self, sample_ratio: float, tail_sampling: bool) -> None:
+        """Initialize the sampler.
+
+        Args:
+            sample_ratio (`float`):
+                The ratio of the traces to sample at the start.
+            tail_sampling (`bool`):
+                Whether to record the spans not sampled at the start.
+        """
+        self._head = ParentBased(TraceIdRatioBased(sample_ratio))
+        self._tail_sampling = tail_sampling
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: OTelSpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: TraceState | None = None,
+    ) -> SamplingResult:
+        """Decide whether to sample the span."""
+        result = self._head.should_sample(
+            parent_context,
+            trace_id,
+            name,
+            kind,
+            attributes,
+            links,
+            trace_state,
+        )
+        if result.decision == Decision.DROP and self._tail_sampling:
+            return SamplingResult(
+                Decision.RECORD_ONLY,
+                attributes,
+                result.trace_state,
+            )
+        return result
+
+    def get_description(self) -> str:
+        """Get the description of the sampler."""
+        return f"AgentScopeSampler{{{self._head.get_description()}}}"
+
+
+class _TailSamplingSpanProcessor(SpanProcessor):
+    """The span processor that forwards the sampled spans, and buffers the
+    recorded but not sampled spans until their local root span ends. The
+    buffered trace is forwarded as sampled if any span fails or the root
+    span is slow, and dropped otherwise."""
+
+    def __init__(
+        self,
+        processor: SpanProcessor,
+        keep_error_traces: bool,
+        slow_trace_threshold: float | None,
+        max_buffered_traces: int = 1000,
+    ) -> None:
+        """Initialize the span processor.
+
+        Args:
+            processor (`SpanProcessor`):
+                The span processor exporting the kept spans.
+            keep_error_traces (`bool`):
+                Whether to keep the traces with failed spans.
+            slow_trace_threshold (`float | None`):
+                The duration in seconds of the root span, beyond which the
+                trace is kept. If `None`, the slow traces are not kept.
+            max_buffered_traces (`int`, defaults to `1000`):
+                The maximum number of the unfinished traces in the buffer,
+                beyond which the oldest one is dropped.
+        """
+        self._processor = processor
+        self._keep_error_traces = keep_error_traces
+        self._slow_trace_threshold = slow_trace_threshold
+        self._max_buffered_traces = max_buffered_traces
+        self._traces: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(
+        self,
+        span: Span,
+        parent_context: Context | None = None,
+    ) -> None:
+        """Forward the started span."""
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        """Forward the sampled span, or buffer the not sampled span until
+        the tail sampling decision of its trace."""
+        if span.context.trace_flags.sampled:
+            self._processor.on_end(span)
+            return
+
+        with self._lock:
+            trace_id = span.context.trace_id
+            self._traces.setdefault(trace_id, []).append(span)
+
+            dropped = []
+            if span.parent is None or span.parent.is_remote:
+                spans = self._traces.pop(trace_id)
+                if not self._keep(span, spans):
+                    dropped, spans = spans, []
+
+            else:
+                spans = []
+                while len(self._traces) > self._max_buffered_traces:
+                    dropped.extend(self._traces.popitem(last=False)[1])
+
+        with _deferred_lock:
+            for _ in dropped:
+                _deferred.pop(_.context.span_id, None)
+
+        for _ in spans:
+            self._processor.on_end(self._sampled(_))
+
+    def shutdown(self) -> None:
+        """Shut down the span processor."""
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Export the kept spans."""
+        return self._processor.force_flush(timeout_millis)
+
+    def _keep(self, root: ReadableSpan, spans: list[ReadableSpan]) -> bool:
+        """Whether to keep the trace."""
+        if self._keep_error_traces and any(
+            _.status.status_code == StatusCode.ERROR for _ in spans
+        ):
+            return True
+
+        return (
+            self._slow_trace_threshold is not None
+            and root.start_time is not None
+            and root.end_time is not None
+            and root.end_time - root.start_time
+            >= self._slow_trace_threshold * 1e9
+        )
+
+    @staticmethod
+    def _sampled(span: ReadableSpan) -> ReadableSpan:
+        """Copy the span as sampled, with the deferred attributes
+        serialized."""
+        attributes = dict(span.attributes or {})
+        with _deferred_lock:
+            deferred = _deferred.pop(span.context.span_id, [])
+        for kind, get_attributes in deferred:
+            attributes.update(_serialize_attributes(kind, get_attributes()))
+
+        return ReadableSpan(
+            name=span.name,
+            context=SpanContext(
+                span.context.trace_id,
+                span.context.span_id,
+                span.context.is_remote,
+                TraceFlags(TraceFlags.SAMPLED),
+                span.context.trace_state,
+            ),
+            parent=span.parent,
+            resource=span.resource,
+            attributes=attributes,
+            events=span.events,
+            links=span.links,
+            kind=span.kind,
+            status=span.status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=span.instrumentation_scope,
+        )
+
+
+def _normalize_budgets(
+    max_attribute_length: int | dict[SpanKind | str, int] | None,
+) -> dict[str, int | None]:
+    """Get the attribute budgets by the span kind."""
+    if isinstance(max_attribute_length, dict):
+        return {
+            SpanKind(kind).value: length
+            for kind, length in max_attribute_length.items()
+        }
+    return {kind.value: max_attribute_length for kind in SpanKind}
@@ -1,27 +1,125 @@
 # -*- coding: utf-8 -*-
 """The tracing interface class in agentscope."""
+from typing import TYPE_CHECKING
+
 from agentscope import _config
+from ._types import SpanKind
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+else:
+    SpanProcessor = "SpanProcessor"
+    TracerProvider = "TracerProvider"
 
 
-def setup_tracing(endpoint: str) -> None:
+def setup_tracing(
+    endpoint: str,
+    sample_ratio: float = 1.0,
+    keep_error_traces: bool = True,
+    slow_trace_threshold: float | None = None,
+    max_attribute_length: int | dict[SpanKind | str, int] | None = None,
+    hash_binary: bool = False,
+) -> None:
     """Set up the AgentScope tracing by configuring the endpoint URL.
 
+    The inputs and outputs of the traced calls are only serialized for the
+    sampled spans. With a `sample_ratio` below 1, the traces are sampled by
+    their IDs when they start (head sampling), and the other traces are
+    still kept if any span fails or the root span is slow (tail sampling),
+    where their inputs and outputs are serialized when the trace is kept.
+
+    Example:
+        .. code-block:: python
+
+            setup_tracing(
+                endpoint="http://localhost:4318/v1/traces",
+                sample_ratio=0.1,
+                slow_trace_threshold=30,
+                max_attribute_length={"LLM": 8192, "FORMATTER": 4096},
+                hash_binary=True,
+            )
+
     Args:
         endpoint (`str`):
             The endpoint URL for the tracing exporter.
+        sample_ratio (`float`, defaults to `1.0`):
+            The ratio of the traces to sample when they start.
+        keep_error_traces (`bool`, defaults to `True`):
+            Whether to keep the traces not sampled at the start if any span
+            fails.
+        slow_trace_threshold (`float | None`, defaults to `None`):
+            The duration in seconds of the root span, beyond which the trace
+            not sampled at the start is kept. If `None`, not kept by the
+            duration.
+        max_attribute_length (`int | dict[SpanKind | str, int] | None`, \
+        defaults to `None`):
+            The maximum length of the serialized input, output and metadata
+            attributes, beyond which they are truncated. A dict gives the
+            budgets by the span kind, e.g. `{"LLM": 8192}`, and the kinds not
+            in it have no limit. If `None`, no limit.
+        hash_binary (`bool`, defaults to `False`):
+            Whether to record the SHA-256 digests of the binary payloads,
+            e.g. the base64 images and audios, instead of inlining them.
     """
-    # Lazy import
-    from opentelemetry.sdk.trace import TracerProvider
     from opentelemetry.sdk.trace.export import BatchSpanProcessor
     from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
         OTLPSpanExporter,
     )
     from opentelemetry import trace
 
-    tracer_provider = TracerProvider()
-    exporter = OTLPSpanExporter(endpoint=endpoint)
-    span_processor = BatchSpanProcessor(exporter)
-    tracer_provider.add_span_processor(span_processor)
+    tracer_provider = _create_tracer_provider(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)),
+        sample_ratio=sample_ratio,
+        keep_error_traces=keep_error_traces,
+        slow_trace_threshold=slow_trace_threshold,
+        max_attribute_length=max_attribute_length,
+        hash_binary=hash_binary,
+    )
     trace.set_tracer_provider(tracer_provider)
 
     _config.trace_enabled = True
+
+
+def _create_tracer_provider(
+    span_processor: SpanProcessor,
+    sample_ratio: float = 1.0,
+    keep_error_traces: bool = True,
+    slow_trace_threshold: float | None = None,
+    max_attribute_length: int | dict[SpanKind | str, int] | None = None,
+    hash_binary: bool = False,
+) -> TracerProvider:
+    """Create the tracer provider with the sampling, and apply the attribute
+    settings. Refer to `setup_tracing` for the arguments."""
+    # Lazy import
+    from opentelemetry.sdk.trace import TracerProvider
+    from ._sampling import (
+        _settings,
+        _normalize_budgets,
+        _TailSamplingSpanProcessor,
+        _TraceSampler,
+    )
+
+    if not 0 <= sample_ratio <= 1:
+        raise ValueError(
+            f"The sample ratio should be in [0, 1], but got {sample_ratio}.",
+        )
+
+    tail_sampling = sample_ratio < 1 and (
+        keep_error_traces or slow_trace_threshold is not None
+    )
+    _settings.max_attribute_length = _normalize_budgets(max_attribute_length)
+    _settings.hash_binary = hash_binary
+    _settings.tail_sampling = tail_sampling
+
+    if tail_sampling:
+        span_processor = _TailSamplingSpanProcessor(
+            span_processor,
+            keep_error_traces=keep_error_traces,
+            slow_trace_threshold=slow_trace_threshold,
+        )
+
+    tracer_provider = TracerProvider(
+        sampler=_TraceSampler(sample_ratio, tail_sampling),
+    )
+    tracer_provider.add_span_processor(span_processor)
+    return tracer_provider
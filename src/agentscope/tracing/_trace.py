@@ -16,14 +16,15 @@ from typing import (
 import aioitertools
 
 from ._attributes import _serialize_to_str
+from ._sampling import _set_lazy_attributes
 from .. import _config
-from ..embedding._embedding_base import EmbeddingModelBase
-from ..model._model_base import ChatModelBase
 from .._logging import logger
 from ._types import SpanKind, SpanAttributes
 
 if TYPE_CHECKING:
     from ..agent import AgentBase
+    from ..embedding import EmbeddingModelBase
+    from ..model import ChatModelBase
     from ..formatter import FormatterBase
     from ..tool import (
         Toolkit,
@@ -43,6 +44,8 @@ else:
     ToolUseBlock = "ToolUseBlock"
     EmbeddingResponse = "EmbeddingResponse"
     ChatResponse = "ChatResponse"
+    EmbeddingModelBase = "EmbeddingModelBase"
+    ChatModelBase = "ChatModelBase"
     Span = "Span"
 
 
@@ -63,6 +66,7 @@ def _check_tracing_enabled() -> bool:
 def _trace_sync_generator_wrapper(
     res: Generator[T, None, None],
     span: Span,
+    kind: str = SpanKind.COMMON,
 ) -> Generator[T, None, None]:
     """Trace the sync generator output with OpenTelemetry."""
 
@@ -84,10 +88,10 @@ def _trace_sync_generator_wrapper(
     finally:
         if not has_error:
             # Set the last chunk as output
-            span.set_attributes(
-                {
-                    SpanAttributes.OUTPUT: _serialize_to_str(last_chunk),
-                },
+            _set_lazy_attributes(
+                span,
+                kind,
+                lambda: {SpanAttributes.OUTPUT: last_chunk},
             )
             span.set_status(opentelemetry.trace.StatusCode.OK)
         span.end()
@@ -96,6 +100,7 @@ def _trace_sync_generator_wrapper(
 async def _trace_async_generator_wrapper(
     res: AsyncGenerator[T, None],
     span: Span,
+    kind: str = SpanKind.COMMON,
 ) -> AsyncGenerator[T, None]:
     """Trace the async generator output with OpenTelemetry.
 
@@ -104,6 +109,8 @@ async def _trace_async_generator_wrapper(
             The generator or async generator to be traced.
         span (`Span`):
             The OpenTelemetry span to be used for tracing.
+        kind (`str`, defaults to `SpanKind.COMMON`):
+            The span kind, which decides the attribute budget.
 
     Yields:
         `T`:
@@ -128,10 +135,10 @@ async def _trace_async_generator_wrapper(
     finally:
         if not has_error:
             # Set the last chunk as output
-            span.set_attributes(
-                {
-                    SpanAttributes.OUTPUT: _serialize_to_str(last_chunk),
-                },
+            _set_lazy_attributes(
+                span,
+                kind,
+                lambda: {SpanAttributes.OUTPUT: last_chunk},
             )
             span.set_status(opentelemetry.trace.StatusCode.OK)
         span.end()
@@ -188,13 +195,6 @@ def trace(
                     SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(
                         _config.run_id,
                     ),
-                    SpanAttributes.INPUT: _serialize_to_str(
-                        {
-                            "args": args,
-                            "kwargs": kwargs,
-                        },
-                    ),
-                    SpanAttributes.META: _serialize_to_str({}),
                 }
 
                 with tracer.start_as_current_span(
@@ -202,6 +202,17 @@ def trace(
                     attributes=attributes,
                     end_on_exit=False,
                 ) as span:
+                    _set_lazy_attributes(
+                        span,
+                        SpanKind.COMMON,
+                        lambda: {
+                            SpanAttributes.INPUT: {
+                                "args": args,
+                                "kwargs": kwargs,
+                            },
+                            SpanAttributes.META: {},
+                        },
+                    )
                     try:
                         res = await func(*args, **kwargs)
 
@@ -212,8 +223,10 @@ def trace(
                             return _trace_sync_generator_wrapper(res, span)
 
                         # non-generator result
-                        span.set_attributes(
-                            {SpanAttributes.OUTPUT: _serialize_to_str(res)},
+                        _set_lazy_attributes(
+                            span,
+                            SpanKind.COMMON,
+                            lambda: {SpanAttributes.OUTPUT: res},
                         )
                         span.set_status(opentelemetry.trace.StatusCode.OK)
                         span.end()
@@ -249,13 +262,6 @@ def trace(
                 SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(
                     _config.run_id,
                 ),
-                SpanAttributes.INPUT: _serialize_to_str(
-                    {
-                        "args": args,
-                        "kwargs": kwargs,
-                    },
-                ),
-                SpanAttributes.META: _serialize_to_str({}),
             }
 
             with tracer.start_as_current_span(
@@ -263,6 +269,14 @@ def trace(
                 attributes=attributes,
                 end_on_exit=False,
             ) as span:
+                _set_lazy_attributes(
+                    span,
+                    SpanKind.COMMON,
+                    lambda: {
+                        SpanAttributes.INPUT: {"args": args, "kwargs": kwargs},
+                        SpanAttributes.META: {},
+                    },
+                )
                 try:
                     res = func(*args, **kwargs)
 
@@ -273,8 +287,10 @@ def trace(
                         return _trace_sync_generator_wrapper(res, span)
 
                     # non-generator result
-                    span.set_attributes(
-                        {SpanAttributes.OUTPUT: _serialize_to_str(res)},
+                    _set_lazy_attributes(
+                        span,
+                        SpanKind.COMMON,
+                        lambda: {SpanAttributes.OUTPUT: res},
                     )
                     span.set_status(opentelemetry.trace.StatusCode.OK)
                     span.end()
@@ -320,16 +336,6 @@ def trace_toolkit(
         attributes = {
             SpanAttributes.SPAN_KIND: _serialize_to_str(SpanKind.TOOL),
             SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(_config.run_id),
-            SpanAttributes.INPUT: _serialize_to_str(
-                {
-                    "tool_call": tool_call,
-                },
-            ),
-            SpanAttributes.META: _serialize_to_str(
-                {
-                    **tool_call,
-                },
-            ),
         }
 
         with tracer.start_as_current_span(
@@ -337,12 +343,24 @@ def trace_toolkit(
             attributes=attributes,
             end_on_exit=False,
         ) as span:
+            _set_lazy_attributes(
+                span,
+                SpanKind.TOOL,
+                lambda: {
+                    SpanAttributes.INPUT: {"tool_call": tool_call},
+                    SpanAttributes.META: {**tool_call},
+                },
+            )
             try:
                 # Call the toolkit function
                 res = await func(self, tool_call=tool_call)
 
                 # The result must be an AsyncGenerator of ToolResponse objects
-                return _trace_async_generator_wrapper(res, span)
+                return _trace_async_generator_wrapper(
+                    res,
+                    span,
+                    SpanKind.TOOL,
+                )
 
             except Exception as e:
                 span.set_status(
@@ -401,18 +419,6 @@ def trace_reply(
         attributes = {
             SpanAttributes.SPAN_KIND: _serialize_to_str(SpanKind.AGENT),
             SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(_config.run_id),
-            SpanAttributes.INPUT: _serialize_to_str(
-                {
-                    "args": args,
-                    "kwargs": kwargs,
-                },
-            ),
-            SpanAttributes.META: _serialize_to_str(
-                {
-                    "id": self.id,
-                    "name": agent_name,
-                },
-            ),
         }
 
         with tracer.start_as_current_span(
@@ -420,13 +426,23 @@ def trace_reply(
             attributes=attributes,
             end_on_exit=False,
         ) as span:
+            _set_lazy_attributes(
+                span,
+                SpanKind.AGENT,
+                lambda: {
+                    SpanAttributes.INPUT: {"args": args, "kwargs": kwargs},
+                    SpanAttributes.META: {"id": self.id, "name": agent_name},
+                },
+            )
             try:
                 # Call the agent reply function
                 res = await func(self, *args, **kwargs)
 
                 # Set the output attribute
-                span.set_attributes(
-                    {SpanAttributes.OUTPUT: _serialize_to_str(res)},
+                _set_lazy_attributes(
+                    span,
+                    SpanKind.AGENT,
+                    lambda: {SpanAttributes.OUTPUT: res},
                 )
                 span.set_status(opentelemetry.trace.StatusCode.OK)
                 span.end()
@@ -459,6 +475,8 @@ def trace_embedding(
         if not _check_tracing_enabled():
             return await func(self, *args, **kwargs)
 
+        from ..embedding import EmbeddingModelBase
+
         if not isinstance(self, EmbeddingModelBase):
             logger.warning(
                 "Skipping tracing for %s as the first argument"
@@ -476,17 +494,6 @@ def trace_embedding(
         attributes = {
             SpanAttributes.SPAN_KIND: _serialize_to_str(SpanKind.EMBEDDING),
             SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(_config.run_id),
-            SpanAttributes.INPUT: _serialize_to_str(
-                {
-                    "args": args,
-                    "kwargs": kwargs,
-                },
-            ),
-            SpanAttributes.META: _serialize_to_str(
-                {
-                    "model_name": self.model_name,
-                },
-            ),
         }
 
         with tracer.start_as_current_span(
@@ -494,13 +501,23 @@ def trace_embedding(
             attributes=attributes,
             end_on_exit=False,
         ) as span:
+            _set_lazy_attributes(
+                span,
+                SpanKind.EMBEDDING,
+                lambda: {
+                    SpanAttributes.INPUT: {"args": args, "kwargs": kwargs},
+                    SpanAttributes.META: {"model_name": self.model_name},
+                },
+            )
             try:
                 # Call the embedding function
                 res = await func(self, *args, **kwargs)
 
                 # Set the output attribute
-                span.set_attributes(
-                    {SpanAttributes.OUTPUT: _serialize_to_str(res)},
+                _set_lazy_attributes(
+                    span,
+                    SpanKind.EMBEDDING,
+                    lambda: {SpanAttributes.OUTPUT: res},
                 )
                 span.set_status(opentelemetry.trace.StatusCode.OK)
                 span.end()
@@ -562,13 +579,6 @@ def trace_format(
         attributes = {
             SpanAttributes.SPAN_KIND: _serialize_to_str(SpanKind.FORMATTER),
             SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(_config.run_id),
-            SpanAttributes.INPUT: _serialize_to_str(
-                {
-                    "args": args,
-                    "kwargs": kwargs,
-                },
-            ),
-            SpanAttributes.META: _serialize_to_str({}),
         }
 
         with tracer.start_as_current_span(
@@ -576,13 +586,23 @@ def trace_format(
             attributes=attributes,
             end_on_exit=False,
         ) as span:
+            _set_lazy_attributes(
+                span,
+                SpanKind.FORMATTER,
+                lambda: {
+                    SpanAttributes.INPUT: {"args": args, "kwargs": kwargs},
+                    SpanAttributes.META: {},
+                },
+            )
             try:
                 # Call the formatter function
                 res = await func(self, *args, **kwargs)
 
                 # Set the output attribute
-                span.set_attributes(
-                    {SpanAttributes.OUTPUT: _serialize_to_str(res)},
+                _set_lazy_attributes(
+                    span,
+                    SpanKind.FORMATTER,
+                    lambda: {SpanAttributes.OUTPUT: res},
                 )
                 span.set_status(opentelemetry.trace.StatusCode.OK)
                 span.end()
@@ -637,6 +657,8 @@ def trace_llm(
         if not _check_tracing_enabled():
             return await func(self, *args, **kwargs)
 
+        from ..model import ChatModelBase
+
         if not isinstance(self, ChatModelBase):
             logger.warning(
                 "Skipping tracing for %s as the first argument"
@@ -654,18 +676,6 @@ def trace_llm(
         attributes = {
             SpanAttributes.SPAN_KIND: _serialize_to_str(SpanKind.LLM),
             SpanAttributes.PROJECT_RUN_ID: _serialize_to_str(_config.run_id),
-            SpanAttributes.INPUT: _serialize_to_str(
-                {
-                    "args": args,
-                    "kwargs": kwargs,
-                },
-            ),
-            SpanAttributes.META: _serialize_to_str(
-                {
-                    "model_name": self.model_name,
-                    "stream": self.stream,
-                },
-            ),
         }
 
         # Begin the llm call span
@@ -674,17 +684,34 @@ def trace_llm(
             attributes=attributes,
             end_on_exit=False,
         ) as span:
+            _set_lazy_attributes(
+                span,
+                SpanKind.LLM,
+                lambda: {
+                    SpanAttributes.INPUT: {"args": args, "kwargs": kwargs},
+                    SpanAttributes.META: {
+                        "model_name": self.model_name,
+                        "stream": self.stream,
+                    },
+                },
+            )
             try:
                 # Must be an async calling
                 res = await func(self, *args, **kwargs)
 
                 # If the result is a AsyncGenerator
                 if isinstance(res, AsyncGenerator):
-                    return _trace_async_generator_wrapper(res, span)
+                    return _trace_async_generator_wrapper(
+                        res,
+                        span,
+                        SpanKind.LLM,
+                    )
 
                 # non-generator result
-                span.set_attributes(
-                    {SpanAttributes.OUTPUT: _serialize_to_str(res)},
+                _set_lazy_attributes(
+                    span,
+                    SpanKind.LLM,
+                    lambda: {SpanAttributes.OUTPUT: res},
                 )
                 span.set_status(opentelemetry.trace.StatusCode.OK)
                 span.end()
@@ -2,6 +2,7 @@
 """The types in agentscope"""
 
 from ._hook import (
+    AgentHookModes,
     AgentHookTypes,
     ReActAgentHookTypes,
 )
@@ -13,6 +14,7 @@ from ._json import (
 from ._tool import ToolFunction
 
 __all__ = [
+    "AgentHookModes",
     "AgentHookTypes",
     "ReActAgentHookTypes",
     "Embedding",
@@ -23,3 +23,5 @@ ReActAgentHookTypes = (
         "post_acting",
     ]
 )
+
+AgentHookModes = Literal["copy", "read_only", "mutating"]
@@ -7,7 +7,38 @@ from unittest.async_case import IsolatedAsyncioTestCase
 
 import numpy as np
 
-from agentscope.embedding import FileEmbeddingCache
+from agentscope.embedding import (
+    FileEmbeddingCache,
+    MmapEmbeddingCache,
+    EmbeddingModelBase,
+    EmbeddingResponse,
+    EmbeddingUsage,
+)
+
+
+class _CountingEmbedding(EmbeddingModelBase):
+    """A fake embedding model that records the API calls."""
+
+    supported_modalities: list[str] = ["text"]
+
+    def __init__(self, embedding_cache: FileEmbeddingCache) -> None:
+        """Initialize the fake embedding model."""
+        super().__init__("fake-embedding", 2)
+        self.embedding_cache = embedding_cache
+        self.batch_size_limit = 2
+        self.api_calls: list[list[str]] = []
+
+    async def __call__(self, text: list[str]) -> EmbeddingResponse:
+        """Embed the given texts with the per-text cache."""
+        return await self._embed_with_cache(text)
+
+    async def _call_api(self, inputs: list) -> EmbeddingResponse:
+        """Record the batch and return fake embeddings."""
+        self.api_calls.append(inputs)
+        return EmbeddingResponse(
+            embeddings=[[float(len(_)), 1.0] for _ in inputs],
+            usage=EmbeddingUsage(time=0.1, tokens=len(inputs)),
+        )
 
 
 class EmbeddingCacheTest(IsolatedAsyncioTestCase):
@@ -162,6 +193,94 @@ class EmbeddingCacheTest(IsolatedAsyncioTestCase):
             [],
         )
 
+    async def test_per_item_embedding_cache(self) -> None:
+        """Test that each text is cached separately and only the missing
+        texts are sent to the API in batches."""
+        model = _CountingEmbedding(FileEmbeddingCache())
+
+        res = await model(["a", "bb", "a", "ccc"])
+        self.assertListEqual(
+            model.api_calls,
+            [["a", "bb"], ["ccc"]],
+        )
+        self.assertListEqual(
+            res.embeddings,
+            [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0], [3.0, 1.0]],
+        )
+        self.assertEqual(res.source, "api")
+        self.assertEqual((res.cache_hits, res.cache_misses), (0, 4))
+        self.assertEqual(res.usage.tokens, 3)
+
+        model.api_calls.clear()
+        res = await model(["ccc", "dddd", "a"])
+        self.assertListEqual(model.api_calls, [["dddd"]])
+        self.assertListEqual(
+            res.embeddings,
+            [[3.0, 1.0], [4.0, 1.0], [1.0, 1.0]],
+        )
+        self.assertEqual((res.cache_hits, res.cache_misses), (2, 1))
+
+        model.api_calls.clear()
+        res = await model(["bb", "a"])
+        self.assertListEqual(model.api_calls, [])
+        self.assertEqual(res.source, "cache")
+        self.assertEqual((res.cache_hits, res.cache_misses), (2, 0))
+
+    async def test_mmap_embedding_cache(self) -> None:
+        """Test the memory-mapped embedding cache."""
+        cache_dir = os.path.join(self.embedding_cache.cache_dir, "mmap")
+        cache = MmapEmbeddingCache(cache_dir=cache_dir, max_entries=3)
+
+        await cache.store(self.embeddings, self.identifier1)
+        await cache.store([[1, 2]], self.identifier1)
+        cached_embedding = await cache.retrieve(self.identifier1)
+        self.assertListEqual(cached_embedding.tolist(), self.embeddings)
+        self.assertFalse(cached_embedding.flags.writeable)
+
+        await cache.store([[1, 2]], self.identifier1, overwrite=True)
+        self.assertListEqual(
+            (await cache.retrieve(self.identifier1)).tolist(),
+            [[1, 2]],
+        )
+
+        await cache.store_batch(
+            [self.embeddings, self.embeddings],
+            [self.identifier2, self.identifier3],
+        )
+        # Touch identifier1 so that identifier2 is the least recently used
+        await cache.retrieve(self.identifier1)
+        await cache.store(self.embeddings, self.identifier4)
+        results = await cache.retrieve_batch(
+            [
+                self.identifier1,
+                self.identifier2,
+                self.identifier3,
+                self.identifier4,
+            ],
+        )
+        self.assertListEqual(
+            [None if _ is None else _.tolist() for _ in results],
+            [[[1, 2]], None, self.embeddings, self.embeddings],
+        )
+
+        # The index and arena are persistent
+        cache.close()
+        cache = MmapEmbeddingCache(cache_dir=cache_dir, max_entries=3)
+        self.assertListEqual(
+            (await cache.retrieve(self.identifier4)).tolist(),
+            self.embeddings,
+        )
+
+        await cache.remove(self.identifier4)
+        self.assertIsNone(await cache.retrieve(self.identifier4))
+        with self.assertRaises(KeyError):
+            await cache.remove(self.identifier4)
+
+        await cache.clear()
+        self.assertEqual(cache.cache_size, 0)
+        self.assertIsNone(await cache.retrieve(self.identifier1))
+        cache.close()
+
     async def asyncTearDown(self) -> None:
         """Tear down the test case."""
         if os.path.exists(self.embedding_cache.cache_dir):
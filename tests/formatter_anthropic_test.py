@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 """The Anthropic formatter unittests."""
+import json
+from typing import Any
 from unittest.async_case import IsolatedAsyncioTestCase
 
 from agentscope.formatter import (
@@ -599,3 +601,39 @@ class TestAnthropicChatFormatterFormatter(IsolatedAsyncioTestCase):
             res,
             self.ground_truth_multiagent_without_first_conversation[1:],
         )
+
+    async def test_format_not_aliased(self) -> None:
+        """Test modifying the formatted messages doesn't affect the input
+        messages, e.g. in the memory."""
+
+        def _clear(data: Any) -> None:
+            """Clear the nested dicts and lists in place."""
+            if isinstance(data, (dict, list)):
+                values = data.values() if isinstance(data, dict) else data
+                for value in list(values):
+                    _clear(value)
+                data.clear()
+
+        msgs = [
+            *self.msgs_conversation,
+            *self.msgs_tools,
+            Msg(
+                "system",
+                [
+                    ToolResultBlock(
+                        type="tool_result",
+                        id="1",
+                        name="get_capital",
+                        output=[TextBlock(type="text", text="Tokyo")],
+                    ),
+                ],
+                "system",
+            ),
+        ]
+        expected = json.dumps([_.to_dict() for _ in msgs])
+        for formatter in [
+            AnthropicChatFormatter(),
+            AnthropicMultiAgentFormatter(),
+        ]:
+            _clear(await formatter.format(msgs))
+            self.assertEqual(json.dumps([_.to_dict() for _ in msgs]), expected)
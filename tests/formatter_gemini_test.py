@@ -5,6 +5,7 @@ from unittest.async_case import IsolatedAsyncioTestCase
 from unittest.mock import patch, MagicMock
 
 from agentscope.formatter import GeminiChatFormatter, GeminiMultiAgentFormatter
+from agentscope.formatter._media_resolver import _MediaResolver
 from agentscope.message import (
     Msg,
     URLSource,
@@ -707,6 +708,159 @@ class TestGeminiFormatter(IsolatedAsyncioTestCase):
             self.ground_truth_multiagent_without_first_conversation[1:],
         )
 
+    async def test_media_prefetch(self) -> None:
+        """Test prefetching the media concurrently, where the same media is
+        loaded once and the payloads are cached by their content."""
+        resolver = _MediaResolver()
+        copy_path = "./image_copy.png"
+        with open(copy_path, "wb") as f:
+            f.write(b"fake image content")
+
+        with patch.object(
+            resolver,
+            "_fetch",
+            return_value=b"fake web image content",
+        ) as mock_fetch, patch(
+            "agentscope.formatter._truncated_formatter_base._media_resolver",
+            resolver,
+        ), patch(
+            "agentscope.formatter._gemini_formatter._media_resolver",
+            resolver,
+        ):
+            msgs = [
+                Msg(
+                    "user",
+                    [
+                        ImageBlock(
+                            type="image",
+                            source=URLSource(type="url", url=url),
+                        )
+                        for url in [
+                            "https://example.com/image.png",
+                            "https://example.com/image.png",
+                            self.image_path,
+                            copy_path,
+                        ]
+                    ],
+                    "user",
+                ),
+            ]
+            res = await GeminiChatFormatter().format(msgs)
+            await GeminiChatFormatter().format(msgs)
+
+        os.remove(copy_path)
+
+        mock_fetch.assert_called_once_with("https://example.com/image.png")
+        self.assertListEqual(
+            [_["inline_data"]["data"] for _ in res[0]["parts"]],
+            ["ZmFrZSB3ZWIgaW1hZ2UgY29udGVudA=="] * 2
+            + ["ZmFrZSBpbWFnZSBjb250ZW50"] * 2,
+        )
+        # The two local files with the same content share one payload
+        self.assertEqual(resolver.cache_bytes, 32 + 24)
+
+    async def test_media_prefetch_uncached(self) -> None:
+        """Test the prefetched media too large for the cache is not fetched
+        again when formatting, and the resolver is set up lazily."""
+        resolver = _MediaResolver(max_cache_bytes=1)
+        # pylint: disable-next=protected-access
+        self.assertIsNone(resolver._executor)
+
+        with patch.object(
+            resolver,
+            "_fetch",
+            return_value=b"fake web image content",
+        ) as mock_fetch, patch(
+            "agentscope.formatter._truncated_formatter_base._media_resolver",
+            resolver,
+        ), patch(
+            "agentscope.formatter._gemini_formatter._media_resolver",
+            resolver,
+        ):
+            msg = Msg(
+                "user",
+                [
+                    ImageBlock(
+                        type="image",
+                        source=URLSource(
+                            type="url",
+                            url="https://example.com/image.png",
+                        ),
+                    ),
+                ],
+                "user",
+            )
+            res = await GeminiChatFormatter().format([msg])
+
+        mock_fetch.assert_called_once_with("https://example.com/image.png")
+        self.assertEqual(
+            res[0]["parts"][0]["inline_data"]["data"],
+            "ZmFrZSB3ZWIgaW1hZ2UgY29udGVudA==",
+        )
+        self.assertEqual(resolver.cache_bytes, 0)
+
+    async def test_media_prefetch_nested_and_errors(self) -> None:
+        """Test prefetching the media nested in the tool results, and the
+        failed media is not loaded again when formatting."""
+
+        class NestedFormatter(GeminiChatFormatter):
+            """The formatter prefetching the tool result media."""
+
+            _prefetch_tool_result_media = True
+
+        def _fetch(url: str) -> bytes:
+            if url.endswith("broken.png"):
+                raise RuntimeError("Failed to fetch")
+            return b"fake web image content"
+
+        resolver = _MediaResolver()
+        with patch.object(
+            resolver,
+            "_fetch",
+            side_effect=_fetch,
+        ) as mock_fetch, patch(
+            "agentscope.formatter._truncated_formatter_base._media_resolver",
+            resolver,
+        ), patch(
+            "agentscope.formatter._gemini_formatter._media_resolver",
+            resolver,
+        ):
+            tool_result = ToolResultBlock(
+                type="tool_result",
+                id="1",
+                name="screenshot",
+                output=[
+                    ImageBlock(
+                        type="image",
+                        source=URLSource(
+                            type="url",
+                            url="https://example.com/nested.png",
+                        ),
+                    ),
+                ],
+            )
+            await NestedFormatter().format(
+                [Msg("system", [tool_result], "system")],
+            )
+            mock_fetch.assert_called_once_with(
+                "https://example.com/nested.png",
+            )
+
+            broken = ImageBlock(
+                type="image",
+                source=URLSource(
+                    type="url",
+                    url="https://example.com/broken.png",
+                ),
+            )
+            with self.assertRaises(RuntimeError):
+                await GeminiChatFormatter().format(
+                    [Msg("user", [broken], "user")],
+                )
+            # Fetched once by the prefetching, rather than retried when
+            # formatting
+            self.assertEqual(mock_fetch.call_count, 2)
+
     async def asyncTearDown(self) -> None:
         """Clean up the test environment."""
         if os.path.exists(self.image_path):
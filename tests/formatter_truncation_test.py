@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""The truncation tests of the truncated formatters in agentscope."""
+import json
+from typing import Any
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from agentscope.formatter import (
+    OpenAIChatFormatter,
+    KeepFirstNStrategy,
+    SummarizeMiddleStrategy,
+)
+from agentscope.message import Msg, ToolUseBlock, ToolResultBlock
+from agentscope.token import TokenCounterBase
+
+
+class CharTokenCounter(TokenCounterBase):
+    """A token counter that counts the characters of the serialized
+    messages, and records the number of calls."""
+
+    def __init__(self) -> None:
+        """Initialize the token counter."""
+        self.n_calls = 0
+
+    async def count(self, messages: list[dict], **kwargs: Any) -> int:
+        """Count the characters of the messages."""
+        self.n_calls += 1
+        return len(json.dumps(messages))
+
+
+class FormatterTruncationTest(IsolatedAsyncioTestCase):
+    """The truncation tests of the truncated formatters."""
+
+    async def asyncSetUp(self) -> None:
+        """Set up the test case."""
+        self.system = Msg("system", "You are a helpful assistant.", "system")
+        self.msgs = [
+            Msg("user", f"Question {i}: " + "x" * 50, "user")
+            for i in range(10)
+        ]
+        self.tool_msgs = [
+            Msg(
+                "assistant",
+                [
+                    ToolUseBlock(
+                        type="tool_use",
+                        id="1",
+                        name="search",
+                        input={"query": "y" * 50},
+                    ),
+                ],
+                "assistant",
+            ),
+            Msg(
+                "system",
+                [
+                    ToolResultBlock(
+                        type="tool_result",
+                        id="1",
+                        name="search",
+                        output="z" * 50,
+                    ),
+                ],
+                "system",
+            ),
+        ]
+
+    async def _full_count(self, msgs: list[Msg]) -> int:
+        """Count the tokens of the messages formatted without limit."""
+        return await CharTokenCounter().count(
+            await OpenAIChatFormatter().format(msgs),
+        )
+
+    async def test_drop_oldest(self) -> None:
+        """Test dropping the oldest messages in one pass, with the token
+        counts of the message groups cached."""
+        counter = CharTokenCounter()
+        msgs = [self.system, *self.msgs[:4], *self.tool_msgs, *self.msgs[4:]]
+        max_tokens = await self._full_count(
+            [self.system, *self.tool_msgs, *self.msgs[4:]],
+        )
+        formatter = OpenAIChatFormatter(
+            token_counter=counter,
+            max_tokens=max_tokens,
+        )
+
+        res = await formatter.format(msgs)
+        self.assertEqual(
+            res,
+            await OpenAIChatFormatter().format(
+                [self.system, *self.tool_msgs, *self.msgs[4:]],
+            ),
+        )
+        # The total, the system prompt, 11 groups, and the final check
+        self.assertEqual(counter.n_calls, 14)
+
+        # The group counts are cached for the next call
+        counter.n_calls = 0
+        await formatter.format(msgs)
+        self.assertEqual(counter.n_calls, 2)
+
+        # The tool call and result are dropped together
+        formatter.max_tokens = max_tokens - 1
+        res = await formatter.format(msgs)
+        self.assertEqual(
+            res,
+            await OpenAIChatFormatter().format(
+                [self.system, *self.msgs[4:]],
+            ),
+        )
+
+    async def test_strategies(self) -> None:
+        """Test the keep-first-N and summarize-middle strategies."""
+        msgs = [self.system, *self.msgs]
+        max_tokens = await self._full_count(
+            [self.system, self.msgs[0], *self.msgs[-3:]],
+        )
+        formatter = OpenAIChatFormatter(
+            token_counter=CharTokenCounter(),
+            max_tokens=max_tokens,
+            truncation_strategy=KeepFirstNStrategy(1),
+        )
+        res = await formatter.format(msgs)
+        self.assertEqual(
+            res,
+            await OpenAIChatFormatter().format(
+                [self.system, self.msgs[0], *self.msgs[-3:]],
+            ),
+        )
+
+        summarized: list[Msg] = []
+
+        async def _summarize(dropped: list[Msg]) -> Msg:
+            summarized.extend(dropped)
+            return Msg("user", "Summary", "user")
+
+        formatter.truncation_strategy = SummarizeMiddleStrategy(
+            _summarize,
+            keep_first=1,
+            summary_tokens=80,
+        )
+        res = await formatter.format(msgs)
+        self.assertListEqual(
+            [_.get_text_content() for _ in summarized],
+            [_.get_text_content() for _ in self.msgs[1:8]],
+        )
+        self.assertEqual(
+            res,
+            await OpenAIChatFormatter().format(
+                [
+                    self.system,
+                    self.msgs[0],
+                    Msg("user", "Summary", "user"),
+                    *self.msgs[-2:],
+                ],
+            ),
+        )
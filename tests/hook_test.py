@@ -1,9 +1,20 @@
 # -*- coding: utf-8 -*-
 """Hook related tests in agentscope."""
+import asyncio
+import json
+import threading
+from functools import partial
 from typing import Any
 from unittest.async_case import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import httpx
 
 from agentscope.agent import AgentBase
+from agentscope.hooks import (
+    StudioForwarder,
+    as_studio_forward_message_pre_print_hook,
+)
 from agentscope.message import Msg, TextBlock
 
 
@@ -558,6 +569,101 @@ class HookTest(IsolatedAsyncioTestCase):
             ],
         )
 
+    async def test_hook_modes(self) -> None:
+        """Test the read-only and mutating hooks that receive the arguments
+        without copying them."""
+        texts = []
+
+        def read_only_hook(_: MyAgent, kwargs: dict[str, Any]) -> None:
+            """A read-only hook that records the input message."""
+            self.assertIsInstance(kwargs["msg"], Msg)
+            texts.append(kwargs["msg"].content[0]["text"])
+
+        self.agent.register_instance_hook(
+            "pre_reply",
+            "read_only",
+            read_only_hook,
+            mode="read_only",
+        )
+        self.agent.register_instance_hook(
+            "pre_reply",
+            "mutating_wo_modifying",
+            read_only_hook,
+            mode="mutating",
+        )
+        self.agent.register_instance_hook(
+            "pre_reply",
+            "mutating_wo_returning",
+            async_pre_func_wo_modifying,
+            mode="mutating",
+        )
+        self.agent.register_instance_hook(
+            "pre_reply",
+            "mutating_w_modifying",
+            async_pre_func_w_modifying,
+            mode="mutating",
+        )
+
+        msg = self.msg
+        res = await self.agent(msg)
+        self.assertListEqual(texts, ["0", "0"])
+        # The modification without returning is discarded as in copy mode
+        self.assertListEqual(
+            res.content,
+            [
+                TextBlock(type="text", text="0"),
+                TextBlock(type="text", text="pre_1"),
+                TextBlock(type="text", text="mark"),
+            ],
+        )
+        # The input message is only copied when modified by the hook
+        self.assertListEqual(msg.content, [TextBlock(type="text", text="0")])
+
+        stats = self.agent.get_hook_stats()["pre_reply"]
+        self.assertEqual(stats["read_only"].n_calls, 1)
+        self.assertEqual(stats["read_only"].n_copies, 0)
+        self.assertEqual(stats["mutating_wo_modifying"].n_copies, 0)
+        self.assertEqual(stats["mutating_wo_returning"].n_copies, 1)
+        self.assertEqual(stats["mutating_w_modifying"].n_copies, 1)
+
+        # Modifying the arguments in a read-only hook raises an error
+        self.agent.register_instance_hook(
+            "pre_reply",
+            "read_only",
+            async_pre_func_w_modifying,
+            mode="read_only",
+        )
+        with self.assertRaises(TypeError):
+            await self.agent(msg)
+        self.assertListEqual(msg.content, [TextBlock(type="text", text="0")])
+
+        # The values returned by the methods are protected as well
+        name = mode = "read_only"
+        for hook in [
+            lambda _, kw: kw["msg"].to_dict()["content"][0].update(text="1"),
+            lambda _, kw: kw["msg"].get_content_blocks().clear(),
+        ]:
+            self.agent.register_instance_hook("pre_reply", name, hook, mode)
+            with self.assertRaises(TypeError):
+                await self.agent(msg)
+        self.assertListEqual(msg.content, [TextBlock(type="text", text="0")])
+
+        self.agent.reset_hook_stats()
+        self.assertDictEqual(self.agent.get_hook_stats(), {})
+
+        # The modes are cleared with the hooks
+        MyAgent.register_class_hook(
+            "pre_reply",
+            "read_only",
+            read_only_hook,
+            mode="read_only",
+        )
+        MyAgent.clear_class_hooks("pre_reply")
+        self.agent.clear_instance_hooks()
+        # pylint: disable=protected-access
+        self.assertNotIn(("pre_reply", "read_only"), MyAgent._class_hook_modes)
+        self.assertDictEqual(self.agent._instance_hook_modes, {})
+
     async def test_observe_hooks(self) -> None:
         """Test the observe hooks."""
         self.agent.register_instance_hook(
@@ -775,6 +881,106 @@ class HookTest(IsolatedAsyncioTestCase):
     #     )
     #     self.assertListEqual(agent_c.records, ["pre_4"])
 
+    async def test_studio_forwarder(self) -> None:
+        """Test forwarding the printed messages to the studio in the
+        background."""
+        requests: list[dict] = []
+        n_failures = [1]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """Record the request, and fail the first one."""
+            if n_failures[0] > 0:
+                n_failures[0] -= 1
+                return httpx.Response(500)
+            requests.append(json.loads(request.content))
+            return httpx.Response(200)
+
+        client = partial(
+            httpx.AsyncClient,
+            transport=httpx.MockTransport(handler),
+        )
+        with patch("httpx.AsyncClient", client):
+            forwarder = StudioForwarder(
+                "http://studio",
+                "run",
+                interval=0.05,
+                max_pending=2,
+                backoff=0.01,
+            )
+            self.agent.register_instance_hook(
+                "pre_print",
+                "studio",
+                partial(
+                    as_studio_forward_message_pre_print_hook,
+                    studio_url="http://studio",
+                    run_id="run",
+                    forwarder=forwarder,
+                ),
+                mode="read_only",
+            )
+
+            # The streaming chunks are coalesced into the latest state, and
+            # the failed request is retried
+            msg = Msg("assistant", "", "assistant")
+            for text in ["a", "ab", "abc"]:
+                msg.content = text
+                await self.agent.print(msg, last=text == "abc")
+            await asyncio.sleep(0.2)
+
+            self.assertEqual(len(requests), 1)
+            self.assertEqual(requests[0]["msg"]["content"], "abc")
+            self.assertEqual(requests[0]["runId"], "run")
+
+            # The oldest message is dropped when the queue is full
+            msgs = [Msg("assistant", str(i), "assistant") for i in range(3)]
+            for _ in msgs:
+                await self.agent.print(_)
+            await forwarder.flush()
+
+            self.assertEqual(forwarder.n_dropped, 1)
+            self.assertListEqual(
+                [_["msg"]["content"] for _ in requests[1:]],
+                ["1", "2"],
+            )
+
+    async def test_studio_forwarder_new_loop(self) -> None:
+        """Test the worker and the client of the previous event loop are
+        cleaned up when the forwarder is used in a new event loop."""
+        client = partial(
+            httpx.AsyncClient,
+            transport=httpx.MockTransport(lambda _: httpx.Response(200)),
+        )
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+
+        async def submit(forwarder: StudioForwarder, msg_id: str) -> None:
+            """Submit a message in the running event loop."""
+            forwarder.submit("reply", {"id": msg_id})
+
+        with patch("httpx.AsyncClient", client):
+            forwarder = StudioForwarder("http://studio", "run")
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    submit(forwarder, "1"),
+                    other_loop,
+                ).result()
+                # pylint: disable=protected-access
+                old_client, old_worker = forwarder._client, forwarder._worker
+
+                await submit(forwarder, "2")
+                await asyncio.sleep(0.1)
+
+                self.assertIsNot(forwarder._client, old_client)
+                self.assertTrue(old_client.is_closed)
+                self.assertTrue(old_worker.cancelled())
+                # pylint: enable=protected-access
+            finally:
+                await forwarder.flush()
+                other_loop.call_soon_threadsafe(other_loop.stop)
+                thread.join()
+                other_loop.close()
+
     async def asyncTearDown(self) -> None:
         """Tear down the test environment."""
         self.agent.clear_instance_hooks()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Unittests for the lazy imports of agentscope."""
+import json
+import subprocess
+import sys
+from unittest import TestCase
+
+import agentscope
+
+
+def _imported_modules(code: str) -> set[str]:
+    """Run the code in a fresh interpreter, and return the names of the
+    top-level modules imported by then."""
+    res = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{code}\nimport sys, json\n"
+            "print(json.dumps(sorted({_.split('.')[0] for _ in "
+            "sys.modules})))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(res.stdout.splitlines()[-1]))
+
+
+class ImportTest(TestCase):
+    """The unittests for the lazy imports."""
+
+    heavy_modules = {
+        "anthropic",
+        "dashscope",
+        "google",
+        "mcp",
+        "numpy",
+        "ollama",
+        "openai",
+        "opentelemetry",
+        "requests",
+        "socketio",
+    }
+
+    def test_import_agentscope(self) -> None:
+        """Test importing agentscope doesn't import the subpackages and the
+        third-party libraries."""
+        modules = _imported_modules("import agentscope")
+        self.assertEqual(modules & self.heavy_modules, set())
+
+    def test_import_agent(self) -> None:
+        """Test importing the agent doesn't import the provider SDKs, the
+        MCP library and the RAG dependencies."""
+        modules = _imported_modules(
+            "from agentscope.agent import ReActAgent\n"
+            "from agentscope.model import OpenAIChatModel\n"
+            "from agentscope.tool import Toolkit",
+        )
+        self.assertEqual(
+            modules & self.heavy_modules,
+            {"opentelemetry"},
+        )
+
+    def test_lazy_attributes(self) -> None:
+        """Test the lazily loaded attributes."""
+        self.assertIn("agent", dir(agentscope))
+        self.assertIs(
+            agentscope.agent.ReActAgent,
+            sys.modules["agentscope.agent._react_agent"].ReActAgent,
+        )
+        for name in agentscope.__all__:
+            self.assertTrue(hasattr(agentscope, name))
+
+        for module in [agentscope.model, agentscope.tool, agentscope.rag]:
+            for name in module.__all__:
+                self.assertTrue(hasattr(module, name))
+
+        with self.assertRaises(AttributeError):
+            getattr(agentscope, "not_exist")
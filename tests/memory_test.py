@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""The unittests for the memory classes in agentscope."""
+import os
+import random
+import shutil
+from unittest.async_case import IsolatedAsyncioTestCase
+
+from agentscope.memory import (
+    InMemoryMemory,
+    MessageLog,
+    PagedMemory,
+    SharedLogMemory,
+)
+from agentscope.message import Msg, ImageBlock, Base64Source
+
+
+class InMemoryMemoryTest(IsolatedAsyncioTestCase):
+    """The unittests for the in-memory memory."""
+
+    async def test_add_and_delete(self) -> None:
+        """Test the duplicate checks, tombstoned deletes and ranges against
+        a plain list."""
+        memory = InMemoryMemory()
+        msgs = [Msg("user", str(i), "user") for i in range(200)]
+        expected = list(msgs[:100])
+
+        await memory.add(msgs[:100])
+        await memory.add(msgs[:50])
+        self.assertEqual(await memory.size(), 100)
+
+        rng = random.Random(0)
+        for i in range(100, 200):
+            if rng.random() < 0.4:
+                index = rng.sample(range(len(expected)), rng.randint(1, 3))
+                await memory.delete(index)
+                expected = [
+                    _ for idx, _ in enumerate(expected) if idx not in index
+                ]
+            else:
+                await memory.add(msgs[i])
+                expected.append(msgs[i])
+
+            self.assertEqual(await memory.size(), len(expected))
+            if i % 10 == 0:
+                self.assertListEqual(await memory.get_memory(), expected)
+
+        self.assertListEqual(await memory.get_memory(), expected)
+        self.assertListEqual(await memory.get_memory(-5), expected[-5:])
+        self.assertListEqual(await memory.get_memory(2, 6), expected[2:6])
+
+        # Deleting from the end leaves no tombstones
+        await memory.delete(len(expected) - 1)
+        self.assertListEqual(await memory.get_memory(), expected[:-1])
+
+        with self.assertRaises(IndexError):
+            await memory.delete(len(expected))
+
+        # The deleted messages can be added again
+        await memory.add(expected[-1])
+        self.assertListEqual(await memory.get_memory(), expected)
+
+    async def test_state_dict(self) -> None:
+        """Test the state dict is compatible with the previous format."""
+        memory = InMemoryMemory()
+        msgs = [Msg("user", str(i), "user") for i in range(5)]
+        await memory.add(msgs)
+        await memory.delete([1, 3])
+
+        state = memory.state_dict()
+        self.assertListEqual(
+            state["content"],
+            [msgs[0].to_dict(), msgs[2].to_dict(), msgs[4].to_dict()],
+        )
+
+        new_memory = InMemoryMemory()
+        new_memory.load_state_dict(state)
+        self.assertListEqual(
+            [_.id for _ in await new_memory.get_memory()],
+            [msgs[0].id, msgs[2].id, msgs[4].id],
+        )
+        await new_memory.add(msgs[0])
+        self.assertEqual(await new_memory.size(), 3)
+
+
+class SharedLogMemoryTest(IsolatedAsyncioTestCase):
+    """The unittests for the shared log memory."""
+
+    async def test_shared_log_memory(self) -> None:
+        """Test composing the private messages with the shared logs."""
+        log = MessageLog()
+        memories = [SharedLogMemory() for _ in range(3)]
+        msgs = [Msg("user", str(i), "user") for i in range(6)]
+
+        log.append(msgs[0])
+        for memory in memories:
+            memory.attach(log)
+
+        # The private message and the broadcast replies are ordered, and
+        # the own reply appears once
+        await memories[0].add(msgs[1])
+        log.append(msgs[1])
+        log.append([msgs[2], msgs[3]])
+        self.assertListEqual(await memories[0].get_memory(), msgs[1:4])
+        self.assertListEqual(await memories[1].get_memory(), msgs[1:4])
+        await memories[1].add(msgs[2])
+        self.assertEqual(await memories[1].size(), 3)
+
+        # Deleting hides the message from one memory only
+        await memories[1].delete([0, 2])
+        self.assertListEqual(await memories[1].get_memory(), [msgs[2]])
+        self.assertListEqual(await memories[2].get_memory(), msgs[1:4])
+
+        memories[2].detach(log)
+        log.append(msgs[4])
+        await memories[2].add(msgs[5])
+        self.assertListEqual(
+            await memories[2].get_memory(),
+            [*msgs[1:4], msgs[5]],
+        )
+
+        new_memory = InMemoryMemory()
+        new_memory.load_state_dict(memories[2].state_dict())
+        self.assertListEqual(
+            [_.id for _ in await new_memory.get_memory()],
+            [_.id for _ in [*msgs[1:4], msgs[5]]],
+        )
+
+        await memories[0].clear()
+        log.append(msgs[5])
+        self.assertListEqual(await memories[0].get_memory(), [msgs[5]])
+
+
+class PagedMemoryTest(IsolatedAsyncioTestCase):
+    """The unittests for the disk-backed paged memory."""
+
+    async def asyncSetUp(self) -> None:
+        """Set up the test case."""
+        self.path = "./.test_paged_memory"
+
+    async def test_paged_memory(self) -> None:
+        """Test paging the messages from disk, and storing the large base64
+        data once in the blob store."""
+        memory = PagedMemory(self.path, hot_size=3, blob_threshold=16)
+        image = ImageBlock(
+            type="image",
+            source=Base64Source(
+                type="base64",
+                media_type="image/png",
+                data="a" * 64,
+            ),
+        )
+        msgs = [
+            Msg("user", [image] if i % 2 == 0 else str(i), "user")
+            for i in range(10)
+        ]
+        await memory.add(msgs)
+        await memory.add(msgs[5])
+
+        # Only the hot tail is kept in RAM, the evicted messages are
+        # written in batches, and the image is stored once
+        self.assertEqual(await memory.size(), 10)
+        hot = memory._hot  # pylint: disable=protected-access
+        self.assertEqual(len(hot), 3)
+        memory.flush()
+        self.assertEqual(len(os.listdir(os.path.join(self.path, "blobs"))), 1)
+
+        res = await memory.get_memory()
+        self.assertListEqual(
+            [_.to_dict() for _ in res],
+            [_.to_dict() for _ in msgs],
+        )
+        self.assertListEqual(
+            [_.id for _ in await memory.get_memory(2, 8)],
+            [_.id for _ in msgs[2:8]],
+        )
+
+        # The modification of the hot messages are persisted
+        msgs[8].content = "modified"
+        await memory.delete([0, 4, 9])
+        expected = [_ for i, _ in enumerate(msgs) if i not in [0, 4, 9]]
+        self.assertListEqual(
+            [_.id for _ in await memory.get_memory()],
+            [_.id for _ in expected],
+        )
+
+        # Restore the memory from the disk
+        state = memory.state_dict()
+        memory.close()
+        with self.assertRaises(ValueError):
+            PagedMemory(self.path)
+        new_memory = PagedMemory()
+        new_memory.load_state_dict(state)
+        self.assertListEqual(
+            [_.to_dict() for _ in await new_memory.get_memory()],
+            [_.to_dict() for _ in expected],
+        )
+        await new_memory.add(msgs[2])
+        self.assertEqual(await new_memory.size(), 7)
+
+        # The blobs are removed when no longer referenced
+        await new_memory.clear()
+        self.assertEqual(await new_memory.size(), 0)
+        self.assertListEqual(os.listdir(os.path.join(self.path, "blobs")), [])
+        new_memory.close()
+
+    async def test_default_path(self) -> None:
+        """Test the instances with the default path don't share their
+        storage, and the paged messages are served from the page cache."""
+        memories = [PagedMemory(hot_size=1), PagedMemory(hot_size=1)]
+        for name in ["a", "b"]:
+            for memory in memories:
+                await memory.add(Msg("user", f"{memory.path}-{name}", "user"))
+
+        for memory in memories:
+            self.assertListEqual(
+                [_.content for _ in await memory.get_memory()],
+                [f"{memory.path}-a", f"{memory.path}-b"],
+            )
+        self.assertNotEqual(memories[0].path, memories[1].path)
+
+        # The older message is paged once, and frozen
+        memory = memories[0]
+        memory._pages.clear()  # pylint: disable=protected-access
+        first = (await memory.get_memory())[0]
+        self.assertIs((await memory.get_memory())[0], first)
+        self.assertTrue(first.frozen)
+
+        # The temporary directories are removed when closed
+        for memory in memories:
+            memory.close()
+            self.assertFalse(os.path.exists(memory.path))
+
+    async def asyncTearDown(self) -> None:
+        """Clean up the test case."""
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""The unittests for the message class in agentscope."""
+import json
+import pickle
+from copy import deepcopy
+from unittest import TestCase
+
+from agentscope.message import Msg, TextBlock, ImageBlock, Base64Source
+
+
+class MsgTest(TestCase):
+    """The unittests for the message class."""
+
+    def test_frozen_msg(self) -> None:
+        """Test freezing, evolving and copying the messages."""
+        image = ImageBlock(
+            type="image",
+            source=Base64Source(
+                type="base64",
+                media_type="image/png",
+                data="a" * 1024,
+            ),
+        )
+        msg = Msg("user", [image], "user", metadata={"tags": ["a"]})
+        frozen = msg.freeze()
+
+        # The original message is still mutable, and the data is shared
+        self.assertTrue(frozen.frozen)
+        self.assertFalse(msg.frozen)
+        self.assertEqual(frozen.id, msg.id)
+        self.assertIs(
+            frozen.content[0]["source"]["data"],
+            msg.content[0]["source"]["data"],
+        )
+        self.assertIs(frozen.freeze(), frozen)
+
+        with self.assertRaises(AttributeError):
+            frozen.name = "assistant"
+        with self.assertRaises(TypeError):
+            frozen.content.append(TextBlock(type="text", text="Hi"))
+        with self.assertRaises(TypeError):
+            frozen.content[0]["type"] = "text"
+        with self.assertRaises(TypeError):
+            frozen.metadata["tags"].append("b")
+
+        # The evolved message shares the unchanged parts
+        evolved = frozen.evolve(
+            content=[*frozen.content, TextBlock(type="text", text="Hi")],
+        )
+        self.assertTrue(evolved.frozen)
+        self.assertIs(evolved.content[0], frozen.content[0])
+        self.assertIs(evolved.metadata, frozen.metadata)
+        self.assertEqual(len(frozen.content), 1)
+        with self.assertRaises(TypeError):
+            frozen.evolve(sender="assistant")
+
+        # The deep copy is mutable
+        copied = deepcopy(evolved)
+        copied.content.append(TextBlock(type="text", text="Hello"))
+        copied.content[0]["type"] = "text"
+        self.assertFalse(copied.frozen)
+        self.assertEqual(evolved.content[0]["type"], "image")
+
+        # The frozen message can be serialized
+        self.assertDictEqual(
+            json.loads(json.dumps(evolved.to_dict())),
+            json.loads(json.dumps(deepcopy(evolved).to_dict())),
+        )
+        self.assertTrue(pickle.loads(pickle.dumps(evolved)).frozen)
@@ -326,6 +326,91 @@ class TestAnthropicChatModel(IsolatedAsyncioTestCase):
             ]
             self.assertEqual(final_response.content, expected_content)
 
+    async def test_streaming_delta_mode(self) -> None:
+        """Test the thinking signature is emitted once in the delta mode,
+        and no empty thinking block is emitted without thinking."""
+        with patch("anthropic.AsyncAnthropic") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            model = AnthropicChatModel(
+                model_name="claude-3-sonnet-20240229",
+                api_key="test_key",
+                stream=True,
+                stream_mode="delta",
+            )
+            model.client = mock_client
+
+            start_event = AnthropicEventMock(
+                "message_start",
+                message=Mock(usage=Mock(input_tokens=10, output_tokens=0)),
+            )
+            thinking_events = [
+                AnthropicEventMock(
+                    "content_block_delta",
+                    index=0,
+                    delta=Mock(type="thinking_delta", thinking="Hmm"),
+                ),
+                AnthropicEventMock(
+                    "content_block_delta",
+                    index=0,
+                    delta=Mock(type="signature_delta", signature="sig"),
+                ),
+            ]
+            text_events = [
+                AnthropicEventMock(
+                    "content_block_delta",
+                    index=1,
+                    delta=Mock(type="text_delta", text=text),
+                )
+                for text in ["Hello", " there!"]
+            ]
+
+            for events, expected_content in [
+                (
+                    [start_event, *text_events],
+                    [
+                        [TextBlock(type="text", text="Hello")],
+                        [TextBlock(type="text", text=" there!")],
+                    ],
+                ),
+                (
+                    [start_event, *thinking_events, *text_events],
+                    [
+                        [ThinkingBlock(type="thinking", thinking="Hmm")],
+                        [
+                            ThinkingBlock(
+                                type="thinking",
+                                thinking="",
+                                signature="sig",
+                            ),
+                            TextBlock(type="text", text="Hello"),
+                        ],
+                        [TextBlock(type="text", text=" there!")],
+                    ],
+                ),
+            ]:
+
+                async def mock_stream(
+                    events: list = events,
+                ) -> AsyncGenerator:
+                    for event in events:
+                        yield event
+
+                mock_client.messages.create = AsyncMock(
+                    return_value=mock_stream(),
+                )
+                responses = [
+                    _
+                    async for _ in await model(
+                        [{"role": "user", "content": "Hi"}],
+                    )
+                ]
+                self.assertListEqual(
+                    [_.content for _ in responses],
+                    expected_content,
+                )
+
     async def test_generate_kwargs_integration(self) -> None:
         """Test integration of generate_kwargs."""
         with patch("anthropic.AsyncAnthropic") as mock_client_class:
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Unittests for the chat response caches."""
+import os
+import shutil
+import tempfile
+from typing import Any, AsyncGenerator, Literal
+from unittest import IsolatedAsyncioTestCase
+
+from agentscope.message import TextBlock
+from agentscope.model import (
+    ChatCacheBase,
+    ChatModelBase,
+    ChatResponse,
+    FileChatCache,
+    InMemoryChatCache,
+)
+from agentscope.model._cache_base import _cached
+from agentscope.model._model_usage import ChatUsage
+
+
+class MyModel(ChatModelBase):
+    """The test model counting the API calls."""
+
+    _cache_config = ("generate_kwargs",)
+
+    def __init__(
+        self,
+        response_cache: ChatCacheBase,
+        stream: bool = False,
+        stream_mode: Literal["accumulated", "delta"] = "accumulated",
+    ) -> None:
+        """Initialize the model."""
+        super().__init__(
+            "test",
+            stream,
+            stream_mode,
+            response_cache=response_cache,
+        )
+        self.generate_kwargs: dict = {}
+        self.n_calls = 0
+
+    @_cached
+    async def __call__(
+        self,
+        messages: list[dict],
+        **kwargs: Any,
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        """Return the response of the call count."""
+        self.n_calls += 1
+        if self.stream:
+            return self._stream()
+        return self._response(f"Response {self.n_calls}")
+
+    async def _stream(self) -> AsyncGenerator[ChatResponse, None]:
+        """Yield the streaming responses."""
+        for i in range(3):
+            yield self._response(f"Chunk {self.n_calls}-{i}")
+
+    @staticmethod
+    def _response(text: str) -> ChatResponse:
+        """Create a response."""
+        return ChatResponse(
+            content=[TextBlock(type="text", text=text)],
+            usage=ChatUsage(input_tokens=10, output_tokens=5, time=1.0),
+        )
+
+
+class ChatCacheTest(IsolatedAsyncioTestCase):
+    """The unittests for the chat response caches."""
+
+    async def asyncSetUp(self) -> None:
+        """Create the cache directory."""
+        self.cache_dir = tempfile.mkdtemp()
+
+    async def test_read_through(self) -> None:
+        """Test the identical requests are answered by the cache, while the
+        different requests are not."""
+        model = MyModel(InMemoryChatCache())
+        messages = [{"role": "user", "content": "Hi"}]
+
+        res = await model(messages)
+        self.assertEqual(res.source, "api")
+        res = await model(messages)
+        self.assertEqual(model.n_calls, 1)
+        self.assertEqual(res.source, "cache")
+        self.assertEqual(res.content[0]["text"], "Response 1")
+        self.assertEqual(res.usage.input_tokens, 10)
+
+        # The different messages, arguments and configurations
+        await model([{"role": "user", "content": "Hello"}])
+        await model(messages, tools=[{"name": "search"}])
+        model.generate_kwargs = {"temperature": 0.5}
+        await model(messages)
+        self.assertEqual(model.n_calls, 4)
+
+    async def test_stream_replay(self) -> None:
+        """Test the streaming responses are replayed chunk by chunk in the
+        delta mode, and as the final response in the accumulated mode."""
+        cache = InMemoryChatCache()
+        model = MyModel(cache, stream=True, stream_mode="delta")
+
+        recorded = [_ async for _ in await model([])]
+        replayed = [_ async for _ in await model([])]
+        self.assertEqual(model.n_calls, 1)
+        self.assertEqual(
+            [_.content for _ in replayed],
+            [_.content for _ in recorded],
+        )
+        self.assertTrue(all(_.source == "cache" for _ in replayed))
+
+        # The streaming settings are part of the identifier
+        model.stream_mode = "accumulated"
+        recorded = [_ async for _ in await model([])]
+        replayed = [_ async for _ in await model([])]
+        self.assertEqual(model.n_calls, 2)
+        self.assertEqual(len(replayed), 1)
+        self.assertEqual(replayed[0].content, recorded[-1].content)
+        # pylint: disable-next=protected-access
+        self.assertEqual(len(list(cache._entries.values())[-1]), 1)
+
+    async def test_modes(self) -> None:
+        """Test the record and replay modes."""
+        cache = FileChatCache(self.cache_dir, mode="record")
+        model = MyModel(cache)
+        await model([])
+        await model([])
+        self.assertEqual(model.n_calls, 2)
+
+        # The recorded responses are replayed by another process offline
+        cache = FileChatCache(self.cache_dir, mode="replay")
+        model = MyModel(cache)
+        res = await model([])
+        self.assertEqual(model.n_calls, 0)
+        self.assertEqual(res.content[0]["text"], "Response 2")
+        self.assertIsInstance(res.usage, ChatUsage)
+
+        with self.assertRaises(RuntimeError):
+            await model([{"role": "user", "content": "Hi"}])
+
+        with self.assertRaises(ValueError):
+            InMemoryChatCache(mode="write")
+
+    async def test_eviction(self) -> None:
+        """Test the least recently used responses are evicted."""
+        for cache in [
+            InMemoryChatCache(max_entries=2),
+            FileChatCache(self.cache_dir, max_file_number=2),
+        ]:
+            model = MyModel(cache)
+            for text in ["a", "b", "a", "c"]:
+                await model([{"role": "user", "content": text}])
+            self.assertEqual(model.n_calls, 3)
+
+            # "b" is evicted as "a" is used recently
+            await model([{"role": "user", "content": "a"}])
+            await model([{"role": "user", "content": "b"}])
+            self.assertEqual(model.n_calls, 4)
+
+            await cache.clear()
+
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    async def asyncTearDown(self) -> None:
+        """Remove the cache directory."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -249,6 +249,111 @@ class TestOpenAIChatModel(IsolatedAsyncioTestCase):
             expected_content = [TextBlock(type="text", text="Hello there!")]
             self.assertEqual(final_response.content, expected_content)
 
+    async def test_streaming_tool_call_arguments(self) -> None:
+        """Test the tool call arguments streamed in pieces."""
+        with patch("openai.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            model = OpenAIChatModel(
+                model_name="gpt-4",
+                api_key="test_key",
+                stream=True,
+            )
+            model.client = mock_client
+
+            pieces = ['{"city": "Bei', 'jing", "days": ', "[1, 2", "]}"]
+            stream_mock = self._create_stream_mock(
+                [
+                    {
+                        "tool_calls": [
+                            {
+                                "id": "call_1" if i == 0 else None,
+                                "name": "get_weather" if i == 0 else None,
+                                "arguments": piece,
+                            },
+                        ],
+                    }
+                    for i, piece in enumerate(pieces)
+                ],
+            )
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=stream_mock,
+            )
+
+            responses = [_ async for _ in await model([])]
+            self.assertEqual(
+                responses[-1].content,
+                [
+                    ToolUseBlock(
+                        type="tool_use",
+                        id="call_1",
+                        name="get_weather",
+                        input={"city": "Beijing", "days": [1, 2]},
+                    ),
+                ],
+            )
+
+    async def test_streaming_delta_mode(self) -> None:
+        """Test the delta mode of the streaming response."""
+        with patch("openai.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            model = OpenAIChatModel(
+                model_name="gpt-4",
+                api_key="test_key",
+                stream=True,
+                stream_mode="delta",
+            )
+            model.client = mock_client
+
+            stream_mock = self._create_stream_mock(
+                [
+                    {"content": "Hello"},
+                    {"content": " there!"},
+                    {
+                        "tool_calls": [
+                            {
+                                "id": "call_1",
+                                "name": "search",
+                                "arguments": '{"query": ',
+                            },
+                        ],
+                    },
+                    {
+                        "tool_calls": [
+                            {
+                                "id": None,
+                                "name": None,
+                                "arguments": '"agentscope"}',
+                            },
+                        ],
+                    },
+                ],
+            )
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=stream_mock,
+            )
+
+            responses = [_ async for _ in await model([])]
+            self.assertListEqual(
+                [_.content for _ in responses],
+                [
+                    [TextBlock(type="text", text="Hello")],
+                    [TextBlock(type="text", text=" there!")],
+                    [],
+                    [
+                        ToolUseBlock(
+                            type="tool_use",
+                            id="call_1",
+                            name="search",
+                            input={"query": "agentscope"},
+                        ),
+                    ],
+                ],
+            )
+
     # Auxiliary methods - ensure all Mock objects have complete attributes
     def _create_mock_response(
         self,
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+"""Unittests for the rate limiter of the chat models."""
+import asyncio
+import time
+from typing import Any, AsyncGenerator
+from unittest import IsolatedAsyncioTestCase
+
+from agentscope.message import TextBlock
+from agentscope.model import (
+    ChatModelBase,
+    ChatResponse,
+    OpenAIChatModel,
+    RateLimiter,
+)
+from agentscope.model._model_usage import ChatUsage
+from agentscope.model._rate_limiter import _estimate_tokens, _rate_limited
+
+
+class RateLimitError(Exception):
+    """The rate limit error mimicking the provider SDKs."""
+
+    def __init__(self, headers: dict) -> None:
+        """Initialize the error."""
+        super().__init__("Too many requests")
+        self.status_code = 429
+        self.headers = headers
+
+
+class MyModel(ChatModelBase):
+    """The test model recording the concurrent requests."""
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        stream: bool = False,
+        n_failures: int = 0,
+    ) -> None:
+        """Initialize the model."""
+        super().__init__("test", stream, rate_limiter=rate_limiter)
+        self.n_failures = n_failures
+        self.n_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @_rate_limited
+    async def __call__(
+        self,
+        messages: list[dict],
+        **kwargs: Any,
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        """Return a response after a short delay."""
+        self.n_calls += 1
+        if self.n_calls <= self.n_failures:
+            raise RateLimitError({"retry-after-ms": "50"})
+
+        if self.stream:
+            return self._stream()
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        return self._response()
+
+    async def _stream(self) -> AsyncGenerator[ChatResponse, None]:
+        """Yield the streaming responses."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        for _ in range(3):
+            await asyncio.sleep(0.02)
+            yield self._response()
+        self.in_flight -= 1
+
+    @staticmethod
+    def _response() -> ChatResponse:
+        """Create a response."""
+        return ChatResponse(
+            content=[TextBlock(type="text", text="Hi")],
+            usage=ChatUsage(input_tokens=10, output_tokens=5, time=0.05),
+        )
+
+
+class RateLimiterTest(IsolatedAsyncioTestCase):
+    """The unittests for the rate limiter."""
+
+    async def test_max_concurrency(self) -> None:
+        """Test the in-flight requests are bounded, including the streaming
+        requests until their streams end."""
+        limiter = RateLimiter(max_concurrency=2)
+        model = MyModel(limiter)
+        res = await asyncio.gather(*[model([]) for _ in range(6)])
+        self.assertEqual(model.max_in_flight, 2)
+        self.assertEqual(limiter._in_flight, 0)
+        self.assertGreater(max(_.usage.queue_time for _ in res), 0.05)
+
+        stream_model = MyModel(limiter, stream=True)
+
+        async def consume() -> None:
+            async for _ in await stream_model([]):
+                pass
+
+        await asyncio.gather(*[consume() for _ in range(4)])
+        self.assertEqual(stream_model.max_in_flight, 2)
+        self.assertEqual(limiter._in_flight, 0)
+
+    async def test_requests_per_minute(self) -> None:
+        """Test the requests beyond the budget wait for the refill."""
+        limiter = RateLimiter(requests_per_minute=600)
+        model = MyModel(limiter)
+
+        # Use up the initial budget
+        limiter._requests.level = 1
+        start = time.monotonic()
+        await asyncio.gather(model([]), model([]), model([]))
+        # The 2nd and 3rd requests wait 0.1s each at 10 requests/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    async def test_tokens_per_minute(self) -> None:
+        """Test the estimated tokens are corrected by the usage."""
+        limiter = RateLimiter(tokens_per_minute=6000)
+        model = MyModel(limiter)
+        await model([{"role": "user", "content": "a" * 4000}])
+        # About 1000 tokens estimated, while 15 tokens used
+        self.assertGreater(limiter._tokens.level, 5900)
+
+    async def test_estimate_tokens(self) -> None:
+        """Test the media blocks are charged a fixed cost rather than by the
+        length of their base64 data."""
+        image = {
+            "type": "image",
+            "source": {"type": "base64", "data": "a" * 400000},
+        }
+        messages = [
+            {"role": "user", "content": [{"type": "text", "text": "a" * 40}]},
+            {"role": "user", "content": [image]},
+            {"role": "user", "content": "Hi", "images": ["a" * 400000]},
+        ]
+        self.assertEqual(_estimate_tokens(messages), 10 + 1600 + 1 + 1600)
+
+    async def test_refund_shortens_wait(self) -> None:
+        """Test the queued requests re-check the bucket, so that the tokens
+        refunded meanwhile shorten their waits."""
+        limiter = RateLimiter(tokens_per_minute=600)
+        limiter._tokens.level = 100
+        await limiter.acquire(100)
+
+        start = time.monotonic()
+        task = asyncio.create_task(limiter.acquire(100))
+        await asyncio.sleep(0.1)
+        # Only 1 of the 100 estimated tokens is used
+        limiter.release(100, 1)
+        await task
+        # Without the refund, it waits 10s for 100 tokens at 10 tokens/s
+        self.assertLess(time.monotonic() - start, 1)
+
+    async def test_retry_rate_limited(self) -> None:
+        """Test the rate limited requests are retried after the delay in the
+        headers, and the rates are lowered."""
+        limiter = RateLimiter(requests_per_minute=6000, max_retries=2)
+        model = MyModel(limiter, n_failures=2)
+        res = await model([])
+        self.assertEqual(model.n_calls, 3)
+        self.assertGreaterEqual(res.usage.queue_time, 0.1)
+        self.assertLess(limiter._scale, 1)
+
+        model = MyModel(limiter, n_failures=3)
+        with self.assertRaises(RateLimitError):
+            await model([])
+        self.assertEqual(limiter._in_flight, 0)
+
+    async def test_shared(self) -> None:
+        """Test the rate limiters are shared by the endpoint."""
+        self.assertIs(
+            RateLimiter.shared("http://a", max_concurrency=1),
+            RateLimiter.shared("http://a"),
+        )
+        self.assertIsNot(
+            RateLimiter.shared("http://a"),
+            RateLimiter.shared("http://b"),
+        )
+        with self.assertLogs("as", "WARNING"):
+            RateLimiter.shared("http://a", max_concurrency=2)
+
+    async def test_sdk_retries(self) -> None:
+        """Test the retries of the SDK client are disabled by the rate
+        limiter unless specified."""
+        limiter = RateLimiter()
+        for rate_limiter, client_args, max_retries in [
+            (None, None, 2),
+            (limiter, None, 0),
+            (limiter, {"max_retries": 3}, 3),
+        ]:
+            model = OpenAIChatModel(
+                "gpt-4o",
+                api_key="xxx",
+                client_args=client_args,
+                rate_limiter=rate_limiter,
+            )
+            self.assertEqual(model.client.max_retries, max_retries)
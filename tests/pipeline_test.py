@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 """Unit tests for pipeline classes and functions"""
+import asyncio
+import time
 from typing import Any
 from unittest.async_case import IsolatedAsyncioTestCase
 
+from agentscope.memory import SharedLogMemory
 from agentscope.message import Msg
 from agentscope.pipeline import (
+    MsgHub,
     SequentialPipeline,
     FanoutPipeline,
     sequential_pipeline,
@@ -42,6 +46,22 @@ class AddAgent(AgentBase):
         """Handle interrupt"""
 
 
+class EvolveAgent(AddAgent):
+    """Add agent class that doesn't modify the input message."""
+
+    def __init__(self, value: int) -> None:
+        """Initialize the agent"""
+        super().__init__(value)
+        self.inputs: list[Msg] = []
+
+    async def reply(self, x: Msg | None) -> Msg | None:
+        """Reply function"""
+        self.inputs.append(x)
+        return x.evolve(
+            metadata={"result": x.metadata["result"] + self.value},
+        )
+
+
 class StreamAgent(AgentBase):
     """Add agent class."""
 
@@ -113,6 +133,68 @@ class MultAgent(AgentBase):
         """Handle interrupt"""
 
 
+class ObserveAgent(AgentBase):
+    """Observe agent class."""
+
+    n_observing = 0
+    max_observing = 0
+
+    def __init__(self) -> None:
+        """Initialize the agent"""
+        super().__init__()
+        self.name = "Observe"
+        self.observed: list[str] = []
+
+    async def reply(self, content: str) -> Msg:
+        """Reply function"""
+        return Msg(self.name, content, "assistant")
+
+    async def observe(self, msg: Msg | list[Msg] | None) -> None:
+        """Observe function, which takes a while"""
+        ObserveAgent.n_observing += 1
+        ObserveAgent.max_observing = max(
+            ObserveAgent.max_observing,
+            ObserveAgent.n_observing,
+        )
+        await asyncio.sleep(0.1)
+        self.observed.append(msg.content)
+        ObserveAgent.n_observing -= 1
+
+    async def handle_interrupt(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Msg:
+        """Handle interrupt"""
+
+
+class MemoryAgent(AgentBase):
+    """Agent class with a shared log memory."""
+
+    def __init__(self) -> None:
+        """Initialize the agent"""
+        super().__init__()
+        self.name = "Memory"
+        self.memory = SharedLogMemory()
+
+    async def reply(self, content: str) -> Msg:
+        """Reply function"""
+        msg = Msg(self.name, content, "assistant")
+        await self.memory.add(msg)
+        return msg
+
+    async def observe(self, msg: Msg | list[Msg] | None) -> None:
+        """Observe function"""
+        await self.memory.add(msg)
+
+    async def handle_interrupt(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Msg:
+        """Handle interrupt"""
+
+
 class PipelineTest(IsolatedAsyncioTestCase):
     """Test cases for Pipelines"""
 
@@ -278,6 +360,18 @@ class PipelineTest(IsolatedAsyncioTestCase):
         self.assertEqual(res[1].metadata["result"], 2)  # 0 + 2
         self.assertEqual(res[2].metadata["result"], 0)  # 0 * 3
 
+    async def test_fanout_pipeline_frozen_message(self) -> None:
+        """Test fanout_pipeline shares the frozen input without copying"""
+        agents = [EvolveAgent(1), EvolveAgent(2)]
+
+        x = Msg("user", "", "user", metadata={"result": 0}).freeze()
+        res = await fanout_pipeline(agents, x)
+        self.assertEqual(res[0].metadata["result"], 1)
+        self.assertEqual(res[1].metadata["result"], 2)
+        self.assertEqual(x.metadata["result"], 0)
+        for agent in agents:
+            self.assertIs(agent.inputs[0], x)
+
     async def test_class_fanout_pipeline_concurrent(self) -> None:
         """Test FanoutPipeline class with concurrent execution"""
 
@@ -376,3 +470,87 @@ class PipelineTest(IsolatedAsyncioTestCase):
                 )
 
             i += 1
+
+    async def test_msghub_broadcast(self) -> None:
+        """Test the concurrent and fire-and-forget broadcast of MsgHub"""
+        agents = [ObserveAgent() for _ in range(5)]
+
+        # The participants observe the reply concurrently
+        async with MsgHub(agents):
+            start = time.perf_counter()
+            await agents[0]("1")
+            self.assertLess(time.perf_counter() - start, 0.3)
+            self.assertListEqual(agents[0].observed, [])
+            for agent in agents[1:]:
+                self.assertListEqual(agent.observed, ["1"])
+
+        # The concurrency is limited
+        ObserveAgent.max_observing = 0
+        async with MsgHub(agents, max_concurrency=2) as hub:
+            await hub.broadcast(Msg("user", "2", "user"))
+            self.assertEqual(ObserveAgent.max_observing, 2)
+
+        # The broadcast returns without waiting, while the messages are
+        # observed in order
+        async with MsgHub(agents, fire_and_forget=True) as hub:
+            start = time.perf_counter()
+            for content in ["3", "4", "5"]:
+                await hub.broadcast(Msg("user", content, "user"))
+            self.assertLess(time.perf_counter() - start, 0.1)
+            await hub.flush()
+            for agent in agents:
+                self.assertListEqual(agent.observed[-3:], ["3", "4", "5"])
+
+        # The deleted participant observes the messages left in its inbox,
+        # and its worker is stopped
+        deleted = agents[-1]
+        async with MsgHub(list(agents), fire_and_forget=True) as hub:
+            await hub.broadcast(Msg("user", "6", "user"))
+            # pylint: disable-next=protected-access
+            worker = hub._inboxes[deleted.id].worker
+            hub.delete(deleted)
+            await hub.flush()
+            self.assertEqual(deleted.observed[-1], "6")
+            await asyncio.sleep(0)
+            self.assertTrue(worker.cancelled())
+
+        with self.assertRaises(ValueError):
+            MsgHub(agents, max_concurrency=0)
+
+    async def test_msghub_shared_log(self) -> None:
+        """Test broadcasting through the shared log of MsgHub"""
+        agents = [MemoryAgent() for _ in range(3)]
+        observer = ObserveAgent()
+        announcement = Msg("user", "0", "user")
+
+        # The observe hooks of the log readers are still called
+        n_observed = []
+        agents[0].register_instance_hook(
+            "pre_observe",
+            "count",
+            lambda _, kwargs: n_observed.append(1),
+        )
+
+        async with MsgHub(
+            [*agents, observer],
+            announcement=announcement,
+            shared_log=True,
+        ) as hub:
+            replies = [
+                await agent(str(i + 1)) for i, agent in enumerate(agents)
+            ]
+            self.assertEqual(len(hub.log), 4)
+
+        after = await agents[0]("after")
+
+        for agent in agents:
+            self.assertListEqual(
+                await agent.memory.get_memory(),
+                [
+                    announcement,
+                    *replies,
+                    *([after] if agent is agents[0] else []),
+                ],
+            )
+        self.assertListEqual(observer.observed, ["0", "1", "2", "3"])
+        self.assertEqual(len(n_observed), 3)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Test the RAG knowledge implementations."""
-from typing import Any
+from typing import Any, AsyncGenerator
 from unittest.async_case import IsolatedAsyncioTestCase
 
 from agentscope.embedding import (
@@ -11,6 +11,8 @@ from agentscope.message import TextBlock
 from agentscope.rag import (
     SimpleKnowledge,
     QdrantStore,
+    NumpyStore,
+    IngestionProgress,
     Document,
     DocMetadata,
 )
@@ -30,10 +32,18 @@ class TestTextEmbedding(EmbeddingModelBase):
         self,
         text: list[TextBlock | str],
         **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Return a fixed embedding for testing."""
+        return await self._call_api(text, **kwargs)
+
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
     ) -> EmbeddingResponse:
         """Return a fixed embedding for testing."""
         embeddings = []
-        for t in text:
+        for t in inputs:
             if isinstance(t, dict):
                 t = t.get("text")
             if t == "This is an apple":
@@ -48,6 +58,36 @@ class TestTextEmbedding(EmbeddingModelBase):
         )
 
 
+class BatchRecordingEmbedding(EmbeddingModelBase):
+    """A mock embedding model that records the batches."""
+
+    supported_modalities: list[str] = ["text"]
+
+    def __init__(self) -> None:
+        """The constructor for the mock embedding model."""
+        super().__init__(model_name="mock-model", dimensions=2)
+        self.batches: list[list[str]] = []
+
+    async def __call__(
+        self,
+        text: list[TextBlock],
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Return an embedding derived from the text length."""
+        return await self._call_api(text, **kwargs)
+
+    async def _call_api(
+        self,
+        inputs: list,
+        **kwargs: Any,
+    ) -> EmbeddingResponse:
+        """Return an embedding derived from the text length."""
+        self.batches.append([_["text"] for _ in inputs])
+        return EmbeddingResponse(
+            embeddings=[[float(len(_["text"])), 1.0] for _ in inputs],
+        )
+
+
 class RAGKnowledgeTest(IsolatedAsyncioTestCase):
     """Test cases for RAG knowledge implementations."""
 
@@ -107,3 +147,48 @@ class RAGKnowledgeTest(IsolatedAsyncioTestCase):
             res[0].score,
             0.9974149072579597,
         )
+
+    async def test_add_documents_stream(self) -> None:
+        """Test the streaming ingestion of SimpleKnowledge."""
+        embedding_model = BatchRecordingEmbedding()
+        knowledge = SimpleKnowledge(
+            embedding_model=embedding_model,
+            embedding_store=NumpyStore(dimensions=2, distance="Euclid"),
+        )
+
+        async def _read() -> AsyncGenerator[Document, None]:
+            for i in range(5):
+                yield Document(
+                    metadata=DocMetadata(
+                        content=TextBlock(type="text", text="x" * (i + 1)),
+                        doc_id="doc",
+                        chunk_id=i,
+                        total_chunks=5,
+                    ),
+                )
+
+        reports: list[tuple[int, int]] = []
+
+        async def _report(progress: IngestionProgress) -> None:
+            reports.append((progress.batches, progress.documents))
+
+        progress = await knowledge.add_documents_stream(
+            _read(),
+            batch_size=2,
+            max_concurrency=2,
+            progress_callback=_report,
+        )
+
+        self.assertListEqual(
+            sorted(embedding_model.batches),
+            [["x", "xx"], ["xxx", "xxxx"], ["xxxxx"]],
+        )
+        self.assertEqual((progress.batches, progress.documents), (3, 5))
+        self.assertEqual(reports[-1], (3, 5))
+        self.assertEqual(knowledge.embedding_store.size, 5)
+
+        res = await knowledge.embedding_store.search([3.0, 1.0], limit=1)
+        self.assertEqual(res[0].metadata.content["text"], "xxx")
+
+        with self.assertRaises(ValueError):
+            await knowledge.add_documents_stream(_read(), max_concurrency=0)
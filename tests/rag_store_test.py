@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 """Test the RAG store implementations."""
+import os
+import shutil
 from unittest import IsolatedAsyncioTestCase
 
+import numpy as np
+
 from agentscope.message import TextBlock
 from agentscope.rag import (
     QdrantStore,
+    NumpyStore,
     Document,
     DocMetadata,
 )
@@ -64,3 +69,104 @@ class RAGStoreTest(IsolatedAsyncioTestCase):
             res[0].metadata.content["text"],
             "This is a test document.",
         )
+
+    def _make_document(
+        self,
+        embedding: list[float],
+        doc_id: str,
+        chunk_id: int,
+    ) -> Document:
+        """Create a text document for testing."""
+        return Document(
+            embedding=embedding,
+            metadata=DocMetadata(
+                content=TextBlock(
+                    type="text",
+                    text=f"{doc_id}-{chunk_id}",
+                ),
+                doc_id=doc_id,
+                chunk_id=chunk_id,
+                total_chunks=2,
+            ),
+        )
+
+    async def test_numpy_store(self) -> None:
+        """Test the NumpyStore implementation."""
+        persist_dir = "./.cache/test_numpy_store"
+        store = NumpyStore(dimensions=3, persist_dir=persist_dir)
+        await store.add(
+            [
+                self._make_document([0.1, 0.2, 0.3], "doc1", 0),
+                self._make_document([0.9, 0.1, 0.4], "doc1", 1),
+                self._make_document([0.1, 0.3, 0.2], "doc2", 0),
+            ],
+        )
+
+        # The same scores as the Qdrant store
+        res = await store.search(
+            query_embedding=[0.15, 0.25, 0.35],
+            limit=3,
+            score_threshold=0.8,
+        )
+        self.assertListEqual(
+            [_.metadata.content["text"] for _ in res],
+            ["doc1-0", "doc2-0"],
+        )
+        self.assertAlmostEqual(res[0].score, 0.9974149072579597, places=6)
+
+        res = await store.search(
+            query_embedding=[0.15, 0.25, 0.35],
+            limit=1,
+            metadata_filter={"doc_id": "doc2"},
+        )
+        self.assertListEqual(
+            [_.metadata.content["text"] for _ in res],
+            ["doc2-0"],
+        )
+
+        # Re-adding a chunk overwrites it, and delete removes by doc_id
+        await store.add([self._make_document([0.1, 0.3, 0.2], "doc2", 0)])
+        self.assertEqual(store.size, 3)
+        await store.delete(doc_ids=["doc1"])
+        self.assertEqual(store.size, 1)
+
+        # The store is loaded from the persist directory
+        store = NumpyStore(dimensions=3, persist_dir=persist_dir)
+        res = await store.search([0.9, 0.1, 0.4], limit=5)
+        self.assertListEqual(
+            [_.metadata.content["text"] for _ in res],
+            ["doc2-0"],
+        )
+        shutil.rmtree(persist_dir)
+        self.assertFalse(os.path.exists(persist_dir))
+
+    async def test_numpy_store_ivf(self) -> None:
+        """Test the IVF partitions and euclidean distance of NumpyStore."""
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(400, 8)).astype(np.float32)
+        store = NumpyStore(
+            dimensions=8,
+            distance="Euclid",
+            ivf_threshold=300,
+            n_partitions=4,
+            n_probe=4,
+        )
+        await store.add(
+            [
+                self._make_document(vector.tolist(), f"doc{i}", 0)
+                for i, vector in enumerate(vectors)
+            ],
+        )
+
+        query = vectors[7] + 0.01
+        expected = np.argsort(np.linalg.norm(vectors - query, axis=1))[:5]
+        # Probing all the partitions gives the exact results
+        res = await store.search(query.tolist(), limit=5)
+        self.assertListEqual(
+            [_.metadata.doc_id for _ in res],
+            [f"doc{_}" for _ in expected],
+        )
+        self.assertTrue(all(a.score <= b.score for a, b in zip(res, res[1:])))
+
+        res = await store.search(query.tolist(), limit=5, score_threshold=0.1)
+        self.assertListEqual([_.metadata.doc_id for _ in res], ["doc7"])
@@ -1,14 +1,17 @@
 # -*- coding: utf-8 -*-
 """The ReAct agent unittests."""
-from typing import Any
+import asyncio
+import time
+from typing import Any, AsyncGenerator
 from unittest import IsolatedAsyncioTestCase
 
 from agentscope.agent import ReActAgent
 from agentscope.formatter import DashScopeChatFormatter
-from agentscope.memory import InMemoryMemory
+from agentscope.memory import InMemoryMemory, LongTermMemoryBase
 from agentscope.message import TextBlock, ToolUseBlock, Msg
 from agentscope.model import ChatModelBase, ChatResponse
-from agentscope.tool import Toolkit
+from agentscope.rag import DocMetadata, Document, KnowledgeBase
+from agentscope.tool import Toolkit, ToolResponse
 
 
 class MyModel(ChatModelBase):
@@ -30,6 +33,140 @@ class MyModel(ChatModelBase):
         )
 
 
+class StreamModel(ChatModelBase):
+    """Test streaming model class, which streams two tool calls whose
+    arguments are completed one by one, and then replies with text."""
+
+    def __init__(self, first_input: dict, final_input: dict) -> None:
+        """Initialize the test model."""
+        super().__init__("test_model", stream=True)
+        self.first_input = first_input
+        self.final_input = final_input
+        self.n_calls = 0
+
+    async def __call__(
+        self,
+        _messages: list[dict],
+        **kwargs: Any,
+    ) -> AsyncGenerator[ChatResponse, None]:
+        """Mock streaming model call."""
+        self.n_calls += 1
+        return self._stream() if self.n_calls == 1 else self._text()
+
+    async def _stream(self) -> AsyncGenerator[ChatResponse, None]:
+        """Stream the tool calls."""
+        call_1 = ToolUseBlock(
+            type="tool_use",
+            id="1",
+            name="lookup",
+            input=self.first_input,
+        )
+        yield ChatResponse(content=[call_1], completed_tool_call_ids=["1"])
+        await asyncio.sleep(0.3)
+
+        call_1 = ToolUseBlock(
+            type="tool_use",
+            id="1",
+            name="lookup",
+            input=self.final_input,
+        )
+        call_2 = ToolUseBlock(
+            type="tool_use",
+            id="2",
+            name="lookup",
+            input={"key": "b"},
+        )
+        yield ChatResponse(
+            content=[call_1, call_2],
+            completed_tool_call_ids=["1", "2"],
+        )
+
+    async def _text(self) -> AsyncGenerator[ChatResponse, None]:
+        """Stream the text reply."""
+        yield ChatResponse(content=[TextBlock(type="text", text="done")])
+
+
+class DeltaModel(ChatModelBase):
+    """Test streaming model class in the delta mode."""
+
+    def __init__(self) -> None:
+        """Initialize the test model."""
+        super().__init__("test_model", stream=True, stream_mode="delta")
+
+    async def __call__(
+        self,
+        _messages: list[dict],
+        **kwargs: Any,
+    ) -> AsyncGenerator[ChatResponse, None]:
+        """Mock streaming model call."""
+        return self._stream()
+
+    async def _stream(self) -> AsyncGenerator[ChatResponse, None]:
+        """Stream the text reply piece by piece."""
+        for text in ["Hello", ", ", "world!"]:
+            yield ChatResponse(content=[TextBlock(type="text", text=text)])
+
+
+class MyKnowledge(KnowledgeBase):
+    """Test knowledge base class returning the given documents."""
+
+    def __init__(self, scores: dict[str, float], delay: float) -> None:
+        """Initialize the test knowledge base."""
+        super().__init__(None, None)
+        self.scores = scores
+        self.delay = delay
+
+    async def retrieve(self, query: str, **kwargs: Any) -> list:
+        """Mock retrieval with latency."""
+        await asyncio.sleep(self.delay)
+        return [
+            Document(
+                metadata=DocMetadata(
+                    content=TextBlock(type="text", text=doc_id),
+                    doc_id=doc_id,
+                    chunk_id=0,
+                    total_chunks=1,
+                ),
+                score=score,
+            )
+            for doc_id, score in self.scores.items()
+        ]
+
+    async def add_documents(self, *args: Any, **kwargs: Any) -> None:
+        """Mock adding documents."""
+
+
+class MyLongTermMemory(LongTermMemoryBase):
+    """Test long-term memory class."""
+
+    async def record(self, msgs: Any, **kwargs: Any) -> None:
+        """Mock recording."""
+
+    async def retrieve(self, msg: Any, **kwargs: Any) -> str:
+        """Mock retrieval with latency."""
+        await asyncio.sleep(0.2)
+        return "Alice likes tea."
+
+    async def record_to_memory(
+        self,
+        thinking: str,
+        content: list[str],
+        **kwargs: Any,
+    ) -> ToolResponse:
+        """Mock recording by the agent."""
+        return ToolResponse(content=[TextBlock(type="text", text="Done.")])
+
+    async def retrieve_from_memory(
+        self,
+        keywords: list[str],
+        **kwargs: Any,
+    ) -> ToolResponse:
+        """Mock retrieval by the agent."""
+        return ToolResponse(
+            content=[TextBlock(type="text", text=await self.retrieve(None))],
+        )
+
+
 async def pre_reasoning_hook(self: ReActAgent, _kwargs: Any) -> None:
     """Mock pre-reasoning hook."""
     if hasattr(self, "cnt_pre_reasoning"):
@@ -153,3 +290,141 @@ class ReActAgentTest(IsolatedAsyncioTestCase):
             getattr(agent, "cnt_post_acting"),
             2,
         )
+
+    async def test_concurrent_retrieval(self) -> None:
+        """Test retrieving from the long-term memory and the knowledge bases
+        concurrently."""
+        agent = ReActAgent(
+            name="Friday",
+            sys_prompt="You are a helpful assistant named Friday.",
+            model=MyModel(),
+            formatter=DashScopeChatFormatter(),
+            long_term_memory=MyLongTermMemory(),
+            long_term_memory_mode="static_control",
+            knowledge=[
+                MyKnowledge({"d1": 0.9, "d2": 0.5}, 0.2),
+                MyKnowledge({"d3": 80, "d1": 40, "d4": 20}, 0.2),
+                MyKnowledge({"d5": 1.0}, 5),
+            ],
+            enable_rewrite_query=False,
+            retrieval_timeout=0.5,
+        )
+
+        start = time.perf_counter()
+        await agent(Msg("user", "What does Alice like?", "user"))
+        self.assertLess(time.perf_counter() - start, 1)
+
+        msgs = await agent.memory.get_memory()
+        self.assertEqual(msgs[1].name, "long_term_memory")
+        self.assertIn("Alice likes tea.", msgs[1].content)
+
+        # The scores are normalized by the knowledge base, the duplicate
+        # chunk is kept once, and the timed-out knowledge base is skipped
+        self.assertListEqual(
+            [_["text"] for _ in msgs[2].content[1:-1]],
+            ["d1", "d3", "d2", "d4"],
+        )
+
+    async def test_delta_stream_mode(self) -> None:
+        """Test the streaming chunks in the delta mode are accumulated."""
+        agent = ReActAgent(
+            name="Friday",
+            sys_prompt="You are a helpful assistant named Friday.",
+            model=DeltaModel(),
+            formatter=DashScopeChatFormatter(),
+        )
+        res = await agent(Msg("user", "Hi", "user"))
+        self.assertEqual(res.get_text_content(), "Hello, world!")
+
+    async def test_speculative_tool_calls(self) -> None:
+        """Test calling the tool functions before the model response is
+        finished."""
+        called = []
+
+        async def lookup(key: str) -> ToolResponse:
+            """Look up the key.
+
+            Args:
+                key (`str`):
+                    The key.
+            """
+            called.append(key)
+            await asyncio.sleep(0.3)
+            return ToolResponse(content=[TextBlock(type="text", text=key)])
+
+        for final_key, expected_calls, max_time in [
+            # The speculative call is taken over by the acting, which runs
+            # while the model is still streaming
+            ("a", ["a", "b"], 0.8),
+            # The speculative call is cancelled as the final input differs
+            ("c", ["a", "c", "b"], 1.5),
+        ]:
+            called.clear()
+            toolkit = Toolkit()
+            toolkit.register_tool_function(lookup, speculative=True)
+            agent = ReActAgent(
+                name="Friday",
+                sys_prompt="You are a helpful assistant named Friday.",
+                model=StreamModel({"key": "a"}, {"key": final_key}),
+                formatter=DashScopeChatFormatter(),
+                toolkit=toolkit,
+                speculative_tool_calls=True,
+            )
+
+            start = time.perf_counter()
+            await agent(Msg("user", "Look up", "user"))
+            self.assertLess(time.perf_counter() - start, max_time)
+            self.assertListEqual(called, expected_calls)
+
+            results = [
+                _.content[0]["output"][0]["text"]
+                for _ in await agent.memory.get_memory()
+                if _.has_content_blocks("tool_result")
+            ]
+            self.assertListEqual(results[:2], [final_key, "b"])
+
+    async def test_speculative_tool_calls_with_hooks(self) -> None:
+        """Test the speculative tool call is re-run when the pre-acting hook
+        modifies the tool call."""
+        called = []
+
+        async def lookup(key: str) -> ToolResponse:
+            """Look up the key.
+
+            Args:
+                key (`str`):
+                    The key.
+            """
+            called.append(key)
+            await asyncio.sleep(0.1)
+            return ToolResponse(content=[TextBlock(type="text", text=key)])
+
+        def rewrite_hook(_self: ReActAgent, kwargs: dict) -> dict:
+            """Rewrite the input of the first tool call."""
+            if kwargs["tool_call"]["input"] == {"key": "a"}:
+                kwargs["tool_call"]["input"] = {"key": "z"}
+            return kwargs
+
+        toolkit = Toolkit()
+        toolkit.register_tool_function(lookup, speculative=True)
+        agent = ReActAgent(
+            name="Friday",
+            sys_prompt="You are a helpful assistant named Friday.",
+            model=StreamModel({"key": "a"}, {"key": "a"}),
+            formatter=DashScopeChatFormatter(),
+            toolkit=toolkit,
+            speculative_tool_calls=True,
+        )
+        agent.register_instance_hook("pre_acting", "rewrite", rewrite_hook)
+
+        await agent(Msg("user", "Look up", "user"))
+        self.assertListEqual(called, ["a", "z", "b"])
+        # pylint: disable-next=protected-access
+        self.assertDictEqual(agent._speculative_calls, {})
+
+        results = [
+            _.content[0]["output"][0]["text"]
+            for _ in await agent.memory.get_memory()
+            if _.has_content_blocks("tool_result")
+        ]
+        self.assertListEqual(results[:2], ["z", "b"])
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Session module tests."""
+import asyncio
 import os
+import shutil
 from typing import Union
 from unittest import IsolatedAsyncioTestCase
 
@@ -9,7 +11,7 @@ from agentscope.formatter import DashScopeChatFormatter
 from agentscope.memory import InMemoryMemory
 from agentscope.message import Msg
 from agentscope.model import DashScopeChatModel
-from agentscope.session import JSONSession
+from agentscope.session import JSONSession, JournalSession, SQLiteSession
 from agentscope.tool import Toolkit
 
 
@@ -79,8 +81,131 @@ class SessionTest(IsolatedAsyncioTestCase):
             agent2=agent2,
         )
 
+    async def test_journal_session(self) -> None:
+        """Test saving the changes incrementally and loading the session
+        from the snapshot and journal."""
+        session = JournalSession(save_dir="./journal_sessions")
+        snapshot_path = "./journal_sessions/user_1.snapshot.json"
+        journal_path = "./journal_sessions/user_1.journal.jsonl"
+
+        agent = MyAgent()
+        for i in range(20):
+            await agent.observe(Msg("Alice", f"Hi {i}!", "user"))
+            await session.save_session_state(session_id="user_1", agent=agent)
+
+        # The first save writes the snapshot, and the others only append
+        # the new messages to the journal until it's compacted
+        with open(journal_path, "r", encoding="utf-8") as f:
+            n_records = len(f.readlines())
+        self.assertGreater(n_records, 0)
+        self.assertLess(n_records, 20)
+        self.assertTrue(os.path.exists(snapshot_path))
+
+        # Modify and delete messages
+        agent.sys_prompt = "Another prompt."
+        await agent.memory.delete(3)
+        await session.save_session_state(session_id="user_1", agent=agent)
+
+        # An incomplete record from an interrupted save is ignored
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"seq": 1000, "ops": [')
+
+        new_agent = MyAgent()
+        await JournalSession(save_dir="./journal_sessions").load_session_state(
+            session_id="user_1",
+            agent=new_agent,
+        )
+        self.assertDictEqual(new_agent.state_dict(), agent.state_dict())
+
+        # The following saves are appended correctly
+        await new_agent.observe(Msg("Alice", "Bye!", "user"))
+        await JournalSession(save_dir="./journal_sessions").save_session_state(
+            session_id="user_1",
+            agent=new_agent,
+        )
+        await session.load_session_state(session_id="user_1", agent=agent)
+        self.assertDictEqual(new_agent.state_dict(), agent.state_dict())
+
+    async def test_journal_session_cache(self) -> None:
+        """Test the cached sessions are bounded and reloaded from the files
+        when evicted, and the idle locks are removed."""
+        session = JournalSession(
+            save_dir="./journal_sessions",
+            max_cached_sessions=2,
+        )
+        agents = [MyAgent() for _ in range(3)]
+        for i, agent in enumerate(agents):
+            await agent.observe(Msg("Alice", f"Hi {i}!", "user"))
+            await session.save_session_state(f"user_{i}", agent=agent)
+
+        # pylint: disable=protected-access
+        self.assertListEqual(list(session._sessions), ["user_1", "user_2"])
+        self.assertDictEqual(session._locks, {})
+
+        # The evicted session is read from the files again
+        await agents[0].observe(Msg("Alice", "Bye!", "user"))
+        await session.save_session_state("user_0", agent=agents[0])
+        self.assertListEqual(list(session._sessions), ["user_2", "user_0"])
+
+        new_agent = MyAgent()
+        await JournalSession(save_dir="./journal_sessions").load_session_state(
+            "user_0",
+            agent=new_agent,
+        )
+        self.assertDictEqual(new_agent.state_dict(), agents[0].state_dict())
+
+    async def test_sqlite_session(self) -> None:
+        """Test saving many sessions concurrently in batches, and evicting
+        the idle sessions."""
+        session = SQLiteSession("./sqlite_sessions/sessions.db")
+
+        agents = [MyAgent() for _ in range(50)]
+        for i, agent in enumerate(agents):
+            await agent.observe(Msg("Alice", f"Hi {i}!", "user"))
+
+        # The concurrent saves of the same session are serialized
+        await asyncio.gather(
+            *[
+                session.save_session_state(f"user_{i}", agent=agent)
+                for i, agent in enumerate(agents)
+            ],
+            session.save_session_state("user_0", agent=agents[1]),
+        )
+
+        for i in range(2, 50):
+            new_agent = MyAgent()
+            await session.load_session_state(f"user_{i}", agent=new_agent)
+            self.assertDictEqual(
+                new_agent.state_dict(), agents[i].state_dict()
+            )
+
+        new_agent = MyAgent()
+        await session.load_session_state("user_0", agent=new_agent)
+        self.assertIn(
+            new_agent.state_dict(),
+            [agents[0].state_dict(), agents[1].state_dict()],
+        )
+
+        with self.assertRaises(ValueError):
+            await session.load_session_state(
+                "user_50",
+                allow_not_exist=False,
+                agent=new_agent,
+            )
+
+        # Evict the sessions not accessed recently
+        await asyncio.sleep(0.2)
+        await session.load_session_state("user_2", agent=new_agent)
+        self.assertEqual(await session.evict_idle_sessions(ttl=0.1), 49)
+        await session.load_session_state("user_2", agent=new_agent)
+        self.assertDictEqual(new_agent.state_dict(), agents[2].state_dict())
+
+        await session.close()
+
     async def asyncTearDown(self) -> None:
         """Clean up after the test."""
+        shutil.rmtree("./sqlite_sessions", ignore_errors=True)
+        shutil.rmtree("./journal_sessions", ignore_errors=True)
         # Remove the session file if it exists
         session_file = "./user_1.json"
         if os.path.exists(session_file):
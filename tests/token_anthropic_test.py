@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """The unittests for huggingface token counter."""
+import math
 import os
 from unittest.async_case import IsolatedAsyncioTestCase
 
@@ -106,3 +107,38 @@ class AnthropicTokenCounterTest(IsolatedAsyncioTestCase):
 
             res = await counter.count(self.messages)
             self.assertEqual(res, 49)
+
+    async def test_anthropic_token_estimation(self) -> None:
+        """Test the offline estimation of the Anthropic token counter."""
+        counter = AnthropicTokenCounter(
+            model_name="claude-sonnet-4-20250514",
+            mode="estimate",
+            safety_margin=0.0,
+        )
+
+        # The image cannot be decoded, so the upper bound is used
+        res = await counter.count(self.messages)
+        self.assertGreater(res, 1600 + 49 * 0.8)
+        self.assertLess(res, 1600 + 49 * 2)
+
+        # The estimations are memoized per message
+        texts: list[str] = []
+
+        def _tokenizer(text: str) -> int:
+            texts.append(text)
+            return len(text.split())
+
+        counter = AnthropicTokenCounter(
+            model_name="claude-sonnet-4-20250514",
+            mode="estimate",
+            safety_margin=0.5,
+            tokenizer=_tokenizer,
+        )
+        res = await counter.count(self.messages[:2])
+        self.assertEqual(res, math.ceil((4 + 4 + 4 + 6 + 1600) * 1.5))
+        self.assertListEqual(
+            texts,
+            ["You're a helpful assistant.", "What is the capital of France?"],
+        )
+        await counter.count(self.messages[:2])
+        self.assertEqual(len(texts), 2)
@@ -2,10 +2,19 @@
 # pylint: disable=line-too-long
 # flake8: noqa: E501
 """The unittests for OpenAI token counter."""
+import base64
+import io
 import os
 from unittest.async_case import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
 
 from agentscope.token import OpenAITokenCounter
+from agentscope.token._openai_token_counter import (
+    _IMAGE_SIZE_CACHE,
+    _get_sizes_of_image_urls,
+)
 
 
 class OpenAITokenCounterTest(IsolatedAsyncioTestCase):
@@ -158,3 +167,40 @@ class OpenAITokenCounterTest(IsolatedAsyncioTestCase):
 
         n_tokens = await counter.count(self.messages, self.tools)
         self.assertEqual(n_tokens, 1841)
+
+    async def test_image_size_cache(self) -> None:
+        """Test the image sizes are parsed from the headers, fetched
+        concurrently and cached."""
+        images = {}
+        for fmt in ["PNG", "JPEG", "GIF", "WEBP"]:
+            buffer = io.BytesIO()
+            Image.new("RGB", (640, 480)).save(buffer, fmt)
+            images[fmt] = buffer.getvalue()
+
+        data_url = "data:image/png;base64," + base64.b64encode(
+            images["PNG"],
+        ).decode("ascii")
+        web_urls = {
+            f"https://example.com/image.{fmt.lower()}": data
+            for fmt, data in images.items()
+        }
+
+        def _get(url: str, **kwargs: dict) -> MagicMock:
+            """Return the leading bytes of the image."""
+            self.assertEqual(kwargs["headers"]["Range"], "bytes=0-65535")
+            return MagicMock(status_code=206, content=web_urls[url][:1000])
+
+        _IMAGE_SIZE_CACHE.clear()
+        with patch("requests.get", side_effect=_get) as mock_get:
+            sizes = await _get_sizes_of_image_urls(
+                [data_url, *web_urls, data_url],
+            )
+            self.assertEqual(mock_get.call_count, 4)
+            self.assertDictEqual(
+                sizes,
+                {_: (640, 480) for _ in [data_url, *web_urls]},
+            )
+
+            # The sizes are cached
+            await _get_sizes_of_image_urls([data_url, *web_urls])
+            self.assertEqual(mock_get.call_count, 4)
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 """Test toolkit module in agentscope."""
 import asyncio
+import contextvars
+import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from functools import partial
 from typing import Union, Optional, Any, AsyncGenerator, Generator, Tuple
@@ -105,6 +109,13 @@ def sync_generator_func() -> Generator[ToolResponse, None, None]:
     yield response3
 
 
+def pid_func() -> ToolResponse:
+    """Return the process id of the caller."""
+    return ToolResponse(
+        content=[TextBlock(type="text", text=str(os.getpid()))]
+    )
+
+
 class StructuredModel(BaseModel):
     """Test structured model"""
 
@@ -846,6 +857,142 @@ class ToolkitTest(IsolatedAsyncioTestCase):
                 "</notes>",
             )
 
+    async def test_concurrency_and_timeout(self) -> None:
+        """Test the sync tool offloading, concurrency limits, timeout and
+        statistics."""
+        toolkit = Toolkit(max_concurrency=5)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        running = [0, 0]
+        lock = threading.Lock()
+        request_id: contextvars.ContextVar[str] = contextvars.ContextVar(
+            "request_id",
+        )
+
+        def blocking_func() -> ToolResponse:
+            """Block the thread until released."""
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            release.wait(10)
+            with lock:
+                running[0] -= 1
+            return ToolResponse(content=[TextBlock(type="text", text="done")])
+
+        def generator_func() -> Generator[ToolResponse, None, None]:
+            """Yield the context variable in the thread."""
+            yield ToolResponse(
+                content=[TextBlock(type="text", text=request_id.get())],
+            )
+
+        async def slow_func() -> ToolResponse:
+            """A slow async function."""
+            await asyncio.sleep(10)
+            return ToolResponse(content=[])
+
+        toolkit.register_tool_function(blocking_func, max_concurrency=2)
+        toolkit.register_tool_function(generator_func)
+        toolkit.register_tool_function(slow_func, timeout=0.1)
+
+        async def _call(name: str) -> ToolResponse:
+            res = await toolkit.call_tool_function(
+                ToolUseBlock(type="tool_use", id="1", name=name, input={}),
+            )
+            async for chunk in res:
+                last_chunk = chunk
+            return last_chunk
+
+        # The sync calls don't block the event loop, and at most two of
+        # them run at the same time
+        tasks = [asyncio.create_task(_call("blocking_func")) for _ in range(4)]
+        while running[0] < 2:
+            await asyncio.sleep(0.01)
+        stats = toolkit.get_tool_stats()
+        self.assertEqual(stats["blocking_func"].n_running, 2)
+        self.assertEqual(stats["blocking_func"].n_waiting, 2)
+
+        # The event loop keeps serving the other tools meanwhile
+        request_id.set("request-1")
+        res = await _call("generator_func")
+        self.assertEqual(res.content[0]["text"], "request-1")
+        res = await _call("slow_func")
+        self.assertEqual(
+            res.content,
+            [
+                TextBlock(
+                    type="text",
+                    text="<system-info>The tool call has exceeded the "
+                    "timeout of 0.1 seconds.</system-info>",
+                ),
+            ],
+        )
+        self.assertFalse(any(_.done() for _ in tasks))
+
+        release.set()
+        for chunk in await asyncio.gather(*tasks):
+            self.assertEqual(chunk.content[0]["text"], "done")
+        self.assertEqual(running[1], 2)
+
+        stats = toolkit.get_tool_stats()
+        self.assertEqual(stats["blocking_func"].n_calls, 4)
+        self.assertEqual(stats["blocking_func"].n_running, 0)
+        self.assertEqual(stats["blocking_func"].n_waiting, 0)
+        self.assertGreater(stats["blocking_func"].max_wait_time, 0)
+        self.assertEqual(stats["slow_func"].n_timeouts, 1)
+
+    async def test_process_executor(self) -> None:
+        """Test only the opted-in module-level functions are run in the
+        process pool executor, while the bound methods and the meta tools
+        still work."""
+
+        class Agent:
+            """The agent with a tool method."""
+
+            def __init__(self) -> None:
+                self.n_calls = 0
+
+            def count(self) -> ToolResponse:
+                """Count the calls."""
+                self.n_calls += 1
+                return ToolResponse(content=[])
+
+        agent = Agent()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            toolkit = Toolkit(executor=executor)
+            toolkit.create_tool_group("browser_use", "The browser tools.")
+            toolkit.register_tool_function(toolkit.reset_equipped_tools)
+            toolkit.register_tool_function(agent.count)
+            toolkit.register_tool_function(pid_func, run_in_process=True)
+
+            async def _call(name: str, **kwargs: Any) -> ToolResponse:
+                res = await toolkit.call_tool_function(
+                    ToolUseBlock(
+                        type="tool_use",
+                        id="1",
+                        name=name,
+                        input=kwargs,
+                    ),
+                )
+                async for chunk in res:
+                    last_chunk = chunk
+                return last_chunk
+
+            res = await _call("pid_func")
+            self.assertNotEqual(res.content[0]["text"], str(os.getpid()))
+
+            await _call("count")
+            self.assertEqual(agent.n_calls, 1)
+
+            await _call("reset_equipped_tools", browser_use=True)
+            self.assertTrue(toolkit.groups["browser_use"].active)
+
+            for func in [agent.count, lambda: None, async_func]:
+                with self.assertRaises(ValueError):
+                    Toolkit().register_tool_function(
+                        func,
+                        run_in_process=True,
+                    )
+
     async def asyncTearDown(self) -> None:
         """Clean up after each test."""
         self.toolkit = None
@@ -6,10 +6,16 @@ from typing import (
     Any,
 )
 from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
 
 from agentscope import _config
 from agentscope.agent import AgentBase
-from agentscope.embedding import EmbeddingModelBase
+from agentscope.embedding import EmbeddingModelBase, EmbeddingResponse
 from agentscope.formatter import FormatterBase
 from agentscope.message import (
     TextBlock,
@@ -25,6 +31,8 @@ from agentscope.tracing import (
     trace_format,
     trace_embedding,
 )
+from agentscope.tracing._sampling import _settings
+from agentscope.tracing._setup import _create_tracer_provider
 
 
 class TracingTest(IsolatedAsyncioTestCase):
@@ -369,6 +377,16 @@ class TracingTest(IsolatedAsyncioTestCase):
                     raise ValueError("Simulated error in embedding call")
                 return [[0, 1, 2]]
 
+            async def _call_api(
+                self,
+                inputs: list,
+                **kwargs: Any,
+            ) -> EmbeddingResponse:
+                """Simulate the API call"""
+                return EmbeddingResponse(
+                    embeddings=[[0, 1, 2] for _ in inputs]
+                )
+
         model = EmbeddingModel()
         res = await model(False)
         self.assertListEqual(res, [[0, 1, 2]])
@@ -376,6 +394,104 @@ class TracingTest(IsolatedAsyncioTestCase):
         with self.assertRaises(ValueError):
             await model(True)
 
+    async def test_trace_sampling(self) -> None:
+        """Test the sampling and the attribute budgets of the tracing"""
+
+        class Payload:
+            """An input recording whether it's serialized"""
+
+            n_serialized = 0
+
+            def __str__(self) -> str:
+                Payload.n_serialized += 1
+                return "payload"
+
+        @trace(name="inner")
+        def inner(  # pylint: disable=unused-argument
+            payload: Payload,
+            raise_error: bool,
+        ) -> str:
+            """The inner function"""
+            if raise_error:
+                raise ValueError("Simulated error")
+            return "ok"
+
+        @trace(name="outer")
+        def outer(payload: Payload, raise_error: bool) -> str:
+            """The outer function"""
+            try:
+                return inner(payload, raise_error)
+            except ValueError:
+                return "failed"
+
+        exporter = InMemorySpanExporter()
+        provider = _create_tracer_provider(
+            SimpleSpanProcessor(exporter),
+            sample_ratio=0.0,
+            keep_error_traces=True,
+        )
+        try:
+            with patch(
+                "opentelemetry.trace.get_tracer",
+                provider.get_tracer,
+            ):
+                # Not sampled, and dropped without serialization
+                self.assertEqual(outer(Payload(), False), "ok")
+                self.assertEqual(len(exporter.get_finished_spans()), 0)
+                self.assertEqual(Payload.n_serialized, 0)
+
+                # Kept by the tail sampling as the inner span fails
+                self.assertEqual(outer(Payload(), True), "failed")
+                spans = exporter.get_finished_spans()
+                self.assertListEqual(
+                    [_.name for _ in spans],
+                    ["inner", "outer"],
+                )
+                self.assertTrue(
+                    all(_.context.trace_flags.sampled for _ in spans)
+                )
+                self.assertEqual(Payload.n_serialized, 2)
+                self.assertIn("payload", spans[1].attributes["input"])
+                self.assertEqual(spans[1].attributes["output"], '"failed"')
+
+            # Sampled with the attribute budgets and hashed binary payloads
+            exporter.clear()
+            provider = _create_tracer_provider(
+                SimpleSpanProcessor(exporter),
+                max_attribute_length={"COMMON": 200},
+                hash_binary=True,
+            )
+            with patch(
+                "opentelemetry.trace.get_tracer",
+                provider.get_tracer,
+            ):
+
+                @trace(name="binary")
+                def binary(  # pylint: disable=unused-argument
+                    block: dict,
+                    text: str,
+                ) -> None:
+                    """The function with a binary input"""
+
+                binary(
+                    {
+                        "type": "base64",
+                        "media_type": "image/png",
+                        "data": "a" * 10000,
+                    },
+                    "b" * 1000,
+                )
+                (span,) = exporter.get_finished_spans()
+                self.assertIn("sha256:", span.attributes["input"])
+                self.assertNotIn("a" * 100, span.attributes["input"])
+                self.assertIn("...[truncated", span.attributes["input"])
+                self.assertLess(len(span.attributes["input"]), 250)
+
+        finally:
+            _settings.max_attribute_length = {}
+            _settings.hash_binary = False
+            _settings.tail_sampling = False
+
     async def asyncTearDown(self) -> None:
         """Tear down the environment"""
         _config.trace_enabled = True